@@ -0,0 +1,61 @@
+"""Deduplicate documents by content hash
+
+Revision ID: 20260215_0900
+Revises: 20260214_1704
+Create Date: 2026-02-15 09:00:00.000000
+
+Repoints vendor invoices at the oldest document per (client_id, file_hash),
+removes the duplicate rows and replaces the plain file_hash index with a
+partial unique index. Duplicate objects in storage are left in place.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20260215_0900'
+down_revision = '20260214_1704'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TEMPORARY TABLE document_duplicates ON COMMIT DROP AS
+        SELECT id, keep_id FROM (
+            SELECT
+                id,
+                first_value(id) OVER (
+                    PARTITION BY client_id, file_hash
+                    ORDER BY uploaded_at, id
+                ) AS keep_id
+            FROM documents
+            WHERE file_hash IS NOT NULL
+        ) ranked
+        WHERE id <> keep_id
+    """)
+
+    op.execute("""
+        UPDATE vendor_invoices vi
+        SET document_id = d.keep_id
+        FROM document_duplicates d
+        WHERE vi.document_id = d.id
+    """)
+
+    op.execute("""
+        DELETE FROM documents
+        WHERE id IN (SELECT id FROM document_duplicates)
+    """)
+
+    op.drop_index('ix_documents_file_hash', table_name='documents')
+    op.create_index(
+        'uq_documents_client_file_hash',
+        'documents',
+        ['client_id', 'file_hash'],
+        unique=True,
+        postgresql_where=sa.text('file_hash IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_documents_client_file_hash', table_name='documents')
+    op.create_index('ix_documents_file_hash', 'documents', ['file_hash'])
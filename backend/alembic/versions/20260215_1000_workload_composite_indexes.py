@@ -0,0 +1,80 @@
+"""Composite, partial and covering indexes for hot ledger/queue/bank queries
+
+Revision ID: 20260215_1000
+Revises: 20260215_0900
+Create Date: 2026-02-15 10:00:00.000000
+
+Indexes are built CONCURRENTLY so the migration does not block writes on
+large tables. Enum-typed status columns store member names, so the partial
+index predicates use 'PENDING' / 'UNMATCHED'.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20260215_1000'
+down_revision = '20260215_0900'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    dict(
+        index_name='ix_general_ledger_client_status_date',
+        table_name='general_ledger',
+        columns=['client_id', 'status', 'accounting_date'],
+        postgresql_include=['id', 'source_type'],
+    ),
+    dict(
+        index_name='ix_gl_lines_entry_account_amounts',
+        table_name='general_ledger_lines',
+        columns=['general_ledger_id', 'account_number'],
+        postgresql_include=['debit_amount', 'credit_amount'],
+    ),
+    dict(
+        index_name='ix_review_queue_client_status_created',
+        table_name='review_queue',
+        columns=['client_id', 'status', 'created_at'],
+    ),
+    dict(
+        index_name='ix_review_queue_pending_client_created',
+        table_name='review_queue',
+        columns=['client_id', 'created_at'],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    ),
+    dict(
+        index_name='ix_bank_transactions_client_status_date',
+        table_name='bank_transactions',
+        columns=['client_id', 'status', 'transaction_date'],
+    ),
+    dict(
+        index_name='ix_bank_transactions_unmatched_client_date',
+        table_name='bank_transactions',
+        columns=['client_id', 'transaction_date'],
+        postgresql_where=sa.text("status = 'UNMATCHED'"),
+    ),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index in INDEXES:
+            op.create_index(
+                **index,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+    for table_name in {index['table_name'] for index in INDEXES}:
+        op.execute(f"ANALYZE {table_name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index in reversed(INDEXES):
+            op.drop_index(
+                index['index_name'],
+                table_name=index['table_name'],
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
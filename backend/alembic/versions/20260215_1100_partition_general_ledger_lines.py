@@ -0,0 +1,284 @@
+"""Denormalize and range-partition general_ledger_lines by fiscal year
+
+Revision ID: 20260215_1100
+Revises: 20260215_1000
+Create Date: 2026-02-15 11:00:00.000000
+
+Lines carry client_id, accounting_date, fiscal_year and status from their
+entry so reports can filter lines directly and prune to the relevant
+fiscal-year partitions.
+
+The table is rebuilt online:
+1. Create the partitioned general_ledger_lines_new with yearly partitions
+2. Mirror writes on the old table into the new one with a trigger
+3. Backfill in id-ordered batches, each in its own transaction
+4. Build indexes, then swap the tables under a short SHARE lock after a
+   final reconcile pass
+
+Afterwards trg_general_ledger_sync_lines keeps the copied columns in line
+with general_ledger (bulk status updates bypass the ORM).
+"""
+from datetime import date
+from uuid import UUID
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20260215_1100'
+down_revision = '20260215_1000'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 5000
+
+LINE_COLUMNS = [
+    'id', 'general_ledger_id', 'line_number', 'account_number',
+    'debit_amount', 'credit_amount', 'vat_code', 'tax_code_id',
+    'vat_amount', 'vat_base_amount', 'department_id', 'project_id',
+    'cost_center_id', 'line_description', 'ai_confidence_score',
+    'ai_reasoning', 'created_at',
+]
+ENTRY_COLUMNS = ['client_id', 'accounting_date', 'fiscal_year', 'status']
+
+# (temporary name on general_ledger_lines_new, final name, definition)
+INDEXES = [
+    ('ix_gll_new_general_ledger_id', 'ix_general_ledger_lines_general_ledger_id',
+     '(general_ledger_id)'),
+    ('ix_gll_new_account_number', 'ix_general_ledger_lines_account_number',
+     '(account_number)'),
+    ('ix_gll_new_tax_code_id', 'ix_general_ledger_lines_tax_code_id',
+     '(tax_code_id)'),
+    ('ix_gll_new_client_status_date_account', 'ix_gl_lines_client_status_date_account',
+     '(client_id, status, accounting_date, account_number) INCLUDE (debit_amount, credit_amount)'),
+    # From 20260215_1000: joins from entries to their lines per account
+    ('ix_gll_new_entry_account_amounts', 'ix_gl_lines_entry_account_amounts',
+     '(general_ledger_id, account_number) INCLUDE (debit_amount, credit_amount)'),
+]
+
+SELECT_FROM_OLD = (
+    "SELECT " + ", ".join(f"l.{c}" for c in LINE_COLUMNS) + ", "
+    + ", ".join(f"g.{c}" for c in ENTRY_COLUMNS)
+    + " FROM general_ledger_lines l JOIN general_ledger g ON g.id = l.general_ledger_id"
+)
+INSERT_INTO_NEW = (
+    "INSERT INTO general_ledger_lines_new ("
+    + ", ".join(LINE_COLUMNS + ENTRY_COLUMNS) + ") "
+)
+
+MIRROR_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION mirror_general_ledger_lines() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM general_ledger_lines_new WHERE id = OLD.id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        {INSERT_INTO_NEW}
+        {SELECT_FROM_OLD} WHERE l.id = NEW.id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SYNC_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_{table}() RETURNS trigger AS $$
+BEGIN
+    UPDATE {table}
+    SET client_id = NEW.client_id,
+        accounting_date = NEW.accounting_date,
+        fiscal_year = NEW.fiscal_year,
+        status = NEW.status
+    WHERE general_ledger_id = NEW.id
+      AND fiscal_year = OLD.fiscal_year;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SYNC_TRIGGER = """
+CREATE TRIGGER {name}
+AFTER UPDATE OF client_id, accounting_date, fiscal_year, status ON general_ledger
+FOR EACH ROW
+WHEN (
+    OLD.client_id IS DISTINCT FROM NEW.client_id
+    OR OLD.accounting_date IS DISTINCT FROM NEW.accounting_date
+    OR OLD.fiscal_year IS DISTINCT FROM NEW.fiscal_year
+    OR OLD.status IS DISTINCT FROM NEW.status
+)
+EXECUTE FUNCTION sync_{table}()
+"""
+
+SYNC_COLUMNS_DIFFER = " OR ".join(f"n.{c} IS DISTINCT FROM g.{c}" for c in ENTRY_COLUMNS)
+
+
+def _create_partitioned_table() -> None:
+    op.execute("""
+        CREATE TABLE general_ledger_lines_new (
+            id UUID NOT NULL,
+            general_ledger_id UUID NOT NULL
+                REFERENCES general_ledger (id) ON DELETE CASCADE,
+            line_number INTEGER NOT NULL,
+            client_id UUID NOT NULL,
+            accounting_date DATE NOT NULL,
+            fiscal_year INTEGER NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            account_number VARCHAR(10) NOT NULL,
+            debit_amount NUMERIC(15, 2) NOT NULL,
+            credit_amount NUMERIC(15, 2) NOT NULL,
+            vat_code VARCHAR(10),
+            tax_code_id UUID,
+            vat_amount NUMERIC(15, 2),
+            vat_base_amount NUMERIC(15, 2),
+            department_id UUID,
+            project_id UUID,
+            cost_center_id UUID,
+            line_description TEXT,
+            ai_confidence_score INTEGER,
+            ai_reasoning TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT general_ledger_lines_new_pkey PRIMARY KEY (id, fiscal_year),
+            CONSTRAINT uq_gl_line_number_new UNIQUE (general_ledger_id, line_number, fiscal_year),
+            CONSTRAINT fk_general_ledger_lines_new_tax_code FOREIGN KEY (tax_code_id)
+                REFERENCES tax_codes (id) ON DELETE SET NULL,
+            CONSTRAINT check_amounts_positive_new
+                CHECK (debit_amount >= 0 AND credit_amount >= 0),
+            CONSTRAINT check_debit_or_credit_new
+                CHECK ((debit_amount > 0 AND credit_amount = 0) OR (credit_amount > 0 AND debit_amount = 0))
+        ) PARTITION BY RANGE (fiscal_year)
+    """)
+
+    bind = op.get_bind()
+    first, last = bind.execute(
+        sa.text("SELECT min(fiscal_year), max(fiscal_year) FROM general_ledger")
+    ).one()
+    current = date.today().year
+    first = min(first or current, current)
+    last = max(last or current, current) + 1
+    for year in range(first, last + 1):
+        op.execute(
+            f"CREATE TABLE general_ledger_lines_y{year} PARTITION OF general_ledger_lines_new "
+            f"FOR VALUES FROM ({year}) TO ({year + 1})"
+        )
+    op.execute("CREATE TABLE general_ledger_lines_default PARTITION OF general_ledger_lines_new DEFAULT")
+
+
+def upgrade() -> None:
+    _create_partitioned_table()
+
+    # Mirror line writes and entry status changes into the new table
+    op.execute(MIRROR_FUNCTION)
+    op.execute("""
+        CREATE TRIGGER trg_general_ledger_lines_mirror
+        AFTER INSERT OR UPDATE OR DELETE ON general_ledger_lines
+        FOR EACH ROW EXECUTE FUNCTION mirror_general_ledger_lines()
+    """)
+    op.execute(SYNC_FUNCTION.format(table='general_ledger_lines_new'))
+    op.execute(SYNC_TRIGGER.format(
+        name='trg_general_ledger_sync_lines_new', table='general_ledger_lines_new'
+    ))
+
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        # Backfill in short transactions; ON CONFLICT skips rows the
+        # mirror trigger already copied
+        last_id = UUID(int=0)
+        while True:
+            rows = bind.execute(
+                sa.text("SELECT id FROM general_ledger_lines WHERE id > :last_id ORDER BY id LIMIT :batch"),
+                {"last_id": last_id, "batch": BATCH_SIZE},
+            ).scalars().all()
+            if not rows:
+                break
+            bind.execute(
+                sa.text(
+                    f"{INSERT_INTO_NEW} {SELECT_FROM_OLD} "
+                    "WHERE l.id >= :first_id AND l.id <= :last_id ON CONFLICT DO NOTHING"
+                ),
+                {"first_id": rows[0], "last_id": rows[-1]},
+            )
+            last_id = rows[-1]
+
+        for temp_name, _, definition in INDEXES:
+            op.execute(f"CREATE INDEX IF NOT EXISTS {temp_name} ON general_ledger_lines_new {definition}")
+
+    # Swap: block writers briefly, reconcile rows a backfill batch raced
+    # with the triggers, rename
+    op.execute("LOCK TABLE general_ledger, general_ledger_lines IN SHARE MODE")
+    op.execute(
+        "DELETE FROM general_ledger_lines_new n "
+        "WHERE NOT EXISTS (SELECT 1 FROM general_ledger_lines l WHERE l.id = n.id)"
+    )
+    op.execute(f"{INSERT_INTO_NEW} {SELECT_FROM_OLD} ON CONFLICT DO NOTHING")
+    op.execute(
+        "UPDATE general_ledger_lines_new n "
+        "SET " + ", ".join(f"{c} = g.{c}" for c in ENTRY_COLUMNS) + " "
+        f"FROM general_ledger g WHERE g.id = n.general_ledger_id AND ({SYNC_COLUMNS_DIFFER})"
+    )
+
+    op.execute("DROP TRIGGER trg_general_ledger_sync_lines_new ON general_ledger")
+    op.execute("DROP FUNCTION sync_general_ledger_lines_new()")
+    op.execute("DROP TABLE general_ledger_lines")
+    op.execute("DROP FUNCTION mirror_general_ledger_lines()")
+    op.execute("ALTER TABLE general_ledger_lines_new RENAME TO general_ledger_lines")
+    for constraint in [
+        'general_ledger_lines_new_pkey', 'uq_gl_line_number_new',
+        'general_ledger_lines_new_general_ledger_id_fkey',
+        'fk_general_ledger_lines_new_tax_code',
+        'check_amounts_positive_new', 'check_debit_or_credit_new',
+    ]:
+        op.execute(
+            f"ALTER TABLE general_ledger_lines RENAME CONSTRAINT {constraint} "
+            f"TO {constraint.replace('_new', '')}"
+        )
+    for temp_name, final_name, _ in INDEXES:
+        op.execute(f"ALTER INDEX {temp_name} RENAME TO {final_name}")
+
+    op.execute(SYNC_FUNCTION.format(table='general_ledger_lines'))
+    op.execute(SYNC_TRIGGER.format(name='trg_general_ledger_sync_lines', table='general_ledger_lines'))
+    op.execute("ANALYZE general_ledger_lines")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_general_ledger_sync_lines ON general_ledger")
+    op.execute("DROP FUNCTION IF EXISTS sync_general_ledger_lines()")
+
+    op.execute("ALTER TABLE general_ledger_lines RENAME TO general_ledger_lines_partitioned")
+    op.execute(f"""
+        CREATE TABLE general_ledger_lines AS
+        SELECT {', '.join(LINE_COLUMNS)} FROM general_ledger_lines_partitioned
+    """)
+    op.execute("DROP TABLE general_ledger_lines_partitioned CASCADE")
+
+    for column in ['id', 'general_ledger_id', 'line_number', 'account_number',
+                   'debit_amount', 'credit_amount', 'created_at']:
+        op.alter_column('general_ledger_lines', column, nullable=False)
+    op.create_primary_key('general_ledger_lines_pkey', 'general_ledger_lines', ['id'])
+    op.create_unique_constraint(
+        'uq_gl_line_number', 'general_ledger_lines', ['general_ledger_id', 'line_number']
+    )
+    op.create_check_constraint(
+        'check_amounts_positive', 'general_ledger_lines',
+        'debit_amount >= 0 AND credit_amount >= 0',
+    )
+    op.create_check_constraint(
+        'check_debit_or_credit', 'general_ledger_lines',
+        '(debit_amount > 0 AND credit_amount = 0) OR (credit_amount > 0 AND debit_amount = 0)',
+    )
+    op.create_foreign_key(
+        'general_ledger_lines_general_ledger_id_fkey', 'general_ledger_lines',
+        'general_ledger', ['general_ledger_id'], ['id'], ondelete='CASCADE',
+    )
+    op.create_foreign_key(
+        'fk_general_ledger_lines_tax_code', 'general_ledger_lines',
+        'tax_codes', ['tax_code_id'], ['id'], ondelete='SET NULL',
+    )
+    op.create_index('ix_general_ledger_lines_general_ledger_id', 'general_ledger_lines', ['general_ledger_id'])
+    op.create_index('ix_general_ledger_lines_account_number', 'general_ledger_lines', ['account_number'])
+    op.create_index('ix_general_ledger_lines_tax_code_id', 'general_ledger_lines', ['tax_code_id'])
+    op.create_index(
+        'ix_gl_lines_entry_account_amounts', 'general_ledger_lines',
+        ['general_ledger_id', 'account_number'],
+        postgresql_include=['debit_amount', 'credit_amount'],
+    )
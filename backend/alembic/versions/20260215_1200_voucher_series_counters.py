@@ -0,0 +1,58 @@
+"""Per-year voucher number counters in voucher_series
+
+Revision ID: 20260215_1200
+Revises: 20260215_1100
+Create Date: 2026-02-15 12:00:00.000000
+
+voucher_series gets a fiscal_year column. Rows with a year are counters
+used by VoucherNumberAllocator; the (client_id, code) uniqueness now only
+applies to rows without a year.
+
+Counters are created lazily by the allocator; the ones created here cover
+existing "YYYY-NNNN" vouchers so the first allocation does not need to
+scan general_ledger.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20260215_1200'
+down_revision = '20260215_1100'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('voucher_series', sa.Column('fiscal_year', sa.Integer(), nullable=True))
+
+    op.drop_constraint('uq_voucher_series_client_code', 'voucher_series', type_='unique')
+    op.create_index(
+        'uq_voucher_series_client_code', 'voucher_series', ['client_id', 'code'],
+        unique=True, postgresql_where=sa.text('fiscal_year IS NULL'),
+    )
+    op.create_index(
+        'uq_voucher_series_client_code_year', 'voucher_series',
+        ['client_id', 'code', 'fiscal_year'], unique=True,
+    )
+
+    op.execute("""
+        INSERT INTO voucher_series (id, client_id, code, name, fiscal_year, next_number, is_active, created_at)
+        SELECT gen_random_uuid(), client_id, voucher_series,
+               voucher_series || ' ' || split_part(voucher_number, '-', 1),
+               CAST(split_part(voucher_number, '-', 1) AS INTEGER),
+               MAX(CAST(split_part(voucher_number, '-', 2) AS INTEGER)) + 1,
+               true, now()
+        FROM general_ledger
+        WHERE voucher_series IS NOT NULL
+          AND voucher_number ~ '^[0-9]{4}-[0-9]+$'
+        GROUP BY client_id, voucher_series, split_part(voucher_number, '-', 1)
+        ON CONFLICT (client_id, code, fiscal_year) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM voucher_series WHERE fiscal_year IS NOT NULL")
+    op.drop_index('uq_voucher_series_client_code_year', table_name='voucher_series')
+    op.drop_index('uq_voucher_series_client_code', table_name='voucher_series')
+    op.create_unique_constraint('uq_voucher_series_client_code', 'voucher_series', ['client_id', 'code'])
+    op.drop_column('voucher_series', 'fiscal_year')
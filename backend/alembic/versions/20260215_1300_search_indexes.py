@@ -0,0 +1,109 @@
+"""Full-text and trigram search indexes for audit trail, vouchers and invoices
+
+Revision ID: 20260215_1300
+Revises: 20260215_1200
+Create Date: 2026-02-15 13:00:00.000000
+
+Adds generated search_vector columns (STORED, to_tsvector('simple', ...))
+with GIN indexes, pg_trgm GIN indexes for substring search on identifiers
+and names, and a (client_id, timestamp, id) index for keyset pagination of
+the audit trail.
+
+Adding a stored generated column rewrites the table; the indexes are then
+built CONCURRENTLY so writes are only blocked during the rewrite.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '20260215_1300'
+down_revision = '20260215_1200'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTORS = {
+    'audit_trail': (
+        "to_tsvector('simple'::regconfig, coalesce(table_name, '') || ' ' || coalesce(action, '') "
+        "|| ' ' || coalesce(changed_by_name, '') || ' ' || coalesce(reason, ''))"
+    ),
+    'general_ledger': (
+        "to_tsvector('simple'::regconfig, coalesce(voucher_series, '') || ' ' || voucher_number "
+        "|| ' ' || description || ' ' || source_type)"
+    ),
+    'vendor_invoices': (
+        "to_tsvector('simple'::regconfig, invoice_number || ' ' || coalesce(ai_detected_category, '') "
+        "|| ' ' || coalesce(ehf_message_id, ''))"
+    ),
+}
+
+TRIGRAM_INDEXES = [
+    ('ix_audit_trail_changed_by_name_trgm', 'audit_trail', 'changed_by_name'),
+    ('ix_audit_trail_reason_trgm', 'audit_trail', 'reason'),
+    ('ix_general_ledger_voucher_number_trgm', 'general_ledger', 'voucher_number'),
+    ('ix_general_ledger_description_trgm', 'general_ledger', 'description'),
+    ('ix_vendor_invoices_invoice_number_trgm', 'vendor_invoices', 'invoice_number'),
+    ('ix_vendors_name_trgm', 'vendors', 'name'),
+]
+
+
+def _search_index_name(table_name: str) -> str:
+    return f'ix_{table_name}_search'
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table_name, expression in SEARCH_VECTORS.items():
+        op.add_column(
+            table_name,
+            sa.Column(
+                'search_vector',
+                postgresql.TSVECTOR(),
+                sa.Computed(expression, persisted=True),
+            ),
+        )
+
+    with op.get_context().autocommit_block():
+        for table_name in SEARCH_VECTORS:
+            op.create_index(
+                _search_index_name(table_name), table_name, ['search_vector'],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for index_name, table_name, column in TRIGRAM_INDEXES:
+            op.create_index(
+                index_name, table_name, [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.create_index(
+            'ix_audit_trail_client_timestamp_id', 'audit_trail',
+            ['client_id', 'timestamp', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    for table_name in {*SEARCH_VECTORS, 'vendors'}:
+        op.execute(f"ANALYZE {table_name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_audit_trail_client_timestamp_id', table_name='audit_trail',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+            op.drop_index(
+                index_name, table_name=table_name,
+                postgresql_concurrently=True, if_exists=True,
+            )
+
+    for table_name in SEARCH_VECTORS:
+        # Dropping the column drops its GIN index
+        op.drop_column(table_name, 'search_vector')
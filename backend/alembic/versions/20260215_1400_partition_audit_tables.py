@@ -0,0 +1,200 @@
+"""Range-partition the audit tables by month
+
+Revision ID: 20260215_1400
+Revises: 20260215_1300
+Create Date: 2026-02-15 14:00:00.000000
+
+audit_trail, voucher_audit_log and task_audit_log become partitioned by
+month on their timestamp (<table>_p<yyyy>_<mm> plus a default partition)
+so closed fiscal years can be archived and detached
+(app/services/audit_archive.py). The primary keys become (id, <key>).
+
+The tables are append-only, so each one is rebuilt online:
+1. Create <table>_new with monthly partitions from the oldest row to next month
+2. Mirror inserts on the old table into the new one with a trigger
+3. Backfill in id-ordered batches, each in its own transaction
+4. Build the indexes, then swap the tables under a short SHARE lock after
+   copying rows a backfill batch raced with
+"""
+from datetime import date
+from uuid import UUID
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20260215_1400'
+down_revision = '20260215_1300'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 5000
+
+# table -> (partition key, foreign keys)
+AUDIT_TABLES = {
+    'audit_trail': (
+        'timestamp',
+        ["FOREIGN KEY (client_id) REFERENCES clients (id) ON DELETE RESTRICT"],
+    ),
+    'voucher_audit_log': (
+        'timestamp',
+        ["FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE SET NULL"],
+    ),
+    'task_audit_log': (
+        'created_at',
+        ["FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE"],
+    ),
+}
+
+
+def _months(first: date, last: date):
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _month_bounds(year: int, month: int):
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return date(year, month, 1), end
+
+
+def _stored_columns(bind, table: str) -> list:
+    """Columns that can be inserted (not the generated search_vector)"""
+    return bind.execute(
+        sa.text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table "
+            "AND is_generated = 'NEVER' ORDER BY ordinal_position"
+        ),
+        {"table": table},
+    ).scalars().all()
+
+
+def _secondary_indexes(bind, table: str) -> list:
+    """(name, definition) of every index except the primary key"""
+    return bind.execute(
+        sa.text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = :table "
+            "AND indexname <> :pkey ORDER BY indexname"
+        ),
+        {"table": table, "pkey": f"{table}_pkey"},
+    ).all()
+
+
+def _partition(table: str, key: str) -> None:
+    bind = op.get_bind()
+    new = f"{table}_new"
+    columns = ", ".join(f'"{c}"' for c in _stored_columns(bind, table))
+    foreign_keys = AUDIT_TABLES[table][1]
+
+    op.execute(f"""
+        CREATE TABLE {new} (
+            LIKE {table} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS,
+            CONSTRAINT {new}_pkey PRIMARY KEY (id, "{key}"),
+            {', '.join(foreign_keys)}
+        ) PARTITION BY RANGE ("{key}")
+    """)
+
+    first = bind.execute(sa.text(f'SELECT min("{key}") FROM {table}')).scalar()
+    today = date.today()
+    last = date(today.year + 1, 1, 1) if today.month == 12 else date(today.year, today.month + 1, 1)
+    for year, month in _months((first.date() if first else today), last):
+        start, end = _month_bounds(year, month)
+        op.execute(
+            f"CREATE TABLE {table}_p{year}_{month:02d} PARTITION OF {new} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {new} DEFAULT")
+
+    # Append-only: mirroring inserts is enough
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION mirror_{table}() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO {new} ({columns})
+            SELECT {columns} FROM {table} WHERE id = NEW.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        CREATE TRIGGER trg_{table}_mirror
+        AFTER INSERT ON {table}
+        FOR EACH ROW EXECUTE FUNCTION mirror_{table}()
+    """)
+
+    indexes = _secondary_indexes(bind, table)
+    with op.get_context().autocommit_block():
+        last_id = UUID(int=0)
+        while True:
+            rows = bind.execute(
+                sa.text(f"SELECT id FROM {table} WHERE id > :last_id ORDER BY id LIMIT :batch"),
+                {"last_id": last_id, "batch": BATCH_SIZE},
+            ).scalars().all()
+            if not rows:
+                break
+            bind.execute(
+                sa.text(
+                    f"INSERT INTO {new} ({columns}) SELECT {columns} FROM {table} "
+                    "WHERE id >= :first_id AND id <= :last_id ON CONFLICT DO NOTHING"
+                ),
+                {"first_id": rows[0], "last_id": rows[-1]},
+            )
+            last_id = rows[-1]
+
+        for name, definition in indexes:
+            op.execute(
+                definition
+                .replace(f"INDEX {name} ON", f"INDEX IF NOT EXISTS {name}_new ON", 1)
+                .replace(f".{table} ", f".{new} ", 1)
+            )
+
+    # Swap: block writers briefly, copy rows the backfill raced with, rename
+    op.execute(f"LOCK TABLE {table} IN SHARE MODE")
+    op.execute(
+        f"INSERT INTO {new} ({columns}) SELECT {columns} FROM {table} o "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {new} n WHERE n.id = o.id AND n.\"{key}\" = o.\"{key}\")"
+    )
+    op.execute(f"DROP TABLE {table}")
+    op.execute(f"DROP FUNCTION mirror_{table}()")
+    op.execute(f"ALTER TABLE {new} RENAME TO {table}")
+    op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {new}_pkey TO {table}_pkey")
+    for name, _ in indexes:
+        op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+    op.execute(f"ANALYZE {table}")
+
+
+def _unpartition(table: str) -> None:
+    bind = op.get_bind()
+    old = f"{table}_partitioned"
+    columns = ", ".join(f'"{c}"' for c in _stored_columns(bind, table))
+    indexes = _secondary_indexes(bind, table)
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+    for name, _ in indexes:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_old")
+    op.execute(f"""
+        CREATE TABLE {table} (
+            LIKE {old} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS,
+            CONSTRAINT {table}_pkey PRIMARY KEY (id),
+            {', '.join(AUDIT_TABLES[table][1])}
+        )
+    """)
+    op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {old}")
+    for name, definition in indexes:
+        # Definitions of partitioned indexes read "ON ONLY <table>"
+        op.execute(definition.replace(" ON ONLY ", " ON ", 1))
+    op.execute(f"DROP TABLE {old} CASCADE")
+
+
+def upgrade() -> None:
+    for table, (key, _) in AUDIT_TABLES.items():
+        _partition(table, key)
+
+
+def downgrade() -> None:
+    for table in AUDIT_TABLES:
+        _unpartition(table)
@@ -0,0 +1,63 @@
+"""Resumable tenant-wide period close jobs
+
+Revision ID: 20260215_1500
+Revises: 20260215_1400
+Create Date: 2026-02-15 15:00:00.000000
+
+period_close_jobs holds one month-end close run for a tenant;
+period_close_job_items holds each client's status, result and step
+timings so an interrupted run can resume (app/services/period_close_jobs.py).
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '20260215_1500'
+down_revision = '20260215_1400'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'period_close_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('tenants.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('period', sa.String(7), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('concurrency', sa.Integer(), nullable=False, server_default='8'),
+        sa.Column('total_clients', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('timings', sa.JSON(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_period_close_jobs_tenant_id', 'period_close_jobs', ['tenant_id'])
+
+    op.create_table(
+        'period_close_job_items',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('job_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('period_close_jobs.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('client_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('clients.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('timings', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('job_id', 'client_id', name='uq_period_close_job_items_job_client'),
+    )
+    op.create_index('ix_period_close_job_items_job_status', 'period_close_job_items', ['job_id', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_period_close_job_items_job_status', table_name='period_close_job_items')
+    op.drop_table('period_close_job_items')
+    op.drop_index('ix_period_close_jobs_tenant_id', table_name='period_close_jobs')
+    op.drop_table('period_close_jobs')
@@ -0,0 +1,55 @@
+"""Payment status history
+
+Revision ID: 20260216_0900
+Revises: 20260215_1500
+Create Date: 2026-02-16 09:00:00.000000
+
+payment_status_history holds one row per payment status transition of a
+vendor or customer invoice. Overdue detection writes its rows in bulk for
+all clients at once (app/services/payment_status_service.py).
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '20260216_0900'
+down_revision = '20260215_1500'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'payment_status_history',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('client_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('clients.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('invoice_type', sa.String(20), nullable=False),
+        sa.Column('invoice_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('from_status', sa.String(20), nullable=True),
+        sa.Column('to_status', sa.String(20), nullable=False),
+        sa.Column('paid_amount', sa.Numeric(15, 2), nullable=True),
+        sa.Column('reason', sa.String(50), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+    )
+    op.create_index('ix_payment_status_history_client_id', 'payment_status_history', ['client_id'])
+    op.create_index('ix_payment_status_history_invoice', 'payment_status_history', ['invoice_type', 'invoice_id'])
+
+    # Overdue detection scans open invoices by due date across all clients
+    op.create_index(
+        'ix_vendor_invoices_open_due_date', 'vendor_invoices', ['due_date'],
+        postgresql_where=sa.text("payment_status IN ('unpaid', 'partially_paid')"),
+    )
+    op.create_index(
+        'ix_customer_invoices_open_due_date', 'customer_invoices', ['due_date'],
+        postgresql_where=sa.text("payment_status IN ('unpaid', 'partially_paid')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_customer_invoices_open_due_date', table_name='customer_invoices')
+    op.drop_index('ix_vendor_invoices_open_due_date', table_name='vendor_invoices')
+    op.drop_index('ix_payment_status_history_invoice', table_name='payment_status_history')
+    op.drop_index('ix_payment_status_history_client_id', table_name='payment_status_history')
+    op.drop_table('payment_status_history')
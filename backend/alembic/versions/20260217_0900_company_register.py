@@ -0,0 +1,56 @@
+"""Company register (local Enhetsregisteret mirror)
+
+Revision ID: 20260217_0900
+Revises: 20260216_0900
+Create Date: 2026-02-17 09:00:00.000000
+
+company_register holds the Enhetsregisteret bulk dataset, loaded by
+scripts/import_company_register.py. Lookups by org number use the primary
+key; name search uses a pg_trgm GIN index for substrings and a
+lower(name) text_pattern_ops index for short prefixes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20260217_0900'
+down_revision = '20260216_0900'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_table(
+        'company_register',
+        sa.Column('org_number', sa.String(9), primary_key=True),
+        sa.Column('name', sa.String(500), nullable=False),
+        sa.Column('organizational_form', sa.String(10), nullable=True),
+        sa.Column('organizational_form_desc', sa.String(255), nullable=True),
+        sa.Column('address', sa.String(500), nullable=True),
+        sa.Column('postal_code', sa.String(10), nullable=True),
+        sa.Column('city', sa.String(100), nullable=True),
+        sa.Column('municipality', sa.String(100), nullable=True),
+        sa.Column('municipality_number', sa.String(10), nullable=True),
+        sa.Column('nace_code', sa.String(10), nullable=True),
+        sa.Column('nace_description', sa.String(255), nullable=True),
+        sa.Column('registration_date', sa.Date(), nullable=True),
+        sa.Column('employees', sa.Integer(), nullable=True),
+        sa.Column('imported_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+    )
+    op.create_index(
+        'ix_company_register_name_trgm', 'company_register', ['name'],
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_company_register_name_prefix', 'company_register',
+        [sa.text('lower(name) text_pattern_ops')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_company_register_name_prefix', table_name='company_register')
+    op.drop_index('ix_company_register_name_trgm', table_name='company_register')
+    op.drop_table('company_register')
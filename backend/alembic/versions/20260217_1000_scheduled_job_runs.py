@@ -0,0 +1,32 @@
+"""Scheduled job runs (one claim per job and day)
+
+Revision ID: 20260217_1000
+Revises: 20260217_0900
+Create Date: 2026-02-17 10:00:00.000000
+
+scheduled_job_runs records which instance runs a scheduled job on a given
+day. The primary key makes the claim (INSERT ... ON CONFLICT DO NOTHING)
+succeed on exactly one instance.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20260217_1000'
+down_revision = '20260217_0900'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scheduled_job_runs',
+        sa.Column('job_name', sa.String(100), primary_key=True),
+        sa.Column('scheduled_date', sa.Date(), primary_key=True),
+        sa.Column('claimed_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('claimed_by', sa.String(255), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('scheduled_job_runs')
@@ -3,7 +3,7 @@ Base Agent Classes
 """
 import anthropic
 import logging
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
@@ -12,6 +12,8 @@ from app.config import settings
 from app.models.agent_task import AgentTask
 from app.models.agent_event import AgentEvent
 from app.models.audit_trail import AuditTrail
+from app.utils.audit import get_audit_spool, record_audit
+from app.utils.metrics import LLM_REQUEST_DURATION, record_llm_usage, timed
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +37,10 @@ class BaseAgent:
         if not settings.ANTHROPIC_API_KEY:
             logger.warning(f"{agent_type}: ANTHROPIC_API_KEY not set")
             self.client = None
+            self.async_client = None
         else:
             self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+            self.async_client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
         
         self.model = settings.CLAUDE_MODEL
         self.max_tokens = settings.CLAUDE_MAX_TOKENS
@@ -226,11 +230,17 @@ class BaseAgent:
         action: str,
         entity_type: str,
         entity_id: str,
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        out_of_band: bool = False
     ):
         """
         Log audit trail entry
         
+        By default the entry is buffered in the caller's transaction and
+        written when it commits - use this for anything that documents a
+        booking. out_of_band=True appends to the local audit spool instead
+        (no database round-trip; for non-critical agent telemetry).
+        
         Args:
             db: Database session
             tenant_id: Tenant UUID
@@ -238,19 +248,22 @@ class BaseAgent:
             entity_type: Type of entity
             entity_id: Entity UUID
             details: Additional details
+            out_of_band: Write to the audit spool instead of the transaction
         """
-        audit = AuditTrail(
+        values = dict(
             client_id=tenant_id,
+            table_name=entity_type,
+            record_id=entity_id,
             action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            actor_type='ai',
-            actor_id=self.agent_type,
-            details=details or {}
+            changed_by_type='ai_agent',
+            changed_by_name=self.agent_type,
+            new_value=details or {}
         )
         
-        db.add(audit)
-        await db.commit()
+        if out_of_band:
+            await get_audit_spool().append(AuditTrail, **values)
+        else:
+            record_audit(db, AuditTrail, **values)
         
         logger.debug(
             f"{self.agent_type}: Logged audit: {action} on {entity_type} {entity_id}"
@@ -287,7 +300,9 @@ class BaseAgent:
         
         logger.info(f"{self.agent_type}: Calling Claude API")
         
-        message = self.client.messages.create(**kwargs)
+        with timed(LLM_REQUEST_DURATION, model=self.model):
+            message = self.client.messages.create(**kwargs)
+        record_llm_usage(self.model, message.usage)
         
         response_text = message.content[0].text
         
@@ -298,6 +313,39 @@ class BaseAgent:
         
         return response_text
     
+    async def stream_claude(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream Claude's response text as it is generated
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+        
+        Yields:
+            Text deltas
+        """
+        if not self.async_client:
+            raise Exception("Claude API not configured. Set ANTHROPIC_API_KEY.")
+        
+        kwargs = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        
+        if system_prompt:
+            kwargs["system"] = system_prompt
+        
+        logger.info(f"{self.agent_type}: Streaming Claude API response")
+        
+        async with self.async_client.messages.stream(**kwargs) as stream:
+            async for text in stream.text_stream:
+                yield text
+    
     async def execute_task(
         self,
         db: AsyncSession,
@@ -16,6 +16,7 @@ from app.models.vendor import Vendor
 from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
 from app.models.agent_learned_pattern import AgentLearnedPattern
 from app.models.chart_of_accounts import Account
+from app.services.voucher_numbering import VoucherNumberAllocator
 
 logger = logging.getLogger(__name__)
 
@@ -152,19 +153,6 @@ Returner ALLTID gyldig JSON."""
             }
         )
         
-        # Log audit
-        await self.log_audit(
-            db,
-            tenant_id=task.tenant_id,
-            action="booking_created",
-            entity_type="general_ledger",
-            entity_id=str(journal_entry.id),
-            details={
-                "invoice_id": str(invoice.id),
-                "confidence": booking_data["confidence_score"]
-            }
-        )
-        
         return {
             "journal_entry_id": str(journal_entry.id),
             "confidence": booking_data["confidence_score"]
@@ -474,22 +462,9 @@ HUSK:
         Returns:
             Created GeneralLedger entry
         """
-        # Get next voucher number (simple increment - in production, use sequence)
-        result = await db.execute(
-            select(GeneralLedger)
-            .where(GeneralLedger.client_id == tenant_id)
-            .order_by(GeneralLedger.created_at.desc())
-            .limit(1)
+        voucher_number = await VoucherNumberAllocator(db).next_number(
+            tenant_id, "A", invoice.invoice_date.year
         )
-        last_entry = result.scalar_one_or_none()
-        
-        if last_entry and last_entry.voucher_number:
-            try:
-                next_number = int(last_entry.voucher_number) + 1
-            except ValueError:
-                next_number = 1
-        else:
-            next_number = 1
         
         # Create journal entry
         entry = GeneralLedger(
@@ -498,7 +473,7 @@ HUSK:
             accounting_date=invoice.invoice_date,
             period=invoice.invoice_date.strftime("%Y-%m"),
             fiscal_year=invoice.invoice_date.year,
-            voucher_number=str(next_number),
+            voucher_number=voucher_number,
             voucher_series="A",
             description=f"Faktura {invoice.invoice_number}",
             source_type="ehf_invoice",
@@ -530,6 +505,19 @@ HUSK:
             )
             db.add(line)
         
+        # Audit row commits together with the entry
+        await self.log_audit(
+            db,
+            tenant_id=tenant_id,
+            action="booking_created",
+            entity_type="general_ledger",
+            entity_id=str(entry.id),
+            details={
+                "invoice_id": str(invoice.id),
+                "confidence": confidence
+            }
+        )
+        
         await db.commit()
         await db.refresh(entry)
         
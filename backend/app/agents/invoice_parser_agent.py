@@ -115,7 +115,8 @@ class InvoiceParserAgent(BaseAgent):
             details={
                 "vendor_name": parsed_data.get("vendor_name"),
                 "total_amount": parsed_data.get("total_amount")
-            }
+            },
+            out_of_band=True
         )
         
         return {
@@ -14,6 +14,7 @@ from app.models.agent_task import AgentTask
 from app.models.general_ledger import GeneralLedger
 from app.models.vendor_invoice import VendorInvoice
 from app.models.review_queue import ReviewQueue, ReviewPriority, ReviewStatus, IssueCategory
+from app.utils.metrics import ORCHESTRATOR_EVENT_DURATION, ORCHESTRATOR_EVENT_LAG, observe_since, timed
 
 logger = logging.getLogger(__name__)
 
@@ -52,8 +53,10 @@ class OrchestratorAgent(BaseAgent):
                 logger.info(f"Orchestrator: Found {len(events)} unprocessed events")
                 
                 for event in events:
+                    observe_since(ORCHESTRATOR_EVENT_LAG, event.created_at, event_type=event.event_type)
                     try:
-                        await self.handle_event(db, event)
+                        with timed(ORCHESTRATOR_EVENT_DURATION, event_type=event.event_type):
+                            await self.handle_event(db, event)
                         await self.mark_processed(db, event.id)
                     except Exception as e:
                         logger.error(
@@ -194,7 +197,8 @@ class OrchestratorAgent(BaseAgent):
                 "agent_type": "invoice_parser",
                 "task_type": "parse_invoice",
                 "invoice_id": invoice_id
-            }
+            },
+            out_of_band=True
         )
     
     async def handle_invoice_parsed(
@@ -255,7 +259,8 @@ class OrchestratorAgent(BaseAgent):
                 "agent_type": "bookkeeper",
                 "task_type": "book_invoice",
                 "invoice_id": invoice_id
-            }
+            },
+            out_of_band=True
         )
     
     async def handle_booking_completed(
@@ -365,11 +370,6 @@ class OrchestratorAgent(BaseAgent):
             .where(GeneralLedger.id == entry.id)
             .values(status='posted')
         )
-        await db.commit()
-        
-        logger.info(
-            f"Orchestrator: Auto-approved journal entry {entry.id}"
-        )
         
         await self.log_audit(
             db,
@@ -382,6 +382,11 @@ class OrchestratorAgent(BaseAgent):
                 "confidence": entry.lines[0].ai_confidence_score if entry.lines else None
             }
         )
+        await db.commit()
+        
+        logger.info(
+            f"Orchestrator: Auto-approved journal entry {entry.id}"
+        )
     
     async def send_to_review(
         self,
@@ -446,7 +451,8 @@ class OrchestratorAgent(BaseAgent):
                 "priority": priority.value,
                 "confidence": confidence,
                 "review_queue_id": str(review_item.id)
-            }
+            },
+            out_of_band=True
         )
     
     def _generate_review_summary(
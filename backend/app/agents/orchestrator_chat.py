@@ -3,6 +3,8 @@ Orchestrator Chat Agent - Conversational interface for review queue management
 """
 import json
 import logging
+import re
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,9 +16,31 @@ from app.models.review_queue import ReviewQueue, ReviewStatus, ReviewPriority, I
 from app.models.vendor_invoice import VendorInvoice
 from app.models.general_ledger import GeneralLedger
 from app.models.vendor import Vendor
+from app.services.chat.intent_tiers import IntentStats
+from app.utils.sse import EventEmitter
 
 logger = logging.getLogger(__name__)
 
+# Command patterns, checked in order (English + Norwegian). Approve/reject
+# come first: "godkjenn alle ventende" is an approval, not a queue listing.
+ORCHESTRATOR_INTENT_PATTERNS = [
+    ("approve", re.compile(r"^(?:approve|godkjenn)\b")),
+    ("reject", re.compile(r"^(?:reject|avvis)\b")),
+    ("show_queue", re.compile(
+        r"show queue|list queue|what's in the queue|pending items|review queue"
+        r"|vis (?:review)?køen?|hva ligger i køen|^ventende\b|\b(?:vis|list)\b.*\bventende\b"
+    )),
+    ("show_details", re.compile(
+        r"show details|details for|info about|show item|vis detaljer|detaljer for"
+    )),
+    ("workload", re.compile(
+        r"workload|how many|statistics|stats|overview|arbeidsmengde|hvor mange|statistikk|oversikt"
+    )),
+]
+
+# Local rule hits vs. messages sent to Claude
+orchestrator_intent_stats = IntentStats(tiers=("rules", "llm"))
+
 
 class OrchestratorChatAgent(BaseAgent):
     """
@@ -63,7 +87,8 @@ Always structure responses in a clear, scannable format."""
         db: AsyncSession,
         client_id: str,
         user_message: str,
-        conversation_history: Optional[List[Dict[str, str]]] = None
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        emit: Optional[EventEmitter] = None
     ) -> Dict[str, Any]:
         """
         Main chat interface
@@ -73,6 +98,8 @@ Always structure responses in a clear, scannable format."""
             client_id: Client UUID
             user_message: User's message
             conversation_history: Previous messages for context
+            emit: Optional SSE emitter; receives the structured result as an
+                "action" event and Claude output as "token" events
         
         Returns:
             Response dictionary with message and any actions taken
@@ -82,6 +109,25 @@ Always structure responses in a clear, scannable format."""
         # Parse intent and extract entities
         intent = await self._detect_intent(user_message)
         
+        response = await self._dispatch(db, client_id, intent, user_message, conversation_history, emit)
+        
+        if emit and response.get("action") != "general_query":
+            # Command results are resolved locally - send data first, then text
+            await emit("action", {"type": response.get("action"), "data": response.get("data") or {}})
+            await emit("token", {"text": response.get("message", "")})
+        
+        return response
+    
+    async def _dispatch(
+        self,
+        db: AsyncSession,
+        client_id: str,
+        intent: Dict[str, Any],
+        user_message: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        emit: Optional[EventEmitter]
+    ) -> Dict[str, Any]:
+        """Route a detected intent to its handler"""
         # Handle different intents
         if intent["type"] == "show_queue":
             return await self._handle_show_queue(db, client_id)
@@ -110,44 +156,39 @@ Always structure responses in a clear, scannable format."""
         
         else:
             # General query - use Claude for contextual response
-            return await self._handle_general_query(db, client_id, user_message, conversation_history)
+            return await self._handle_general_query(db, client_id, user_message, conversation_history, emit)
     
     async def _detect_intent(self, message: str) -> Dict[str, Any]:
         """
         Detect user intent from message
         
+        Commands are matched locally with compiled patterns; only messages
+        that match none of them are answered by Claude (type "general").
+        
         Returns:
             Dictionary with intent type and extracted entities
         """
+        started = time.perf_counter()
         message_lower = message.lower().strip()
-        
-        # Show queue
-        if any(phrase in message_lower for phrase in ["show queue", "list queue", "what's in the queue", "pending items", "review queue"]):
-            return {"type": "show_queue"}
-        
-        # Approve
-        if message_lower.startswith("approve"):
-            item_id = self._extract_uuid(message)
-            return {"type": "approve", "item_id": item_id}
-        
-        # Reject
-        if message_lower.startswith("reject"):
-            item_id = self._extract_uuid(message)
-            # Extract reason if provided after the ID
-            reason_match = message.split(str(item_id))[-1].strip() if item_id else None
-            return {"type": "reject", "item_id": item_id, "reason": reason_match}
-        
-        # Show details
-        if any(phrase in message_lower for phrase in ["show details", "details for", "info about", "show item"]):
-            item_id = self._extract_uuid(message)
-            return {"type": "show_details", "item_id": item_id}
-        
-        # Workload
-        if any(phrase in message_lower for phrase in ["workload", "how many", "statistics", "stats", "overview"]):
-            return {"type": "workload"}
-        
-        # General query
-        return {"type": "general"}
+        intent: Dict[str, Any] = {"type": "general"}
+        
+        for intent_type, pattern in ORCHESTRATOR_INTENT_PATTERNS:
+            if not pattern.search(message_lower):
+                continue
+            
+            intent = {"type": intent_type}
+            if intent_type in ("approve", "reject", "show_details"):
+                intent["item_id"] = self._extract_uuid(message)
+            if intent_type == "reject":
+                # Extract reason if provided after the ID
+                item_id = intent["item_id"]
+                intent["reason"] = message.split(str(item_id))[-1].strip() if item_id else None
+            break
+        
+        orchestrator_intent_stats.record(
+            "llm" if intent["type"] == "general" else "rules", started
+        )
+        return intent
     
     def _extract_uuid(self, message: str) -> Optional[str]:
         """Extract UUID from message (full or partial)"""
@@ -206,7 +247,7 @@ Always structure responses in a clear, scannable format."""
             select(ReviewQueue)
             .where(
                 ReviewQueue.client_id == UUID(client_id),
-                cast(ReviewQueue.status, String) == 'PENDING'
+                ReviewQueue.status == ReviewStatus.PENDING
             )
             .order_by(desc(ReviewQueue.priority), ReviewQueue.created_at)
             .limit(limit)
@@ -452,7 +493,7 @@ Always structure responses in a clear, scannable format."""
             select(func.count(ReviewQueue.id))
             .where(
                 ReviewQueue.client_id == UUID(client_id),
-                cast(ReviewQueue.status, String) == 'PENDING'
+                ReviewQueue.status == ReviewStatus.PENDING
             )
         )
         pending = pending_count.scalar()
@@ -461,7 +502,7 @@ Always structure responses in a clear, scannable format."""
             select(func.count(ReviewQueue.id))
             .where(
                 ReviewQueue.client_id == UUID(client_id),
-                cast(ReviewQueue.status, String) == 'APPROVED',
+                ReviewQueue.status == ReviewStatus.APPROVED,
                 func.date(ReviewQueue.resolved_at) == datetime.utcnow().date()
             )
         )
@@ -471,7 +512,7 @@ Always structure responses in a clear, scannable format."""
             select(func.count(ReviewQueue.id))
             .where(
                 ReviewQueue.client_id == UUID(client_id),
-                cast(ReviewQueue.status, String) == 'REJECTED',
+                ReviewQueue.status == ReviewStatus.REJECTED,
                 func.date(ReviewQueue.resolved_at) == datetime.utcnow().date()
             )
         )
@@ -505,9 +546,10 @@ Always structure responses in a clear, scannable format."""
         db: AsyncSession,
         client_id: str,
         user_message: str,
-        conversation_history: Optional[List[Dict[str, str]]] = None
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        emit: Optional[EventEmitter] = None
     ) -> Dict[str, Any]:
-        """Handle general queries using Claude"""
+        """Handle general queries using Claude (streamed as tokens when emit is given)"""
         
         # Build context from database
         context = await self._build_context(db, client_id)
@@ -528,11 +570,18 @@ Provide a helpful, concise response based on the context."""
         messages.append({"role": "user", "content": prompt})
         
         try:
-            # Call Claude
-            response_text = await self.call_claude(
-                prompt=prompt,
-                system_prompt=self.system_prompt
-            )
+            if emit:
+                parts = []
+                async for text in self.stream_claude(prompt=prompt, system_prompt=self.system_prompt):
+                    parts.append(text)
+                    await emit("token", {"text": text})
+                response_text = "".join(parts)
+            else:
+                # Call Claude
+                response_text = await self.call_claude(
+                    prompt=prompt,
+                    system_prompt=self.system_prompt
+                )
             
             return {
                 "message": response_text,
@@ -552,7 +601,7 @@ Provide a helpful, concise response based on the context."""
             select(func.count(ReviewQueue.id))
             .where(
                 ReviewQueue.client_id == UUID(client_id),
-                cast(ReviewQueue.status, String) == 'PENDING'
+                ReviewQueue.status == ReviewStatus.PENDING
             )
         )
         pending_count = pending_result.scalar()
@@ -562,7 +611,7 @@ Provide a helpful, concise response based on the context."""
             select(ReviewQueue)
             .where(
                 ReviewQueue.client_id == UUID(client_id),
-                cast(ReviewQueue.status, String) == 'PENDING'
+                ReviewQueue.status == ReviewStatus.PENDING
             )
             .order_by(desc(ReviewQueue.priority), ReviewQueue.created_at)
             .limit(3)
@@ -12,6 +12,7 @@ from app.agents.base import BaseAgent
 from app.agents.invoice_parser_agent import InvoiceParserAgent
 from app.agents.bookkeeping_agent import BookkeepingAgent
 from app.agents.learning_agent import LearningAgent
+from app.utils.metrics import AGENT_TASK_DURATION, AGENT_TASK_WAIT, observe_since, timed
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +66,9 @@ class AgentWorker:
                                 f"Executing task {task.id} (type={task.task_type})"
                             )
                             
-                            result = await self.agent.execute_task(db, task)
+                            observe_since(AGENT_TASK_WAIT, task.created_at, agent_type=self.agent.agent_type)
+                            with timed(AGENT_TASK_DURATION, agent_type=self.agent.agent_type):
+                                result = await self.agent.execute_task(db, task)
                             
                             # Complete task
                             await self.agent.complete_task(
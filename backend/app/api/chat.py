@@ -6,10 +6,12 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
+from datetime import datetime
 from uuid import UUID
 
-from app.database import get_db
-from app.agents.orchestrator_chat import OrchestratorChatAgent
+from app.database import AsyncSessionLocal, get_db
+from app.agents.orchestrator_chat import OrchestratorChatAgent, orchestrator_intent_stats
+from app.utils.sse import EventEmitter, sse_response
 
 logger = logging.getLogger(__name__)
 
@@ -101,7 +103,6 @@ async def chat(
         )
         
         # Build response
-        from datetime import datetime
         response = ChatResponse(
             message=result["message"],
             action=result.get("action"),
@@ -126,6 +127,53 @@ async def chat(
         )
 
 
+@router.post("/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Streaming variant of the chat endpoint (Server-Sent Events)
+    
+    Command results (queue, approvals, details) are sent as one "action"
+    event; general questions stream Claude's answer as "token" events.
+    The final "done" event carries the same payload as POST /.
+    """
+    try:
+        UUID(request.client_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid client_id format: {request.client_id}"
+        )
+    
+    history = None
+    if request.conversation_history:
+        history = [
+            {"role": msg.role, "content": msg.content}
+            for msg in request.conversation_history
+        ]
+    
+    logger.info(f"Chat: Streaming message for client {request.client_id}")
+    
+    async def produce(emit: EventEmitter) -> Dict[str, Any]:
+        async with AsyncSessionLocal() as db:
+            result = await chat_agent.chat(
+                db=db,
+                client_id=request.client_id,
+                user_message=request.message,
+                conversation_history=history,
+                emit=emit
+            )
+            await db.commit()
+        
+        return {
+            "message": result["message"],
+            "action": result.get("action"),
+            "data": result.get("data"),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    return sse_response(produce)
+
+
 @router.get("/health")
 async def chat_health():
     """Health check for chat endpoint"""
@@ -137,6 +185,12 @@ async def chat_health():
     }
 
 
+@router.get("/intent-stats")
+async def chat_intent_stats():
+    """Share of messages resolved by local command rules vs. sent to Claude"""
+    return orchestrator_intent_stats.snapshot()
+
+
 # Additional convenience endpoints
 
 @router.get("/queue/{client_id}")
@@ -173,7 +227,6 @@ async def get_review_queue(
             conversation_history=None
         )
         
-        from datetime import datetime
         return ChatResponse(
             message=result["message"],
             action=result.get("action"),
@@ -223,7 +276,6 @@ async def approve_item(
             conversation_history=None
         )
         
-        from datetime import datetime
         return ChatResponse(
             message=result["message"],
             action=result.get("action"),
@@ -279,7 +331,6 @@ async def reject_item(
             conversation_history=None
         )
         
-        from datetime import datetime
         return ChatResponse(
             message=result["message"],
             action=result.get("action"),
@@ -11,9 +11,10 @@ from decimal import Decimal
 from uuid import UUID
 from pydantic import BaseModel
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.accrual import Accrual
 from app.models.accrual_posting import AccrualPosting
+from app.services.accrual_batch import AccrualBatchPoster, summarize_plan
 from app.services.accrual_service import AccrualService
 
 
@@ -161,6 +162,38 @@ async def create_accrual(
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
 
+@router.get("/api/accruals/posting-plan")
+async def get_posting_plan(
+    to_date: str = Query(..., description="Last posting date (YYYY-MM-DD)"),
+    from_date: Optional[str] = Query(None, description="First posting date (YYYY-MM-DD)"),
+    client_id: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Dry run of auto-posting: every pending posting in the date range with
+    its GL accounts and amounts, and totals per client. Nothing is written.
+    """
+    
+    try:
+        planned = await AccrualBatchPoster(db).plan(
+            to_date=date.fromisoformat(to_date),
+            from_date=date.fromisoformat(from_date) if from_date else None,
+            client_id=UUID(client_id) if client_id else None
+        )
+        
+        return {
+            **summarize_plan(planned),
+            "from_date": from_date,
+            "to_date": to_date,
+            "postings": [posting.to_dict() for posting in planned]
+        }
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+
 @router.get("/api/accruals/{accrual_id}")
 async def get_accrual(
     accrual_id: str,
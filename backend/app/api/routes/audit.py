@@ -3,18 +3,58 @@ Audit Trail API - Complete system event history
 """
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, func
+from collections import Counter
 from datetime import date, datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List
 from uuid import UUID
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.audit_trail import AuditTrail
 from app.models.user import User
+from app.services.audit_archive import (
+    AuditArchiveError,
+    after_cursor,
+    archived_years_in_range,
+    get_audit_archive,
+)
+from app.services.search import (
+    COUNT_MODES,
+    audit_search,
+    count_results,
+    decode_cursor,
+    keyset_condition,
+    keyset_order,
+    page_from_rows,
+)
 
 router = APIRouter(prefix="/api/audit", tags=["Audit"])
 
 
+def _archived_entry_filter(
+    action: Optional[str],
+    table_name: Optional[str],
+    changed_by_type: Optional[str],
+    search: Optional[str],
+) -> Callable[[AuditTrail], bool]:
+    """The list filters for archived entries (search is a plain substring match)"""
+    term = search.strip().lower() if search and search.strip() else None
+    
+    def matches(entry: AuditTrail) -> bool:
+        if action and entry.action != action:
+            return False
+        if table_name and entry.table_name != table_name:
+            return False
+        if changed_by_type and entry.changed_by_type != changed_by_type:
+            return False
+        if term:
+            fields = (entry.table_name, entry.action, entry.changed_by_name, entry.reason)
+            return any(term in field.lower() for field in fields if field)
+        return True
+    
+    return matches
+
+
 @router.get("/")
 async def get_audit_trail(
     client_id: UUID = Query(..., description="Client ID to filter audit entries"),
@@ -23,11 +63,14 @@ async def get_audit_trail(
     action: Optional[str] = Query(None, description="Filter by action (create/update/delete)"),
     table_name: Optional[str] = Query(None, description="Filter by table name"),
     changed_by_type: Optional[str] = Query(None, description="Filter by changed_by_type (user/ai_agent/system)"),
-    search: Optional[str] = Query(None, description="Search in table_name, action, or changed_by_name"),
+    search: Optional[str] = Query(None, description="Search in table_name, action, changed_by_name or reason"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)"),
-    page: int = Query(1, ge=1, description="Page number (starts at 1)"),
+    page: int = Query(1, ge=1, description="Page number (starts at 1), ignored when cursor is given"),
     page_size: int = Query(50, ge=1, le=500, description="Number of entries per page"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset cursor (pagination.next_cursor of the previous page)"),
+    count: str = Query("auto", description="Total count mode (auto/exact/estimate/none)"),
+    include_archived: bool = Query(False, description="Include archived fiscal years when no start_date is given"),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get audit trail entries with filtering, sorting, and pagination.
@@ -35,11 +78,23 @@ async def get_audit_trail(
     This endpoint provides a complete history of all changes made to the system
     for trust and transparency.
     
+    Search uses the full-text and trigram indexes (see app/services/search.py).
+    Pass pagination.next_cursor as cursor to page without OFFSET; with
+    count=auto the total is exact up to 10 000 entries and estimated beyond.
+    
+    Closed fiscal years that have been archived (app/services/audit_archive.py)
+    are read from the archive when start_date reaches them, or for all
+    archived years with include_archived=true. Archived entries are older than
+    every live entry, so they page after (desc) or before (asc) the live ones.
+    
     Returns:
     - entries: List of audit trail entries
     - pagination: Page metadata
     - summary: Aggregated statistics
     """
+    if count not in COUNT_MODES:
+        raise HTTPException(status_code=400, detail=f"count must be one of {', '.join(COUNT_MODES)}")
+    descending = sort_order.lower() == "desc"
     
     # Build base query
     query = select(AuditTrail)
@@ -66,38 +121,82 @@ async def get_audit_trail(
     if changed_by_type:
         filters.append(AuditTrail.changed_by_type == changed_by_type)
     
-    # Search filter
-    if search:
-        search_pattern = f"%{search}%"
-        search_filters = or_(
-            AuditTrail.table_name.ilike(search_pattern),
-            AuditTrail.action.ilike(search_pattern),
-            AuditTrail.changed_by_name.ilike(search_pattern),
-            AuditTrail.reason.ilike(search_pattern)
-        )
-        filters.append(search_filters)
+    # Search filter (full-text + trigram indexes)
+    if search and search.strip():
+        filters.append(audit_search(search))
     
     if filters:
         query = query.where(and_(*filters))
     
-    # Apply sorting (always by timestamp)
-    if sort_order.lower() == "desc":
-        query = query.order_by(AuditTrail.timestamp.desc())
+    # Archived fiscal years in the requested range
+    archived_years: List[int] = []
+    archived_scope: List[AuditTrail] = []  # client + date range, for the summary
+    archived: List[AuditTrail] = []  # all filters, for the listing
+    if start_date or include_archived:
+        archive = get_audit_archive()
+        archived_years = await archived_years_in_range(db, archive, AuditTrail, start_date, end_date)
+        if archived_years:
+            start_bound = datetime.combine(start_date, datetime.min.time()) if start_date else None
+            end_bound = datetime.combine(end_date, datetime.max.time()) if end_date else None
+            try:
+                archived_scope = archive.load(
+                    AuditTrail, archived_years,
+                    where=lambda e: (
+                        e.client_id == client_id
+                        and (start_bound is None or e.timestamp >= start_bound)
+                        and (end_bound is None or e.timestamp <= end_bound)
+                    ),
+                )
+            except AuditArchiveError as e:
+                raise HTTPException(status_code=500, detail=str(e))
+            matches = _archived_entry_filter(action, table_name, changed_by_type, search)
+            archived = sorted(
+                (e for e in archived_scope if matches(e)),
+                key=lambda e: (e.timestamp, e.id),
+                reverse=descending,
+            )
+    
+    # Total count (before pagination)
+    total = await count_results(db, query, mode=count)
+    total_count = total["count"]
+    if total_count is not None:
+        total_count += len(archived)
+    
+    # Apply sorting (always by timestamp, id as tie-breaker for the cursor)
+    query = query.order_by(*keyset_order(AuditTrail.timestamp, AuditTrail.id, descending))
+    
+    # Apply pagination: keyset when a cursor is given, offset otherwise
+    if cursor:
+        try:
+            query = query.where(keyset_condition(AuditTrail.timestamp, AuditTrail.id, cursor, descending))
+            archived = after_cursor(archived, "timestamp", *decode_cursor(cursor), descending=descending)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    offset = 0 if cursor else (page - 1) * page_size
+    limit = page_size + 1
+    
+    async def fetch_live(skip: int, rows: int) -> List[AuditTrail]:
+        result = await db.execute(query.offset(skip).limit(rows))
+        return list(result.scalars().all())
+    
+    # Archived entries are older than all live ones: they come after the
+    # live entries when sorting newest first, before them otherwise
+    if descending:
+        rows = await fetch_live(offset, limit)
+        if len(rows) < limit and archived:
+            if rows or not offset:
+                live_total = offset + len(rows)
+            else:
+                live_total = (await count_results(db, query, mode="exact"))["count"]
+            skip = max(0, offset - live_total)
+            rows += archived[skip:skip + limit - len(rows)]
     else:
-        query = query.order_by(AuditTrail.timestamp.asc())
-    
-    # Get total count (before pagination)
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total_count = total_result.scalar() or 0
+        rows = archived[offset:offset + limit]
+        if len(rows) < limit:
+            rows += await fetch_live(max(0, offset - len(archived)), limit - len(rows))
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.limit(page_size).offset(offset)
-    
-    # Execute query
-    result = await db.execute(query)
-    entries = result.scalars().all()
+    result_page = page_from_rows(rows, page_size, "timestamp")
+    entries = result_page.rows
     
     # Build response data
     response_entries = []
@@ -124,17 +223,19 @@ async def get_audit_trail(
         response_entries.append(entry_dict)
     
     # Calculate pagination metadata
-    total_pages = (total_count + page_size - 1) // page_size  # Ceiling division
-    has_next = page < total_pages
-    has_prev = page > 1
+    total_pages = (total_count + page_size - 1) // page_size if total_count is not None else None
+    has_next = result_page.next_cursor is not None
+    has_prev = page > 1 if not cursor else True
     
     pagination = {
-        "page": page,
+        "page": page if not cursor else None,
         "page_size": page_size,
         "total_entries": total_count,
+        "total_estimated": total["estimated"],
         "total_pages": total_pages,
         "has_next": has_next,
         "has_prev": has_prev,
+        "next_cursor": result_page.next_cursor,
     }
     
     # Calculate summary statistics
@@ -172,11 +273,31 @@ async def get_audit_trail(
     action_result = await db.execute(action_query)
     action_breakdown = {row.action: row.count for row in action_result}
     
+    total_events = summary_row.total_events or 0
+    tables_affected = summary_row.tables_affected or 0
+    unique_users = summary_row.unique_users or 0
+    
+    # Add archived years: distinct counts need the live values to union with
+    if archived_scope:
+        live_filters = [AuditTrail.client_id == client_id, *summary_filters]
+        live_tables = (await db.execute(
+            select(AuditTrail.table_name).distinct().where(*live_filters)
+        )).scalars().all()
+        live_users = (await db.execute(
+            select(AuditTrail.changed_by_id).distinct().where(*live_filters, AuditTrail.changed_by_id.isnot(None))
+        )).scalars().all()
+        
+        total_events += len(archived_scope)
+        tables_affected = len(set(live_tables) | {e.table_name for e in archived_scope})
+        unique_users = len(set(live_users) | {e.changed_by_id for e in archived_scope if e.changed_by_id})
+        action_breakdown = dict(Counter(action_breakdown) + Counter(e.action for e in archived_scope))
+    
     summary = {
-        "total_events": summary_row.total_events or 0,
-        "tables_affected": summary_row.tables_affected or 0,
-        "unique_users": summary_row.unique_users or 0,
+        "total_events": total_events,
+        "tables_affected": tables_affected,
+        "unique_users": unique_users,
         "action_breakdown": action_breakdown,
+        "archived_years": archived_years,
         "date_range": {
             "start": start_date.isoformat() if start_date else None,
             "end": end_date.isoformat() if end_date else None,
@@ -200,7 +321,7 @@ async def get_audit_trail(
 @router.get("/{audit_id}")
 async def get_audit_entry(
     audit_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get a single audit trail entry by ID with full details.
@@ -237,7 +358,7 @@ async def get_audit_entry(
 @router.get("/tables/list")
 async def get_audit_tables(
     client_id: UUID = Query(..., description="Client ID"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get list of all tables that have audit entries.
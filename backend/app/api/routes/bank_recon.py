@@ -350,11 +350,9 @@ async def create_match(
         bank_txn.ledger_entry_id = ledger_entry.id
         bank_txn.matched_at = datetime.utcnow()
         bank_txn.matched_by_user_id = user_id
-        
-        await db.commit()
-        await db.refresh(reconciliation)
-        
-        # Log audit event
+        await db.flush()  # reconciliation.id for the audit row
+
+        # Log audit event (committed together with the match)
         await log_audit_event(
             db=db,
             voucher_id=ledger_entry.id,
@@ -372,6 +370,9 @@ async def create_match(
             }
         )
         
+        await db.commit()
+        await db.refresh(reconciliation)
+        
         return MatchResponse(
             id=str(reconciliation.id),
             bank_transaction_id=str(reconciliation.transaction_id),
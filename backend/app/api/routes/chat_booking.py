@@ -7,8 +7,9 @@ from typing import Optional, List, Dict, Any
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
 from app.services.chat.chat_service import ChatService
+from app.utils.sse import EventEmitter, sse_response
 
 import logging
 
@@ -115,13 +116,51 @@ async def send_message(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/message/stream")
+async def send_message_stream(request: ChatRequest):
+    """
+    Send a chat message and stream the response as Server-Sent Events
+    
+    Events: "action" (intent, invoice_card, pending_confirmation) as soon as
+    each is resolved, "token" for response text, then "done" with the same
+    payload as POST /message.
+    """
+    try:
+        UUID(request.client_id)
+        if request.user_id:
+            UUID(request.user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid UUID: {str(e)}")
+    
+    session_id = request.session_id or str(UUID(int=0))
+    logger.info(f"Chat booking stream: session={session_id}, client={request.client_id}, message={request.message[:50]}")
+    
+    async def produce(emit: EventEmitter) -> Dict[str, Any]:
+        # The request-scoped session is closed before the body streams
+        async with AsyncSessionLocal() as db:
+            result = await chat_service.process_message(
+                db=db,
+                session_id=session_id,
+                client_id=request.client_id,
+                user_id=request.user_id,
+                message=request.message,
+                attachments=request.attachments,
+                emit=emit
+            )
+            await db.commit()
+        
+        return {**result, 'session_id': session_id}
+    
+    return sse_response(produce)
+
+
 @router.get("/history/{session_id}")
 async def get_history(session_id: str):
     """
     Get conversation history for a session
     """
     try:
-        context = chat_service.context_manager.get_context(session_id)
+        context = await chat_service.context_manager.get_context(session_id)
         history = context.get('conversation_history', [])
         
         return {
@@ -142,7 +181,7 @@ async def clear_session(session_id: str):
     Clear session context
     """
     try:
-        chat_service.context_manager.clear_context(session_id)
+        await chat_service.context_manager.clear_context(session_id)
         return {
             "success": True,
             "message": f"Session {session_id} cleared"
@@ -152,6 +191,16 @@ async def clear_session(session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/intent-stats")
+async def get_intent_stats():
+    """
+    Intent classification tier statistics
+    
+    Hit rate and latency for the rule, cache, LLM and fallback tiers.
+    """
+    return chat_service.intent_classifier.get_stats()
+
+
 @router.get("/suggestions")
 async def get_suggestions():
     """
@@ -9,11 +9,11 @@ from uuid import UUID, uuid4
 from pydantic import BaseModel
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.client import Client
 from app.models.review_queue import ReviewQueue
 from app.schemas.client import ClientCreateSchema, ClientUpdateSchema, ClientResponse
-from app.services.brreg import search_companies, get_company_details
+from app.services.brreg import search_companies, get_company_details, get_companies
 
 router = APIRouter(prefix="/api/clients", tags=["Clients"])
 
@@ -64,7 +64,8 @@ async def get_status_summary(client_id: UUID, db: AsyncSession) -> StatusSummary
 @router.get("/search-brreg")
 async def search_brreg_companies(
     q: str = Query(..., min_length=2, description="Company name search query"),
-    limit: int = Query(10, ge=1, le=50, description="Maximum results")
+    limit: int = Query(10, ge=1, le=50, description="Maximum results"),
+    db: AsyncSession = Depends(get_read_db)
 ) -> List[Dict[str, Any]]:
     """
     Search Norwegian company registry (Brønnøysundregistrene) by company name
@@ -102,13 +103,14 @@ async def search_brreg_companies(
         }
     ]
     """
-    companies = await search_companies(q, limit=limit)
+    companies = await search_companies(q, limit=limit, db=db)
     return companies
 
 
 @router.get("/brreg/{org_number}")
 async def get_brreg_company_details(
-    org_number: str
+    org_number: str,
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get detailed company information from Brønnøysundregistrene by org number
@@ -119,12 +121,35 @@ async def get_brreg_company_details(
     Returns:
     Company details or 404 if not found
     """
-    company = await get_company_details(org_number)
+    company = await get_company_details(org_number, db=db)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found in Brønnøysundregistrene")
     return company
 
 
+class BrregLookupRequest(BaseModel):
+    org_numbers: List[str]
+
+
+@router.post("/brreg/lookup")
+async def lookup_brreg_companies(
+    data: BrregLookupRequest,
+    db: AsyncSession = Depends(get_read_db)
+) -> Dict[str, Any]:
+    """
+    Get company details for many org numbers in one call
+
+    Body:
+    - org_numbers: List of 9-digit organization numbers (max 1000)
+
+    Returns:
+    Details per org number (null for numbers that are not registered)
+    """
+    if len(data.org_numbers) > 1000:
+        raise HTTPException(status_code=400, detail="At most 1000 org numbers per lookup")
+    return await get_companies(data.org_numbers, db=db)
+
+
 @router.post("/", response_model=ClientDetail, status_code=201)
 async def create_client(
     data: ClientCreateSchema,
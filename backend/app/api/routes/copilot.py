@@ -8,8 +8,9 @@ from typing import Optional, Dict, Any
 from pydantic import BaseModel
 from uuid import UUID
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
 from app.services.copilot_service import CopilotService
+from app.utils.sse import EventEmitter, sse_response
 
 
 router = APIRouter()
@@ -75,6 +76,35 @@ async def chat(
         raise HTTPException(status_code=500, detail=f"Copilot error: {str(e)}")
 
 
+@router.post("/api/copilot/chat/stream")
+async def chat_stream(request: CopilotChatRequest):
+    """
+    Chat with AI Copilot, streamed as Server-Sent Events.
+    
+    Same body as POST /api/copilot/chat. Events:
+    - action: {"type": "suggestions", "data": {"suggestions": [...]}}
+    - token:  {"text": "..."}
+    - done:   {"success": true, "response": "...", "suggestions": [...]}
+    """
+    
+    async def produce(emit: EventEmitter) -> Dict[str, Any]:
+        async with AsyncSessionLocal() as db:
+            result = await copilot_service.chat_stream(
+                message=request.message,
+                context=request.context,
+                db=db,
+                emit=emit
+            )
+        
+        return {
+            "success": True,
+            "response": result["response"],
+            "suggestions": result["suggestions"]
+        }
+    
+    return sse_response(produce)
+
+
 @router.get("/api/copilot/suggest")
 async def suggest(
     context: str,
@@ -6,9 +6,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, timedelta
 from typing import List, Optional
 from decimal import Decimal
+from uuid import UUID
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.services.currency_rate_service import CurrencyRateService
+from app.services.currency_revaluation import CurrencyRevaluationService
 from pydantic import BaseModel
 
 
@@ -20,6 +22,7 @@ class CurrencyRateResponse(BaseModel):
     currency_code: str
     base_currency: str
     rate: float
+    unit: int = 1  # Units of currency_code the rate is quoted for (100 for SEK, DKK)
     rate_date: str
     source: str
     created_at: str
@@ -38,6 +41,13 @@ class ConversionRequest(BaseModel):
     date: Optional[str] = None
 
 
+class RevaluationRequest(BaseModel):
+    as_of_date: date
+    client_id: Optional[UUID] = None
+    tenant_id: Optional[UUID] = None  # All clients of the tenant
+    reverse: bool = True  # Reverse the vouchers on the following day
+
+
 class ConversionResponse(BaseModel):
     original_amount: float
     original_currency: str
@@ -64,6 +74,7 @@ async def get_latest_rates(db: AsyncSession = Depends(get_db)):
     for currency, rate_obj in rates.items():
         rates_dict[currency] = {
             "rate": float(rate_obj.rate),
+            "unit": rate_obj.unit,
             "date": rate_obj.rate_date.isoformat(),
             "source": rate_obj.source
         }
@@ -117,6 +128,7 @@ async def get_currency_rate(
         currency_code=rate.currency_code,
         base_currency=rate.base_currency,
         rate=float(rate.rate),
+        unit=rate.unit,
         rate_date=rate.rate_date.isoformat(),
         source=rate.source,
         created_at=rate.created_at.isoformat(),
@@ -282,3 +294,40 @@ async def get_supported_currencies():
             {"code": "BTC", "name": "Bitcoin", "source": "CoinGecko"},
         ]
     }
+
+
+@router.get("/revaluation/preview")
+async def preview_revaluation(
+    as_of_date: date = Query(..., description="Closing date (YYYY-MM-DD)"),
+    client_id: Optional[UUID] = Query(None),
+    tenant_id: Optional[UUID] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Preview the revaluation of open foreign-currency supplier and customer
+    items at the closing rate, per client, ledger and currency. Nothing is posted.
+    """
+    try:
+        return await CurrencyRevaluationService(db).preview(as_of_date, client_id, tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/revaluation")
+async def post_revaluation(
+    request: RevaluationRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Revalue open foreign-currency items and post one agio/disagio voucher
+    per client (series VAL), reversed on the following day
+    """
+    try:
+        return await CurrencyRevaluationService(db).post(
+            request.as_of_date,
+            client_id=request.client_id,
+            tenant_id=request.tenant_id,
+            reverse=request.reverse
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
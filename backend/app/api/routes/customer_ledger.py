@@ -3,16 +3,16 @@ Customer Ledger API Routes - Kundereskontro
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, and_, or_
 from typing import List, Optional
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 import uuid
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.customer_ledger import CustomerLedger, CustomerLedgerTransaction
 from app.models.client import Client
-from app.models.general_ledger import GeneralLedger
+from app.services.subledger_analytics import SubledgerAnalytics
 from app.utils.export_utils import (
     generate_pdf_customer_ledger,
     generate_excel_customer_ledger,
@@ -35,63 +35,32 @@ async def get_customer_ledger(
     
     Returns list of open/paid customer invoices with remaining balances.
     """
-    query = select(CustomerLedger).where(CustomerLedger.client_id == client_id)
-    
-    # Apply filters
-    if status and status != "all":
-        if status == "overdue":
-            # Overdue = due date passed and still has remaining amount
-            query = query.where(
-                and_(
-                    CustomerLedger.due_date < date.today(),
-                    CustomerLedger.status.in_(["open", "partially_paid"])
-                )
-            )
-        else:
-            query = query.where(CustomerLedger.status == status)
-    
-    if date_from:
-        query = query.where(CustomerLedger.invoice_date >= date_from)
-    
-    if date_to:
-        query = query.where(CustomerLedger.invoice_date <= date_to)
-    
-    if customer_id:
-        query = query.where(CustomerLedger.customer_id == customer_id)
-    
-    # Order by due date (oldest first)
-    query = query.order_by(CustomerLedger.due_date.asc())
-    
-    result = await db.execute(query)
-    entries = result.scalars().all()
-    
-    # Build response
+    analytics = SubledgerAnalytics(db, "customer")
     ledger_list = []
     today = date.today()
     
-    for ledger_entry in entries:
-        entry_dict = ledger_entry.to_dict()
+    async for entry_dict in analytics.entries(
+        client_id,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+        counterparty_id=customer_id,
+    ):
+        days_overdue = entry_dict["days_overdue"]
+        due_date = date.fromisoformat(entry_dict["due_date"])
         
-        # Calculate days overdue
-        if ledger_entry.due_date < today and ledger_entry.status in ["open", "partially_paid"]:
-            days_overdue = (today - ledger_entry.due_date).days
-            entry_dict["days_overdue"] = days_overdue
-            
-            # Add status label
-            if days_overdue > 60:
-                entry_dict["status_label"] = "Forfalt (kritisk)"
-            elif days_overdue > 30:
-                entry_dict["status_label"] = "Forfalt"
-            else:
-                entry_dict["status_label"] = "Forfaller snart"
-        elif ledger_entry.due_date == today:
-            entry_dict["days_overdue"] = 0
+        # Add status label
+        if days_overdue > 60:
+            entry_dict["status_label"] = "Forfalt (kritisk)"
+        elif days_overdue > 30:
+            entry_dict["status_label"] = "Forfalt"
+        elif days_overdue > 0:
+            entry_dict["status_label"] = "Forfaller snart"
+        elif due_date == today:
             entry_dict["status_label"] = "Forfaller i dag"
-        elif (ledger_entry.due_date - today).days <= 7:
-            entry_dict["days_overdue"] = 0
+        elif (due_date - today).days <= 7:
             entry_dict["status_label"] = "Forfaller snart"
         else:
-            entry_dict["days_overdue"] = 0
             entry_dict["status_label"] = "Aktuell"
         
         ledger_list.append(entry_dict)
@@ -99,7 +68,7 @@ async def get_customer_ledger(
     return {
         "entries": ledger_list,
         "total_count": len(ledger_list),
-        "total_remaining": sum(float(e.remaining_amount) for e in entries),
+        "total_remaining": sum(e["remaining_amount"] for e in ledger_list),
     }
 
 
@@ -186,135 +155,34 @@ async def get_customer_statement(
 @router.get("/aging")
 async def get_customer_aging(
     client_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db)
+    as_of_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get aging report for customer ledger
     
-    Breaks down open balances by age:
+    Breaks down open balances by age, in total and per customer:
     - Not due
     - 0-30 days overdue
     - 31-60 days overdue
     - 61-90 days overdue
     - 90+ days overdue
     """
-    today = date.today()
-    
-    # Get all open entries
-    query = (
-        select(CustomerLedger)
-        .where(and_(
-            CustomerLedger.client_id == client_id,
-            CustomerLedger.status.in_(["open", "partially_paid"])
-        ))
-    )
-    
-    result = await db.execute(query)
-    entries = result.scalars().all()
-    
-    # Calculate aging buckets
-    aging = {
-        "not_due": Decimal("0.00"),
-        "0_30": Decimal("0.00"),
-        "31_60": Decimal("0.00"),
-        "61_90": Decimal("0.00"),
-        "90_plus": Decimal("0.00"),
-    }
-    
-    for entry in entries:
-        if entry.due_date >= today:
-            aging["not_due"] += entry.remaining_amount
-        else:
-            days_overdue = (today - entry.due_date).days
-            if days_overdue <= 30:
-                aging["0_30"] += entry.remaining_amount
-            elif days_overdue <= 60:
-                aging["31_60"] += entry.remaining_amount
-            elif days_overdue <= 90:
-                aging["61_90"] += entry.remaining_amount
-            else:
-                aging["90_plus"] += entry.remaining_amount
-    
-    total = sum(aging.values())
-    
-    return {
-        "aging": {
-            "not_due": float(aging["not_due"]),
-            "0_30_days": float(aging["0_30"]),
-            "31_60_days": float(aging["31_60"]),
-            "61_90_days": float(aging["61_90"]),
-            "90_plus_days": float(aging["90_plus"]),
-        },
-        "total": float(total),
-        "percentages": {
-            "not_due": round((aging["not_due"] / total * 100) if total > 0 else 0, 1),
-            "0_30_days": round((aging["0_30"] / total * 100) if total > 0 else 0, 1),
-            "31_60_days": round((aging["31_60"] / total * 100) if total > 0 else 0, 1),
-            "61_90_days": round((aging["61_90"] / total * 100) if total > 0 else 0, 1),
-            "90_plus_days": round((aging["90_plus"] / total * 100) if total > 0 else 0, 1),
-        },
-    }
+    return await SubledgerAnalytics(db, "customer").aging(client_id, as_of_date)
 
 
 @router.get("/reconcile")
 async def reconcile_customer_ledger(
     client_id: uuid.UUID,
     as_of_date: Optional[date] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Validate that customer ledger reconciles with account 1500
     
     CRITICAL: Sum of open entries MUST equal account 1500 balance
     """
-    if not as_of_date:
-        as_of_date = date.today()
-    
-    # Get sum of open customer ledger entries
-    ledger_query = select(
-        func.sum(CustomerLedger.remaining_amount)
-    ).where(and_(
-        CustomerLedger.client_id == client_id,
-        CustomerLedger.status.in_(["open", "partially_paid"]),
-        CustomerLedger.invoice_date <= as_of_date
-    ))
-    
-    ledger_result = await db.execute(ledger_query)
-    ledger_sum = ledger_result.scalar() or Decimal("0.00")
-    
-    # Get account 1500 balance from general ledger
-    # TODO: This should query account_balances table for performance
-    # For now, calculate from general_ledger_lines
-    from app.models.general_ledger import GeneralLedgerLine  # Import here to avoid circular
-    
-    account_query = select(
-        func.sum(GeneralLedgerLine.debit_amount - GeneralLedgerLine.credit_amount)
-    ).select_from(GeneralLedgerLine).join(
-        GeneralLedger,
-        GeneralLedgerLine.general_ledger_id == GeneralLedger.id
-    ).where(and_(
-        GeneralLedger.client_id == client_id,
-        GeneralLedgerLine.account_number == "1500",
-        GeneralLedger.accounting_date <= as_of_date
-    ))
-    
-    account_result = await db.execute(account_query)
-    account_balance = account_result.scalar() or Decimal("0.00")
-    
-    difference = ledger_sum - account_balance
-    reconciles = abs(difference) < Decimal("0.01")  # Allow 1 cent rounding difference
-    
-    return {
-        "as_of_date": as_of_date.isoformat(),
-        "customer_ledger_total": float(ledger_sum),
-        "account_1500_balance": float(account_balance),
-        "difference": float(difference),
-        "reconciles": reconciles,
-        "status": "OK" if reconciles else "ERROR - Does not reconcile!",
-    }
-
-
-
+    return await SubledgerAnalytics(db, "customer").reconcile(client_id, as_of_date)
 
 
 # ==================== EXPORT ENDPOINTS ====================
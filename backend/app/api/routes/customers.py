@@ -599,6 +599,7 @@ async def bulk_import_customers(
     file: bytes = File(...),
     filename: str = Query(...),
     client_id: UUID = Query(...),
+    update_existing: bool = Query(False, description="Update customers whose org number is already registered instead of skipping them"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -626,7 +627,7 @@ async def bulk_import_customers(
         df = parse_file(file, filename)
         
         # Import customers
-        result = await import_customers(db, df, client_id)
+        result = await import_customers(db, df, client_id, update_existing)
         
         return result.to_dict()
     
@@ -131,8 +131,6 @@ async def get_cross_client_tasks(
     client_ids = [c.id for c in clients]
     
     # INVOICING TASKS - Vendor invoices needing review
-    from sqlalchemy import cast, String
-    
     invoicing_tasks = []
     
     # Get pending review queue items for these clients
@@ -143,7 +141,7 @@ async def get_cross_client_tasks(
     ).where(
         VendorInvoice.client_id.in_(client_ids),
         ReviewQueue.source_type == 'vendor_invoice',
-        cast(ReviewQueue.status, String) == 'PENDING'
+        ReviewQueue.status == ReviewStatus.PENDING
     ).order_by(ReviewQueue.created_at.desc())
     
     review_result = await db.execute(review_query)
@@ -185,7 +183,7 @@ async def get_cross_client_tasks(
         Client, BankTransaction.client_id == Client.id
     ).where(
         BankTransaction.client_id.in_(client_ids),
-        cast(BankTransaction.status, String) == 'unmatched'
+        BankTransaction.status == TransactionStatus.UNMATCHED
     ).order_by(BankTransaction.transaction_date.desc()).limit(50)
     
     bank_result = await db.execute(bank_query)
@@ -295,9 +293,8 @@ async def get_dashboard_status(
     """
     
     # Review Queue stats
-    from sqlalchemy import cast, String
     pending_query = select(func.count(ReviewQueue.id)).where(
-        cast(ReviewQueue.status, String) == 'pending'
+        ReviewQueue.status == ReviewStatus.PENDING
     )
     pending_result = await db.execute(pending_query)
     pending_count = pending_result.scalar() or 0
@@ -307,7 +304,7 @@ async def get_dashboard_status(
     total_reviews = total_result.scalar() or 0
     
     approved_query = select(func.count(ReviewQueue.id)).where(
-        cast(ReviewQueue.status, String) == 'approved'
+        ReviewQueue.status == ReviewStatus.APPROVED
     )
     approved_result = await db.execute(approved_query)
     approved_count = approved_result.scalar() or 0
@@ -457,9 +454,8 @@ async def get_verification_status(
     total_invoices = total_result.scalar() or 0
     
     # Review queue pending count
-    from sqlalchemy import cast, String
     review_pending_query = select(func.count(ReviewQueue.id)).where(
-        cast(ReviewQueue.status, String) == 'pending'
+        ReviewQueue.status == ReviewStatus.PENDING
     )
     review_pending_result = await db.execute(review_pending_query)
     review_pending_count = review_pending_result.scalar() or 0
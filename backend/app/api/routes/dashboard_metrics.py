@@ -4,13 +4,13 @@ Comprehensive metrics for the main page dashboard (2B Implementation)
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, cast, String, Integer, extract
+from sqlalchemy import select, func, and_, Integer, extract
 from datetime import datetime, date, timedelta
 from typing import Dict, Any, Optional
 from uuid import UUID
 from decimal import Decimal
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.vendor_invoice import VendorInvoice
 from app.models.bank_transaction import BankTransaction, TransactionStatus
 from app.models.review_queue import ReviewQueue, ReviewStatus, ReviewPriority
@@ -24,7 +24,7 @@ router = APIRouter(prefix="/api/dashboard", tags=["Dashboard Metrics"])
 async def get_dashboard_metrics(
     tenant_id: Optional[str] = Query(None, description="Filter by tenant_id (optional)"),
     client_id: Optional[str] = Query(None, description="Filter by client_id (optional)"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     🎯 Dashboard Metrics Endpoint - Main ERP Dashboard (Task 2B)
@@ -72,7 +72,7 @@ async def get_dashboard_metrics(
     
     # ===== METRIC 2: Banktransaksjoner til matching =====
     unmatched_bank_query = select(func.count(BankTransaction.id)).where(
-        cast(BankTransaction.status, String) == 'unmatched'
+        BankTransaction.status == TransactionStatus.UNMATCHED
     )
     if client_id:
         unmatched_bank_query = unmatched_bank_query.where(
@@ -336,7 +336,7 @@ async def get_review_queue_breakdown(
     by_priority = {}
     for priority in ['low', 'medium', 'high', 'urgent']:
         priority_query = select(func.count(ReviewQueue.id)).where(
-            cast(ReviewQueue.priority, String) == priority.upper()
+            ReviewQueue.priority == ReviewPriority[priority.upper()]
         )
         if client_id:
             priority_query = priority_query.where(ReviewQueue.client_id == client_id)
@@ -348,7 +348,7 @@ async def get_review_queue_breakdown(
     by_status = {}
     for status in ['pending', 'in_progress', 'approved', 'corrected', 'rejected']:
         status_query = select(func.count(ReviewQueue.id)).where(
-            cast(ReviewQueue.status, String) == status.upper()
+            ReviewQueue.status == ReviewStatus[status.upper()]
         )
         if client_id:
             status_query = status_query.where(ReviewQueue.client_id == client_id)
@@ -399,7 +399,7 @@ async def get_client_level_metrics(
         bank_count_query = select(func.count(BankTransaction.id)).where(
             and_(
                 BankTransaction.client_id == client.id,
-                cast(BankTransaction.status, String) == 'unmatched'
+                BankTransaction.status == TransactionStatus.UNMATCHED
             )
         )
         bank_count_result = await db.execute(bank_count_query)
@@ -409,7 +409,7 @@ async def get_client_level_metrics(
         review_count_query = select(func.count(ReviewQueue.id)).where(
             and_(
                 ReviewQueue.client_id == client.id,
-                cast(ReviewQueue.status, String) == 'PENDING'
+                ReviewQueue.status == ReviewStatus.PENDING
             )
         )
         review_count_result = await db.execute(review_count_query)
@@ -445,7 +445,7 @@ async def get_client_level_metrics(
 @router.get("/metrics/summary")
 async def get_metrics_summary(
     client_id: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Quick summary for mini-widgets (simplified version)
@@ -453,7 +453,7 @@ async def get_metrics_summary(
     
     # Pending items count
     pending_query = select(func.count(ReviewQueue.id)).where(
-        cast(ReviewQueue.status, String) == 'PENDING'
+        ReviewQueue.status == ReviewStatus.PENDING
     )
     if client_id:
         pending_query = pending_query.where(ReviewQueue.client_id == UUID(client_id))
@@ -473,7 +473,7 @@ async def get_metrics_summary(
     
     # Bank transactions
     bank_query = select(func.count(BankTransaction.id)).where(
-        cast(BankTransaction.status, String) == 'unmatched'
+        BankTransaction.status == TransactionStatus.UNMATCHED
     )
     if client_id:
         bank_query = bank_query.where(BankTransaction.client_id == UUID(client_id))
@@ -0,0 +1,48 @@
+"""
+Debug API - Query profiler statistics per route
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, Dict
+
+from app.config import settings
+from app.utils.query_profiler import ROUTE_SORT_KEYS, registry
+
+router = APIRouter(prefix="/api/debug", tags=["Debug"])
+
+
+def require_debug_endpoint():
+    """Dependency: profiler statistics are only exposed in debug setups"""
+    if not (settings.DEBUG or settings.QUERY_PROFILER_DEBUG_ENDPOINT):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Debug endpoints are disabled (set DEBUG or QUERY_PROFILER_DEBUG_ENDPOINT)"
+        )
+
+
+@router.get("/queries", dependencies=[Depends(require_debug_endpoint)])
+async def worst_routes(
+    sort: str = Query("db_time", description="db_time (avg), queries (avg), n_plus_one or total (DB time)"),
+    limit: int = Query(20, ge=1, le=200, description="Max routes"),
+) -> Dict[str, Any]:
+    """
+    Routes with the most database work since startup (this process).
+    
+    Each route lists request count, average/max queries and DB time, how
+    many requests repeated one statement shape past the N+1 threshold, and
+    the repeated shapes.
+    """
+    if sort not in ROUTE_SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(ROUTE_SORT_KEYS)}")
+    
+    return {
+        "routes": registry.worst(sort=sort, limit=limit),
+        "n_plus_one_threshold": settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD,
+        "sort": sort,
+    }
+
+
+@router.delete("/queries", dependencies=[Depends(require_debug_endpoint)])
+async def reset_route_stats() -> Dict[str, Any]:
+    """Clear the collected route statistics"""
+    registry.reset()
+    return {"status": "reset"}
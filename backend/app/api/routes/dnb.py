@@ -14,6 +14,7 @@ from app.database import get_db
 from app.services.dnb.service import DNBService
 from app.services.dnb.oauth_client import DNBOAuth2Client
 from app.models.bank_connection import BankConnection
+from app.services.session_store import create_session_store
 from app.config import settings
 from sqlalchemy import select
 
@@ -64,8 +65,9 @@ class SyncTransactionsRequest(BaseModel):
     to_date: Optional[str] = None    # YYYY-MM-DD
 
 
-# OAuth state storage (in production, use Redis)
-oauth_states = {}
+# OAuth state storage (expires if the user never completes the flow)
+OAUTH_STATE_TTL_SECONDS = 15 * 60
+oauth_states = create_session_store("oauth:dnb", default_ttl=OAUTH_STATE_TTL_SECONDS)
 
 
 @router.post("/oauth/initiate")
@@ -83,10 +85,10 @@ async def initiate_oauth(
         state = secrets.token_urlsafe(32)
         
         # Store state for verification (with client_id)
-        oauth_states[state] = {
+        await oauth_states.set(state, {
             "client_id": request.client_id,
             "timestamp": datetime.utcnow().isoformat()
-        }
+        })
         
         # Get authorization URL
         oauth_client = dnb_service.get_oauth_client()
@@ -118,10 +120,10 @@ async def oauth_callback(
     """
     try:
         # Verify state (CSRF protection)
-        if state not in oauth_states:
+        state_data = await oauth_states.pop(state)
+        if state_data is None:
             raise HTTPException(status_code=400, detail="Invalid state parameter")
         
-        state_data = oauth_states.pop(state)
         client_id = UUID(state_data["client_id"])
         
         # Exchange code for token
@@ -1,41 +1,83 @@
 """
 Documents API - PDF/file retrieval
 """
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse, JSONResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Request, UploadFile, File, Form
+from fastapi.responses import StreamingResponse, JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
-import boto3
+from typing import Optional
 from botocore.exceptions import ClientError
-from datetime import datetime, timedelta
 
 from app.database import get_db
 from app.models.document import Document
 from app.models.vendor_invoice import VendorInvoice
-from app.config import settings
+from app.services.document_service import DocumentService
+from app.services.storage import get_document_storage, parse_range_header
+from app.services.storage.base import FileTooLargeError, RangeNotSatisfiableError
 
 
 router = APIRouter(prefix="/api/documents", tags=["documents"])
 
+MAX_DOCUMENT_SIZE = 50 * 1024 * 1024  # 50MB
+
+
+async def _get_document(db: AsyncSession, document_id: UUID) -> Document:
+    result = await db.execute(select(Document).where(Document.id == document_id))
+    document = result.scalar_one_or_none()
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return document
+
+
+@router.post("/upload")
+async def upload_document(
+    client_id: UUID = Form(...),
+    document_type: str = Form("invoice_pdf"),
+    user_id: Optional[UUID] = Form(None),
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload a document
+
+    The file is streamed to storage in chunks and hashed on the fly.
+    Uploading a file whose content already exists for the client returns
+    the existing document (deduplicated: true).
+    """
+    service = DocumentService(db)
+    try:
+        document, created = await service.store_upload(
+            client_id=client_id,
+            upload=file,
+            document_type=document_type,
+            uploaded_by_user_id=user_id,
+            max_size=MAX_DOCUMENT_SIZE,
+        )
+    except FileTooLargeError:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Max size: {MAX_DOCUMENT_SIZE / 1024 / 1024}MB"
+        )
+
+    return JSONResponse({
+        **document.to_dict(),
+        "file_hash": document.file_hash,
+        "deduplicated": not created,
+    })
+
 
 @router.get("/{document_id}/url")
 async def get_document_url(
     document_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get pre-signed URL for document download
-    Returns a temporary URL valid for 1 hour
+    Returns a temporary URL valid for 1 hour (reused until shortly before expiry)
     """
-    # Get document from database
-    stmt = select(Document).where(Document.id == document_id)
-    result = db.execute(stmt)
-    document = result.scalar_one_or_none()
-    
-    if not document:
-        raise HTTPException(status_code=404, detail="Document not found")
-    
+    document = await _get_document(db, document_id)
+
     # For demo: if no S3 data, return placeholder
     if not document.s3_bucket or not document.s3_key:
         return JSONResponse({
@@ -46,47 +88,93 @@ async def get_document_url(
             "demo_mode": True,
             "message": "PDF preview not available - document not in S3 storage"
         })
-    
+
     try:
-        # Generate pre-signed URL (valid for 1 hour)
-        s3_client = boto3.client('s3', region_name='eu-west-1')
-        presigned_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': document.s3_bucket,
-                'Key': document.s3_key
-            },
-            ExpiresIn=3600  # 1 hour
+        presigned_url = await DocumentService(db).get_download_url(document)
+    except ClientError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error generating download URL: {str(e)}"
         )
-        
-        expires_at = datetime.utcnow() + timedelta(hours=1)
-        
-        # Update document record with URL and expiry
-        document.download_url = presigned_url
-        document.download_url_expires_at = expires_at
-        db.commit()
-        
+
+    # Local storage has no direct URLs - serve through the content endpoint
+    if presigned_url is None:
         return JSONResponse({
             "document_id": str(document.id),
             "filename": document.filename,
             "mime_type": document.mime_type,
             "file_size": document.file_size,
-            "download_url": presigned_url,
-            "expires_at": expires_at.isoformat(),
+            "download_url": f"/api/documents/{document.id}/content",
+            "expires_at": None,
             "demo_mode": False
         })
-        
-    except ClientError as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error generating download URL: {str(e)}"
+
+    return JSONResponse({
+        "document_id": str(document.id),
+        "filename": document.filename,
+        "mime_type": document.mime_type,
+        "file_size": document.file_size,
+        "download_url": presigned_url,
+        "expires_at": document.download_url_expires_at.isoformat(),
+        "demo_mode": False
+    })
+
+
+@router.get("/{document_id}/content")
+async def get_document_content(
+    document_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream document content
+
+    Supports HTTP Range requests (206 Partial Content) so PDF viewers can
+    fetch pages on demand instead of downloading the whole file.
+    """
+    document = await _get_document(db, document_id)
+
+    if not document.s3_bucket or not document.s3_key:
+        raise HTTPException(status_code=404, detail="Document content not in storage")
+
+    storage = get_document_storage(document.s3_bucket)
+    total = document.file_size
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'inline; filename="{document.filename}"',
+    }
+
+    try:
+        byte_range = parse_range_header(request.headers.get("range"), total)
+    except RangeNotSatisfiableError:
+        return Response(
+            status_code=416,
+            headers={**headers, "Content-Range": f"bytes */{total}"},
+        )
+
+    if byte_range is None:
+        return StreamingResponse(
+            storage.open_range(document.s3_key),
+            media_type=document.mime_type,
+            headers={**headers, "Content-Length": str(total)},
         )
 
+    return StreamingResponse(
+        storage.open_range(document.s3_key, byte_range),
+        status_code=206,
+        media_type=document.mime_type,
+        headers={
+            **headers,
+            "Content-Range": byte_range.content_range,
+            "Content-Length": str(byte_range.length),
+        },
+    )
+
 
 @router.get("/invoice/{invoice_id}/pdf")
 async def get_invoice_pdf_url(
     invoice_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get PDF URL for a specific invoice
@@ -94,12 +182,12 @@ async def get_invoice_pdf_url(
     """
     # Get invoice
     stmt = select(VendorInvoice).where(VendorInvoice.id == invoice_id)
-    result = db.execute(stmt)
+    result = await db.execute(stmt)
     invoice = result.scalar_one_or_none()
-    
+
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
-    
+
     if not invoice.document_id:
         return JSONResponse({
             "invoice_id": str(invoice.id),
@@ -107,34 +195,21 @@ async def get_invoice_pdf_url(
             "has_pdf": False,
             "message": "No PDF document attached to this invoice"
         })
-    
-    # Get document
-    stmt = select(Document).where(Document.id == invoice.document_id)
-    result = db.execute(stmt)
-    document = result.scalar_one_or_none()
-    
-    if not document:
-        raise HTTPException(status_code=404, detail="Document not found")
-    
+
     # Use the main document URL endpoint logic
-    return await get_document_url(document.id, db)
+    return await get_document_url(invoice.document_id, db)
 
 
 @router.get("/{document_id}/info")
 async def get_document_info(
     document_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get document metadata (without generating download URL)
     """
-    stmt = select(Document).where(Document.id == document_id)
-    result = db.execute(stmt)
-    document = result.scalar_one_or_none()
-    
-    if not document:
-        raise HTTPException(status_code=404, detail="Document not found")
-    
+    document = await _get_document(db, document_id)
+
     return JSONResponse({
         "id": str(document.id),
         "filename": document.filename,
@@ -6,7 +6,7 @@ Enforces double-entry bookkeeping: SUM(debits) = SUM(credits)
 """
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select
 from pydantic import BaseModel, Field, validator
 from typing import List, Optional
 from decimal import Decimal
@@ -17,6 +17,7 @@ from app.database import get_db
 from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
 from app.models.client import Client
 from app.services.ledger_sync_service import sync_ledgers_for_journal_entry
+from app.services.voucher_numbering import VoucherNumberAllocator
 
 router = APIRouter(prefix="/api/journal-entries", tags=["Journal Entries"])
 
@@ -142,29 +143,10 @@ async def create_journal_entry(
             detail=f"Client {entry.client_id} not found"
         )
     
-    # Generate voucher number (simple incrementing for now)
-    # TODO: Use proper voucher series management
-    result = await db.execute(
-        select(GeneralLedger)
-        .where(
-            and_(
-                GeneralLedger.client_id == entry.client_id,
-                GeneralLedger.voucher_series == entry.voucher_series
-            )
-        )
-        .order_by(GeneralLedger.voucher_number.desc())
-        .limit(1)
+    # Allocate voucher number from the series counter
+    voucher_number = await VoucherNumberAllocator(db).next_number(
+        entry.client_id, entry.voucher_series, entry.accounting_date.year
     )
-    last_entry = result.scalar_one_or_none()
-    
-    if last_entry:
-        try:
-            last_number = int(last_entry.voucher_number.split('-')[-1])
-            voucher_number = f"{entry.accounting_date.year}-{last_number + 1:04d}"
-        except (ValueError, IndexError):
-            voucher_number = f"{entry.accounting_date.year}-0001"
-    else:
-        voucher_number = f"{entry.accounting_date.year}-0001"
     
     # Create general ledger entry
     gl_entry = GeneralLedger(
@@ -0,0 +1,75 @@
+"""
+Metrics API - Prometheus scrape endpoint
+"""
+import logging
+from datetime import datetime
+from typing import Dict, Set, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_db
+from app.models.agent_event import AgentEvent
+from app.models.agent_task import AgentTask
+from app.utils.metrics import (
+    AGENT_EVENTS_OLDEST_AGE,
+    AGENT_EVENTS_UNPROCESSED,
+    AGENT_QUEUE_DEPTH,
+    render_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Metrics"])
+
+# Agent tasks still waiting for or holding a worker
+QUEUED_TASK_STATUSES = ("pending", "in_progress")
+
+# Queue label sets exported by this process; reset to 0 once they drain
+_queue_labels: Set[Tuple[str, str]] = set()
+
+
+async def collect_queue_metrics(db: AsyncSession) -> None:
+    """Sample agent queue depth and the orchestrator backlog (both use status/processed indexes)"""
+    result = await db.execute(
+        select(AgentTask.agent_type, AgentTask.status, func.count())
+        .where(AgentTask.status.in_(QUEUED_TASK_STATUSES))
+        .group_by(AgentTask.agent_type, AgentTask.status)
+    )
+    depths: Dict[Tuple[str, str], int] = {
+        (agent_type, task_status): count for agent_type, task_status, count in result.all()
+    }
+    for labels in _queue_labels - depths.keys():
+        AGENT_QUEUE_DEPTH.labels(*labels).set(0)
+    for labels, count in depths.items():
+        AGENT_QUEUE_DEPTH.labels(*labels).set(count)
+    _queue_labels.update(depths)
+
+    result = await db.execute(
+        select(func.count(), func.min(AgentEvent.created_at))
+        .where(AgentEvent.processed == False)
+    )
+    unprocessed, oldest = result.one()
+    AGENT_EVENTS_UNPROCESSED.set(unprocessed)
+    AGENT_EVENTS_OLDEST_AGE.set((datetime.utcnow() - oldest).total_seconds() if oldest else 0)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(db: AsyncSession = Depends(get_db)) -> Response:
+    """
+    Prometheus exposition of all metrics (every worker process in
+    multiprocess mode). Queue gauges are sampled from the database per scrape.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+
+    try:
+        await collect_queue_metrics(db)
+    except Exception as e:
+        # Still serve the in-process metrics when the database is unavailable
+        logger.warning(f"Could not sample agent queue metrics: {e}")
+
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
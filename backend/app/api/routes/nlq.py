@@ -84,6 +84,15 @@ async def get_examples():
     }
 
 
+@router.get("/api/nlq/stats")
+async def stats():
+    """SQL/result cache statistics and active execution engine"""
+    return {
+        "success": True,
+        **nlq_service.get_stats()
+    }
+
+
 @router.get("/api/nlq/health")
 async def health():
     """Health check for NLQ service"""
@@ -62,13 +62,11 @@ async def get_other_voucher_stats(
             detail=f"Invalid client_id format: {client_id}. Must be a valid UUID."
         )
     
-    from sqlalchemy import cast, String
-    
     # Base query - exclude supplier invoices
     base_query = select(ReviewQueue).where(
         and_(
             ReviewQueue.client_id == client_uuid,
-            cast(ReviewQueue.type, String) != 'SUPPLIER_INVOICE'
+            ReviewQueue.type != VoucherType.SUPPLIER_INVOICE
         )
     )
     
@@ -82,7 +80,7 @@ async def get_other_voucher_stats(
             and_(
                 ReviewQueue.client_id == client_uuid,
                 ReviewQueue.type == voucher_type,
-                cast(ReviewQueue.status, String) == 'PENDING'
+                ReviewQueue.status == ReviewStatus.PENDING
             )
         )
         result = await db.execute(query)
@@ -118,8 +116,8 @@ async def get_other_voucher_stats(
         query = select(func.count()).where(
             and_(
                 ReviewQueue.client_id == client_uuid,
-                cast(ReviewQueue.type, String) != 'SUPPLIER_INVOICE',
-                cast(ReviewQueue.status, String) == status.value.upper(),
+                ReviewQueue.type != VoucherType.SUPPLIER_INVOICE,
+                ReviewQueue.status == status,
                 ReviewQueue.resolved_at >= start_date
             )
         )
@@ -191,12 +189,11 @@ async def get_pending_other_vouchers(
         )
     
     # Build query - exclude supplier invoices
-    from sqlalchemy import cast, String
     query = select(ReviewQueue).where(
         and_(
             ReviewQueue.client_id == client_uuid,
-            cast(ReviewQueue.status, String) == 'PENDING',
-            cast(ReviewQueue.type, String) != 'SUPPLIER_INVOICE'
+            ReviewQueue.status == ReviewStatus.PENDING,
+            ReviewQueue.type != VoucherType.SUPPLIER_INVOICE
         )
     )
     
@@ -215,7 +212,6 @@ async def get_pending_other_vouchers(
     
     # Apply priority filter if specified
     if priority:
-        from sqlalchemy import cast, String
         priority_upper = priority.upper()
         valid_priorities = ['LOW', 'MEDIUM', 'HIGH', 'URGENT']
         if priority_upper not in valid_priorities:
@@ -223,7 +219,7 @@ async def get_pending_other_vouchers(
                 status_code=400,
                 detail=f"Invalid priority: {priority}"
             )
-        query = query.where(cast(ReviewQueue.priority, String) == priority_upper)
+        query = query.where(ReviewQueue.priority == ReviewPriority[priority_upper])
     
     # Count total before pagination
     count_query = select(func.count()).select_from(query.subquery())
@@ -404,9 +400,6 @@ async def approve_other_voucher(
     review_item.resolution_notes = request.notes
     # TODO: Set resolved_by_user_id when auth is implemented
     
-    await db.commit()
-    await db.refresh(review_item)
-    
     # Log audit event
     await log_audit_event(
         db=db,
@@ -423,6 +416,9 @@ async def approve_other_voucher(
         }
     )
     
+    await db.commit()
+    await db.refresh(review_item)
+    
     return {
         "id": str(review_item.id),
         "type": review_item.type.value.lower(),
@@ -2,12 +2,18 @@
 Period Close API - Automated monthly/quarterly closing
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
+from typing import List, Optional
 from uuid import UUID
 
 from app.database import get_db
+from app.services.period_close_jobs import (
+    create_period_close_job,
+    period_close_job_progress,
+    run_period_close_job,
+)
 from app.services.period_close_service import PeriodCloseService
 
 
@@ -20,6 +26,13 @@ class PeriodCloseRequest(BaseModel):
     period: str  # YYYY-MM
 
 
+class PeriodCloseJobRequest(BaseModel):
+    tenant_id: UUID
+    period: str  # YYYY-MM
+    client_ids: Optional[List[UUID]] = None  # Default: all active clients of the tenant
+    concurrency: Optional[int] = None
+
+
 @router.post("/api/period-close/run")
 async def run_period_close(
     request: PeriodCloseRequest,
@@ -108,10 +121,75 @@ async def get_period_status(
             return {
                 "period": period,
                 "status": "open",
-                "closed_at": null
+                "closed_at": None
             }
     
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid client ID or period format")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+
+@router.post("/api/period-close/jobs", status_code=202)
+async def start_period_close_job(
+    request: PeriodCloseJobRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Close a period for all active clients of a tenant.
+    
+    Clients are closed in parallel in the background; poll
+    GET /api/period-close/jobs/{job_id} for progress.
+    """
+    try:
+        job = await create_period_close_job(
+            db,
+            tenant_id=request.tenant_id,
+            period=request.period,
+            client_ids=request.client_ids,
+            concurrency=request.concurrency
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="period must be in YYYY-MM format")
+    
+    background_tasks.add_task(run_period_close_job, job.id)
+    return job.to_dict()
+
+
+@router.get("/api/period-close/jobs/{job_id}")
+async def get_period_close_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Progress of a period close job.
+    
+    Returns item counts per status, average/max milliseconds per close
+    step, and the clients that failed with their errors.
+    """
+    progress = await period_close_job_progress(db, job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Period close job not found")
+    return progress
+
+
+@router.post("/api/period-close/jobs/{job_id}/resume", status_code=202)
+async def resume_period_close_job(
+    job_id: UUID,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Run a job again for the clients that failed or never finished.
+    
+    Clients that were closed (or already closed) are not touched.
+    """
+    progress = await period_close_job_progress(db, job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Period close job not found")
+    if progress["status"] == "completed":
+        raise HTTPException(status_code=409, detail="Period close job is already completed")
+    
+    background_tasks.add_task(run_period_close_job, job_id)
+    return progress
@@ -24,6 +24,8 @@ from app.models.reconciliation import (
 from app.models.general_ledger import GeneralLedger
 from app.models.chart_of_accounts import Account
 from app.utils.audit import log_audit_event
+from app.services.storage import LocalStorage
+from app.services.storage.base import FileTooLargeError
 
 router = APIRouter(prefix="/api/reconciliations", tags=["Reconciliations"])
 
@@ -32,6 +34,9 @@ UPLOAD_DIR = Path("/home/ubuntu/.openclaw/workspace/ai-erp/backend/uploads/recon
 ALLOWED_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg", ".xlsx", ".csv"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
+# Attachment paths are stored relative to the uploads dir
+attachment_storage = LocalStorage(UPLOAD_DIR.parent)
+
 
 # Pydantic models for request/response
 class ReconciliationCreate(BaseModel):
@@ -397,9 +402,6 @@ async def approve_reconciliation(
     reconciliation.approved_at = datetime.utcnow()
     reconciliation.approved_by = user_id
     
-    await db.commit()
-    await db.refresh(reconciliation)
-    
     # Log audit event
     await log_audit_event(
         db=db,
@@ -418,6 +420,9 @@ async def approve_reconciliation(
         }
     )
     
+    await db.commit()
+    await db.refresh(reconciliation)
+    
     # Get account details
     account_query = select(Account).where(Account.id == reconciliation.account_id)
     account_result = await db.execute(account_query)
@@ -448,7 +453,7 @@ async def upload_attachment(
     """
     Upload an attachment for a reconciliation
     
-    Saves file to uploads/reconciliations/{reconciliation_id}/
+    Streams file to uploads/reconciliations/{reconciliation_id}/
     Max size: 10MB
     Allowed types: PDF, PNG, JPG, XLSX, CSV
     """
@@ -468,31 +473,23 @@ async def upload_attachment(
             detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
         )
     
-    # Read file and validate size
-    file_content = await file.read()
-    file_size = len(file_content)
+    # Stream file to disk in chunks, enforcing the size limit as it arrives
+    file_id = str(uuid.uuid4())
+    safe_filename = f"{file_id}{file_ext}"
+    relative_path = f"reconciliations/{reconciliation_id}/{safe_filename}"
     
-    if file_size > MAX_FILE_SIZE:
+    try:
+        stored = await attachment_storage.save_upload(
+            relative_path, file, max_size=MAX_FILE_SIZE
+        )
+    except FileTooLargeError:
         raise HTTPException(
             status_code=400,
             detail=f"File too large. Max size: {MAX_FILE_SIZE / 1024 / 1024}MB"
         )
-    
-    # Create directory if not exists
-    recon_dir = UPLOAD_DIR / str(reconciliation_id)
-    recon_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Generate unique filename
-    file_id = str(uuid.uuid4())
-    safe_filename = f"{file_id}{file_ext}"
-    file_path = recon_dir / safe_filename
-    
-    # Save file
-    with open(file_path, "wb") as f:
-        f.write(file_content)
+    file_size = stored.size
     
     # Create database record
-    relative_path = f"reconciliations/{reconciliation_id}/{safe_filename}"
     attachment = ReconciliationAttachment(
         id=uuid.uuid4(),
         reconciliation_id=reconciliation_id,
@@ -568,10 +565,8 @@ async def delete_attachment(
         raise HTTPException(status_code=404, detail="Attachment not found")
     
     # Delete file from disk
-    file_path = UPLOAD_DIR.parent / attachment.file_path
     try:
-        if file_path.exists():
-            file_path.unlink()
+        await attachment_storage.delete(attachment.file_path)
     except Exception as e:
         # Log error but continue with database deletion
         print(f"Error deleting file: {e}")
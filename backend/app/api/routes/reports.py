@@ -11,8 +11,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
+from app.services.ledger_lines import line_filters
 from app.models.chart_of_accounts import Account
 from app.models.client import Client
 from app.utils.export_utils import (
@@ -36,7 +37,7 @@ async def get_saldobalanse(
     to_date: Optional[date] = Query(None, description="Til-dato (inklusiv)"),
     account_from: Optional[str] = Query(None, description="Kontoområde fra"),
     account_to: Optional[str] = Query(None, description="Kontoområde til"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Saldobalanse - viser saldo per konto for valgt periode.
@@ -57,17 +58,9 @@ async def get_saldobalanse(
             func.sum(GeneralLedgerLine.debit_amount).label("total_debit"),
             func.sum(GeneralLedgerLine.credit_amount).label("total_credit")
         )
-        .join(GeneralLedger, GeneralLedgerLine.general_ledger_id == GeneralLedger.id)
-        .where(GeneralLedger.client_id == client_id)
-        .where(GeneralLedger.status == "posted")
+        .where(*line_filters(client_id, from_date, to_date))
     )
     
-    # Filtrer på dato hvis oppgitt
-    if from_date:
-        query = query.where(GeneralLedger.accounting_date >= from_date)
-    if to_date:
-        query = query.where(GeneralLedger.accounting_date <= to_date)
-    
     # Filtrer på kontoområde hvis oppgitt
     if account_from:
         query = query.where(GeneralLedgerLine.account_number >= account_from)
@@ -127,7 +120,7 @@ async def get_resultatregnskap(
     client_id: UUID = Query(..., description="Client UUID"),
     from_date: Optional[date] = Query(None, description="Fra-dato (inklusiv)"),
     to_date: Optional[date] = Query(None, description="Til-dato (inklusiv)"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Resultatregnskap - viser inntekter (3000-3999) og kostnader (4000-8999).
@@ -145,18 +138,11 @@ async def get_resultatregnskap(
             func.sum(GeneralLedgerLine.debit_amount).label("total_debit"),
             func.sum(GeneralLedgerLine.credit_amount).label("total_credit")
         )
-        .join(GeneralLedger, GeneralLedgerLine.general_ledger_id == GeneralLedger.id)
-        .where(GeneralLedger.client_id == client_id)
-        .where(GeneralLedger.status == "posted")
+        .where(*line_filters(client_id, from_date, to_date))
         .where(GeneralLedgerLine.account_number >= "3000")
         .where(GeneralLedgerLine.account_number <= "8999")
     )
     
-    if from_date:
-        query = query.where(GeneralLedger.accounting_date >= from_date)
-    if to_date:
-        query = query.where(GeneralLedger.accounting_date <= to_date)
-    
     query = query.group_by(GeneralLedgerLine.account_number)
     query = query.order_by(GeneralLedgerLine.account_number)
     
@@ -243,7 +229,7 @@ async def get_resultatregnskap(
 async def get_balanse(
     client_id: UUID = Query(..., description="Client UUID"),
     to_date: Optional[date] = Query(None, description="Balansedato (default = i dag)"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Balanserapport - viser eiendeler (1000-1999) og gjeld/egenkapital (2000-2999).
@@ -260,16 +246,11 @@ async def get_balanse(
             func.sum(GeneralLedgerLine.debit_amount).label("total_debit"),
             func.sum(GeneralLedgerLine.credit_amount).label("total_credit")
         )
-        .join(GeneralLedger, GeneralLedgerLine.general_ledger_id == GeneralLedger.id)
-        .where(GeneralLedger.client_id == client_id)
-        .where(GeneralLedger.status == "posted")
+        .where(*line_filters(client_id, to_date=to_date))
         .where(GeneralLedgerLine.account_number >= "1000")
         .where(GeneralLedgerLine.account_number <= "2999")
     )
     
-    if to_date:
-        query = query.where(GeneralLedger.accounting_date <= to_date)
-    
     query = query.group_by(GeneralLedgerLine.account_number)
     query = query.order_by(GeneralLedgerLine.account_number)
     
@@ -319,16 +300,11 @@ async def get_balanse(
             func.sum(GeneralLedgerLine.debit_amount).label("total_debit"),
             func.sum(GeneralLedgerLine.credit_amount).label("total_credit")
         )
-        .join(GeneralLedger, GeneralLedgerLine.general_ledger_id == GeneralLedger.id)
-        .where(GeneralLedger.client_id == client_id)
-        .where(GeneralLedger.status == "posted")
+        .where(*line_filters(client_id, to_date=to_date))
         .where(GeneralLedgerLine.account_number >= "3000")
         .where(GeneralLedgerLine.account_number <= "8999")
     )
     
-    if to_date:
-        resultat_query = resultat_query.where(GeneralLedger.accounting_date <= to_date)
-    
     resultat_query = resultat_query.group_by(GeneralLedgerLine.account_number)
     
     resultat_result = await db.execute(resultat_query)
@@ -396,7 +372,7 @@ async def get_hovedbok(
     to_date: Optional[date] = Query(None, description="Til-dato (inklusiv)"),
     limit: int = Query(1000, description="Max antall posteringer"),
     offset: int = Query(0, description="Offset for paginering"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Hovedbok - viser alle posteringer kronologisk, med filter på konto og periode.
@@ -421,8 +397,7 @@ async def get_hovedbok(
             GeneralLedgerLine.vat_amount
         )
         .join(GeneralLedgerLine, GeneralLedger.id == GeneralLedgerLine.general_ledger_id)
-        .where(GeneralLedger.client_id == client_id)
-        .where(GeneralLedger.status == "posted")
+        .where(*line_filters(client_id, from_date, to_date))
     )
     
     # FIX: Støtte for kontorange (account_from/account_to)
@@ -436,11 +411,6 @@ async def get_hovedbok(
         if account_to:
             query = query.where(GeneralLedgerLine.account_number <= account_to)
     
-    if from_date:
-        query = query.where(GeneralLedger.accounting_date >= from_date)
-    if to_date:
-        query = query.where(GeneralLedger.accounting_date <= to_date)
-    
     # Sorter kronologisk
     query = query.order_by(
         GeneralLedger.accounting_date,
@@ -481,11 +451,9 @@ async def get_hovedbok(
                 func.sum(GeneralLedgerLine.debit_amount).label("total_debit"),
                 func.sum(GeneralLedgerLine.credit_amount).label("total_credit")
             )
-            .join(GeneralLedger, GeneralLedgerLine.general_ledger_id == GeneralLedger.id)
-            .where(GeneralLedger.client_id == client_id)
-            .where(GeneralLedger.status == "posted")
+            .where(*line_filters(client_id))
             .where(GeneralLedgerLine.account_number == account_number)
-            .where(GeneralLedger.accounting_date < from_date)
+            .where(GeneralLedgerLine.accounting_date < from_date)
         )
         opening_result = await db.execute(opening_query)
         opening_row = opening_result.first()
@@ -538,7 +506,7 @@ async def export_saldobalanse_pdf(
     to_date: Optional[date] = Query(None, description="Til-dato (inklusiv)"),
     account_from: Optional[str] = Query(None, description="Kontoområde fra"),
     account_to: Optional[str] = Query(None, description="Kontoområde til"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Export Saldobalanse as PDF"""
     # Get data from existing endpoint logic
@@ -555,7 +523,7 @@ async def export_saldobalanse_excel(
     to_date: Optional[date] = Query(None, description="Til-dato (inklusiv)"),
     account_from: Optional[str] = Query(None, description="Kontoområde fra"),
     account_to: Optional[str] = Query(None, description="Kontoområde til"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Export Saldobalanse as Excel"""
     data = await get_saldobalanse(client_id, from_date, to_date, account_from, account_to, db)
@@ -569,7 +537,7 @@ async def export_resultat_pdf(
     client_id: UUID = Query(..., description="Client UUID"),
     from_date: Optional[date] = Query(None, description="Fra-dato (inklusiv)"),
     to_date: Optional[date] = Query(None, description="Til-dato (inklusiv)"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Export Resultatregnskap as PDF"""
     data = await get_resultatregnskap(client_id, from_date, to_date, db)
@@ -583,7 +551,7 @@ async def export_resultat_excel(
     client_id: UUID = Query(..., description="Client UUID"),
     from_date: Optional[date] = Query(None, description="Fra-dato (inklusiv)"),
     to_date: Optional[date] = Query(None, description="Til-dato (inklusiv)"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Export Resultatregnskap as Excel"""
     data = await get_resultatregnskap(client_id, from_date, to_date, db)
@@ -596,7 +564,7 @@ async def export_resultat_excel(
 async def export_balanse_pdf(
     client_id: UUID = Query(..., description="Client UUID"),
     to_date: Optional[date] = Query(None, description="Balansedato (default = i dag)"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Export Balanse as PDF"""
     data = await get_balanse(client_id, to_date, db)
@@ -609,7 +577,7 @@ async def export_balanse_pdf(
 async def export_balanse_excel(
     client_id: UUID = Query(..., description="Client UUID"),
     to_date: Optional[date] = Query(None, description="Balansedato (default = i dag)"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Export Balanse as Excel"""
     data = await get_balanse(client_id, to_date, db)
@@ -628,7 +596,7 @@ async def export_hovedbok_pdf(
     to_date: Optional[date] = Query(None, description="Til-dato (inklusiv)"),
     limit: int = Query(1000, description="Max antall posteringer"),
     offset: int = Query(0, description="Offset for paginering"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Export Hovedbok as PDF"""
     data = await get_hovedbok(client_id, account_number, account_from, account_to, 
@@ -648,7 +616,7 @@ async def export_hovedbok_excel(
     to_date: Optional[date] = Query(None, description="Til-dato (inklusiv)"),
     limit: int = Query(1000, description="Max antall posteringer"),
     offset: int = Query(0, description="Offset for paginering"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Export Hovedbok as Excel"""
     data = await get_hovedbok(client_id, account_number, account_from, account_to, 
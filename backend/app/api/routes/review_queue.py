@@ -32,6 +32,12 @@ class CorrectRequest(BaseModel):
     notes: Optional[str] = None
 
 
+class BulkApproveRequest(BaseModel):
+    """Bulk approve review items request"""
+    item_ids: List[str]
+    notes: Optional[str] = None
+
+
 @router.get("/pending")
 async def get_pending_items(
     client_id: Optional[str] = None,
@@ -175,23 +181,22 @@ async def get_review_items(
     
     # Apply filters
     if status:
-        # Database stores UPPERCASE values (PENDING, APPROVED, etc.)
-        # API accepts lowercase or uppercase - normalize to UPPERCASE for DB comparison
-        from sqlalchemy import cast, String
+        # Database stores enum names (PENDING, APPROVED, etc.)
+        # API accepts lowercase or uppercase - compare against the enum member
+        # (not a string cast) so the status index can be used
         status_upper = status.upper()  # e.g., "PENDING"
         valid_statuses = ['PENDING', 'IN_PROGRESS', 'APPROVED', 'CORRECTED', 'REJECTED']
         if status_upper not in valid_statuses:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
-        query = query.where(cast(ReviewQueue.status, String) == status_upper)
+        query = query.where(ReviewQueue.status == ReviewStatus[status_upper])
     
     if priority:
         # Database stores UPPERCASE values - normalize to UPPERCASE
-        from sqlalchemy import cast, String
         priority_upper = priority.upper()  # e.g., "MEDIUM"
         valid_priorities = ['LOW', 'MEDIUM', 'HIGH', 'URGENT']
         if priority_upper not in valid_priorities:
             raise HTTPException(status_code=400, detail=f"Invalid priority: {priority}")
-        query = query.where(cast(ReviewQueue.priority, String) == priority_upper)
+        query = query.where(ReviewQueue.priority == ReviewPriority[priority_upper])
     
     if client_id:
         try:
@@ -201,14 +206,13 @@ async def get_review_items(
     
     if category:
         # Database stores UPPERCASE values - normalize to UPPERCASE
-        from sqlalchemy import cast, String
         category_upper = category.upper()
         valid_categories = ['LOW_CONFIDENCE', 'UNKNOWN_VENDOR', 'UNUSUAL_AMOUNT', 'MISSING_VAT', 
                            'UNCLEAR_DESCRIPTION', 'DUPLICATE_INVOICE', 'PROCESSING_ERROR', 
                            'MANUAL_REVIEW_REQUIRED']
         if category_upper not in valid_categories:
             raise HTTPException(status_code=400, detail=f"Invalid category: {category}")
-        query = query.where(cast(ReviewQueue.issue_category, String) == category_upper)
+        query = query.where(ReviewQueue.issue_category == IssueCategory[category_upper])
     
     # Count total before pagination
     count_query = select(func.count()).select_from(query.subquery())
@@ -273,6 +277,43 @@ async def get_review_items(
     }
 
 
+@router.post("/bulk-approve")
+async def bulk_approve_items(
+    request: BulkApproveRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Approve many review queue items and book their invoices to General Ledger
+    
+    Items are processed in chunks with one transaction each; the response
+    reports the outcome per item instead of failing the whole request.
+    """
+    from app.services.bulk_approval_service import BulkApprovalService
+    
+    if not request.item_ids:
+        raise HTTPException(status_code=400, detail="item_ids must not be empty")
+    
+    item_ids = []
+    invalid = []
+    for item_id in request.item_ids:
+        try:
+            item_ids.append(UUID(item_id))
+        except ValueError:
+            invalid.append({"id": item_id, "success": False, "error": "Invalid UUID format"})
+    
+    result = await BulkApprovalService(db).approve_items(
+        item_ids,
+        notes=request.notes,
+        user_id=None  # TODO: Set when auth is implemented
+    )
+    
+    response = result.to_dict()
+    response["results"] = invalid + response["results"]
+    response["requested"] += len(invalid)
+    response["failed"] += len(invalid)
+    return response
+
+
 @router.get("/{item_id}")
 async def get_review_item(
     item_id: str,
@@ -452,9 +493,6 @@ async def approve_item(
     review_item.resolution_notes = request.notes
     # TODO: Set resolved_by_user_id when auth is implemented
     
-    await db.commit()
-    await db.refresh(review_item)
-    
     # Log audit event
     await log_audit_event(
         db=db,
@@ -471,6 +509,9 @@ async def approve_item(
         }
     )
     
+    await db.commit()
+    await db.refresh(review_item)
+    
     elapsed = time.time() - start_time
     
     response = {
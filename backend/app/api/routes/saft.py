@@ -0,0 +1,85 @@
+"""
+SAF-T Financial API Routes - Norwegian Standard Audit File export
+"""
+import asyncio
+import logging
+import os
+import tempfile
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+
+from app.database import get_read_db
+from app.services.saft_export import (
+    SaftExporter,
+    SaftExportError,
+    SaftSchemaUnavailableError,
+    saft_xsd_path,
+    validate_saft_file,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/saft", tags=["saft"])
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+@router.get("/export")
+async def export_saft(
+    client_id: UUID,
+    date_from: date = Query(..., description="First accounting date in the file"),
+    date_to: date = Query(..., description="Last accounting date in the file"),
+    validate: bool = Query(True, description="Run the XSD/control total validation pass"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Export SAF-T Financial XML (v1.30) for a client and period
+
+    The file is written to a temporary file in constant memory, validated
+    in a second streaming pass and then sent. A file that fails validation
+    is not returned; the response lists the errors instead (422). Without
+    the SAF-T XSD installed, a validated export is refused (503).
+    """
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must be on or after date_from")
+    if validate and not saft_xsd_path().is_file():
+        # Fail before the export instead of after writing the whole file
+        raise HTTPException(status_code=503, detail=f"SAF-T XSD not installed ({saft_xsd_path()})")
+
+    fd, path = tempfile.mkstemp(prefix="saft_", suffix=".xml")
+    os.close(fd)
+    try:
+        await SaftExporter(db).write(client_id, date_from, date_to, path)
+        if validate:
+            result = await asyncio.to_thread(validate_saft_file, path)
+            if not result.valid:
+                logger.error(f"SAF-T export for client {client_id} failed validation: {result.errors[:5]}")
+                raise HTTPException(status_code=422, detail=result.to_dict())
+    except SaftSchemaUnavailableError as e:
+        _remove(path)
+        logger.error(str(e))
+        raise HTTPException(status_code=503, detail=str(e))
+    except SaftExportError as e:
+        _remove(path)
+        raise HTTPException(status_code=400, detail=str(e))
+    except BaseException:
+        _remove(path)
+        raise
+
+    filename = f"SAF-T_Financial_{client_id}_{date_from.isoformat()}_{date_to.isoformat()}.xml"
+    return FileResponse(
+        path,
+        media_type="application/xml",
+        filename=filename,
+        background=BackgroundTask(_remove, path),
+    )
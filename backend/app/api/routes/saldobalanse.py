@@ -18,7 +18,7 @@ from reportlab.lib.units import mm
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.pdfgen import canvas
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.services.report_service import calculate_saldobalanse, get_saldobalanse_summary
 from app.services.account_balance_service import AccountBalanceService
 
@@ -33,7 +33,7 @@ async def get_saldobalanse(
     to_date: Optional[date] = Query(None, description="End date for transactions (optional)"),
     account_class: Optional[str] = Query(None, description="Filter by account class (e.g., '1', '2', '3')"),
     include_summary: bool = Query(True, description="Include summary statistics"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get Saldobalanse (Trial Balance) report.
@@ -116,7 +116,7 @@ async def export_saldobalanse_excel(
     from_date: Optional[date] = Query(None, description="Start date for transactions"),
     to_date: Optional[date] = Query(None, description="End date for transactions"),
     account_class: Optional[str] = Query(None, description="Filter by account class"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Export Saldobalanse to Excel (.xlsx format).
@@ -317,7 +317,7 @@ async def export_saldobalanse_pdf(
     from_date: Optional[date] = Query(None, description="Start date for transactions"),
     to_date: Optional[date] = Query(None, description="End date for transactions"),
     account_class: Optional[str] = Query(None, description="Filter by account class"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Export Saldobalanse to PDF format.
@@ -486,7 +486,7 @@ async def get_account_transactions(
     from_date: Optional[date] = Query(None, description="Start date"),
     to_date: Optional[date] = Query(None, description="End date"),
     limit: int = Query(100, description="Max transactions to return"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Drill-down: Get all transactions for a specific account.
@@ -550,7 +550,7 @@ async def recalculate_balances(
 async def validate_balance(
     client_id: UUID = Query(..., description="Client ID"),
     period: Optional[str] = Query(None, description="Period to validate (YYYY-MM)"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Validate that all GL entries balance (Debit = Credit).
@@ -0,0 +1,45 @@
+"""
+Global Search API - Vouchers, invoices and audit trail in one query box
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from app.database import get_db
+from app.services.search import SEARCH_TYPES, global_search
+
+router = APIRouter(prefix="/api/search", tags=["Search"])
+
+
+@router.get("/")
+async def search(
+    client_id: UUID = Query(..., description="Client ID"),
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    types: Optional[str] = Query(None, description="Comma-separated subset of vouchers,invoices,audit"),
+    limit: int = Query(10, ge=1, le=50, description="Max results per type"),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Search vouchers, vendor invoices and the audit trail of a client.
+    
+    Uses the full-text (search_vector) and trigram indexes; results are
+    ordered by relevance, newest first.
+    """
+    selected = [t.strip() for t in types.split(",") if t.strip()] if types else list(SEARCH_TYPES)
+    unknown = [t for t in selected if t not in SEARCH_TYPES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown search type(s) {', '.join(unknown)}; expected {', '.join(SEARCH_TYPES)}"
+        )
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q must not be blank")
+    
+    results = await global_search(db, client_id, q, selected, limit)
+    
+    return {
+        "query": q,
+        "results": results,
+        "counts": {search_type: len(items) for search_type, items in results.items()},
+    }
@@ -3,18 +3,18 @@ Supplier Ledger API Routes - Leverandørreskontro
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, and_, or_
 from typing import List, Optional
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 import uuid
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.supplier_ledger import SupplierLedger, SupplierLedgerTransaction
 from app.models.vendor import Vendor
 from app.models.client import Client
-from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
 from app.models.chart_of_accounts import Account
+from app.services.subledger_analytics import SubledgerAnalytics
 from app.utils.export_utils import (
     generate_pdf_supplier_ledger,
     generate_excel_supplier_ledger,
@@ -37,51 +37,21 @@ async def get_supplier_ledger(
     
     Returns list of open/paid supplier invoices with remaining balances.
     """
-    query = (
-        select(SupplierLedger, Vendor)
-        .join(Vendor, SupplierLedger.supplier_id == Vendor.id)
-        .where(SupplierLedger.client_id == client_id)
-    )
-    
-    # Apply filters
-    if status and status != "all":
-        query = query.where(SupplierLedger.status == status)
-    
-    if date_from:
-        query = query.where(SupplierLedger.invoice_date >= date_from)
-    
-    if date_to:
-        query = query.where(SupplierLedger.invoice_date <= date_to)
-    
-    if supplier_id:
-        query = query.where(SupplierLedger.supplier_id == supplier_id)
-    
-    # Order by due date (oldest first)
-    query = query.order_by(SupplierLedger.due_date.asc())
-    
-    result = await db.execute(query)
-    entries = result.all()
-    
-    # Build response
-    ledger_list = []
-    for ledger_entry, vendor in entries:
-        entry_dict = ledger_entry.to_dict()
-        entry_dict["supplier_name"] = vendor.name
-        entry_dict["supplier_org_number"] = vendor.org_number
-        
-        # Calculate days overdue
-        if ledger_entry.due_date < date.today() and ledger_entry.status in ["open", "partially_paid"]:
-            days_overdue = (date.today() - ledger_entry.due_date).days
-            entry_dict["days_overdue"] = days_overdue
-        else:
-            entry_dict["days_overdue"] = 0
-        
-        ledger_list.append(entry_dict)
+    analytics = SubledgerAnalytics(db, "supplier")
+    ledger_list = [
+        entry async for entry in analytics.entries(
+            client_id,
+            status=status,
+            date_from=date_from,
+            date_to=date_to,
+            counterparty_id=supplier_id,
+        )
+    ]
     
     return {
         "entries": ledger_list,
         "total_count": len(ledger_list),
-        "total_remaining": sum(float(e.remaining_amount) for e, _ in entries),
+        "total_remaining": sum(e["remaining_amount"] for e in ledger_list),
     }
 
 
@@ -173,134 +143,34 @@ async def get_supplier_statement(
 @router.get("/aging")
 async def get_supplier_aging(
     client_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db)
+    as_of_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get aging report for supplier ledger
     
-    Breaks down open balances by age:
+    Breaks down open balances by age, in total and per supplier:
     - Not due
     - 0-30 days overdue
     - 31-60 days overdue
     - 61-90 days overdue
     - 90+ days overdue
     """
-    today = date.today()
-    
-    # Get all open entries
-    query = (
-        select(SupplierLedger)
-        .where(and_(
-            SupplierLedger.client_id == client_id,
-            SupplierLedger.status.in_(["open", "partially_paid"])
-        ))
-    )
-    
-    result = await db.execute(query)
-    entries = result.scalars().all()
-    
-    # Calculate aging buckets
-    aging = {
-        "not_due": Decimal("0.00"),
-        "0_30": Decimal("0.00"),
-        "31_60": Decimal("0.00"),
-        "61_90": Decimal("0.00"),
-        "90_plus": Decimal("0.00"),
-    }
-    
-    for entry in entries:
-        if entry.due_date >= today:
-            aging["not_due"] += entry.remaining_amount
-        else:
-            days_overdue = (today - entry.due_date).days
-            if days_overdue <= 30:
-                aging["0_30"] += entry.remaining_amount
-            elif days_overdue <= 60:
-                aging["31_60"] += entry.remaining_amount
-            elif days_overdue <= 90:
-                aging["61_90"] += entry.remaining_amount
-            else:
-                aging["90_plus"] += entry.remaining_amount
-    
-    total = sum(aging.values())
-    
-    return {
-        "aging": {
-            "not_due": float(aging["not_due"]),
-            "0_30_days": float(aging["0_30"]),
-            "31_60_days": float(aging["31_60"]),
-            "61_90_days": float(aging["61_90"]),
-            "90_plus_days": float(aging["90_plus"]),
-        },
-        "total": float(total),
-        "percentages": {
-            "not_due": round((aging["not_due"] / total * 100) if total > 0 else 0, 1),
-            "0_30_days": round((aging["0_30"] / total * 100) if total > 0 else 0, 1),
-            "31_60_days": round((aging["31_60"] / total * 100) if total > 0 else 0, 1),
-            "61_90_days": round((aging["61_90"] / total * 100) if total > 0 else 0, 1),
-            "90_plus_days": round((aging["90_plus"] / total * 100) if total > 0 else 0, 1),
-        },
-    }
+    return await SubledgerAnalytics(db, "supplier").aging(client_id, as_of_date)
 
 
 @router.get("/reconcile")
 async def reconcile_supplier_ledger(
     client_id: uuid.UUID,
     as_of_date: Optional[date] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Validate that supplier ledger reconciles with account 2400
     
     CRITICAL: Sum of open entries MUST equal account 2400 balance
     """
-    if not as_of_date:
-        as_of_date = date.today()
-    
-    # Get sum of open supplier ledger entries
-    ledger_query = select(
-        func.sum(SupplierLedger.remaining_amount)
-    ).where(and_(
-        SupplierLedger.client_id == client_id,
-        SupplierLedger.status.in_(["open", "partially_paid"]),
-        SupplierLedger.invoice_date <= as_of_date
-    ))
-    
-    ledger_result = await db.execute(ledger_query)
-    ledger_sum = ledger_result.scalar() or Decimal("0.00")
-    
-    # Get account 2400 balance from general ledger
-    # TODO: This should query account_balances table for performance
-    # For now, calculate from general_ledger_lines
-    account_query = select(
-        func.sum(GeneralLedgerLine.credit_amount - GeneralLedgerLine.debit_amount)
-    ).select_from(GeneralLedgerLine).join(
-        GeneralLedger,
-        GeneralLedgerLine.general_ledger_id == GeneralLedger.id
-    ).where(and_(
-        GeneralLedger.client_id == client_id,
-        GeneralLedgerLine.account_number == "2400",
-        GeneralLedger.accounting_date <= as_of_date
-    ))
-    
-    
-    account_result = await db.execute(account_query)
-    account_balance = account_result.scalar() or Decimal("0.00")
-    
-    difference = ledger_sum - account_balance
-    reconciles = abs(difference) < Decimal("0.01")  # Allow 1 cent rounding difference
-    
-    return {
-        "as_of_date": as_of_date.isoformat(),
-        "supplier_ledger_total": float(ledger_sum),
-        "account_2400_balance": float(account_balance),
-        "difference": float(difference),
-        "reconciles": reconciles,
-        "status": "OK" if reconciles else "ERROR - Does not reconcile!",
-    }
-
-
-
+    return await SubledgerAnalytics(db, "supplier").reconcile(client_id, as_of_date)
 
 
 # ==================== EXPORT ENDPOINTS ====================
@@ -608,6 +608,7 @@ async def bulk_import_suppliers(
     file: bytes = File(...),
     filename: str = Query(...),
     client_id: UUID = Query(...),
+    update_existing: bool = Query(False, description="Update suppliers whose org number is already registered instead of skipping them"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -635,7 +636,7 @@ async def bulk_import_suppliers(
         df = parse_file(file, filename)
         
         # Import suppliers
-        result = await import_suppliers(db, df, client_id)
+        result = await import_suppliers(db, df, client_id, update_existing)
         
         return result.to_dict()
     
@@ -17,6 +17,7 @@ from app.schemas.task import (
     TaskTemplateApply, TaskWithSubtasks
 )
 from app.services.task_template_service import TaskTemplateService
+from app.utils.audit import record_audit
 
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
@@ -125,13 +126,14 @@ async def create_task(
     await db.flush()
     
     # Create audit log
-    audit_log = TaskAuditLog(
+    record_audit(
+        db,
+        TaskAuditLog,
         task_id=db_task.id,
         action=TaskAuditAction.CREATED,
         performed_by="system",
         performed_at=datetime.utcnow()
     )
-    db.add(audit_log)
     
     await db.commit()
     await db.refresh(db_task)
@@ -205,7 +207,9 @@ async def complete_task(
     db_task.updated_at = datetime.utcnow()
     
     # Create audit log
-    audit_log = TaskAuditLog(
+    record_audit(
+        db,
+        TaskAuditLog,
         task_id=db_task.id,
         action=TaskAuditAction.MANUALLY_CHECKED,
         performed_by=completion.completed_by,
@@ -214,7 +218,6 @@ async def complete_task(
         result_description=completion.notes,
         documentation_reference=completion.documentation_url
     )
-    db.add(audit_log)
     
     await db.commit()
     await db.refresh(db_task)
@@ -250,7 +253,9 @@ async def auto_complete_task(
     db_task.updated_at = datetime.utcnow()
     
     # Create audit log
-    audit_log = TaskAuditLog(
+    record_audit(
+        db,
+        TaskAuditLog,
         task_id=db_task.id,
         action=TaskAuditAction.AUTO_COMPLETED if auto_completion.result == "ok" else TaskAuditAction.MARKED_DEVIATION,
         performed_by="AI-agent",
@@ -259,7 +264,6 @@ async def auto_complete_task(
         result_description=auto_completion.result_description,
         documentation_reference=auto_completion.documentation_url
     )
-    db.add(audit_log)
     
     await db.commit()
     await db.refresh(db_task)
@@ -14,6 +14,7 @@ import os
 from app.database import get_db
 from app.services.tink.service import TinkService
 from app.models.bank_connection import BankConnection
+from app.services.session_store import create_session_store
 from app.models.bank_transaction import BankTransaction, TransactionStatus
 from sqlalchemy import select, and_
 
@@ -184,8 +185,9 @@ class ConnectionResponse(BaseModel):
     is_active: bool
 
 
-# OAuth state storage (in production, use Redis)
-oauth_states = {}
+# OAuth state storage (expires if the user never completes the flow)
+OAUTH_STATE_TTL_SECONDS = 15 * 60
+oauth_states = create_session_store("oauth:tink", default_ttl=OAUTH_STATE_TTL_SECONDS)
 
 
 @router.post("/oauth/authorize")
@@ -204,10 +206,10 @@ async def initiate_oauth(
         state = secrets.token_urlsafe(32)
         
         # Store state for verification (with client_id)
-        oauth_states[state] = {
+        await oauth_states.set(state, {
             "client_id": request.client_id,
             "timestamp": datetime.utcnow().isoformat()
-        }
+        })
         
         # Get authorization URL
         oauth_client = tink_service.get_oauth_client()
@@ -248,10 +250,10 @@ async def oauth_callback(
     """
     try:
         # Verify state (CSRF protection)
-        if state not in oauth_states:
+        state_data = await oauth_states.get(state)
+        if state_data is None:
             raise HTTPException(status_code=400, detail="Invalid state parameter (CSRF check failed)")
         
-        state_data = oauth_states.get(state)
         client_id = state_data["client_id"]
         
         # Exchange code for token
@@ -280,12 +282,12 @@ async def oauth_callback(
         logger.info(f"OAuth callback successful for client {client_id}, found {len(accounts)} accounts")
         
         # Keep state and tokens for account connection
-        oauth_states[state] = {
+        await oauth_states.set(state, {
             **state_data,
             "code": code,
             "token_data": token_data,
             "accounts": formatted_accounts
-        }
+        })
         
         return {
             "success": True,
@@ -313,10 +315,10 @@ async def connect_account(
     """
     try:
         # Verify state
-        if request.state not in oauth_states:
+        state_data = await oauth_states.get(request.state)
+        if state_data is None:
             raise HTTPException(status_code=400, detail="Invalid state - please restart OAuth flow")
         
-        state_data = oauth_states[request.state]
         token_data = state_data.get("token_data")
         
         if not token_data:
@@ -336,7 +338,7 @@ async def connect_account(
         )
         
         # Clean up state
-        oauth_states.pop(request.state, None)
+        await oauth_states.delete(request.state)
         
         logger.info(f"Connected account {request.account_number} for client {request.client_id}")
         
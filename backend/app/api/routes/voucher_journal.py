@@ -2,6 +2,7 @@
 Voucher Journal API Routes - Bilagsjournal
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, desc
 from typing import List, Optional
@@ -9,8 +10,14 @@ from datetime import date, datetime
 from decimal import Decimal
 import uuid
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
+from app.services.journal_export import (
+    EXPORT_MEDIA_TYPES,
+    decode_cursor,
+    journal_export_query,
+    stream_journal_export,
+)
 
 router = APIRouter(prefix="/voucher-journal", tags=["voucher_journal"])
 
@@ -27,7 +34,7 @@ async def get_voucher_journal(
     search: Optional[str] = None,
     limit: int = Query(50, ge=1, le=500, description="Items per page (default: 50)"),
     offset: int = Query(0, ge=0, description="Starting index (default: 0)"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get voucher journal (bilagsjournal) with comprehensive filters and pagination
@@ -163,7 +170,7 @@ async def get_voucher_journal(
 async def get_voucher_journal_stats(
     client_id: uuid.UUID,
     period: Optional[str] = None,  # YYYY-MM format
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get statistics for voucher journal
@@ -211,10 +218,50 @@ async def get_voucher_journal_stats(
     return stats
 
 
+@router.get("/export")
+async def export_voucher_journal(
+    client_id: uuid.UUID,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    series: Optional[List[str]] = Query(None, description="Voucher series to include (repeatable)"),
+    after: Optional[str] = Query(None, description="Resume after this row cursor"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of lines"),
+    format: str = Query("csv", regex="^(csv|ndjson|xlsx)$"),
+):
+    """
+    Export voucher journal lines as CSV, NDJSON or XLSX
+    
+    Useful for auditing and external analysis. The file is streamed: lines
+    are read from the database in chunks while the client downloads. Every
+    line has a cursor column; pass the last one received as `after` to
+    resume an interrupted export.
+    """
+    try:
+        cursor = decode_cursor(after) if after else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    query = journal_export_query(
+        client_id,
+        date_from=date_from,
+        date_to=date_to,
+        series=series,
+        after=cursor,
+        limit=limit,
+    )
+    filename = f"bilagsjournal_{client_id}_{date.today().isoformat()}.{format}"
+    
+    return StreamingResponse(
+        stream_journal_export(query, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
 @router.get("/{voucher_id}")
 async def get_voucher_detail(
     voucher_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get full detail of a single voucher including all lines
@@ -252,7 +299,7 @@ async def get_voucher_detail(
 
 @router.get("/types")
 async def get_voucher_types(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get list of voucher types used in the system
@@ -311,83 +358,3 @@ async def get_voucher_types(
             },
         ]
     }
-
-
-@router.get("/export")
-async def export_voucher_journal(
-    client_id: uuid.UUID,
-    date_from: Optional[date] = None,
-    date_to: Optional[date] = None,
-    format: str = Query("json", regex="^(json|csv)$"),
-    db: AsyncSession = Depends(get_db)
-):
-    """
-    Export voucher journal to JSON or CSV
-    
-    Useful for auditing and external analysis.
-    """
-    query = select(GeneralLedger).where(GeneralLedger.client_id == client_id)
-    
-    if date_from:
-        query = query.where(GeneralLedger.accounting_date >= date_from)
-    if date_to:
-        query = query.where(GeneralLedger.accounting_date <= date_to)
-    
-    query = query.order_by(GeneralLedger.accounting_date, GeneralLedger.voucher_number)
-    
-    result = await db.execute(query)
-    vouchers = result.scalars().all()
-    
-    export_data = []
-    
-    for voucher in vouchers:
-        # Get lines
-        lines_query = (
-            select(GeneralLedgerLine)
-            .where(GeneralLedgerLine.general_ledger_id == voucher.id)
-            .order_by(GeneralLedgerLine.line_number)
-        )
-        lines_result = await db.execute(lines_query)
-        lines = lines_result.scalars().all()
-        
-        # Create flat structure for each line
-        for line in lines:
-            export_data.append({
-                "accounting_date": voucher.accounting_date.isoformat(),
-                "voucher_number": f"{voucher.voucher_series}-{voucher.voucher_number}",
-                "voucher_type": voucher.voucher_type,
-                "description": voucher.description,
-                "account_number": line.account_number,
-                "debit": float(line.debit_amount),
-                "credit": float(line.credit_amount),
-                "vat_code": line.vat_code,
-                "vat_amount": float(line.vat_amount) if line.vat_amount else 0.0,
-                "line_description": line.line_description,
-                "posted_by": voucher.posted_by,
-                "created_at": voucher.created_at.isoformat(),
-            })
-    
-    if format == "csv":
-        # Convert to CSV format
-        import csv
-        import io
-        
-        output = io.StringIO()
-        if export_data:
-            fieldnames = export_data[0].keys()
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(export_data)
-        
-        return {
-            "format": "csv",
-            "data": output.getvalue(),
-            "count": len(export_data),
-        }
-    
-    # Return JSON
-    return {
-        "format": "json",
-        "data": export_data,
-        "count": len(export_data),
-    }
@@ -19,21 +19,47 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 40
     
+    # Read replica for get_read_db() (reports, dashboards, listings).
+    # Unset: read-only sessions use the primary.
+    DATABASE_REPLICA_URL: str = ""
+    DB_REPLICA_POOL_SIZE: int = 20
+    DB_REPLICA_MAX_OVERFLOW: int = 20
+    
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Session state (chat context, OAuth state)
+    SESSION_STORE_BACKEND: str = "memory"  # memory/redis (redis when running several workers)
+    CHAT_SESSION_MAX_ENTRIES: int = 10000
+    
     # AWS
     AWS_REGION: str = "eu-north-1"  # Stockholm/Oslo
     AWS_TEXTRACT_REGION: str = "eu-west-1"  # Ireland (Textract not available in Stockholm)
     AWS_ACCESS_KEY: str = ""
     AWS_SECRET_KEY: str = ""
     S3_BUCKET_DOCUMENTS: str = "ai-erp-documents"
+    S3_DOCUMENTS_REGION: str = "eu-west-1"  # Same region as Textract
+    S3_MAX_POOL_CONNECTIONS: int = 50
+    
+    # Document Storage
+    DOCUMENT_STORAGE_BACKEND: str = "s3"  # s3/local
+    LOCAL_STORAGE_ROOT: str = "uploads"
+    PRESIGNED_URL_EXPIRES_SECONDS: int = 3600
     
     # Anthropic Claude API
     ANTHROPIC_API_KEY: str = ""
     CLAUDE_MODEL: str = "claude-sonnet-4-20250514"
     CLAUDE_MAX_TOKENS: int = 4096
     
+    # Natural Language Query
+    NLQ_ENGINE: str = "postgres"  # postgres/duckdb (duckdb = embedded mirror, optional dependency)
+    NLQ_STATEMENT_TIMEOUT_MS: int = 5000
+    NLQ_MAX_ROWS: int = 1000
+    NLQ_SQL_CACHE_SIZE: int = 1024
+    NLQ_RESULT_CACHE_SIZE: int = 256
+    NLQ_DUCKDB_PATH: str = "data/nlq_mirror.duckdb"
+    NLQ_MIRROR_REFRESH_SECONDS: int = 300
+    
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
@@ -66,6 +92,36 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
     
+    # Audit spool (out-of-band agent telemetry, drained into audit_trail)
+    AUDIT_SPOOL_PATH: str = "data/audit_spool.jsonl"
+    AUDIT_SPOOL_DRAIN_SECONDS: int = 30
+    
+    # Archived audit years (gzip JSONL + manifest per closed fiscal year)
+    AUDIT_ARCHIVE_PATH: str = "data/audit_archive"
+    
+    # Query profiler (Server-Timing headers, N+1 logging, /api/debug/queries)
+    QUERY_PROFILER_ENABLED: bool = True
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD: int = 10  # Same statement shape this often in one request
+    QUERY_PROFILER_SLOW_REQUEST_MS: int = 1000
+    QUERY_PROFILER_DEBUG_ENDPOINT: bool = False  # Always available when DEBUG
+    
+    # Tenant-wide period close: clients closed in parallel (each holds a connection)
+    PERIOD_CLOSE_CONCURRENCY: int = 8
+    
+    # In-memory currency rate table: reloaded after this long (rates written by other processes)
+    CURRENCY_RATE_TABLE_TTL_SECONDS: int = 3600
+    
+    # SAF-T Financial export: Skatteetaten's XSD for the validation pass. Empty: the
+    # bundled app/resources/saft/ schema; relative paths are from the backend directory
+    SAFT_XSD_PATH: str = ""
+    
+    # Brønnøysund live API fallback: answers (also "not found") are cached this long
+    BRREG_CACHE_TTL_SECONDS: int = 86400
+    
+    # Prometheus metrics (GET /metrics). Multiple workers: set the
+    # PROMETHEUS_MULTIPROC_DIR environment variable (see app/utils/metrics.py)
+    METRICS_ENABLED: bool = True
+    
     # DNB Open Banking
     DNB_CLIENT_ID: str = ""
     DNB_CLIENT_SECRET: str = ""
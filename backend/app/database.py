@@ -1,11 +1,15 @@
 """
 Database configuration and session management
 """
+from sqlalchemy import DDL, event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 from app.config import settings
+from app.utils.metrics import instrument_pool
+from app.utils.query_profiler import instrument_engine
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,7 +24,33 @@ engine = create_async_engine(
     pool_recycle=3600,  # Recycle connections after 1 hour
 )
 
-# Session factory
+# Read replica for report/listing traffic, with its own pool. Without a
+# replica, read-only sessions use the primary engine.
+if settings.DATABASE_REPLICA_URL:
+    read_engine = create_async_engine(
+        settings.DATABASE_REPLICA_URL,
+        echo=settings.DEBUG,
+        pool_size=settings.DB_REPLICA_POOL_SIZE,
+        max_overflow=settings.DB_REPLICA_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+    )
+else:
+    read_engine = engine
+
+
+# Query profiling: statements run while a request profile is active
+# (QueryProfilerMiddleware) are recorded on it
+instrument_engine(engine.sync_engine)
+
+# Pool saturation gauges for /metrics
+instrument_pool(engine.sync_engine, "primary", settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+
+if read_engine is not engine:
+    instrument_engine(read_engine.sync_engine)
+    instrument_pool(read_engine.sync_engine, "replica", settings.DB_REPLICA_POOL_SIZE + settings.DB_REPLICA_MAX_OVERFLOW)
+
+# Session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -29,9 +59,20 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+ReadOnlySessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 # Base class for models
 Base = declarative_base()
 
+# Trigram search indexes (gin_trgm_ops) need pg_trgm before the tables
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -53,6 +94,43 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only endpoints (reports, dashboards, listings)
+    
+    The session runs on the replica when DATABASE_REPLICA_URL is set and
+    inside a READ ONLY transaction, so an accidental write fails instead of
+    reaching the primary. Nothing is committed; the transaction is rolled
+    back when the request ends.
+    
+    Replicas lag slightly behind the primary: endpoints that must see a
+    write made by the same user a moment ago should keep using get_db.
+    """
+    async with read_only_session() as session:
+        try:
+            yield session
+        except Exception as e:
+            logger.error(f"Read-only database session error: {str(e)}")
+            raise
+
+
+@asynccontextmanager
+async def read_only_session() -> AsyncIterator[AsyncSession]:
+    """
+    Read-only session (replica, READ ONLY transaction) outside a dependency
+    
+    Streaming response bodies run after the request's dependencies have
+    been closed, so they open their own session with this.
+    """
+    async with ReadOnlySessionLocal() as session:
+        try:
+            await session.execute(text("SET TRANSACTION READ ONLY"))
+            yield session
+        finally:
+            await session.rollback()
+            await session.close()
+
+
 async def init_db():
     """Initialize database (create all tables)"""
     async with engine.begin() as conn:
@@ -63,4 +141,6 @@ async def init_db():
 async def close_db():
     """Close database connections"""
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
     logger.info("Database connections closed")
@@ -5,16 +5,25 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from strawberry.fastapi import GraphQLRouter
 from contextlib import asynccontextmanager
+from datetime import date
+import asyncio
 import logging
 
 from app.config import settings
-from app.database import init_db, close_db
+from app.database import init_db, close_db, engine, AsyncSessionLocal
 from app.graphql.schema import schema
 from app.api.webhooks import ehf
 from app.api import chat
-from app.api.routes import review_queue, inbox, dashboard, dashboard_metrics, reports, documents, accounts, audit, bank, customer_invoices, invoices, demo, chat_booking, saldobalanse, clients, client_settings, accruals, copilot, nlq, period_close, bank_reconciliation, trust, income_statement, balance_sheet, journal_entries, auto_booking, tenants, tasks, supplier_ledger, customer_ledger, voucher_journal, test_ehf, suppliers, customers, opening_balance, currencies, tink, bank_recon, reconciliations, bank_matching, other_vouchers, voucher_control
+from app.api.routes import review_queue, inbox, dashboard, dashboard_metrics, reports, documents, accounts, audit, bank, customer_invoices, invoices, demo, chat_booking, saldobalanse, clients, client_settings, accruals, copilot, nlq, period_close, bank_reconciliation, trust, income_statement, balance_sheet, journal_entries, auto_booking, tenants, tasks, supplier_ledger, customer_ledger, voucher_journal, test_ehf, suppliers, customers, opening_balance, currencies, tink, bank_recon, reconciliations, bank_matching, other_vouchers, voucher_control, search, debug, metrics, saft
 from app.api import ai_features
 from app.middleware.demo import DemoEnvironmentMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.query_profiler import QueryProfilerMiddleware
+from app.services.audit_archive import ensure_audit_partitions, next_month
+from app.services.brreg import close_client as close_brreg_client
+from app.services.ledger_lines import ensure_partitions
+from app.utils.audit import drain_spool_periodically, get_audit_spool
+from app.utils.metrics import mark_process_dead
 
 # Setup logging
 logging.basicConfig(
@@ -32,12 +41,30 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("✅ Database initialized")
     
+    today = date.today()
+    year = today.year
+    async with engine.begin() as conn:
+        await ensure_partitions(conn, [year, year + 1])
+        await ensure_audit_partitions(conn, [(year, today.month), next_month(year, today.month)])
+    
+    audit_drainer = asyncio.create_task(
+        drain_spool_periodically(AsyncSessionLocal, settings.AUDIT_SPOOL_DRAIN_SECONDS)
+    )
+    
     yield
     
     # Shutdown
     logger.info("👋 Shutting down AI-Agent ERP...")
+    audit_drainer.cancel()
+    try:
+        async with AsyncSessionLocal() as db:
+            await get_audit_spool().drain(db)
+    except Exception as e:
+        logger.error(f"Final audit spool drain failed: {e}")
+    await close_brreg_client()
     await close_db()
     logger.info("✅ Database connections closed")
+    mark_process_dead()
 
 
 # Create FastAPI app
@@ -61,6 +88,14 @@ app.add_middleware(
 # Demo environment middleware
 app.add_middleware(DemoEnvironmentMiddleware)
 
+# Prometheus request metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Query profiler (outermost: times the whole request)
+if settings.QUERY_PROFILER_ENABLED:
+    app.add_middleware(QueryProfilerMiddleware)
+
 # GraphQL endpoint
 graphql_app = GraphQLRouter(
     schema,
@@ -212,6 +247,18 @@ app.include_router(reconciliations.router)
 # Voucher Control API (Bilagskontroll - Audit trail and control overview)
 app.include_router(voucher_control.router, prefix="/api/voucher-control", tags=["voucher-control"])
 
+# Global Search API (Vouchers, invoices and audit trail)
+app.include_router(search.router)
+
+# SAF-T Financial API (Norwegian standard audit file export)
+app.include_router(saft.router)
+
+# Debug API (Query profiler statistics per route)
+app.include_router(debug.router)
+
+# Metrics API (Prometheus scrape endpoint)
+app.include_router(metrics.router)
+
 # AI Features API (Smart categorization, anomaly detection, reconciliation, etc.)
 app.include_router(ai_features.router)
 
@@ -0,0 +1,52 @@
+"""
+Metrics Middleware
+
+Request latency histogram per route template and in-flight request gauge
+(app/utils/metrics.py). Route templates (/api/tasks/{task_id}) keep the
+label set bounded; unmatched paths share one label.
+"""
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+
+logger = logging.getLogger(__name__)
+
+
+def route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Pure ASGI: no response buffering, two metric updates per request"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            HTTP_REQUEST_DURATION.labels(
+                method=scope.get("method", ""),
+                route=route_template(scope),
+                status=str(status_code),
+            ).observe(time.perf_counter() - start)
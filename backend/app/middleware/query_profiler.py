@@ -0,0 +1,99 @@
+"""
+Query Profiler Middleware
+
+Profiles the database work of every HTTP request (see
+app/utils/query_profiler.py): adds a Server-Timing header, logs slow
+requests and N+1 patterns, and feeds the per-route registry behind
+/api/debug/queries.
+
+Pure ASGI (not BaseHTTPMiddleware) so the profile's context variable is
+visible to the endpoint and the response body is not buffered.
+"""
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.query_profiler import QueryProfile, current_profile, registry
+
+logger = logging.getLogger(__name__)
+
+
+def route_name(scope: Scope) -> str:
+    """METHOD + route template (e.g. GET /api/tasks/{task_id}), or the raw path when unmatched"""
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "<unmatched>"
+    return f"{scope.get('method', '')} {path}"
+
+
+class QueryProfilerMiddleware:
+    """
+    Per-request query count, DB time, slowest statements and N+1 detection
+
+    - Server-Timing: db;dur=..;desc="N queries", app;dur=.., total;dur=..
+    - Structured log (extra=...) for requests over the slow threshold or
+      with a statement shape repeated N+1 threshold times
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        n_plus_one_threshold: int = settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD,
+        slow_request_ms: float = settings.QUERY_PROFILER_SLOW_REQUEST_MS,
+    ):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = current_profile.set(profile)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    profile.server_timing((time.perf_counter() - start) * 1000),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_profile.reset(token)
+            self._report(scope, profile, (time.perf_counter() - start) * 1000)
+
+    def _report(self, scope: Scope, profile: QueryProfile, total_ms: float) -> None:
+        route = route_name(scope)
+        repeated = profile.repeated(self.n_plus_one_threshold)
+        registry.record(route, profile, total_ms, repeated)
+
+        if not repeated and total_ms < self.slow_request_ms:
+            return
+        extra = {
+            "route": route,
+            "path": scope.get("path"),
+            "queries": profile.queries,
+            "db_ms": round(profile.db_ms, 2),
+            "total_ms": round(total_ms, 2),
+            "slowest": profile.slowest_statements(),
+            "repeated": repeated,
+        }
+        if repeated:
+            logger.warning(
+                f"N+1 queries in {route}: {repeated[0]['count']}x {repeated[0]['shape'][:120]}",
+                extra=extra,
+            )
+        else:
+            logger.info(
+                f"Slow request {route}: {total_ms:.0f} ms, {profile.queries} queries, {profile.db_ms:.0f} ms in DB",
+                extra=extra,
+            )
@@ -40,6 +40,10 @@ from app.models.customer import Customer, CustomerAuditLog
 from app.models.currency_rate import CurrencyRate
 from app.models.reconciliation import Reconciliation, ReconciliationAttachment
 from app.models.voucher_audit_log import VoucherAuditLog
+from app.models.period_close_job import PeriodCloseJob, PeriodCloseJobItem
+from app.models.payment_status_history import PaymentStatusHistory
+from app.models.company_register import CompanyRegisterEntry
+from app.models.scheduled_job_run import ScheduledJobRun
 
 __all__ = [
     "Tenant",
@@ -88,4 +92,9 @@ __all__ = [
     "Reconciliation",
     "ReconciliationAttachment",
     "VoucherAuditLog",
+    "PeriodCloseJob",
+    "PeriodCloseJobItem",
+    "PaymentStatusHistory",
+    "CompanyRegisterEntry",
+    "ScheduledJobRun",
 ]
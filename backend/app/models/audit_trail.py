@@ -2,10 +2,10 @@
 Audit Trail model - Fullstendig revisjonslogg (immutable)
 """
 from sqlalchemy import (
-    Column, String, DateTime, ForeignKey, Text, JSON
+    Column, String, DateTime, ForeignKey, Text, JSON, Computed, Index, DDL, event
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import uuid
 
@@ -25,10 +25,14 @@ class AuditTrail(Base):
     - When it was changed
     - Why it was changed
     - Old and new values
+    
+    Range-partitioned by month on timestamp (audit_trail_p<yyyy>_<mm> plus
+    a default partition); closed fiscal years are archived and detached by
+    app/services/audit_archive.py.
     """
     __tablename__ = "audit_trail"
     
-    # Primary Key
+    # Primary Key (table key is (id, timestamp); the ORM identity is id)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Multi-tenant
@@ -60,12 +64,39 @@ class AuditTrail(Base):
     ip_address = Column(String(45), nullable=True)  # IPv4 or IPv6
     user_agent = Column(String(500), nullable=True)  # Browser/client info
     
-    # Timestamp (immutable!)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Timestamp (immutable!) - partition key
+    timestamp = Column(DateTime, default=datetime.utcnow, primary_key=True, index=True)
+    
+    # Full-text search (app/services/search.py)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple'::regconfig, coalesce(table_name, '') || ' ' || coalesce(action, '') "
+            "|| ' ' || coalesce(changed_by_name, '') || ' ' || coalesce(reason, ''))",
+            persisted=True
+        )
+    ))
     
     # Relationships
     client = relationship("Client")
     
+    __table_args__ = (
+        Index('ix_audit_trail_search', 'search_vector', postgresql_using='gin'),
+        Index(
+            'ix_audit_trail_changed_by_name_trgm', 'changed_by_name',
+            postgresql_using='gin', postgresql_ops={'changed_by_name': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_audit_trail_reason_trgm', 'reason',
+            postgresql_using='gin', postgresql_ops={'reason': 'gin_trgm_ops'},
+        ),
+        # Keyset pagination: newest first per client
+        Index('ix_audit_trail_client_timestamp_id', 'client_id', 'timestamp', 'id'),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
+    )
+    
+    __mapper_args__ = {"primary_key": [id]}
+    
     def __repr__(self):
         return (
             f"<AuditTrail(id={self.id}, table={self.table_name}, "
@@ -85,3 +116,14 @@ class AuditTrail(Base):
             "reason": self.reason,
             "timestamp": self.timestamp.isoformat(),
         }
+
+
+# Monthly partitions are created by migration 20260215_1400 and
+# ensure_audit_partitions(); this mirrors the default partition for
+# metadata.create_all() (tests, init_db)
+event.listen(
+    AuditTrail.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS audit_trail_default PARTITION OF audit_trail DEFAULT")
+    .execute_if(dialect="postgresql"),
+)
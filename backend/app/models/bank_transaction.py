@@ -2,7 +2,8 @@
 Bank Transaction model - Bank transactions for reconciliation
 """
 from sqlalchemy import (
-    Column, String, Numeric, DateTime, Boolean, ForeignKey, Enum as SQLEnum, Text
+    Column, String, Numeric, DateTime, Boolean, ForeignKey, Enum as SQLEnum, Text,
+    Index, text
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -137,6 +138,16 @@ class BankTransaction(Base):
         foreign_keys=[manually_matched_invoice_id]
     )
     
+    __table_args__ = (
+        Index('ix_bank_transactions_client_status_date', 'client_id', 'status', 'transaction_date'),
+        # Unmatched transactions awaiting reconciliation
+        Index(
+            'ix_bank_transactions_unmatched_client_date',
+            'client_id', 'transaction_date',
+            postgresql_where=text("status = 'UNMATCHED'"),
+        ),
+    )
+    
     def __repr__(self):
         return f"<BankTransaction(id={self.id}, date={self.transaction_date}, amount={self.amount}, status={self.status})>"
     
@@ -0,0 +1,55 @@
+"""
+Company Register model - Local mirror of Enhetsregisteret (Brønnøysundregistrene)
+
+One row per registered entity, loaded from the bulk dataset by
+scripts/import_company_register.py. Org number lookups use the primary
+key; name search uses the pg_trgm index (substrings) and the
+lower(name) text_pattern_ops index (prefixes shorter than a trigram).
+"""
+from sqlalchemy import Column, String, DateTime, Date, Integer, Index, func
+from datetime import datetime
+
+from app.database import Base
+
+
+class CompanyRegisterEntry(Base):
+    """
+    Company Register Entry = Enhet i Enhetsregisteret
+    """
+    __tablename__ = "company_register"
+
+    org_number = Column(String(9), primary_key=True)  # Organisasjonsnummer
+    name = Column(String(500), nullable=False)
+
+    organizational_form = Column(String(10), nullable=True)  # 'AS', 'ENK', ...
+    organizational_form_desc = Column(String(255), nullable=True)
+
+    # Business address, postal address when there is none
+    address = Column(String(500), nullable=True)
+    postal_code = Column(String(10), nullable=True)
+    city = Column(String(100), nullable=True)
+    municipality = Column(String(100), nullable=True)
+    municipality_number = Column(String(10), nullable=True)
+
+    nace_code = Column(String(10), nullable=True)
+    nace_description = Column(String(255), nullable=True)
+
+    registration_date = Column(Date, nullable=True)
+    employees = Column(Integer, nullable=True)
+
+    # Set by every import; rows an import did not touch are no longer registered
+    imported_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index(
+            'ix_company_register_name_trgm', 'name',
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_company_register_name_prefix', func.lower(name).label('name_lower'),
+            postgresql_ops={'name_lower': 'text_pattern_ops'},
+        ),
+    )
+
+    def __repr__(self):
+        return f"<CompanyRegisterEntry(org_number={self.org_number}, name='{self.name}')>"
@@ -2,7 +2,7 @@
 Customer Invoice model - Outgoing invoices (sales invoices)
 """
 from sqlalchemy import (
-    Column, String, Numeric, Date, DateTime, Boolean, ForeignKey, Text, JSON, Enum as SQLEnum
+    Column, String, Numeric, Date, DateTime, Boolean, ForeignKey, Text, JSON, Enum as SQLEnum, Index, text
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -95,6 +95,14 @@ class CustomerInvoice(Base):
     client = relationship("Client", back_populates="customer_invoices")
     ledger_entry = relationship("GeneralLedger")
     
+    __table_args__ = (
+        # Overdue detection across all clients
+        Index(
+            'ix_customer_invoices_open_due_date', 'due_date',
+            postgresql_where=text("payment_status IN ('unpaid', 'partially_paid')"),
+        ),
+    )
+    
     def __repr__(self):
         return f"<CustomerInvoice(id={self.id}, number='{self.invoice_number}', total={self.total_amount})>"
     
@@ -2,7 +2,7 @@
 Document model - PDF/XML lagring i S3
 """
 from sqlalchemy import (
-    Column, String, Integer, DateTime, ForeignKey, Boolean, BigInteger
+    Column, String, Integer, DateTime, ForeignKey, Boolean, BigInteger, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -16,7 +16,8 @@ class Document(Base):
     """
     Document = PDF/XML/file storage metadata
     
-    Actual files are stored in AWS S3, this table tracks metadata
+    Actual files are stored through app.services.storage (AWS S3 or the
+    local filesystem, s3_bucket = "local"); this table tracks metadata
     """
     __tablename__ = "documents"
     
@@ -40,7 +41,7 @@ class Document(Base):
     filename = Column(String(255), nullable=False)
     mime_type = Column(String(100), nullable=False)  # application/pdf etc
     file_size = Column(BigInteger, nullable=False)  # Bytes
-    file_hash = Column(String(64), nullable=True, index=True)  # SHA-256 hash for deduplication
+    file_hash = Column(String(64), nullable=True)  # SHA-256 hash for deduplication
     
     # Document Type
     document_type = Column(String(50), nullable=False)  # invoice_pdf/ehf_xml/receipt etc
@@ -62,6 +63,15 @@ class Document(Base):
     # Relationships
     client = relationship("Client")
     
+    __table_args__ = (
+        # One stored copy per client and content hash
+        Index(
+            'uq_documents_client_file_hash', 'client_id', 'file_hash',
+            unique=True,
+            postgresql_where=file_hash.isnot(None),
+        ),
+    )
+    
     def __repr__(self):
         return f"<Document(id={self.id}, filename='{self.filename}', type={self.document_type})>"
     
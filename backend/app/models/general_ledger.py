@@ -3,10 +3,12 @@ General Ledger models - Hovedbok (immutable journal entries)
 """
 from sqlalchemy import (
     Column, String, Integer, DateTime, ForeignKey, Boolean,
-    Text, Date, Numeric, UniqueConstraint, CheckConstraint
+    Text, Date, Numeric, UniqueConstraint, CheckConstraint, Index,
+    Computed, DDL, event, inspect, select
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import deferred, object_session, relationship
+from sqlalchemy.orm.base import NO_VALUE
 from datetime import datetime, date
 from decimal import Decimal
 import uuid
@@ -91,6 +93,16 @@ class GeneralLedger(Base):
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Full-text search (app/services/search.py)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple'::regconfig, coalesce(voucher_series, '') || ' ' || voucher_number "
+            "|| ' ' || description || ' ' || source_type)",
+            persisted=True
+        )
+    ))
+
     # Relationships
     client = relationship("Client", back_populates="general_ledger_entries")
     voucher_series_rel = relationship("VoucherSeries", back_populates="journal_entries")
@@ -107,6 +119,22 @@ class GeneralLedger(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint('client_id', 'voucher_series', 'voucher_number', name='uq_client_voucher'),
+        # Reports and dashboards: posted entries per client in a date range
+        Index(
+            'ix_general_ledger_client_status_date',
+            'client_id', 'status', 'accounting_date',
+            postgresql_include=['id', 'source_type'],
+        ),
+        # Search (app/services/search.py)
+        Index('ix_general_ledger_search', 'search_vector', postgresql_using='gin'),
+        Index(
+            'ix_general_ledger_voucher_number_trgm', 'voucher_number',
+            postgresql_using='gin', postgresql_ops={'voucher_number': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_general_ledger_description_trgm', 'description',
+            postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'},
+        ),
     )
     
     def __repr__(self):
@@ -140,10 +168,15 @@ class GeneralLedgerLine(Base):
     
     Each line represents one account movement.
     Multiple lines make up a complete journal entry.
+    
+    Range-partitioned by fiscal_year (general_ledger_lines_y<year> plus a
+    default partition). client_id, accounting_date, fiscal_year and status
+    are copied from the parent entry so reports can filter and prune
+    partitions without joining general_ledger.
     """
     __tablename__ = "general_ledger_lines"
     
-    # Primary Key
+    # Primary Key (table key is (id, fiscal_year); the ORM identity is id)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Parent Entry
@@ -156,6 +189,13 @@ class GeneralLedgerLine(Base):
     
     line_number = Column(Integer, nullable=False)  # Sequence within voucher
     
+    # Denormalized from the parent entry: set on insert by set_line_entry_fields,
+    # updated by the trg_general_ledger_sync_lines trigger
+    client_id = Column(UUID(as_uuid=True), nullable=False)
+    accounting_date = Column(Date, nullable=False)
+    fiscal_year = Column(Integer, primary_key=True)  # Partition key
+    status = Column(String(20), nullable=False)
+    
     # Accounting
     account_number = Column(String(10), nullable=False, index=True)
     debit_amount = Column(Numeric(15, 2), default=Decimal("0.00"), nullable=False)
@@ -193,7 +233,19 @@ class GeneralLedgerLine(Base):
     
     # Constraints
     __table_args__ = (
-        UniqueConstraint('general_ledger_id', 'line_number', name='uq_gl_line_number'),
+        UniqueConstraint('general_ledger_id', 'line_number', 'fiscal_year', name='uq_gl_line_number'),
+        # Covering index: report sums via index-only scans within a partition
+        Index(
+            'ix_gl_lines_client_status_date_account',
+            'client_id', 'status', 'accounting_date', 'account_number',
+            postgresql_include=['debit_amount', 'credit_amount'],
+        ),
+        # Covering index: joins from entries to their lines per account
+        Index(
+            'ix_gl_lines_entry_account_amounts',
+            'general_ledger_id', 'account_number',
+            postgresql_include=['debit_amount', 'credit_amount'],
+        ),
         CheckConstraint(
             'debit_amount >= 0 AND credit_amount >= 0',
             name='check_amounts_positive'
@@ -202,8 +254,11 @@ class GeneralLedgerLine(Base):
             '(debit_amount > 0 AND credit_amount = 0) OR (credit_amount > 0 AND debit_amount = 0)',
             name='check_debit_or_credit'
         ),
+        {'postgresql_partition_by': 'RANGE (fiscal_year)'},
     )
     
+    __mapper_args__ = {"primary_key": [id]}
+    
     def __repr__(self):
         return (
             f"<GeneralLedgerLine(id={self.id}, account={self.account_number}, "
@@ -224,3 +279,77 @@ class GeneralLedgerLine(Base):
             "line_description": self.line_description,
             "ai_confidence_score": self.ai_confidence_score,
         }
+
+
+ENTRY_FIELDS = ("client_id", "accounting_date", "fiscal_year", "status")
+
+
+@event.listens_for(GeneralLedgerLine, "before_insert")
+def set_line_entry_fields(mapper, connection, target):
+    """Copy client_id/accounting_date/fiscal_year/status from the parent entry"""
+    entry = inspect(target).attrs.general_ledger_entry.loaded_value
+    if entry is NO_VALUE or entry is None:
+        session = object_session(target)
+        key = inspect(GeneralLedger).identity_key_from_primary_key([target.general_ledger_id])
+        entry = session.identity_map.get(key) if session is not None else None
+    
+    if entry is None:
+        table = GeneralLedger.__table__
+        entry = connection.execute(
+            select(*(table.c[field] for field in ENTRY_FIELDS))
+            .where(table.c.id == target.general_ledger_id)
+        ).one()
+    
+    for field in ENTRY_FIELDS:
+        setattr(target, field, getattr(entry, field))
+
+
+# Partitions and the sync trigger are created by migration 20260215_1100;
+# these mirror it for metadata.create_all() (tests, init_db)
+event.listen(
+    GeneralLedgerLine.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS general_ledger_lines_default "
+        "PARTITION OF general_ledger_lines DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
+
+SYNC_LINES_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_general_ledger_lines() RETURNS trigger AS $$
+BEGIN
+    UPDATE general_ledger_lines
+    SET client_id = NEW.client_id,
+        accounting_date = NEW.accounting_date,
+        fiscal_year = NEW.fiscal_year,
+        status = NEW.status
+    WHERE general_ledger_id = NEW.id
+      AND fiscal_year = OLD.fiscal_year;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SYNC_LINES_TRIGGER = """
+CREATE TRIGGER trg_general_ledger_sync_lines
+AFTER UPDATE OF client_id, accounting_date, fiscal_year, status ON general_ledger
+FOR EACH ROW
+WHEN (
+    OLD.client_id IS DISTINCT FROM NEW.client_id
+    OR OLD.accounting_date IS DISTINCT FROM NEW.accounting_date
+    OR OLD.fiscal_year IS DISTINCT FROM NEW.fiscal_year
+    OR OLD.status IS DISTINCT FROM NEW.status
+)
+EXECUTE FUNCTION sync_general_ledger_lines()
+"""
+
+event.listen(
+    GeneralLedgerLine.__table__,
+    "after_create",
+    DDL(SYNC_LINES_FUNCTION).execute_if(dialect="postgresql"),
+)
+event.listen(
+    GeneralLedgerLine.__table__,
+    "after_create",
+    DDL(SYNC_LINES_TRIGGER).execute_if(dialect="postgresql"),
+)
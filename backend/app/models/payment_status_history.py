@@ -0,0 +1,67 @@
+"""
+Payment Status History model - Audit trail of invoice payment status changes
+
+One row per status transition of a vendor or customer invoice (payment
+registered, marked paid manually, detected overdue), so the status of an
+invoice on any date can be shown to the auditor.
+"""
+from sqlalchemy import (
+    Column, String, DateTime, ForeignKey, Numeric, Index
+)
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+
+from app.database import Base
+
+
+class PaymentStatusHistory(Base):
+    """
+    Payment Status History = Betalingsstatus-historikk per faktura
+    """
+    __tablename__ = "payment_status_history"
+
+    # Primary Key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    client_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("clients.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    invoice_type = Column(String(20), nullable=False)  # 'vendor', 'customer'
+    invoice_id = Column(UUID(as_uuid=True), nullable=False)  # vendor_invoices.id / customer_invoices.id
+
+    from_status = Column(String(20), nullable=True)
+    to_status = Column(String(20), nullable=False)
+    paid_amount = Column(Numeric(15, 2), nullable=True)  # Paid amount after the change
+
+    reason = Column(String(50), nullable=False)  # 'payment', 'manual', 'overdue_detection'
+
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('ix_payment_status_history_invoice', 'invoice_type', 'invoice_id'),
+    )
+
+    def __repr__(self):
+        return (
+            f"<PaymentStatusHistory(invoice={self.invoice_type}:{self.invoice_id}, "
+            f"{self.from_status} -> {self.to_status})>"
+        )
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "id": str(self.id),
+            "client_id": str(self.client_id),
+            "invoice_type": self.invoice_type,
+            "invoice_id": str(self.invoice_id),
+            "from_status": self.from_status,
+            "to_status": self.to_status,
+            "paid_amount": float(self.paid_amount) if self.paid_amount is not None else None,
+            "reason": self.reason,
+            "changed_at": self.changed_at.isoformat(),
+        }
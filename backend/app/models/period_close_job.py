@@ -0,0 +1,131 @@
+"""
+Period Close Job models - Tenant-wide month-end close runs
+
+A job closes one period for many clients. Each client is an item whose
+status, per-step timings and result are stored as it finishes, so an
+interrupted job can be resumed and only the unfinished clients run again.
+"""
+from sqlalchemy import (
+    Column, String, Integer, DateTime, ForeignKey, Text, JSON, UniqueConstraint, Index
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+
+from app.database import Base
+
+
+class PeriodCloseJob(Base):
+    """
+    Period Close Job = Månedsavslutning for alle klienter i et regnskapsbyrå
+    """
+    __tablename__ = "period_close_jobs"
+
+    # Primary Key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    tenant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    period = Column(String(7), nullable=False)  # YYYY-MM
+
+    status = Column(String(20), nullable=False, default="pending")
+    # 'pending', 'running', 'completed', 'completed_with_errors', 'failed'
+
+    concurrency = Column(Integer, nullable=False, default=8)  # Clients closed in parallel
+    total_clients = Column(Integer, nullable=False, default=0)
+    timings = Column(JSON, nullable=True)  # Set-based steps over all clients, milliseconds
+    error_message = Column(Text, nullable=True)  # Job-level failure (not per client)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    items = relationship("PeriodCloseJobItem", back_populates="job", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<PeriodCloseJob(id={self.id}, period={self.period}, status={self.status})>"
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "id": str(self.id),
+            "tenant_id": str(self.tenant_id),
+            "period": self.period,
+            "status": self.status,
+            "concurrency": self.concurrency,
+            "total_clients": self.total_clients,
+            "timings": self.timings,
+            "error_message": self.error_message,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class PeriodCloseJobItem(Base):
+    """
+    One client's close within a PeriodCloseJob
+    """
+    __tablename__ = "period_close_job_items"
+
+    # Primary Key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    job_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("period_close_jobs.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    client_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("clients.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    status = Column(String(20), nullable=False, default="pending")
+    # 'pending', 'running', 'succeeded', 'failed', 'skipped' (already closed)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    timings = Column(JSON, nullable=True)  # step -> milliseconds
+    result = Column(JSON, nullable=True)  # PeriodCloseService.run_period_close() output
+    error_message = Column(Text, nullable=True)
+
+    # Timestamps
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    job = relationship("PeriodCloseJob", back_populates="items")
+
+    __table_args__ = (
+        UniqueConstraint('job_id', 'client_id', name='uq_period_close_job_items_job_client'),
+        Index('ix_period_close_job_items_job_status', 'job_id', 'status'),
+    )
+
+    def __repr__(self):
+        return (
+            f"<PeriodCloseJobItem(job={self.job_id}, client={self.client_id}, "
+            f"status={self.status})>"
+        )
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "id": str(self.id),
+            "job_id": str(self.job_id),
+            "client_id": str(self.client_id),
+            "status": self.status,
+            "attempts": self.attempts,
+            "timings": self.timings,
+            "result": self.result,
+            "error_message": self.error_message,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -3,7 +3,7 @@ Review Queue model - Køsystem for menneskelig review
 """
 from sqlalchemy import (
     Column, String, Integer, DateTime, ForeignKey, Boolean,
-    Text, JSON, Enum as SQLEnum
+    Text, JSON, Enum as SQLEnum, Index, text
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -127,6 +127,16 @@ class ReviewQueue(Base):
         cascade="all, delete-orphan"
     )
     
+    __table_args__ = (
+        Index('ix_review_queue_client_status_created', 'client_id', 'status', 'created_at'),
+        # Pending work lists (enum labels are stored as member names)
+        Index(
+            'ix_review_queue_pending_client_created',
+            'client_id', 'created_at',
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
+    
     def __repr__(self):
         return (
             f"<ReviewQueue(id={self.id}, priority={self.priority.value}, "
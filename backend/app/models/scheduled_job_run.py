@@ -0,0 +1,27 @@
+"""
+Scheduled Job Run model - One claimed run of a scheduled job
+
+Every app instance fires the same scheduled jobs; the instance that
+inserts the (job_name, scheduled_date) row runs the job and the others
+skip it (app/tasks/leader_lock.py).
+"""
+from sqlalchemy import Column, String, DateTime, Date
+from datetime import datetime
+
+from app.database import Base
+
+
+class ScheduledJobRun(Base):
+    """
+    Scheduled Job Run = claim of one daily run of a scheduled job
+    """
+    __tablename__ = "scheduled_job_runs"
+
+    job_name = Column(String(100), primary_key=True)
+    scheduled_date = Column(Date, primary_key=True)
+
+    claimed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    claimed_by = Column(String(255), nullable=False)  # host:pid of the instance running the job
+
+    def __repr__(self):
+        return f"<ScheduledJobRun(job_name={self.job_name}, scheduled_date={self.scheduled_date})>"
@@ -2,7 +2,7 @@
 Task Audit Log model - Sporbarhet for oppgaveadministrasjon
 """
 from sqlalchemy import (
-    Column, String, DateTime, ForeignKey, Text, Enum as SQLEnum
+    Column, String, DateTime, ForeignKey, Text, Enum as SQLEnum, DDL, event
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -34,10 +34,12 @@ class TaskAuditLog(Base):
     
     Full sporbarhet - hver endring på oppgaver logges.
     Kan IKKE endres eller slettes.
+    
+    Range-partitioned by month on created_at, like audit_trail.
     """
     __tablename__ = "task_audit_log"
     
-    # Primary Key
+    # Primary Key (table key is (id, created_at); the ORM identity is id)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Task Reference
@@ -58,12 +60,18 @@ class TaskAuditLog(Base):
     result_description = Column(Text, nullable=True)
     documentation_reference = Column(Text, nullable=True)  # URL to PDF, report, etc.
     
-    # Timestamp
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Timestamp - partition key
+    created_at = Column(DateTime, default=datetime.utcnow, primary_key=True)
     
     # Relationships
     task = relationship("Task", back_populates="audit_logs")
     
+    __table_args__ = (
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+    
+    __mapper_args__ = {"primary_key": [id]}
+    
     def __repr__(self):
         return (
             f"<TaskAuditLog(id={self.id}, action={self.action.value}, "
@@ -83,3 +91,11 @@ class TaskAuditLog(Base):
             "documentation_reference": self.documentation_reference,
             "created_at": self.created_at.isoformat(),
         }
+
+
+event.listen(
+    TaskAuditLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS task_audit_log_default PARTITION OF task_audit_log DEFAULT")
+    .execute_if(dialect="postgresql"),
+)
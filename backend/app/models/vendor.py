@@ -3,7 +3,7 @@ Vendor model - Leverandører
 """
 from sqlalchemy import (
     Column, String, Boolean, DateTime, JSON, ForeignKey,
-    UniqueConstraint, Numeric
+    UniqueConstraint, Numeric, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -78,6 +78,11 @@ class Vendor(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint('client_id', 'vendor_number', name='uq_client_vendor_number'),
+        # Partial name search (app/services/search.py)
+        Index(
+            'ix_vendors_name_trgm', 'name',
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+        ),
     )
     
     def __repr__(self):
@@ -3,10 +3,10 @@ Vendor Invoice model - Leverandørfakturaer
 """
 from sqlalchemy import (
     Column, String, DateTime, ForeignKey, Numeric, Boolean,
-    Text, JSON, Date, Integer
+    Text, JSON, Date, Integer, Computed, Index, text
 )
-from sqlalchemy.dialects.postgresql import UUID, ARRAY, ENUM
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, ENUM, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime, date
 from decimal import Decimal
 import uuid
@@ -110,6 +110,16 @@ class VendorInvoice(Base):
         nullable=False
     )
     
+    # Full-text search (app/services/search.py)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple'::regconfig, invoice_number || ' ' || coalesce(ai_detected_category, '') "
+            "|| ' ' || coalesce(ehf_message_id, ''))",
+            persisted=True
+        )
+    ))
+    
     # Relationships
     client = relationship("Client", back_populates="vendor_invoices")
     vendor = relationship("Vendor", back_populates="invoices")
@@ -118,6 +128,19 @@ class VendorInvoice(Base):
     ai_matched_transactions = relationship("BankTransaction", foreign_keys="[BankTransaction.ai_matched_invoice_id]", back_populates="ai_matched_invoice")
     accruals = relationship("Accrual", back_populates="source_invoice")
     
+    __table_args__ = (
+        Index('ix_vendor_invoices_search', 'search_vector', postgresql_using='gin'),
+        Index(
+            'ix_vendor_invoices_invoice_number_trgm', 'invoice_number',
+            postgresql_using='gin', postgresql_ops={'invoice_number': 'gin_trgm_ops'},
+        ),
+        # Overdue detection across all clients
+        Index(
+            'ix_vendor_invoices_open_due_date', 'due_date',
+            postgresql_where=text("payment_status IN ('unpaid', 'partially_paid')"),
+        ),
+    )
+    
     def __repr__(self):
         return (
             f"<VendorInvoice(id={self.id}, invoice_number='{self.invoice_number}', "
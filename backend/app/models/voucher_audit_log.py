@@ -3,7 +3,7 @@ VoucherAuditLog model - Comprehensive audit trail for all voucher actions
 """
 from sqlalchemy import (
     Column, String, Float, DateTime, ForeignKey, JSON,
-    Enum as SQLEnum, Index
+    Enum as SQLEnum, Index, DDL, event
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -47,10 +47,12 @@ class VoucherAuditLog(Base):
     Tracks every action across all modules (supplier invoices, other vouchers,
     bank reconciliations, balance reconciliations) to provide full transparency
     and control overview.
+    
+    Range-partitioned by month on timestamp, like audit_trail.
     """
     __tablename__ = "voucher_audit_log"
     
-    # Primary Key
+    # Primary Key (table key is (id, timestamp); the ORM identity is id)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Voucher Reference
@@ -84,11 +86,11 @@ class VoucherAuditLog(Base):
     # AI Confidence (for AI actions)
     ai_confidence = Column(Float, nullable=True)
     
-    # Timestamp
+    # Timestamp - partition key
     timestamp = Column(
         DateTime,
         default=datetime.utcnow,
-        nullable=False,
+        primary_key=True,
         index=True
     )
     
@@ -103,8 +105,11 @@ class VoucherAuditLog(Base):
         Index('ix_voucher_audit_log_voucher_lookup', 'voucher_id', 'voucher_type'),
         Index('ix_voucher_audit_log_timeline', 'voucher_id', 'timestamp'),
         Index('ix_voucher_audit_log_action_time', 'action', 'timestamp'),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
     )
     
+    __mapper_args__ = {"primary_key": [id]}
+    
     def __repr__(self):
         return (
             f"<VoucherAuditLog(id={self.id}, voucher_id={self.voucher_id}, "
@@ -124,3 +129,11 @@ class VoucherAuditLog(Base):
             "timestamp": self.timestamp.isoformat(),
             "details": self.details,
         }
+
+
+event.listen(
+    VoucherAuditLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS voucher_audit_log_default PARTITION OF voucher_audit_log DEFAULT")
+    .execute_if(dialect="postgresql"),
+)
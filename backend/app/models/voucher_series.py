@@ -1,7 +1,7 @@
 """
 Voucher Series model - Bilagsserier for nummerering av bilag
 """
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -21,6 +21,10 @@ class VoucherSeries(Base):
     - EF: EHF elektroniske fakturaer (electronic invoices)
     - BK: Banktransaksjoner (bank transactions)
     - MAN: Manuelle posteringer (manual entries)
+
+    Rows with fiscal_year set are the per-year number counters used by
+    VoucherNumberAllocator (app/services/voucher_numbering.py); rows
+    without a year describe the series.
     """
     __tablename__ = "voucher_series"
 
@@ -39,7 +43,8 @@ class VoucherSeries(Base):
     code = Column(String(10), nullable=False)  # "EF", "BK", "MAN"
     name = Column(String(100), nullable=False)  # Human-readable name
 
-    # Sequential numbering
+    # Sequential numbering (per fiscal year for counter rows)
+    fiscal_year = Column(Integer, nullable=True)
     next_number = Column(Integer, default=1)
 
     # Status
@@ -54,7 +59,11 @@ class VoucherSeries(Base):
 
     # Constraints
     __table_args__ = (
-        UniqueConstraint('client_id', 'code', name='uq_voucher_series_client_code'),
+        Index(
+            'uq_voucher_series_client_code', 'client_id', 'code',
+            unique=True, postgresql_where=text('fiscal_year IS NULL'),
+        ),
+        Index('uq_voucher_series_client_code_year', 'client_id', 'code', 'fiscal_year', unique=True),
     )
 
     def __repr__(self):
@@ -67,6 +76,7 @@ class VoucherSeries(Base):
             "client_id": str(self.client_id),
             "code": self.code,
             "name": self.name,
+            "fiscal_year": self.fiscal_year,
             "next_number": self.next_number,
             "is_active": self.is_active,
             "created_at": self.created_at.isoformat() if self.created_at else None,
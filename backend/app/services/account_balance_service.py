@@ -16,6 +16,13 @@ from decimal import Decimal
 
 from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
 from app.models.chart_of_accounts import Account
+from app.services.ledger_lines import FISCAL_YEAR_SLACK
+
+# period (YYYY-MM) is only stored on the entry
+PERIOD_FILTER = (
+    " AND EXISTS (SELECT 1 FROM general_ledger gl"
+    " WHERE gl.id = gll.general_ledger_id AND gl.period = :period)"
+)
 
 
 class AccountBalanceService:
@@ -75,9 +82,9 @@ class AccountBalanceService:
             gll.debit_amount - gll.credit_amount as net_amount
         FROM general_ledger_lines gll
         JOIN general_ledger gl ON gll.general_ledger_id = gl.id
-        WHERE gl.client_id = :client_id
+        WHERE gll.client_id = :client_id
           AND gll.account_number = :account_number
-          AND gl.status = 'posted'
+          AND gll.status = 'posted'
         """
         
         params = {
@@ -86,13 +93,16 @@ class AccountBalanceService:
         }
         
         # Add date filters
+        # fiscal_year bounds let PostgreSQL prune line partitions
         if from_date:
-            query += " AND gl.accounting_date >= :from_date"
+            query += " AND gll.accounting_date >= :from_date AND gll.fiscal_year >= :from_year"
             params["from_date"] = from_date
+            params["from_year"] = from_date.year - FISCAL_YEAR_SLACK
         
         if to_date:
-            query += " AND gl.accounting_date <= :to_date"
+            query += " AND gll.accounting_date <= :to_date AND gll.fiscal_year <= :to_year"
             params["to_date"] = to_date
+            params["to_year"] = to_date.year + FISCAL_YEAR_SLACK
         
         query += " ORDER BY gl.accounting_date DESC, gl.voucher_number DESC"
         query += f" LIMIT {limit}"
@@ -185,15 +195,14 @@ class AccountBalanceService:
             SUM(gll.credit_amount) as total_credit,
             SUM(gll.debit_amount - gll.credit_amount) as balance
         FROM general_ledger_lines gll
-        JOIN general_ledger gl ON gll.general_ledger_id = gl.id
-        WHERE gl.client_id = :client_id
-          AND gl.status = 'posted'
+        WHERE gll.client_id = :client_id
+          AND gll.status = 'posted'
         """
         
         params = {"client_id": str(client_id)}
         
         if period:
-            query += " AND gl.period = :period"
+            query += PERIOD_FILTER
             params["period"] = period
         
         query += " GROUP BY gll.account_number"
@@ -236,17 +245,16 @@ class AccountBalanceService:
         SELECT 
             SUM(gll.debit_amount) as total_debit,
             SUM(gll.credit_amount) as total_credit,
-            COUNT(DISTINCT gl.id) as entry_count
+            COUNT(DISTINCT gll.general_ledger_id) as entry_count
         FROM general_ledger_lines gll
-        JOIN general_ledger gl ON gll.general_ledger_id = gl.id
-        WHERE gl.client_id = :client_id
-          AND gl.status = 'posted'
+        WHERE gll.client_id = :client_id
+          AND gll.status = 'posted'
         """
         
         params = {"client_id": str(client_id)}
         
         if period:
-            query += " AND gl.period = :period"
+            query += PERIOD_FILTER
             params["period"] = period
         
         result = await db.execute(text(query), params)
@@ -0,0 +1,296 @@
+"""
+Accrual Batch Poster - Set-based posting of due accruals
+
+Posting accruals one at a time costs a posting select, an accrual select,
+a next-posting select and a commit per posting. The batch poster instead:
+
+1. Loads every due posting together with its accrual in one query (rows
+   are locked; postings another run already holds are skipped)
+2. Reserves voucher numbers in series P as one block per client and
+   fiscal year
+3. Builds the GL entries and lines as plain rows in memory
+4. Bulk-inserts entries and lines, marks the postings posted and advances
+   the accruals' next_posting_date in chunks, all in one transaction
+
+plan() on its own is the dry run: the full posting plan for a date range
+without writing anything.
+"""
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.accrual import Accrual
+from app.models.accrual_posting import AccrualPosting
+from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
+from app.services.voucher_numbering import VoucherNumberAllocator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+VOUCHER_SERIES = "P"  # P = Periodisering
+
+
+@dataclass
+class PlannedPosting:
+    """One accrual posting and the GL entry it will produce"""
+    posting_id: UUID
+    accrual_id: UUID
+    client_id: UUID
+    posting_date: date
+    period: str
+    amount: Decimal
+    result_account: str
+    balance_account: str
+    description: str
+    voucher_number: Optional[str] = None
+    general_ledger_id: Optional[UUID] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "posting_id": str(self.posting_id),
+            "accrual_id": str(self.accrual_id),
+            "client_id": str(self.client_id),
+            "posting_date": self.posting_date.isoformat(),
+            "period": self.period,
+            "amount": float(self.amount),
+            "debit_account": self.result_account,
+            "credit_account": self.balance_account,
+            "description": self.description,
+            "voucher_number": self.voucher_number,
+            "gl_entry_id": str(self.general_ledger_id) if self.general_ledger_id else None,
+        }
+
+
+def summarize_plan(planned: List[PlannedPosting]) -> Dict[str, Any]:
+    """Totals of a posting plan, overall and per client"""
+    by_client: Dict[UUID, Dict[str, Any]] = {}
+    for posting in planned:
+        totals = by_client.setdefault(posting.client_id, {"posting_count": 0, "total_amount": Decimal("0.00")})
+        totals["posting_count"] += 1
+        totals["total_amount"] += posting.amount
+    return {
+        "posting_count": len(planned),
+        "total_amount": float(sum((posting.amount for posting in planned), Decimal("0.00"))),
+        "by_client": {
+            str(client_id): {"posting_count": totals["posting_count"], "total_amount": float(totals["total_amount"])}
+            for client_id, totals in by_client.items()
+        },
+    }
+
+
+class AccrualBatchPoster:
+    """Post many accrual postings with a fixed number of statements"""
+
+    def __init__(self, db: AsyncSession, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.allocator = VoucherNumberAllocator(db)
+
+    async def plan(
+        self,
+        to_date: date,
+        from_date: Optional[date] = None,
+        client_id: Optional[UUID] = None,
+        posting_ids: Optional[List[UUID]] = None,
+        lock: bool = False
+    ) -> List[PlannedPosting]:
+        """
+        Pending postings dated up to to_date, with their accruals (one query)
+
+        Args:
+            to_date: Last posting date included
+            from_date: First posting date included (default: no lower bound)
+            client_id: Only this client's accruals
+            posting_ids: Only these postings
+            lock: Lock the posting rows (FOR UPDATE); batch runs skip rows
+                another transaction holds
+
+        Returns:
+            Planned postings in posting date order
+        """
+        # Plain columns: nothing enters the identity map, so the bulk
+        # statements in post() cannot leave stale objects behind
+        query = (
+            select(
+                AccrualPosting.id,
+                AccrualPosting.accrual_id,
+                Accrual.client_id,
+                AccrualPosting.posting_date,
+                AccrualPosting.period,
+                AccrualPosting.amount,
+                Accrual.result_account,
+                Accrual.balance_account,
+                Accrual.description,
+            )
+            .join(Accrual, Accrual.id == AccrualPosting.accrual_id)
+            .where(AccrualPosting.status == "pending", AccrualPosting.posting_date <= to_date)
+            .order_by(Accrual.client_id, AccrualPosting.posting_date, AccrualPosting.id)
+        )
+        if from_date is not None:
+            query = query.where(AccrualPosting.posting_date >= from_date)
+        if client_id is not None:
+            query = query.where(Accrual.client_id == client_id)
+        if posting_ids is not None:
+            query = query.where(AccrualPosting.id.in_(posting_ids))
+        if lock:
+            query = query.with_for_update(of=AccrualPosting, skip_locked=posting_ids is None)
+
+        result = await self.db.execute(query)
+        return [
+            PlannedPosting(
+                posting_id=row.id,
+                accrual_id=row.accrual_id,
+                client_id=row.client_id,
+                posting_date=row.posting_date,
+                period=row.period,
+                amount=row.amount,
+                result_account=row.result_account,
+                balance_account=row.balance_account,
+                description=row.description,
+            )
+            for row in result.all()
+        ]
+
+    async def post(
+        self,
+        to_date: date,
+        from_date: Optional[date] = None,
+        client_id: Optional[UUID] = None,
+        posting_ids: Optional[List[UUID]] = None,
+        posted_by: str = "ai_agent"
+    ) -> Dict[str, Any]:
+        """
+        Post every pending posting matching the filters (see plan()) and commit
+
+        Returns:
+            Dict with posted_count, total_amount, the posted postings and
+            errors for postings that cannot be posted (skipped)
+        """
+        planned = await self.plan(to_date, from_date, client_id, posting_ids, lock=True)
+
+        errors = []
+        valid = []
+        for posting in planned:
+            if posting.amount is None or posting.amount <= 0:
+                errors.append({"posting_id": str(posting.posting_id), "error": "Posting amount must be positive"})
+            else:
+                valid.append(posting)
+
+        if valid:
+            await self._assign_numbers(valid)
+            entries, lines, posted = self._build_rows(valid, posted_by)
+            for start in range(0, len(valid), self.chunk_size):
+                await self.db.execute(insert(GeneralLedger), entries[start:start + self.chunk_size])
+                await self.db.execute(update(AccrualPosting), posted[start:start + self.chunk_size])
+            for start in range(0, len(lines), self.chunk_size):
+                await self.db.execute(insert(GeneralLedgerLine), lines[start:start + self.chunk_size])
+            await self._advance_accruals({posting.accrual_id for posting in valid})
+        await self.db.commit()
+
+        logger.info(f"Posted {len(valid)} accrual postings up to {to_date} ({len(errors)} skipped)")
+        return {
+            **summarize_plan(valid),
+            "posted_count": len(valid),
+            "postings": [posting.to_dict() for posting in valid],
+            "errors": errors,
+        }
+
+    async def _assign_numbers(self, planned: List[PlannedPosting]) -> None:
+        """One voucher number block per (client, fiscal year), in posting date order"""
+        groups: Dict[Tuple[UUID, int], List[PlannedPosting]] = defaultdict(list)
+        for posting in planned:
+            groups[(posting.client_id, posting.posting_date.year)].append(posting)
+
+        for (client_id, fiscal_year), group in sorted(groups.items(), key=lambda g: (str(g[0][0]), g[0][1])):
+            block = await self.allocator.reserve(client_id, VOUCHER_SERIES, fiscal_year, len(group))
+            for posting in group:
+                posting.voucher_number = block.next()
+
+    def _build_rows(
+        self,
+        planned: List[PlannedPosting],
+        posted_by: str
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """GL entry rows, GL line rows (with the denormalized entry columns) and posting updates"""
+        today = date.today()
+        now = datetime.utcnow()
+        entries, lines, posted = [], [], []
+        for posting in planned:
+            entry_id = posting.general_ledger_id = uuid4()
+            entry_fields = {
+                "client_id": posting.client_id,
+                "accounting_date": posting.posting_date,
+                "fiscal_year": posting.posting_date.year,
+                "status": "posted",
+            }
+            entries.append({
+                **entry_fields,
+                "id": entry_id,
+                "entry_date": today,
+                "period": posting.period,
+                "voucher_number": posting.voucher_number,
+                "voucher_series": VOUCHER_SERIES,
+                "description": f"Periodisering: {posting.description}",
+                "source_type": "accrual",
+                "source_id": posting.accrual_id,
+                "created_by_type": posted_by,
+                "created_at": now,
+            })
+            # Debit: Result account (expense)
+            lines.append({
+                **entry_fields,
+                "id": uuid4(),
+                "general_ledger_id": entry_id,
+                "line_number": 1,
+                "account_number": posting.result_account,
+                "debit_amount": posting.amount,
+                "credit_amount": Decimal("0.00"),
+                "line_description": f"Periodisert kostnad: {posting.description}",
+                "created_at": now,
+            })
+            # Credit: Balance account (prepaid asset reduction or deferred liability)
+            lines.append({
+                **entry_fields,
+                "id": uuid4(),
+                "general_ledger_id": entry_id,
+                "line_number": 2,
+                "account_number": posting.balance_account,
+                "debit_amount": Decimal("0.00"),
+                "credit_amount": posting.amount,
+                "line_description": f"Nedskriving av forskudd: {posting.description}",
+                "created_at": now,
+            })
+            posted.append({
+                "id": posting.posting_id,
+                "status": "posted",
+                "posted_by": posted_by,
+                "posted_at": today,
+                "general_ledger_id": entry_id,
+            })
+        return entries, lines, posted
+
+    async def _advance_accruals(self, accrual_ids) -> None:
+        """Set next_posting_date to the earliest pending posting; complete accruals without one"""
+        accrual_ids = sorted(accrual_ids, key=str)
+        next_pending = (
+            select(func.min(AccrualPosting.posting_date))
+            .where(AccrualPosting.accrual_id == Accrual.id, AccrualPosting.status == "pending")
+            .scalar_subquery()
+        )
+        for start in range(0, len(accrual_ids), self.chunk_size):
+            await self.db.execute(
+                update(Accrual)
+                .where(Accrual.id.in_(accrual_ids[start:start + self.chunk_size]))
+                .values(
+                    next_posting_date=next_pending,
+                    status=case((next_pending.is_(None), "completed"), else_=Accrual.status),
+                )
+                .execution_options(synchronize_session=False)
+            )
@@ -9,14 +9,14 @@ from decimal import Decimal
 from typing import Dict, Any, Optional, List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, insert
 import uuid
 
 from app.models.accrual import Accrual
 from app.models.accrual_posting import AccrualPosting
-from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
 from app.models.vendor_invoice import VendorInvoice
 from app.models.client import Client
+from app.services.accrual_batch import AccrualBatchPoster
 from dateutil.relativedelta import relativedelta
 
 
@@ -152,22 +152,25 @@ class AccrualService:
             from_date, to_date, total_amount, frequency
         )
         
-        # Create posting records
-        for posting_data in schedule:
-            posting = AccrualPosting(
-                id=uuid.uuid4(),
-                accrual_id=accrual.id,
-                posting_date=posting_data["posting_date"],
-                amount=posting_data["amount"],
-                period=posting_data["period"],
-                status="pending"
-            )
-            db.add(posting)
-        
         # Set next posting date to first pending posting
         accrual.next_posting_date = schedule[0]["posting_date"]
         
         db.add(accrual)
+        await db.flush()
+        
+        # Create posting records (one bulk insert)
+        await db.execute(insert(AccrualPosting), [
+            {
+                "id": uuid.uuid4(),
+                "accrual_id": accrual.id,
+                "posting_date": posting_data["posting_date"],
+                "amount": posting_data["amount"],
+                "period": posting_data["period"],
+                "status": "pending"
+            }
+            for posting_data in schedule
+        ])
+        
         await db.commit()
         await db.refresh(accrual)
         
@@ -201,12 +204,11 @@ class AccrualService:
             Dict with posting details
         """
         
-        # Fetch posting with accrual
         result = await db.execute(
-            select(AccrualPosting)
+            select(AccrualPosting.status, AccrualPosting.posting_date)
             .where(AccrualPosting.id == posting_id)
         )
-        posting = result.scalar_one_or_none()
+        posting = result.one_or_none()
         
         if not posting:
             raise ValueError(f"AccrualPosting {posting_id} not found")
@@ -214,111 +216,43 @@ class AccrualService:
         if posting.status != "pending":
             raise ValueError(f"Posting {posting_id} is already {posting.status}")
         
-        # Fetch accrual
-        result = await db.execute(
-            select(Accrual)
-            .where(Accrual.id == posting.accrual_id)
-        )
-        accrual = result.scalar_one_or_none()
-        
-        if not accrual:
-            raise ValueError(f"Accrual {posting.accrual_id} not found")
-        
-        # Create GeneralLedger entry
-        voucher_number = f"PER-{posting.posting_date.strftime('%Y%m%d')}-{str(posting.id)[:8]}"
-        
-        gl_entry = GeneralLedger(
-            id=uuid.uuid4(),
-            client_id=accrual.client_id,
-            entry_date=date.today(),
-            accounting_date=posting.posting_date,
-            period=posting.period,
-            fiscal_year=posting.posting_date.year,
-            voucher_number=voucher_number,
-            voucher_series="P",  # P = Periodisering
-            description=f"Periodisering: {accrual.description}",
-            source_type="accrual",
-            source_id=accrual.id,
-            created_by_type=posted_by,
-            status="posted"
+        batch = await AccrualBatchPoster(db).post(
+            to_date=posting.posting_date,
+            posting_ids=[posting_id],
+            posted_by=posted_by
         )
+        if batch["errors"]:
+            raise ValueError(batch["errors"][0]["error"])
+        if not batch["postings"]:
+            raise ValueError(f"Posting {posting_id} was posted by another run")
         
-        # Create GL lines (balanced entry)
-        # Debit: Result account (expense)
-        debit_line = GeneralLedgerLine(
-            id=uuid.uuid4(),
-            general_ledger_id=gl_entry.id,
-            line_number=1,
-            account_number=accrual.result_account,
-            debit_amount=posting.amount,
-            credit_amount=Decimal("0.00"),
-            line_description=f"Periodisert kostnad: {accrual.description}"
-        )
-        
-        # Credit: Balance account (prepaid asset reduction or deferred liability)
-        credit_line = GeneralLedgerLine(
-            id=uuid.uuid4(),
-            general_ledger_id=gl_entry.id,
-            line_number=2,
-            account_number=accrual.balance_account,
-            debit_amount=Decimal("0.00"),
-            credit_amount=posting.amount,
-            line_description=f"Nedskriving av forskudd: {accrual.description}"
-        )
-        
-        db.add(gl_entry)
-        db.add(debit_line)
-        db.add(credit_line)
-        
-        # Update posting status
-        posting.status = "posted"
-        posting.posted_by = posted_by
-        posting.posted_at = date.today()
-        posting.general_ledger_id = gl_entry.id
-        
-        # Update accrual next_posting_date
-        result = await db.execute(
-            select(AccrualPosting)
-            .where(
-                and_(
-                    AccrualPosting.accrual_id == accrual.id,
-                    AccrualPosting.status == "pending"
-                )
-            )
-            .order_by(AccrualPosting.posting_date)
-        )
-        next_posting = result.scalars().first()
-        
-        if next_posting:
-            accrual.next_posting_date = next_posting.posting_date
-        else:
-            # All postings completed
-            accrual.status = "completed"
-            accrual.next_posting_date = None
-        
-        await db.commit()
-        
+        posted = batch["postings"][0]
         return {
             "success": True,
-            "posting_id": str(posting.id),
-            "gl_entry_id": str(gl_entry.id),
-            "voucher_number": voucher_number,
-            "amount": float(posting.amount),
-            "posting_date": posting.posting_date.isoformat(),
+            "posting_id": posted["posting_id"],
+            "gl_entry_id": posted["gl_entry_id"],
+            "voucher_number": posted["voucher_number"],
+            "amount": posted["amount"],
+            "posting_date": posted["posting_date"],
             "status": "posted"
         }
     
     async def auto_post_due_accruals(
         self,
         db: AsyncSession,
-        as_of_date: Optional[date] = None
+        as_of_date: Optional[date] = None,
+        client_id: Optional[UUID] = None
     ) -> Dict[str, Any]:
         """
         Auto-post all pending accruals due today or earlier.
         Called by cron job daily.
         
+        All due postings are posted in one transaction by AccrualBatchPoster;
+        postings that cannot be posted are reported in errors.
+        
         Args:
             as_of_date: Date to check (defaults to today)
+            client_id: Only this client's accruals (defaults to all clients)
         
         Returns:
             Dict with summary: posted_count, total_amount, errors
@@ -327,44 +261,14 @@ class AccrualService:
         if as_of_date is None:
             as_of_date = date.today()
         
-        # Find all pending postings due today or earlier
-        result = await db.execute(
-            select(AccrualPosting)
-            .where(
-                and_(
-                    AccrualPosting.status == "pending",
-                    AccrualPosting.posting_date <= as_of_date
-                )
-            )
-        )
-        due_postings = result.scalars().all()
-        
-        posted_count = 0
-        total_amount = Decimal("0.00")
-        errors = []
-        
-        for posting in due_postings:
-            try:
-                result_dict = await self.post_accrual(
-                    db,
-                    posting.id,
-                    posted_by="ai_agent"
-                )
-                if result_dict["success"]:
-                    posted_count += 1
-                    total_amount += Decimal(str(result_dict["amount"]))
-            except Exception as e:
-                errors.append({
-                    "posting_id": str(posting.id),
-                    "error": str(e)
-                })
+        batch = await AccrualBatchPoster(db).post(to_date=as_of_date, client_id=client_id)
         
         return {
             "success": True,
             "as_of_date": as_of_date.isoformat(),
-            "posted_count": posted_count,
-            "total_amount": float(total_amount),
-            "errors": errors
+            "posted_count": batch["posted_count"],
+            "total_amount": batch["total_amount"],
+            "errors": batch["errors"]
         }
     
     async def detect_accrual_from_invoice(
@@ -30,6 +30,7 @@ from typing import Dict, Any, List, Optional, Union
 from anthropic import Anthropic, AsyncAnthropic, APIError, APITimeoutError, RateLimitError
 from app.config import settings
 from app.utils.errors import AIServiceError, AITimeoutError
+from app.utils.metrics import LLM_REQUEST_DURATION, record_llm_usage, timed
 from app.utils.retry import retry_with_backoff, AI_RETRY_CONFIG
 
 logger = logging.getLogger(__name__)
@@ -91,13 +92,15 @@ class AIClient:
         
         try:
             if self.provider == "claude":
-                response = await self.async_client.messages.create(
-                    model=model,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    system=system or "You are a helpful assistant.",
-                    messages=messages
-                )
+                with timed(LLM_REQUEST_DURATION, model=model):
+                    response = await self.async_client.messages.create(
+                        model=model,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        system=system or "You are a helpful assistant.",
+                        messages=messages
+                    )
+                record_llm_usage(model, response.usage)
                 
                 # Extract text from Claude response
                 return response.content[0].text
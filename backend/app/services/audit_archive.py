@@ -0,0 +1,436 @@
+"""
+Audit archive - Monthly audit partitions and archival of closed fiscal years
+
+audit_trail, voucher_audit_log and task_audit_log are range-partitioned by
+month (<table>_p<yyyy>_<mm> plus a default partition). Once every client
+has closed a fiscal year, archive_year() exports that year's rows to
+gzip-compressed JSONL files with a SHA-256 manifest and detaches the
+year's partitions into the audit_archive schema, so the live tables (and
+autovacuum) only carry open years. The detached tables stay in the database
+until drop_archived_year() is run explicitly for a year whose archive files
+have been verified and copied to retention storage.
+
+Archived years stay readable through AuditArchive.load(); the audit trail
+API merges them in when the requested date range reaches an archived year.
+
+Layout of the archive directory:
+
+    <root>/<year>/manifest.json
+    <root>/<year>/<table>.jsonl.gz
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.config import settings
+from app.database import Base
+from app.models.audit_trail import AuditTrail
+from app.models.fiscal_year import FiscalYear
+from app.models.task_audit_log import TaskAuditLog
+from app.models.voucher_audit_log import VoucherAuditLog
+from app.utils.audit import _from_json, _json_default
+
+logger = logging.getLogger(__name__)
+
+# Partitioned audit models and their partition key
+AUDIT_TABLES: Dict[Type[Base], str] = {
+    AuditTrail: "timestamp",
+    VoucherAuditLog: "timestamp",
+    TaskAuditLog: "created_at",
+}
+
+MANIFEST = "manifest.json"
+ARCHIVE_SCHEMA = "audit_archive"
+EXPORT_BATCH_SIZE = 5000
+
+
+class AuditArchiveError(Exception):
+    """Archive missing, incomplete or failing its checksum"""
+    pass
+
+
+def partition_name(table_name: str, year: int, month: int) -> str:
+    return f"{table_name}_p{int(year)}_{int(month):02d}"
+
+
+def month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+    """[start, end) of a month partition"""
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+def next_month(year: int, month: int) -> Tuple[int, int]:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _exported_columns(table: Table) -> List:
+    """Stored columns; generated columns (search_vector) are recomputed"""
+    return [column for column in table.columns if column.computed is None]
+
+
+async def ensure_audit_partitions(
+    db: Union[AsyncSession, AsyncConnection],
+    months: Iterable[Tuple[int, int]]
+) -> List[str]:
+    """
+    Create missing monthly partitions of the audit tables
+
+    Rows for the month already in the default partition are moved into the
+    new partition before it is attached. Run inside a transaction; the
+    existence check is repeated under the exclusive lock on the default
+    partition, so workers starting at the same time do not race on
+    CREATE TABLE.
+
+    Args:
+        db: Session or connection
+        months: (year, month) pairs that need their own partition
+
+    Returns:
+        Names of the partitions created
+    """
+    async def exists(name: str) -> bool:
+        result = await db.execute(text("SELECT to_regclass(CAST(:name AS text))"), {"name": name})
+        return result.scalar() is not None
+
+    created = []
+    for model, key in AUDIT_TABLES.items():
+        table_name = model.__tablename__
+        missing = [
+            (year, month) for year, month in sorted(set(months))
+            if not await exists(partition_name(table_name, year, month))
+        ]
+        if not missing:
+            continue
+
+        # Generated columns (search_vector) are recomputed on insert
+        columns = ", ".join(f'"{column.name}"' for column in _exported_columns(model.__table__))
+        await db.execute(text(f"LOCK TABLE {table_name}_default IN ACCESS EXCLUSIVE MODE"))
+        for year, month in missing:
+            name = partition_name(table_name, year, month)
+            if await exists(name):
+                continue
+
+            start, end = month_bounds(year, month)
+            bounds = f"{key} >= '{start.isoformat()}' AND {key} < '{end.isoformat()}'"
+            await db.execute(text(
+                f"CREATE TABLE {name} (LIKE {table_name} "
+                f"INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS)"
+            ))
+            await db.execute(text(f"""
+                WITH moved AS (
+                    DELETE FROM {table_name}_default WHERE {bounds} RETURNING {columns}
+                )
+                INSERT INTO {name} ({columns}) SELECT {columns} FROM moved
+            """))
+            await db.execute(text(
+                f"ALTER TABLE {table_name} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            ))
+            created.append(name)
+            logger.info(f"Created audit partition {name}")
+    return created
+
+
+async def closed_years(db: AsyncSession, before: Optional[int] = None) -> List[int]:
+    """
+    Fiscal years closed by every client that has them
+
+    Args:
+        db: Database session
+        before: Only years before this one (default: the current year)
+
+    Returns:
+        Sorted list of years
+    """
+    before = before or date.today().year
+    result = await db.execute(
+        select(FiscalYear.year)
+        .where(FiscalYear.year < before)
+        .group_by(FiscalYear.year)
+        .having(func.bool_and(FiscalYear.is_closed))
+        .order_by(FiscalYear.year)
+    )
+    return list(result.scalars().all())
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AuditArchive:
+    """Read and write archived audit years under a local directory"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def year_dir(self, year: int) -> str:
+        return os.path.join(self.root, str(int(year)))
+
+    def years(self) -> List[int]:
+        """Archived years (directories with a manifest)"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            int(name) for name in os.listdir(self.root)
+            if name.isdigit() and os.path.exists(os.path.join(self.root, name, MANIFEST))
+        )
+
+    def years_between(self, start: Optional[date] = None, end: Optional[date] = None) -> List[int]:
+        """Archived years overlapping [start, end]"""
+        return [
+            year for year in self.years()
+            if (start is None or year >= start.year) and (end is None or year <= end.year)
+        ]
+
+    def manifest(self, year: int) -> Dict[str, Any]:
+        path = os.path.join(self.year_dir(year), MANIFEST)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError as e:
+            raise AuditArchiveError(f"Audit year {year} is not archived") from e
+
+    def iter_rows(self, table_name: str, year: int) -> Iterator[Dict[str, Any]]:
+        """
+        Rows of one archived table, after verifying the file checksum
+
+        Raises:
+            AuditArchiveError: Table not in the archive or checksum mismatch
+        """
+        entry = self.manifest(year)["tables"].get(table_name)
+        if entry is None:
+            raise AuditArchiveError(f"{table_name} is not in the {year} audit archive")
+        path = os.path.join(self.year_dir(year), entry["file"])
+        if _sha256(path) != entry["sha256"]:
+            raise AuditArchiveError(f"Checksum mismatch for {path}")
+
+        table = Base.metadata.tables[table_name]
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield _from_json(table, json.loads(line))
+
+    def load(
+        self,
+        model: Type[Base],
+        years: Iterable[int],
+        where: Optional[Callable[[Base], bool]] = None
+    ) -> List[Base]:
+        """
+        Archived rows as transient model instances (not added to a session)
+
+        Args:
+            model: Audit model
+            years: Archived years to read
+            where: Optional row filter
+
+        Returns:
+            Matching rows
+        """
+        rows = []
+        for year in years:
+            for values in self.iter_rows(model.__tablename__, year):
+                row = model(**values)
+                if where is None or where(row):
+                    rows.append(row)
+        return rows
+
+    async def _export_table(self, db: AsyncSession, model: Type[Base], year: int, directory: str) -> Dict[str, Any]:
+        table = model.__table__
+        key = table.c[AUDIT_TABLES[model]]
+        filename = f"{table.name}.jsonl.gz"
+        path = os.path.join(directory, filename)
+
+        rows = 0
+        result = await db.stream(
+            select(*_exported_columns(table))
+            .where(key >= datetime(year, 1, 1), key < datetime(year + 1, 1, 1))
+            .order_by(key, table.c.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            async for batch in result.mappings().partitions():
+                for row in batch:
+                    f.write(json.dumps(dict(row), default=_json_default) + "\n")
+                rows += len(batch)
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
+
+        # Re-read the file before the rows leave the live tables
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            written = sum(1 for _ in f)
+        if written != rows:
+            raise AuditArchiveError(f"{path}: wrote {written} of {rows} rows")
+
+        return {
+            "file": filename,
+            "rows": rows,
+            "sha256": _sha256(path),
+            "partitions": [partition_name(table.name, year, month) for month in range(1, 13)],
+        }
+
+    async def archive_year(self, db: AsyncSession, year: int) -> Dict[str, Any]:
+        """
+        Export a closed fiscal year of all audit tables, then detach its
+        partitions and move them to the audit_archive schema
+
+        Writers to the year's partitions are blocked while it runs. The
+        archive directory is moved into place right before the transaction
+        commits, so a crash in between leaves rows in both places (readers
+        skip archived years that still have live partitions), never in
+        neither.
+
+        Args:
+            db: Database session (committed on success)
+            year: Fiscal year to archive
+
+        Returns:
+            The archive manifest
+
+        Raises:
+            AuditArchiveError: Year already archived or export failed
+        """
+        year = int(year)
+        final_dir = self.year_dir(year)
+        if os.path.exists(os.path.join(final_dir, MANIFEST)):
+            raise AuditArchiveError(f"Audit year {year} is already archived")
+
+        # Rows that landed in the default partition move into the monthly ones
+        await ensure_audit_partitions(db, [(year, month) for month in range(1, 13)])
+        partitions = [
+            partition_name(model.__tablename__, year, month)
+            for model in AUDIT_TABLES for month in range(1, 13)
+        ]
+        await db.execute(text(f"LOCK TABLE {', '.join(partitions)} IN SHARE MODE"))
+
+        work_dir = final_dir + ".tmp"
+        shutil.rmtree(work_dir, ignore_errors=True)
+        os.makedirs(work_dir)
+        try:
+            manifest = {
+                "year": year,
+                "archived_at": datetime.utcnow().isoformat(),
+                "format": "jsonl.gz",
+                "tables": {},
+            }
+            for model in AUDIT_TABLES:
+                manifest["tables"][model.__tablename__] = await self._export_table(db, model, year, work_dir)
+            with open(os.path.join(work_dir, MANIFEST), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+
+            await db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+            for model in AUDIT_TABLES:
+                for partition in manifest["tables"][model.__tablename__]["partitions"]:
+                    await db.execute(text(f"ALTER TABLE {model.__tablename__} DETACH PARTITION {partition}"))
+                    await db.execute(text(f"ALTER TABLE {partition} SET SCHEMA {ARCHIVE_SCHEMA}"))
+
+            shutil.rmtree(final_dir, ignore_errors=True)
+            os.replace(work_dir, final_dir)
+        except BaseException:
+            await db.rollback()
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise
+
+        try:
+            await db.commit()
+        except BaseException:
+            shutil.rmtree(final_dir, ignore_errors=True)
+            raise
+        logger.info(
+            f"Archived audit year {year}: "
+            + ", ".join(f"{name}={entry['rows']}" for name, entry in manifest["tables"].items())
+        )
+        return manifest
+
+    async def drop_archived_year(self, db: AsyncSession, year: int) -> List[str]:
+        """
+        Drop the detached partitions archive_year() kept for a year
+
+        Irreversible: afterwards the archive files are the only copy of the
+        year's audit rows. Only run once they are verified and retained
+        elsewhere. The files are checked against the manifest first.
+
+        Args:
+            db: Database session (committed on success)
+            year: Archived fiscal year
+
+        Returns:
+            The dropped tables
+
+        Raises:
+            AuditArchiveError: Year not archived or archive files damaged
+        """
+        year = int(year)
+        manifest = self.manifest(year)
+        for model in AUDIT_TABLES:
+            entry = manifest["tables"][model.__tablename__]
+            path = os.path.join(self.year_dir(year), entry["file"])
+            if not os.path.exists(path) or _sha256(path) != entry["sha256"]:
+                raise AuditArchiveError(f"{path}: missing or failing its checksum, not dropping {year}")
+
+        dropped = []
+        for model in AUDIT_TABLES:
+            for partition in manifest["tables"][model.__tablename__]["partitions"]:
+                name = f"{ARCHIVE_SCHEMA}.{partition}"
+                result = await db.execute(text("SELECT to_regclass(CAST(:name AS text))"), {"name": name})
+                if result.scalar() is not None:
+                    await db.execute(text(f"DROP TABLE {name}"))
+                    dropped.append(name)
+        await db.commit()
+        logger.info(f"Dropped {len(dropped)} archived audit partitions of {year}")
+        return dropped
+
+
+async def archived_years_in_range(
+    db: AsyncSession,
+    archive: AuditArchive,
+    model: Type[Base],
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> List[int]:
+    """
+    Archived years overlapping [start, end] whose partitions are detached
+
+    A year whose January partition still exists is read from the database.
+    """
+    years = []
+    for year in archive.years_between(start, end):
+        live = await db.execute(
+            text("SELECT to_regclass(CAST(:name AS text))"),
+            {"name": partition_name(model.__tablename__, year, 1)},
+        )
+        if live.scalar() is None:
+            years.append(year)
+    return years
+
+
+def after_cursor(rows: List[Any], sort_attr: str, sort_value: Any, row_id: Any, descending: bool = True) -> List[Any]:
+    """Rows after a keyset position, mirroring keyset_condition() in Python"""
+    if descending:
+        return [row for row in rows if (getattr(row, sort_attr), row.id) < (sort_value, row_id)]
+    return [row for row in rows if (getattr(row, sort_attr), row.id) > (sort_value, row_id)]
+
+
+_archive: Optional[AuditArchive] = None
+
+
+def get_audit_archive() -> AuditArchive:
+    """Process-wide audit archive"""
+    global _archive
+    if _archive is None:
+        _archive = AuditArchive(settings.AUDIT_ARCHIVE_PATH)
+    return _archive
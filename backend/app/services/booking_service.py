@@ -13,6 +13,7 @@ from decimal import Decimal
 from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
 from app.models.vendor_invoice import VendorInvoice
 from app.models.vendor import Vendor
+from app.services.voucher_numbering import VoucherNumberAllocator
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +66,7 @@ async def book_vendor_invoice(
             }
         
         # 3. Generate voucher number
-        voucher_number = await _generate_voucher_number(db, invoice.client_id)
+        voucher_number = await _generate_voucher_number(db, invoice.client_id, invoice.invoice_date.year)
         
         # 4. Extract booking lines
         lines = booking_suggestion.get('lines', [])
@@ -151,32 +152,14 @@ async def book_vendor_invoice(
         }
 
 
-async def _generate_voucher_number(db: AsyncSession, client_id: UUID) -> str:
+async def _generate_voucher_number(db: AsyncSession, client_id: UUID, fiscal_year: int) -> str:
     """
-    Generate next voucher number for client
+    Generate next AP voucher number for client
     
-    Format: Sequential number per client (1, 2, 3, ...)
+    Format: YYYY-NNNN, sequential per client, series and fiscal year
+    (shared with VoucherGenerator)
     """
-    # Find highest existing voucher number for this client
-    query = select(GeneralLedger).where(
-        GeneralLedger.client_id == client_id,
-        GeneralLedger.voucher_series == "AP"
-    ).order_by(GeneralLedger.voucher_number.desc()).limit(1)
-    
-    result = await db.execute(query)
-    last_entry = result.scalar_one_or_none()
-    
-    if last_entry:
-        try:
-            last_number = int(last_entry.voucher_number)
-            next_number = last_number + 1
-        except ValueError:
-            # Fallback if voucher_number is not numeric
-            next_number = 1
-    else:
-        next_number = 1
-    
-    return str(next_number).zfill(6)  # Zero-padded to 6 digits: 000001, 000002, etc.
+    return await VoucherNumberAllocator(db).next_number(client_id, "AP", fiscal_year)
 
 
 async def reverse_general_ledger_entry(
@@ -219,7 +202,7 @@ async def reverse_general_ledger_entry(
             return {'success': False, 'error': 'Entry is locked (period closed)'}
         
         # 2. Create reversal entry
-        reversal_voucher = await _generate_voucher_number(db, original_entry.client_id)
+        reversal_voucher = await _generate_voucher_number(db, original_entry.client_id, datetime.now().year)
         
         reversal_entry = GeneralLedger(
             id=uuid4(),
@@ -1,25 +1,147 @@
 """
 Brønnøysundregistrene API Integration
 Search Norwegian company registry for autocomplete
+
+Lookups are answered from the local Enhetsregisteret mirror
+(app/services/company_register.py) when a database session is passed and
+the bulk dataset has been imported. The live API is the fallback (for new
+entities and before the first import):
+
+- One pooled httpx client is shared by all calls (closed on shutdown)
+- Answers, including "not found", are cached for
+  settings.BRREG_CACHE_TTL_SECONDS in the session store (shared between
+  workers when SESSION_STORE_BACKEND is redis)
+- get_companies() looks up many org numbers at once: one mirror query,
+  then the remaining numbers in batches of BRREG_BATCH_SIZE per request
 """
+import asyncio
 import httpx
-from typing import List, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional
 import logging
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.company_register import (
+    lookup_register,
+    record_from_entity,
+    register_is_loaded,
+    search_register,
+)
+from app.services.session_store import create_session_store
+
 logger = logging.getLogger(__name__)
 
 # Brønnøysund API endpoints
 BRREG_SEARCH_URL = "https://data.brreg.no/enhetsregisteret/api/enheter"
 
+# Org numbers per request in a batch lookup (comma-separated organisasjonsnummer filter)
+BRREG_BATCH_SIZE = 100
+
+_client: Optional[httpx.AsyncClient] = None
+
+cache = create_session_store("brreg", default_ttl=settings.BRREG_CACHE_TTL_SECONDS)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Shared client for the live API (connection pool reused across calls)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def search_result(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Company as returned by search_companies()"""
+    return {
+        "name": record["name"],
+        "org_number": record["org_number"],
+        "address": record["address"],
+        "postal_code": record["postal_code"],
+        "city": record["city"],
+        "municipality": record["municipality"],
+        "municipality_number": record["municipality_number"],
+        "nace_code": record["nace_code"],
+        "nace_description": record["nace_description"],
+        "organizational_form": record["organizational_form"],
+        "organizational_form_desc": record["organizational_form_desc"],
+    }
+
+
+def details_result(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Company as returned by get_company_details()"""
+    return {
+        "name": record["name"],
+        "org_number": record["org_number"],
+        "address": record["address"],
+        "postal_code": record["postal_code"],
+        "city": record["city"],
+        "municipality": record["municipality"],
+        "nace_code": record["nace_code"],
+        "nace_description": record["nace_description"],
+        "organizational_form": record["organizational_form_desc"],
+        "registration_date": record["registration_date"],
+        "employees": record["employees"],
+    }
+
+
+async def _fetch_records(org_numbers: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Live API lookup of up to BRREG_BATCH_SIZE org numbers in one request"""
+    response = await get_client().get(
+        BRREG_SEARCH_URL,
+        params={"organisasjonsnummer": ",".join(org_numbers), "size": len(org_numbers)},
+    )
+    response.raise_for_status()
+    found = {
+        record["org_number"]: record
+        for record in map(record_from_entity, response.json().get("_embedded", {}).get("enheter", []))
+    }
+    return {org_number: found.get(org_number) for org_number in org_numbers}
+
+
+async def _cached_records(org_numbers: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Records from the live API through the cache (None = not registered; absent = lookup failed)"""
+    records: Dict[str, Optional[Dict[str, Any]]] = {}
+    missing = []
+    for org_number in org_numbers:
+        cached = await cache.get(f"org:{org_number}")
+        if cached is None:
+            missing.append(org_number)
+        else:
+            records[org_number] = cached["record"]
+
+    batches = [missing[i:i + BRREG_BATCH_SIZE] for i in range(0, len(missing), BRREG_BATCH_SIZE)]
+    results = await asyncio.gather(*(_fetch_records(batch) for batch in batches), return_exceptions=True)
+    for batch, fetched in zip(batches, results):
+        if isinstance(fetched, Exception):
+            # Not cached, so the next lookup tries again
+            logger.error(f"Brreg API error fetching {len(batch)} companies: {str(fetched)}")
+            continue
+        for org_number, record in fetched.items():
+            await cache.set(f"org:{org_number}", {"record": record})
+            records[org_number] = record
+    return records
+
 
-async def search_companies(query: str, limit: int = 10) -> List[Dict]:
+async def search_companies(query: str, limit: int = 10, db: Optional[AsyncSession] = None) -> List[Dict]:
     """
     Search companies in Brønnøysundregistrene by name
-    
+
     Args:
         query: Company name search query (e.g., "GHB")
         limit: Maximum number of results (default: 10)
-    
+        db: Session for the local mirror (live API only when omitted)
+
     Returns:
         List of company dictionaries with:
         - name: Company name
@@ -33,58 +155,28 @@ async def search_companies(query: str, limit: int = 10) -> List[Dict]:
     """
     if not query or len(query) < 2:
         return []
-    
+
     try:
-        params = {
-            "navn": query,
-            "size": limit,
-        }
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(BRREG_SEARCH_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            companies = []
-            entities = data.get("_embedded", {}).get("enheter", [])
-            
-            for entity in entities:
-                # Extract business address
-                forretningsadresse = entity.get("forretningsadresse", {})
-                postadresse = entity.get("postadresse", {})
-                
-                # Prefer business address, fallback to postal address
-                address_data = forretningsadresse or postadresse
-                
-                # Build formatted address
-                address_lines = []
-                if address_data.get("adresse"):
-                    address_lines.extend(address_data["adresse"])
-                
-                formatted_address = ", ".join(address_lines) if address_lines else None
-                
-                # Extract NACE code (industry classification)
-                naeringskode1 = entity.get("naeringskode1", {})
-                nace_code = naeringskode1.get("kode", None)
-                nace_description = naeringskode1.get("beskrivelse", None)
-                
-                companies.append({
-                    "name": entity.get("navn", ""),
-                    "org_number": entity.get("organisasjonsnummer", ""),
-                    "address": formatted_address,
-                    "postal_code": address_data.get("postnummer", None),
-                    "city": address_data.get("poststed", None),
-                    "municipality": entity.get("kommune", {}).get("kommunenavn", None),
-                    "municipality_number": entity.get("kommune", {}).get("kommunenummer", None),
-                    "nace_code": nace_code,
-                    "nace_description": nace_description,
-                    "organizational_form": entity.get("organisasjonsform", {}).get("kode", None),
-                    "organizational_form_desc": entity.get("organisasjonsform", {}).get("beskrivelse", None),
-                })
-            
-            logger.info(f"Brreg search for '{query}': found {len(companies)} results")
-            return companies
-    
+        if db is not None:
+            records = await search_register(db, query, limit)
+            if records or await register_is_loaded(db):
+                logger.info(f"Brreg search for '{query}': found {len(records)} results in local register")
+                return [search_result(record) for record in records]
+
+        cache_key = f"search:{query.strip().lower()}:{limit}"
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return cached["companies"]
+
+        response = await get_client().get(BRREG_SEARCH_URL, params={"navn": query, "size": limit})
+        response.raise_for_status()
+        entities = response.json().get("_embedded", {}).get("enheter", [])
+        companies = [search_result(record_from_entity(entity)) for entity in entities]
+        await cache.set(cache_key, {"companies": companies})
+
+        logger.info(f"Brreg search for '{query}': found {len(companies)} results")
+        return companies
+
     except httpx.HTTPError as e:
         logger.error(f"Brreg API error: {str(e)}")
         return []
@@ -93,59 +185,43 @@ async def search_companies(query: str, limit: int = 10) -> List[Dict]:
         return []
 
 
-async def get_company_details(org_number: str) -> Optional[Dict]:
+async def get_company_details(org_number: str, db: Optional[AsyncSession] = None) -> Optional[Dict]:
     """
     Get detailed company information by organization number
-    
+
     Args:
         org_number: 9-digit organization number
-    
+        db: Session for the local mirror (live API only when omitted)
+
     Returns:
         Company details dictionary or None if not found
     """
+    companies = await get_companies([org_number], db=db)
+    return companies.get(org_number)
+
+
+async def get_companies(org_numbers: Iterable[str], db: Optional[AsyncSession] = None) -> Dict[str, Optional[Dict]]:
+    """
+    Company details for many organization numbers in one call
+
+    Args:
+        org_numbers: Organization numbers (duplicates are looked up once)
+        db: Session for the local mirror (live API only when omitted)
+
+    Returns:
+        Details per org number (as get_company_details), None for numbers
+        that are not registered or could not be looked up
+    """
+    wanted = list(dict.fromkeys(org_numbers))
+    records: Dict[str, Optional[Dict[str, Any]]] = {}
     try:
-        url = f"{BRREG_SEARCH_URL}/{org_number}"
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url)
-            
-            if response.status_code == 404:
-                return None
-            
-            response.raise_for_status()
-            entity = response.json()
-            
-            # Extract address
-            forretningsadresse = entity.get("forretningsadresse", {})
-            postadresse = entity.get("postadresse", {})
-            address_data = forretningsadresse or postadresse
-            
-            address_lines = []
-            if address_data.get("adresse"):
-                address_lines.extend(address_data["adresse"])
-            
-            formatted_address = ", ".join(address_lines) if address_lines else None
-            
-            # Extract NACE code
-            naeringskode1 = entity.get("naeringskode1", {})
-            
-            return {
-                "name": entity.get("navn", ""),
-                "org_number": entity.get("organisasjonsnummer", ""),
-                "address": formatted_address,
-                "postal_code": address_data.get("postnummer", None),
-                "city": address_data.get("poststed", None),
-                "municipality": entity.get("kommune", {}).get("kommunenavn", None),
-                "nace_code": naeringskode1.get("kode", None),
-                "nace_description": naeringskode1.get("beskrivelse", None),
-                "organizational_form": entity.get("organisasjonsform", {}).get("beskrivelse", None),
-                "registration_date": entity.get("registreringsdatoEnhetsregisteret", None),
-                "employees": entity.get("antallAnsatte", None),
-            }
-    
-    except httpx.HTTPError as e:
-        logger.error(f"Brreg API error fetching {org_number}: {str(e)}")
-        return None
+        if db is not None and wanted:
+            records.update(await lookup_register(db, wanted))
+        records.update(await _cached_records(o for o in wanted if o not in records))
     except Exception as e:
-        logger.error(f"Unexpected error fetching company {org_number}: {str(e)}")
-        return None
+        logger.error(f"Unexpected error fetching {len(wanted)} companies: {str(e)}")
+
+    return {
+        org_number: details_result(records[org_number]) if records.get(org_number) else None
+        for org_number in wanted
+    }
@@ -0,0 +1,402 @@
+"""
+Bulk Approval Service - Approve and book many review queue items at once
+
+Month-end review sessions approve hundreds of high-confidence vendor
+invoices. Instead of one approve call per item (load, voucher, ledger,
+audit: one round-trip each), items are processed in chunks:
+
+1. Load the chunk's review items, invoices and vendors with grouped queries
+2. Build and validate vouchers in memory (same lines as VoucherGenerator)
+3. Reserve voucher numbers per client and fiscal year as one block
+4. Add GL entries, lines, supplier ledger entries and feedback rows and
+   write them with one flush (batched INSERTs per table)
+5. Commit once per chunk; buffered audit rows are inserted with the commit
+
+Items that fail validation are reported and skipped; a database error
+rolls back only the current chunk.
+"""
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.audit_trail import AuditTrail
+from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
+from app.models.review_queue import ReviewQueue, ReviewStatus
+from app.models.review_queue_feedback import ReviewQueueFeedback
+from app.models.vendor_invoice import VendorInvoice
+from app.models.voucher_audit_log import (
+    AuditAction,
+    AuditVoucherType,
+    PerformedBy,
+    VoucherAuditLog,
+)
+from app.services.ledger_sync_service import LedgerSyncService
+from app.services.voucher_numbering import VoucherNumberAllocator
+from app.services.voucher_service import VoucherGenerator, VoucherValidationError
+from app.utils.audit import record_audit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 100
+VOUCHER_SERIES = "AP"
+
+
+@dataclass
+class _PreparedVoucher:
+    """A validated voucher waiting for its number"""
+    item: ReviewQueue
+    invoice: VendorInvoice
+    accounting_date: date
+    lines: List[Any]
+
+
+@dataclass
+class BulkApprovalResult:
+    """Per-item outcome of a bulk approval"""
+    results: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def approved_count(self) -> int:
+        return sum(1 for r in self.results if r["success"])
+
+    @property
+    def failed_count(self) -> int:
+        return len(self.results) - self.approved_count
+
+    def ok(self, item_id: UUID, **details) -> None:
+        self.results.append({"id": str(item_id), "success": True, "status": "approved", **details})
+
+    def fail(self, item_id: UUID, error: str) -> None:
+        self.results.append({"id": str(item_id), "success": False, "error": error})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requested": len(self.results),
+            "approved": self.approved_count,
+            "failed": self.failed_count,
+            "results": self.results,
+        }
+
+
+class BulkApprovalService:
+    """Approve review queue items and book their vendor invoices in chunks"""
+
+    def __init__(self, db: AsyncSession, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.generator = VoucherGenerator(db)
+        self.allocator = VoucherNumberAllocator(db)
+        self.ledger_sync = LedgerSyncService(db)
+
+    async def approve_items(
+        self,
+        item_ids: List[UUID],
+        notes: Optional[str] = None,
+        user_id: Optional[UUID] = None
+    ) -> BulkApprovalResult:
+        """
+        Approve review items and book them to the General Ledger
+
+        Args:
+            item_ids: Review queue item IDs (duplicates are ignored)
+            notes: Resolution notes stored on every item
+            user_id: Approving user, if known
+
+        Returns:
+            BulkApprovalResult with one entry per requested item
+        """
+        result = BulkApprovalResult()
+        unique_ids = list(dict.fromkeys(item_ids))
+
+        for start in range(0, len(unique_ids), self.chunk_size):
+            chunk = unique_ids[start:start + self.chunk_size]
+            reported = len(result.results)
+            try:
+                await self._approve_chunk(chunk, notes, user_id, result)
+            except Exception as e:
+                await self.db.rollback()
+                logger.error(f"Bulk approval chunk failed ({len(chunk)} items): {e}", exc_info=True)
+                del result.results[reported:]
+                for item_id in chunk:
+                    result.fail(item_id, f"Chunk rolled back: {e}")
+
+        logger.info(
+            f"Bulk approval: {result.approved_count} approved, {result.failed_count} failed "
+            f"({len(unique_ids)} items, chunk size {self.chunk_size})"
+        )
+        return result
+
+    async def _load_chunk(
+        self, item_ids: List[UUID]
+    ) -> Dict[UUID, Tuple[ReviewQueue, Optional[VendorInvoice]]]:
+        """Review items with their invoices and vendors, locked for update"""
+        rows = await self.db.execute(
+            select(ReviewQueue)
+            .where(ReviewQueue.id.in_(item_ids))
+            .with_for_update()
+        )
+        items = {item.id: item for item in rows.scalars()}
+
+        invoice_ids = [
+            item.source_id for item in items.values()
+            if item.source_type == "vendor_invoice"
+        ]
+        invoices: Dict[UUID, VendorInvoice] = {}
+        if invoice_ids:
+            rows = await self.db.execute(
+                select(VendorInvoice)
+                .options(selectinload(VendorInvoice.vendor))
+                .where(VendorInvoice.id.in_(invoice_ids))
+                .with_for_update(of=VendorInvoice)
+            )
+            invoices = {invoice.id: invoice for invoice in rows.scalars()}
+
+        return {
+            item_id: (item, invoices.get(item.source_id))
+            for item_id, item in items.items()
+        }
+
+    def _prepare(
+        self,
+        item: ReviewQueue,
+        invoice: Optional[VendorInvoice],
+        exchange_rate: Optional[Decimal] = None
+    ) -> Tuple[Optional[_PreparedVoucher], Optional[str]]:
+        """Validate one item and build its voucher lines (no DB access)"""
+        if item.status != ReviewStatus.PENDING:
+            return None, f"Item already {item.status.value}"
+
+        if item.source_type != "vendor_invoice" or not item.ai_suggestion:
+            # Nothing to book - approval only
+            return None, None
+
+        if invoice is None:
+            return None, f"Invoice {item.source_id} not found"
+        if invoice.client_id != item.client_id:
+            return None, f"Invoice {invoice.id} belongs to another client"
+        if invoice.general_ledger_id:
+            return None, f"Invoice {invoice.id} already posted to voucher {invoice.general_ledger_id}"
+
+        try:
+            lines = self.generator._generate_voucher_lines_sync(
+                invoice, override_account=item.ai_suggestion.get("account"), exchange_rate=exchange_rate
+            )
+            self.generator._validate_balance(lines)
+        except (ValueError, VoucherValidationError) as e:
+            return None, str(e)
+
+        return _PreparedVoucher(
+            item=item,
+            invoice=invoice,
+            accounting_date=invoice.invoice_date,
+            lines=lines,
+        ), None
+
+    async def _approve_chunk(
+        self,
+        item_ids: List[UUID],
+        notes: Optional[str],
+        user_id: Optional[UUID],
+        result: BulkApprovalResult
+    ) -> None:
+        loaded = await self._load_chunk(item_ids)
+        # Foreign-currency invoices: NOK rates for the whole chunk at once
+        exchange_rates = await self.generator.exchange_rates(
+            [invoice for _, invoice in loaded.values() if invoice is not None]
+        )
+
+        approvals: List[ReviewQueue] = []
+        vouchers: List[_PreparedVoucher] = []
+        for item_id in item_ids:
+            if item_id not in loaded:
+                result.fail(item_id, "Review item not found")
+                continue
+
+            item, invoice = loaded[item_id]
+            prepared, error = self._prepare(item, invoice, exchange_rates.get(item.source_id))
+            if error:
+                result.fail(item_id, error)
+                continue
+
+            approvals.append(item)
+            if prepared:
+                vouchers.append(prepared)
+
+        if not approvals:
+            return
+
+        numbers = await self._reserve_numbers(vouchers)
+        now = datetime.utcnow()
+        booked: Dict[UUID, GeneralLedger] = {}
+        ledger_entries = []
+
+        for prepared in vouchers:
+            entry, lines = self._build_voucher(prepared, numbers[prepared.item.id], user_id)
+            booked[prepared.item.id] = entry
+            ledger_entries.append((entry, lines, prepared.invoice))
+
+            prepared.invoice.general_ledger_id = entry.id
+            prepared.invoice.booked_at = now
+            prepared.invoice.review_status = "approved"
+
+        self.ledger_sync.add_vendor_invoice_entries(ledger_entries)
+
+        for item in approvals:
+            invoice = loaded[item.id][1]
+            entry = booked.get(item.id)
+
+            item.status = ReviewStatus.APPROVED
+            item.resolved_at = now
+            item.resolved_by_user_id = user_id
+            item.resolution_notes = notes
+
+            self._record_feedback_and_audit(item, invoice, entry, notes, user_id)
+
+        # One flush for the whole chunk: the unit of work orders the tables
+        # by foreign key and batches the INSERTs per table
+        await self.db.flush()
+        await self.db.commit()
+
+        for item in approvals:
+            entry = booked.get(item.id)
+            details = {}
+            if entry is not None:
+                details = {
+                    "general_ledger_id": str(entry.id),
+                    "voucher_number": entry.voucher_number,
+                }
+            result.ok(item.id, **details)
+
+    async def _reserve_numbers(self, vouchers: List[_PreparedVoucher]) -> Dict[UUID, str]:
+        """One voucher number block per (client, fiscal year)"""
+        groups: Dict[Tuple[UUID, int], List[_PreparedVoucher]] = defaultdict(list)
+        for prepared in vouchers:
+            groups[(prepared.item.client_id, prepared.accounting_date.year)].append(prepared)
+
+        numbers = {}
+        for (client_id, fiscal_year), group in sorted(groups.items(), key=lambda g: (str(g[0][0]), g[0][1])):
+            block = await self.allocator.reserve(client_id, VOUCHER_SERIES, fiscal_year, len(group))
+            for prepared in sorted(group, key=lambda p: (p.accounting_date, p.invoice.invoice_number or "")):
+                numbers[prepared.item.id] = block.next()
+        return numbers
+
+    def _build_voucher(
+        self,
+        prepared: _PreparedVoucher,
+        voucher_number: str,
+        user_id: Optional[UUID]
+    ) -> Tuple[GeneralLedger, List[GeneralLedgerLine]]:
+        """GL entry and lines for one invoice, added to the session"""
+        invoice = prepared.invoice
+        accounting_date = prepared.accounting_date
+
+        entry = GeneralLedger(
+            id=uuid4(),
+            client_id=prepared.item.client_id,
+            entry_date=date.today(),
+            accounting_date=accounting_date,
+            period=accounting_date.strftime("%Y-%m"),
+            fiscal_year=accounting_date.year,
+            voucher_number=voucher_number,
+            voucher_series=VOUCHER_SERIES,
+            description=self.generator._generate_description(invoice, invoice.vendor),
+            source_type="vendor_invoice",
+            source_id=invoice.id,
+            created_by_type="user",
+            created_by_id=user_id,
+            status="posted",
+            locked=False
+        )
+        lines = [
+            GeneralLedgerLine(
+                id=uuid4(),
+                general_ledger_entry=entry,
+                line_number=line.line_number,
+                account_number=line.account_number,
+                debit_amount=line.debit_amount,
+                credit_amount=line.credit_amount,
+                vat_code=line.vat_code,
+                vat_amount=line.vat_amount or Decimal("0.00"),
+                vat_base_amount=prepared.lines[0].debit_amount if line.vat_code else None,
+                line_description=line.line_description,
+                ai_confidence_score=invoice.ai_confidence_score,
+                ai_reasoning=invoice.ai_reasoning
+            )
+            for line in prepared.lines
+        ]
+        self.db.add(entry)  # lines cascade via general_ledger_entry
+        return entry, lines
+
+    def _record_feedback_and_audit(
+        self,
+        item: ReviewQueue,
+        invoice: Optional[VendorInvoice],
+        entry: Optional[GeneralLedger],
+        notes: Optional[str],
+        user_id: Optional[UUID]
+    ) -> None:
+        """Feedback row plus buffered audit rows (written at commit) for one approval"""
+        if item.ai_suggestion and invoice:
+            self.db.add(ReviewQueueFeedback(
+                id=uuid4(),
+                review_queue_id=item.id,
+                invoice_id=invoice.id,
+                reviewed_by=user_id,
+                action="approved",
+                ai_suggestion=item.ai_suggestion,
+                accountant_correction=None,
+                account_correct=True,
+                vat_correct=True,
+                fully_correct=True,
+                invoice_metadata={
+                    "vendor_name": invoice.vendor.name if invoice.vendor else None,
+                    "amount": float(invoice.total_amount),
+                    "description": getattr(invoice, "description", None),
+                    "currency": invoice.currency,
+                    "bulk": True,
+                }
+            ))
+
+        if entry is not None:
+            record_audit(
+                self.db,
+                AuditTrail,
+                client_id=item.client_id,
+                table_name="general_ledger",
+                record_id=entry.id,
+                action="create",
+                changed_by_type="user",
+                changed_by_id=user_id,
+                changed_by_name="Bulk approval",
+                reason=f"Bulk approval of vendor invoice {invoice.invoice_number}",
+                new_value={
+                    "voucher_number": entry.voucher_number,
+                    "invoice_number": invoice.invoice_number,
+                    "amount": float(invoice.total_amount),
+                    "vendor": invoice.vendor.name if invoice.vendor else "Unknown",
+                }
+            )
+
+        record_audit(
+            self.db,
+            VoucherAuditLog,
+            voucher_id=item.source_id,
+            voucher_type=AuditVoucherType.SUPPLIER_INVOICE,
+            action=AuditAction.APPROVED,
+            performed_by=PerformedBy.ACCOUNTANT,
+            user_id=user_id,
+            ai_confidence=item.ai_confidence / 100.0 if item.ai_confidence else None,
+            details={
+                "review_queue_id": str(item.id),
+                "notes": notes,
+                "bulk": True,
+            }
+        )
@@ -5,7 +5,7 @@ import logging
 from typing import Dict, Any, Optional, List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc, and_, cast, String
+from sqlalchemy import select, func, desc, and_
 from datetime import datetime, timedelta
 
 from app.models.vendor_invoice import VendorInvoice
@@ -320,7 +320,7 @@ class StatusQueryHandler:
                 select(func.count(ReviewQueue.id)).where(
                     and_(
                         ReviewQueue.client_id == UUID(client_id),
-                        cast(ReviewQueue.status, String) == 'PENDING'
+                        ReviewQueue.status == ReviewStatus.PENDING
                     )
                 )
             )
@@ -8,6 +8,8 @@ from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.utils.sse import EventEmitter
+
 from .intent_classifier import IntentClassifier
 from .context_manager import ContextManager
 from .action_handlers import (
@@ -45,7 +47,9 @@ class ChatService:
         session_id: str,
         client_id: str,
         user_id: Optional[str],
-        message: str
+        message: str,
+        attachments: Optional[List[Any]] = None,
+        emit: Optional[EventEmitter] = None
     ) -> Dict[str, Any]:
         """
         Process chat message and return response
@@ -56,6 +60,9 @@ class ChatService:
             client_id: Client UUID
             user_id: User UUID (optional)
             message: User's message
+            attachments: File attachments (logged only for now)
+            emit: Optional SSE emitter; structured results are sent as
+                "action" events as soon as they are resolved
         
         Returns:
             {
@@ -68,24 +75,24 @@ class ChatService:
         
         try:
             # Update context with client_id
-            self.context_manager.update_context(
+            await self.context_manager.update_context(
                 session_id,
                 client_id=client_id,
                 user_id=user_id
             )
             
             # Add user message to history
-            self.context_manager.add_message(
+            await self.context_manager.add_message(
                 session_id,
                 role='user',
                 content=message
             )
             
             # Get context
-            context = self.context_manager.get_context(session_id)
+            context = await self.context_manager.get_context(session_id)
             
             # Check for pending confirmation
-            pending = self.context_manager.get_pending_confirmation(session_id)
+            pending = await self.context_manager.get_pending_confirmation(session_id)
             if pending:
                 return await self._handle_confirmation(db, session_id, client_id, user_id, message, pending)
             
@@ -96,8 +103,11 @@ class ChatService:
             
             logger.info(f"Intent: {intent}, Entities: {entities}")
             
+            if emit:
+                await emit('action', {'type': 'intent', 'data': intent_result})
+            
             # Update context
-            self.context_manager.update_context(
+            await self.context_manager.update_context(
                 session_id,
                 last_intent=intent,
                 entities=entities
@@ -106,7 +116,7 @@ class ChatService:
             # Route to appropriate handler
             if intent == 'book_invoice':
                 response = await self._handle_book_invoice(
-                    db, session_id, client_id, user_id, entities
+                    db, session_id, client_id, user_id, entities, emit
                 )
             
             elif intent == 'show_invoice':
@@ -144,8 +154,11 @@ class ChatService:
                     'data': {}
                 }
             
+            if emit:
+                await emit('token', {'text': response['message']})
+            
             # Add assistant message to history
-            self.context_manager.add_message(
+            await self.context_manager.add_message(
                 session_id,
                 role='assistant',
                 content=response['message'],
@@ -172,7 +185,8 @@ class ChatService:
         session_id: str,
         client_id: str,
         user_id: Optional[str],
-        entities: Dict[str, Any]
+        entities: Dict[str, Any],
+        emit: Optional[EventEmitter] = None
     ) -> Dict[str, Any]:
         """Handle booking an invoice"""
         
@@ -182,7 +196,7 @@ class ChatService:
         # Check if we need to ask which invoice
         if not invoice_number and not invoice_id:
             # Check if there's a current invoice in context
-            context = self.context_manager.get_context(session_id)
+            context = await self.context_manager.get_context(session_id)
             invoice_id = context.get('current_invoice_id')
             
             if not invoice_id:
@@ -216,8 +230,12 @@ class ChatService:
                 'data': analysis
             }
         
+        if emit:
+            # Send the invoice card before the suggestion text is formatted
+            await emit('action', {'type': 'invoice_card', 'data': analysis})
+        
         # Update context with current invoice
-        self.context_manager.update_context(
+        await self.context_manager.update_context(
             session_id,
             current_invoice_id=analysis['invoice']['id'],
             current_invoice_number=analysis['invoice']['invoice_number']
@@ -247,7 +265,7 @@ class ChatService:
         message += f"\n**Bokfør nå?** (Svar 'ja' eller 'nei')"
         
         # Set pending confirmation
-        self.context_manager.set_pending_confirmation(
+        await self.context_manager.set_pending_confirmation(
             session_id,
             action='book_invoice',
             data={
@@ -257,6 +275,12 @@ class ChatService:
             question=message
         )
         
+        if emit:
+            await emit('action', {
+                'type': 'pending_confirmation',
+                'data': {'action': 'book_invoice', 'invoice_id': invoice['id']}
+            })
+        
         return {
             'message': message,
             'action': 'suggest_booking',
@@ -290,7 +314,7 @@ class ChatService:
             }
         
         # Clear pending confirmation
-        self.context_manager.clear_pending_confirmation(session_id)
+        await self.context_manager.clear_pending_confirmation(session_id)
         
         if not confirmed:
             return {
@@ -411,7 +435,7 @@ class ChatService:
         """Correct account in booking"""
         
         # Get current invoice from context
-        context = self.context_manager.get_context(session_id)
+        context = await self.context_manager.get_context(session_id)
         invoice_id = context.get('current_invoice_id')
         
         if not invoice_id:
@@ -7,6 +7,9 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from uuid import UUID, uuid4
 
+from app.config import settings
+from app.services.session_store import SessionStore, create_session_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,21 +25,33 @@ class ContextManager:
     - Pending confirmations (e.g., "Do you want to book this?")
     """
     
-    def __init__(self, max_history: int = 10, session_timeout_minutes: int = 30):
+    def __init__(
+        self,
+        max_history: int = 10,
+        session_timeout_minutes: int = 30,
+        store: Optional[SessionStore] = None
+    ):
         """
         Initialize context manager
         
         Args:
             max_history: Maximum messages to keep in history
-            session_timeout_minutes: Auto-clear context after this time
+            session_timeout_minutes: Auto-clear context after this much inactivity
+            store: Session store (defaults to the configured backend)
         """
         self.max_history = max_history
         self.session_timeout = timedelta(minutes=session_timeout_minutes)
         
-        # In-memory store (in production, use Redis or database)
-        self._sessions: Dict[str, Dict[str, Any]] = {}
+        # Bounded store: LRU + TTL in-process, or Redis shared across workers
+        if store is None:
+            store = create_session_store(
+                "chat",
+                default_ttl=int(self.session_timeout.total_seconds()),
+                max_entries=settings.CHAT_SESSION_MAX_ENTRIES
+            )
+        self._sessions = store
     
-    def get_context(self, session_id: str) -> Dict[str, Any]:
+    async def get_context(self, session_id: str) -> Dict[str, Any]:
         """
         Get current context for session
         
@@ -54,24 +69,16 @@ class ContextManager:
                 'last_activity': '...'
             }
         """
-        session = self._sessions.get(session_id)
-        
-        # Check if session expired
-        if session:
-            last_activity = session.get('last_activity')
-            if last_activity:
-                if datetime.utcnow() - last_activity > self.session_timeout:
-                    logger.info(f"Session {session_id} expired, clearing context")
-                    self.clear_context(session_id)
-                    session = None
+        # Expired sessions are dropped by the store's TTL
+        session = await self._sessions.get(session_id)
         
         # Return existing or new context
         if not session:
-            session = self._create_new_context(session_id)
+            session = await self._create_new_context(session_id)
         
         return session
     
-    def update_context(
+    async def update_context(
         self,
         session_id: str,
         **updates
@@ -86,7 +93,7 @@ class ContextManager:
         Returns:
             Updated context
         """
-        context = self.get_context(session_id)
+        context = await self.get_context(session_id)
         
         # Update fields
         for key, value in updates.items():
@@ -95,13 +102,13 @@ class ContextManager:
         # Update last activity
         context['last_activity'] = datetime.utcnow()
         
-        self._sessions[session_id] = context
+        await self._sessions.set(session_id, context)
         
         logger.debug(f"Context updated for session {session_id}: {list(updates.keys())}")
         
         return context
     
-    def add_message(
+    async def add_message(
         self,
         session_id: str,
         role: str,
@@ -117,7 +124,7 @@ class ContextManager:
             content: Message content
             metadata: Additional metadata (intent, entities, etc.)
         """
-        context = self.get_context(session_id)
+        context = await self.get_context(session_id)
         
         message = {
             'role': role,
@@ -136,9 +143,9 @@ class ContextManager:
         context['conversation_history'] = history
         context['last_activity'] = datetime.utcnow()
         
-        self._sessions[session_id] = context
+        await self._sessions.set(session_id, context)
     
-    def set_pending_confirmation(
+    async def set_pending_confirmation(
         self,
         session_id: str,
         action: str,
@@ -154,7 +161,7 @@ class ContextManager:
             data: Data needed to execute action (e.g., invoice_id, booking_lines)
             question: Question text shown to user
         """
-        context = self.get_context(session_id)
+        context = await self.get_context(session_id)
         
         context['pending_confirmation'] = {
             'action': action,
@@ -163,11 +170,11 @@ class ContextManager:
             'set_at': datetime.utcnow().isoformat()
         }
         
-        self._sessions[session_id] = context
+        await self._sessions.set(session_id, context)
         
         logger.info(f"Pending confirmation set for session {session_id}: {action}")
     
-    def get_pending_confirmation(
+    async def get_pending_confirmation(
         self,
         session_id: str
     ) -> Optional[Dict[str, Any]]:
@@ -177,23 +184,22 @@ class ContextManager:
         Returns:
             Confirmation dict or None
         """
-        context = self.get_context(session_id)
+        context = await self.get_context(session_id)
         return context.get('pending_confirmation')
     
-    def clear_pending_confirmation(self, session_id: str):
+    async def clear_pending_confirmation(self, session_id: str):
         """Clear pending confirmation"""
-        context = self.get_context(session_id)
+        context = await self.get_context(session_id)
         if 'pending_confirmation' in context:
             del context['pending_confirmation']
-            self._sessions[session_id] = context
+            await self._sessions.set(session_id, context)
     
-    def clear_context(self, session_id: str):
+    async def clear_context(self, session_id: str):
         """Clear all context for session"""
-        if session_id in self._sessions:
-            del self._sessions[session_id]
-            logger.info(f"Context cleared for session {session_id}")
+        await self._sessions.delete(session_id)
+        logger.info(f"Context cleared for session {session_id}")
     
-    def _create_new_context(self, session_id: str) -> Dict[str, Any]:
+    async def _create_new_context(self, session_id: str) -> Dict[str, Any]:
         """Create new empty context"""
         context = {
             'session_id': session_id,
@@ -208,18 +214,18 @@ class ContextManager:
             'last_activity': datetime.utcnow()
         }
         
-        self._sessions[session_id] = context
+        await self._sessions.set(session_id, context)
         
         return context
     
-    def get_recent_invoices(self, session_id: str, limit: int = 5) -> List[str]:
+    async def get_recent_invoices(self, session_id: str, limit: int = 5) -> List[str]:
         """
         Get list of recently mentioned invoice IDs
         
         Returns:
             List of invoice IDs (most recent first)
         """
-        context = self.get_context(session_id)
+        context = await self.get_context(session_id)
         history = context.get('conversation_history', [])
         
         invoice_ids = []
@@ -1,13 +1,18 @@
 """
 Intent Classifier - NLP with Claude API
 Classifies user intent and extracts entities
+
+Tiered: compiled rules, then a cache of normalized messages, then Claude
+for ambiguous input only (see intent_tiers).
 """
 import logging
 import json
+import time
 from typing import Dict, Any, Optional
 import anthropic
 
 from app.config import settings
+from .intent_tiers import CHAT_RULES, IntentCache, IntentStats, RuleTier
 
 logger = logging.getLogger(__name__)
 
@@ -27,14 +32,21 @@ class IntentClassifier:
     - general: General conversation
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 2048):
         if not settings.ANTHROPIC_API_KEY:
             logger.warning("ANTHROPIC_API_KEY not set - IntentClassifier will use fallback")
             self.client = None
         else:
-            self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+            self.client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
         
         self.model = settings.CLAUDE_MODEL
+        self.rules = RuleTier(CHAT_RULES)
+        self.cache = IntentCache(max_entries=cache_size)
+        self.stats = IntentStats()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-tier hit rates and latency"""
+        return {**self.stats.snapshot(), "cache_entries": len(self.cache)}
     
     async def classify(
         self,
@@ -57,14 +69,31 @@ class IntentClassifier:
                     'account': '6340',
                     'confirmation': True
                 },
-                'reasoning': 'User wants to book invoice...'
+                'reasoning': 'User wants to book invoice...',
+                'tier': 'rules' | 'cache' | 'llm' | 'fallback'
             }
         """
+        started = time.perf_counter()
+        
+        # Tier 1: unambiguous commands resolved locally
+        result = self.rules.match(message)
+        if result:
+            self.stats.record('rules', started)
+            return {**result, 'tier': 'rules'}
+        
+        # Tier 2: previously classified message
+        cache_key = self.cache.key(message, context)
+        cached = self.cache.get(cache_key)
+        if cached:
+            self.stats.record('cache', started)
+            return {**cached, 'tier': 'cache'}
         
         if not self.client:
             # Fallback to simple keyword matching
-            return self._fallback_classify(message, context)
+            self.stats.record('fallback', started)
+            return {**self._fallback_classify(message, context), 'tier': 'fallback'}
         
+        # Tier 3: Claude
         try:
             # Build context string
             context_str = ""
@@ -113,7 +142,7 @@ Return ONLY a JSON object:
 }}"""
             
             # Call Claude
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=500,
                 messages=[{"role": "user", "content": prompt}]
@@ -131,12 +160,15 @@ Return ONLY a JSON object:
             
             logger.info(f"Intent classified: {result.get('intent')} (confidence: {result.get('confidence')})")
             
-            return result
+            self.cache.put(cache_key, result)
+            self.stats.record('llm', started)
+            return {**result, 'tier': 'llm'}
         
         except Exception as e:
             logger.error(f"Error classifying intent: {str(e)}")
             # Fallback to simple keyword matching
-            return self._fallback_classify(message, context)
+            self.stats.record('fallback', started)
+            return {**self._fallback_classify(message, context), 'tier': 'fallback'}
     
     def _fallback_classify(
         self,
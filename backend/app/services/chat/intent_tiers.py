@@ -0,0 +1,208 @@
+"""
+Intent Tiers - Local fast paths in front of LLM intent classification
+
+Classification runs as a pipeline:
+1. RuleTier: compiled regex rules for unambiguous commands ("vis faktura 123",
+   "godkjenn", "hjelp") - resolved locally in microseconds
+2. IntentCache: LRU cache of previous LLM results keyed by normalized message
+3. LLM: only for ambiguous input
+
+IntentStats records hits and latency per tier.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCT_RE = re.compile(r"[\s.!?,;:]+$")
+UUID_RE = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
+    re.IGNORECASE,
+)
+
+
+def clean_message(message: str) -> str:
+    """Collapse whitespace and strip trailing punctuation (case preserved)"""
+    return _TRAILING_PUNCT_RE.sub("", _WHITESPACE_RE.sub(" ", message.strip()))
+
+
+def normalize_message(message: str) -> str:
+    """Cache key form of a message"""
+    return clean_message(message).lower()
+
+
+@dataclass
+class IntentRule:
+    """
+    One compiled rule
+
+    Named groups become entities: "ref" (invoice number or UUID),
+    "account" (account number) and "filter".
+    """
+    intent: str
+    pattern: Pattern[str]
+
+
+def rule(intent: str, pattern: str) -> IntentRule:
+    return IntentRule(intent=intent, pattern=re.compile(pattern, re.IGNORECASE))
+
+
+# Invoice reference: a token containing at least one digit (INV-123, 2024/55, 123)
+_REF = r"(?P<ref>(?=\S*\d)[\w][\w\-/.]*)"
+
+CHAT_RULES: List[IntentRule] = [
+    rule("help", r"^(?:help|hjelp|kommandoer|commands|\?)$"),
+    rule(
+        "book_invoice",
+        r"^(?:bokfør|bokfor|book)(?:\s+(?:denne|this))?"
+        r"(?:\s+(?:faktura(?:en)?|invoice))?(?:\s+" + _REF + r")?$",
+    ),
+    rule(
+        "show_invoice",
+        r"^(?:vis|show)(?:\s+(?:meg|me))?\s+(?:faktura(?:en)?|invoice)\s+" + _REF + r"$",
+    ),
+    rule(
+        "invoice_status",
+        r"^(?:hva er\s+)?status(?:\s+(?:på|for|on|of))?\s+(?:faktura|invoice)\s+" + _REF + r"$",
+    ),
+    rule(
+        "invoice_status",
+        r"^(?:hva er\s+)?(?:status|oversikt|overview)(?:\s+(?:på|for|on|of))?"
+        r"(?:\s+(?:alle|all))?(?:\s+(?:fakturaer|fakturaene|invoices))?$",
+    ),
+    rule(
+        "approve_booking",
+        r"^(?:godkjenn|approve)(?:\s+(?:bokføring(?:en)?|booking))?(?:\s+(?:for|av|of))?"
+        r"(?:\s+(?:faktura|invoice|item))?(?:\s+" + _REF + r")?$",
+    ),
+    rule(
+        "correct_booking",
+        r"^(?:korriger|correct|endre|change|bruk|use)\b(?:\s+\S+){0,3}?\s*(?:konto|account)\s+"
+        r"(?P<account>\d{4})(?:\s+(?:i stedet|instead))?$",
+    ),
+    rule(
+        "list_invoices",
+        r"^(?:vis|list|show|list opp)(?:\s+(?:meg|me))?(?:\s+(?:alle|all))?"
+        r"(?:\s+(?:ventende|pending|ubehandlede))?\s+(?:fakturaer|fakturaene|invoices)"
+        r"(?:\s+(?:med|with)\s+(?P<filter>lav confidence|low confidence))?$",
+    ),
+]
+
+
+class RuleTier:
+    """First-match evaluation of compiled rules against the cleaned message"""
+
+    def __init__(self, rules: List[IntentRule]):
+        self.rules = rules
+
+    def match(self, message: str) -> Optional[Dict[str, Any]]:
+        text = clean_message(message)
+        for intent_rule in self.rules:
+            m = intent_rule.pattern.match(text)
+            if m:
+                return {
+                    "intent": intent_rule.intent,
+                    "confidence": 0.99,
+                    "entities": self._entities(m),
+                    "reasoning": "Rule match",
+                }
+        return None
+
+    @staticmethod
+    def _entities(m: "re.Match[str]") -> Dict[str, Any]:
+        groups = m.groupdict()
+        entities: Dict[str, Any] = {}
+
+        ref = groups.get("ref")
+        if ref:
+            if UUID_RE.match(ref):
+                entities["invoice_id"] = ref.lower()
+            else:
+                entities["invoice_number"] = ref
+
+        if groups.get("account"):
+            entities["account_number"] = groups["account"]
+
+        if groups.get("filter"):
+            entities["filter"] = "low_confidence"
+
+        return entities
+
+
+class IntentCache:
+    """Thread-safe LRU cache of classification results"""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(message: str, context: Optional[Dict[str, Any]] = None) -> Tuple:
+        """
+        Cache key: normalized message plus the context fields the LLM prompt
+        depends on (client, invoice in focus, previous intent)
+
+        The LLM copies the invoice in focus into its entities ("bokfør den"),
+        so a result is only reused for the same client and invoice.
+        """
+        context = context or {}
+        return (
+            normalize_message(message),
+            str(context.get("client_id") or ""),
+            str(context.get("current_invoice_id") or ""),
+            context.get("last_intent"),
+        )
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: Tuple, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class IntentStats:
+    """Per-tier hit counts and latency"""
+
+    def __init__(self, tiers: Tuple[str, ...] = ("rules", "cache", "llm", "fallback")):
+        self._lock = threading.Lock()
+        self._tiers = {
+            tier: {"hits": 0, "total_ms": 0.0, "max_ms": 0.0} for tier in tiers
+        }
+
+    def record(self, tier: str, started: float) -> None:
+        """Record a classification resolved by tier (started = time.perf_counter())"""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            bucket = self._tiers.setdefault(tier, {"hits": 0, "total_ms": 0.0, "max_ms": 0.0})
+            bucket["hits"] += 1
+            bucket["total_ms"] += elapsed_ms
+            bucket["max_ms"] = max(bucket["max_ms"], elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(b["hits"] for b in self._tiers.values())
+            tiers = {
+                tier: {
+                    "hits": b["hits"],
+                    "hit_rate": round(b["hits"] / total, 4) if total else 0.0,
+                    "avg_ms": round(b["total_ms"] / b["hits"], 3) if b["hits"] else 0.0,
+                    "max_ms": round(b["max_ms"], 3),
+                }
+                for tier, b in self._tiers.items()
+            }
+        return {"total": total, "tiers": tiers}
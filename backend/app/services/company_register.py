@@ -0,0 +1,241 @@
+"""
+Company Register - Local mirror of Enhetsregisteret
+
+Imports the Enhetsregisteret bulk dataset into company_register and
+answers company lookups from it; app/services/brreg.py asks the mirror
+before the live API.
+
+The dataset is the CSV download from data.brreg.no (plain or .gz), whose
+headers are the API's field names flattened with dots
+(forretningsadresse.postnummer, naeringskode1.kode, ...). It is read in
+chunks of IMPORT_CHUNK_SIZE rows, mapped column-wise with pandas and
+written with INSERT ... ON CONFLICT (org_number) DO UPDATE. Entities that
+are no longer in the file are deleted once the whole file has been read.
+
+Usage:
+    python scripts/import_company_register.py enheter_alle.csv.gz
+"""
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Sequence
+
+import pandas as pd
+from sqlalchemy import String, any_, bindparam, delete, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models.company_register import CompanyRegisterEntry
+from app.services.search import LIKE_ESCAPE, TRIGRAM_MIN_LENGTH, escape_like
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 5000
+
+# Keys of a company record (the mirror's columns, as returned by lookups)
+RECORD_FIELDS = (
+    "org_number",
+    "name",
+    "organizational_form",
+    "organizational_form_desc",
+    "address",
+    "postal_code",
+    "city",
+    "municipality",
+    "municipality_number",
+    "nace_code",
+    "nace_description",
+    "registration_date",
+    "employees",
+)
+
+
+def record_from_entity(entity: Dict[str, Any]) -> Dict[str, Any]:
+    """Company record from an Enhetsregisteret API entity (business address, else postal address)"""
+    address_data = entity.get("forretningsadresse") or entity.get("postadresse") or {}
+    address_lines = address_data.get("adresse") or []
+    organizational_form = entity.get("organisasjonsform") or {}
+    nace = entity.get("naeringskode1") or {}
+    return {
+        "org_number": entity.get("organisasjonsnummer", ""),
+        "name": entity.get("navn", ""),
+        "organizational_form": organizational_form.get("kode"),
+        "organizational_form_desc": organizational_form.get("beskrivelse"),
+        "address": ", ".join(address_lines) if address_lines else None,
+        "postal_code": address_data.get("postnummer"),
+        "city": address_data.get("poststed"),
+        "municipality": address_data.get("kommune"),
+        "municipality_number": address_data.get("kommunenummer"),
+        "nace_code": nace.get("kode"),
+        "nace_description": nace.get("beskrivelse"),
+        "registration_date": entity.get("registreringsdatoEnhetsregisteret"),
+        "employees": entity.get("antallAnsatte"),
+    }
+
+
+def record_from_entry(entry: CompanyRegisterEntry) -> Dict[str, Any]:
+    record = {field: getattr(entry, field) for field in RECORD_FIELDS}
+    if isinstance(record["registration_date"], date):
+        record["registration_date"] = record["registration_date"].isoformat()
+    return record
+
+
+def register_records(frame: pd.DataFrame, imported_at: datetime) -> List[Dict[str, Any]]:
+    """
+    Rows for company_register from one chunk of the bulk CSV
+
+    Rows without a 9-digit org number or a name are dropped; when an org
+    number repeats within the chunk the last row wins.
+    """
+    headers = {str(column).strip().lower(): column for column in frame.columns}
+
+    def field(name: str) -> pd.Series:
+        column = headers.get(name.lower())
+        if column is None:
+            return pd.Series(pd.NA, index=frame.index, dtype="string")
+        values = frame[column].astype("string").str.strip()
+        return values.mask(values == "")
+
+    has_business_address = field("forretningsadresse.adresse").notna() | field("forretningsadresse.postnummer").notna()
+
+    def address_field(name: str) -> pd.Series:
+        return field(f"forretningsadresse.{name}").where(has_business_address, field(f"postadresse.{name}"))
+
+    org_numbers = field("organisasjonsnummer").str.replace(r"\D", "", regex=True)
+    names = field("navn")
+    records = pd.DataFrame({
+        "org_number": org_numbers,
+        "name": names,
+        "organizational_form": field("organisasjonsform.kode"),
+        "organizational_form_desc": field("organisasjonsform.beskrivelse"),
+        "address": address_field("adresse"),
+        "postal_code": address_field("postnummer"),
+        "city": address_field("poststed"),
+        "municipality": address_field("kommune"),
+        "municipality_number": address_field("kommunenummer"),
+        "nace_code": field("naeringskode1.kode"),
+        "nace_description": field("naeringskode1.beskrivelse"),
+        "registration_date": pd.to_datetime(
+            field("registreringsdatoEnhetsregisteret"), format="%Y-%m-%d", errors="coerce"
+        ).dt.date,
+        "employees": pd.to_numeric(field("antallAnsatte"), errors="coerce").astype("Int64"),
+    })
+
+    valid = org_numbers.str.fullmatch(r"\d{9}").fillna(False).astype(bool) & names.notna()
+    records = records[valid].drop_duplicates("org_number", keep="last").astype(object)
+    rows = records.where(records.notna(), None).to_dict("records")
+    for row in rows:
+        row["imported_at"] = imported_at
+    return rows
+
+
+def upsert_statement():
+    statement = insert(CompanyRegisterEntry)
+    return statement.on_conflict_do_update(
+        index_elements=[CompanyRegisterEntry.org_number],
+        set_={name: statement.excluded[name] for name in RECORD_FIELDS[1:] + ("imported_at",)},
+    )
+
+
+async def import_register(
+    path: str,
+    session_factory=AsyncSessionLocal,
+    chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Dict[str, int]:
+    """
+    Load the Enhetsregisteret bulk CSV into company_register
+
+    Each chunk is committed on its own, so an interrupted import leaves
+    the rows read so far; entities missing from the file are only
+    removed after the last chunk.
+
+    Returns:
+        {"imported": rows written, "skipped": rows without org number or name (or
+        repeated within a chunk), "removed": stale rows deleted}
+    """
+    started = datetime.utcnow()
+    stats = {"imported": 0, "skipped": 0, "removed": 0}
+    statement = upsert_statement()
+
+    reader = pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size)
+    async with session_factory() as db:
+        while True:
+            frame = await asyncio.to_thread(next, reader, None)
+            if frame is None:
+                break
+            rows = register_records(frame, started)
+            if rows:
+                await db.execute(statement, rows)
+                await db.commit()
+            stats["imported"] += len(rows)
+            stats["skipped"] += len(frame) - len(rows)
+            logger.info(f"Company register import: {stats['imported']} entities written")
+
+        result = await db.execute(
+            delete(CompanyRegisterEntry).where(CompanyRegisterEntry.imported_at < started)
+        )
+        stats["removed"] = result.rowcount
+        await db.commit()
+
+    logger.info(
+        f"Company register import from {path} finished: {stats['imported']} imported, "
+        f"{stats['skipped']} skipped, {stats['removed']} removed"
+    )
+    return stats
+
+
+# === LOOKUPS ===
+
+def name_search_query(term: str, limit: int):
+    """
+    Entities matching a search box input, best match first
+
+    Nine digits are an exact org number lookup. Shorter than a trigram:
+    prefix match on lower(name); otherwise substring match on the
+    trigram index, ordered by similarity.
+    """
+    term = term.strip()
+    digits = term.replace(" ", "")
+    query = select(CompanyRegisterEntry)
+    if len(digits) == 9 and digits.isdigit():
+        return query.where(CompanyRegisterEntry.org_number == digits)
+
+    name = CompanyRegisterEntry.name
+    if len(term) < TRIGRAM_MIN_LENGTH:
+        return (
+            query.where(func.lower(name).like(f"{escape_like(term.lower())}%", escape=LIKE_ESCAPE))
+            .order_by(name)
+            .limit(limit)
+        )
+    return (
+        query.where(name.ilike(f"%{escape_like(term)}%", escape=LIKE_ESCAPE))
+        .order_by(func.similarity(name, term).desc(), name)
+        .limit(limit)
+    )
+
+
+def org_numbers_query(org_numbers: Sequence[str]):
+    """Entities for many org numbers in one query (one array parameter)"""
+    return select(CompanyRegisterEntry).where(
+        CompanyRegisterEntry.org_number == any_(bindparam("org_numbers", list(org_numbers), type_=ARRAY(String)))
+    )
+
+
+async def register_is_loaded(db: AsyncSession) -> bool:
+    """Whether the bulk dataset has been imported"""
+    return (await db.scalar(select(CompanyRegisterEntry.org_number).limit(1))) is not None
+
+
+async def search_register(db: AsyncSession, term: str, limit: int = 10) -> List[Dict[str, Any]]:
+    result = await db.execute(name_search_query(term, limit))
+    return [record_from_entry(entry) for entry in result.scalars().all()]
+
+
+async def lookup_register(db: AsyncSession, org_numbers: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Record per org number found in the mirror"""
+    if not org_numbers:
+        return {}
+    result = await db.execute(org_numbers_query(org_numbers))
+    return {entry.org_number: record_from_entry(entry) for entry in result.scalars().all()}
+
@@ -2,177 +2,400 @@
 Contact Import Service - Bulk CSV/Excel Import for Suppliers and Customers
 
 Handles parsing, validation, and bulk creation of contact records.
+
+A 20k-row register used to take minutes: every row went through
+iterrows(), one duplicate SELECT and its own number lookup. The import now
+works on whole columns:
+
+- Validation is vectorized: org numbers are cleaned and checked against the
+  MOD11 check digit, phone numbers and e-mail addresses are normalized, and
+  every failing row gets an entry in the error report (row = Excel row)
+- Existing contacts are found with ONE lookup of all org numbers in the file
+- Supplier/customer numbers are allocated as one block under a
+  transaction-level advisory lock
+- Rows are written with chunked INSERT ... ON CONFLICT (client_id,
+  org_number): existing contacts are skipped, or have their name, contact
+  and address details updated when update_existing is set (blank cells
+  never overwrite stored values)
 """
-from typing import List, Dict, Any, Optional, Tuple
-import pandas as pd
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
 from io import BytesIO
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import BigInteger, String, any_, bindparam, cast, func, literal_column, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-import re
 
-from app.models.supplier import Supplier
 from app.models.customer import Customer
+from app.models.supplier import Supplier
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 1000
+NUMBER_WIDTH = 5
+
+# MOD11 weights for the first eight digits of a Norwegian organization number
+ORG_NUMBER_WEIGHTS = np.array([3, 2, 7, 6, 5, 4, 3, 2])
+EMAIL_PATTERN = r"[^@\s]+@[^@\s]+\.[^@\s.]+"
+
+NAME_REQUIRED = "Navn er påkrevd"
+ORG_NUMBER_LENGTH = "Ugyldig organisasjonsnummer (må være 9 siffer)"
+ORG_NUMBER_CHECKSUM = "Ugyldig organisasjonsnummer (feil kontrollsiffer)"
+
+
+@dataclass(frozen=True)
+class ContactTable:
+    """How one contact register is imported"""
+    model: type
+    number_column: str
+    name_column: str
+    org_constraint: str
+    org_required: bool
+    default_payment_days: int
+
+
+SUPPLIERS = ContactTable(
+    model=Supplier,
+    number_column="supplier_number",
+    name_column="company_name",
+    org_constraint="uq_client_supplier_org_number",
+    org_required=True,
+    default_payment_days=30,
+)
+
+CUSTOMERS = ContactTable(
+    model=Customer,
+    number_column="customer_number",
+    name_column="name",
+    org_constraint="uq_client_customer_org_number",
+    org_required=False,
+    default_payment_days=14,
+)
+
+
+async def allocate_numbers(db: AsyncSession, table: ContactTable, client_id, count: int) -> List[str]:
+    """
+    Reserve `count` consecutive contact numbers after the highest numeric one
+
+    Takes a transaction-level advisory lock per (register, client), so a
+    concurrent import waits until this transaction commits instead of
+    allocating the same block.
+    """
+    column = getattr(table.model, table.number_column)
+    await db.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:namespace), hashtext(:client_id))"),
+        {"namespace": table.number_column, "client_id": str(client_id)}
+    )
+    last = await db.scalar(
+        select(func.max(cast(column, BigInteger)))
+        .where(table.model.client_id == client_id, column.regexp_match(r"^\d{1,18}$"))
+    )
+    start = (last or 0) + 1
+    return [str(number).zfill(NUMBER_WIDTH) for number in range(start, start + count)]
 
 
 async def generate_next_supplier_number(db: AsyncSession, client_id) -> str:
     """Generate next sequential supplier number"""
-    result = await db.execute(
-        select(Supplier)
-        .where(Supplier.client_id == client_id)
-        .order_by(Supplier.supplier_number.desc())
-        .limit(1)
-    )
-    last_supplier = result.scalar_one_or_none()
-    
-    if last_supplier and last_supplier.supplier_number.isdigit():
-        next_number = int(last_supplier.supplier_number) + 1
-    else:
-        next_number = 1
-    
-    return str(next_number).zfill(5)
+    return (await allocate_numbers(db, SUPPLIERS, client_id, 1))[0]
 
 
 async def generate_next_customer_number(db: AsyncSession, client_id) -> str:
     """Generate next sequential customer number"""
-    result = await db.execute(
-        select(Customer)
-        .where(Customer.client_id == client_id)
-        .order_by(Customer.customer_number.desc())
-        .limit(1)
-    )
-    last_customer = result.scalar_one_or_none()
-    
-    if last_customer and last_customer.customer_number.isdigit():
-        next_number = int(last_customer.customer_number) + 1
-    else:
-        next_number = 1
-    
-    return str(next_number).zfill(5)
+    return (await allocate_numbers(db, CUSTOMERS, client_id, 1))[0]
 
 
 class ContactImportResult:
     """Result of a bulk import operation"""
-    
+
     def __init__(self):
         self.created = 0
+        self.updated = 0
         self.skipped = 0
         self.errors: List[Dict[str, Any]] = []
-    
+        self.warnings: List[Dict[str, Any]] = []
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "created": self.created,
+            "updated": self.updated,
             "skipped": self.skipped,
             "error_count": len(self.errors),
-            "errors": self.errors
+            "errors": self.errors,
+            "warnings": self.warnings
         }
 
 
 def parse_file(file_content: bytes, filename: str) -> pd.DataFrame:
     """
     Parse uploaded CSV or Excel file into DataFrame
-    
+
     Args:
         file_content: Raw file bytes
         filename: Original filename (used to detect format)
-    
+
     Returns:
         pandas DataFrame with contact data
-    
+
     Raises:
         ValueError: If file format is invalid or parsing fails
     """
     try:
         file_obj = BytesIO(file_content)
-        
+
         if filename.endswith('.csv'):
             df = pd.read_csv(file_obj, encoding='utf-8')
         elif filename.endswith(('.xlsx', '.xls')):
             df = pd.read_excel(file_obj)
         else:
             raise ValueError(f"Unsupported file format: {filename}")
-        
+
         # Strip whitespace from column names
         df.columns = df.columns.str.strip()
-        
+
         # Replace NaN with None
         df = df.where(pd.notnull(df), None)
-        
+
         return df
-    
+
     except Exception as e:
         raise ValueError(f"Failed to parse file: {str(e)}")
 
 
-def validate_org_number(org_number: Optional[str]) -> Optional[str]:
+# === VECTORIZED VALIDATION ===
+
+def text_cells(values: pd.Series) -> pd.Series:
+    """Column as stripped strings, <NA> for blank cells"""
+    cells = values.astype("string").str.strip()
+    return cells.mask(cells == "")
+
+
+def number_cells(values: pd.Series) -> pd.Series:
+    """Like text_cells, for number-like columns pandas may have read as floats (923456789.0)"""
+    return text_cells(values).str.replace(r"^(\d+)\.0+$", r"\1", regex=True)
+
+
+def normalize_org_numbers(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
     """
-    Validate and clean Norwegian organization number
-    
+    Clean Norwegian organization numbers and verify the MOD11 check digit
+
     Returns:
-        Cleaned org_number (digits only) or None if invalid
+        (org_numbers, errors): 9-digit strings (<NA> for blank or invalid
+        cells) and the validation message for each non-blank invalid cell
     """
-    if not org_number:
-        return None
-    
-    # Remove spaces and non-digits
-    cleaned = re.sub(r'\D', '', str(org_number))
-    
-    # Must be 9 digits
-    if len(cleaned) != 9:
-        return None
-    
-    return cleaned
-
-
-def validate_phone(phone: Optional[str]) -> Optional[str]:
-    """Clean and validate phone number"""
-    if not phone:
-        return None
-    
-    # Remove spaces and non-digits
-    cleaned = re.sub(r'\D', '', str(phone))
-    
-    return cleaned if cleaned else None
-
-
-def validate_email(email: Optional[str]) -> Optional[str]:
-    """Basic email validation"""
-    if not email:
-        return None
-    
-    email = str(email).strip()
-    
-    # Basic email pattern
-    if '@' in email and '.' in email.split('@')[1]:
-        return email
-    
-    return None
+    cells = number_cells(values)
+    digits = cells.str.replace(r"\D", "", regex=True)
+    nine_digits = digits.str.fullmatch(r"\d{9}").fillna(False).astype(bool)
 
+    valid = pd.Series(False, index=values.index)
+    if nine_digits.any():
+        matrix = np.frombuffer("".join(digits[nine_digits]).encode("ascii"), dtype=np.uint8)
+        matrix = matrix.reshape(-1, 9).astype(np.int64) - ord("0")
+        # Remainder 1 gives check digit 10, which no digit can match
+        check_digit = (11 - matrix[:, :8] @ ORG_NUMBER_WEIGHTS % 11) % 11
+        valid[nine_digits] = check_digit == matrix[:, 8]
 
-async def import_suppliers(
+    errors = pd.Series(None, index=values.index, dtype=object)
+    errors[cells.notna() & ~nine_digits] = ORG_NUMBER_LENGTH
+    errors[nine_digits & ~valid] = ORG_NUMBER_CHECKSUM
+    return digits.where(valid), errors
+
+
+def normalize_phones(values: pd.Series) -> pd.Series:
+    """Phone numbers as digits only, <NA> when nothing is left"""
+    digits = number_cells(values).str.replace(r"\D", "", regex=True)
+    return digits.mask(digits == "")
+
+
+def normalize_emails(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Trimmed e-mail addresses
+
+    Returns:
+        (emails, rejected): valid addresses (<NA> otherwise) and a mask of
+        non-blank cells that were not an address
+    """
+    cells = text_cells(values)
+    valid = cells.str.fullmatch(EMAIL_PATTERN).fillna(False).astype(bool)
+    return cells.where(valid), cells.notna() & ~valid
+
+
+def payment_terms(values: pd.Series, default: int) -> pd.Series:
+    """Days from terms like "30 dager" (first number in the cell)"""
+    days = text_cells(values).str.extract(r"(\d+)", expand=False)
+    return pd.to_numeric(days, errors="coerce").fillna(default).astype(int)
+
+
+def postal_codes(values: pd.Series, countries: pd.Series) -> pd.Series:
+    """Postal codes; Norwegian codes read as numbers get their leading zero back (150 -> 0150)"""
+    codes = number_cells(values)
+    norwegian = countries.str.lower().isin(["norge", "norway", "no"])
+    lost_zero = codes.str.fullmatch(r"\d{1,3}").fillna(False).astype(bool) & norwegian
+    return codes.mask(lost_zero, codes.str.zfill(4))
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def _report(rows: np.ndarray, messages: pd.Series, column: str) -> List[Dict[str, Any]]:
+    flagged = messages.notna().to_numpy()
+    return [
+        {"row": int(row), "column": column, "error": message}
+        for row, message in zip(rows[flagged], messages[flagged])
+    ]
+
+
+def prepare_contacts(df: pd.DataFrame, table: ContactTable) -> Tuple[pd.DataFrame, List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Validate and normalize the uploaded rows for one register
+
+    Returns:
+        (contacts, errors, warnings): one row per importable contact with a
+        `row` column holding its Excel row number, and the per-row reports
+    """
+    rows = np.arange(len(df)) + 2  # Excel row (header = 1, first data = 2)
+    errors: List[Dict[str, Any]] = []
+    warnings: List[Dict[str, Any]] = []
+
+    names = text_cells(_column(df, 'navn'))
+    name_errors = pd.Series(None, index=df.index, dtype=object).mask(names.isna(), NAME_REQUIRED)
+    errors += _report(rows, name_errors, 'navn')
+    rejected = names.isna().to_numpy().copy()
+
+    org_numbers, org_errors = normalize_org_numbers(_column(df, 'org_nummer'))
+    if table.org_required:
+        org_errors = org_errors.mask(org_numbers.isna() & org_errors.isna(), ORG_NUMBER_LENGTH)
+        org_errors[rejected] = None  # One error per row, name first
+        errors += _report(rows, org_errors, 'org_nummer')
+        rejected |= org_errors.notna().to_numpy()
+    else:
+        # Customers without a valid org number are imported as private persons
+        org_errors[rejected] = None
+        org_warnings = (org_errors.dropna() + " - importert som privatperson").reindex(df.index)
+        warnings += _report(rows, org_warnings, 'org_nummer')
+
+    # The same org number twice in one file: the first row wins
+    accepted = org_numbers.where(~rejected)
+    repeated = accepted.notna() & accepted.duplicated(keep="first")
+    if repeated.any():
+        first_row = pd.Series(rows, index=df.index)[accepted.notna()].groupby(accepted).transform("first")
+        duplicates = pd.Series(None, index=df.index, dtype=object)
+        duplicates[repeated] = "Organisasjonsnummer finnes flere ganger i filen (første gang på rad " \
+            + first_row[repeated].astype(str) + ")"
+        errors += _report(rows, duplicates, 'org_nummer')
+        rejected |= repeated.to_numpy()
+
+    emails, bad_emails = normalize_emails(_column(df, 'epost'))
+    email_warnings = pd.Series(None, index=df.index, dtype=object).mask(
+        bad_emails & ~rejected, "Ugyldig e-postadresse - importert uten"
+    )
+    warnings += _report(rows, email_warnings, 'epost')
+
+    countries = text_cells(_column(df, 'land')).fillna('Norge')
+    contacts = pd.DataFrame({
+        'row': rows,
+        'name': names,
+        'org_number': org_numbers,
+        'address_line1': text_cells(_column(df, 'adresse')),
+        'postal_code': postal_codes(_column(df, 'postnummer'), countries),
+        'city': text_cells(_column(df, 'poststed')),
+        'country': countries,
+        'email': emails,
+        'phone': normalize_phones(_column(df, 'telefon')),
+        'bank_account': number_cells(_column(df, 'kontonummer')),
+        'payment_terms_days': payment_terms(_column(df, 'betalingsbetingelser'), table.default_payment_days),
+    }, index=df.index)
+
+    errors.sort(key=lambda entry: entry["row"])
+    warnings.sort(key=lambda entry: entry["row"])
+    return contacts[~rejected], errors, warnings
+
+
+# === DATABASE ===
+
+def existing_contacts_query(table: ContactTable, client_id, org_numbers: List[str]):
+    """Org number and contact number of the registered contacts among org_numbers (one array parameter)"""
+    model = table.model
+    return (
+        select(model.org_number, getattr(model, table.number_column))
+        .where(
+            model.client_id == client_id,
+            model.org_number == any_(bindparam("org_numbers", org_numbers, type_=ARRAY(String)))
+        )
+    )
+
+
+async def existing_contacts(db: AsyncSession, table: ContactTable, client_id, org_numbers: List[str]) -> Dict[str, str]:
+    """Contact number per org number already registered for the client"""
+    if not org_numbers:
+        return {}
+    result = await db.execute(existing_contacts_query(table, client_id, org_numbers))
+    return dict(result.all())
+
+
+def contact_records(contacts: pd.DataFrame, table: ContactTable, client_id, numbers: List[str]) -> List[Dict[str, Any]]:
+    """Insert parameters for the prepared contacts, in order"""
+    frame = contacts.drop(columns=['row', 'name']).astype(object)
+    frame = frame.where(frame.notna(), None)
+    frame[table.name_column] = contacts['name'].astype(object)
+    frame[table.number_column] = numbers
+    frame['client_id'] = client_id
+    frame['currency'] = 'NOK'
+    frame['status'] = 'active'
+    if table is CUSTOMERS:
+        frame = frame.drop(columns=['bank_account'])
+        frame['is_company'] = contacts['org_number'].notna().to_numpy()
+        frame['reminder_fee'] = 0
+        frame['use_kid'] = False
+
+    now = datetime.utcnow()
+    records = frame.to_dict("records")
+    for record in records:
+        record['id'] = uuid.uuid4()
+        record['created_at'] = record['updated_at'] = now
+        record['payment_terms_days'] = int(record['payment_terms_days'])
+        if 'is_company' in record:
+            record['is_company'] = bool(record['is_company'])
+    return records
+
+
+def upsert_statement(table: ContactTable, update_existing: bool):
+    """INSERT ... ON CONFLICT (client_id, org_number) returning whether each row was inserted"""
+    model = table.model
+    statement = insert(model)
+    if update_existing:
+        update_columns = [table.name_column, 'address_line1', 'postal_code', 'city', 'country', 'email', 'phone']
+        if table is SUPPLIERS:
+            update_columns.append('bank_account')
+        assignments = {
+            name: func.coalesce(statement.excluded[name], getattr(model, name)) for name in update_columns
+        }
+        assignments['updated_at'] = statement.excluded.updated_at
+        statement = statement.on_conflict_do_update(constraint=table.org_constraint, set_=assignments)
+    else:
+        statement = statement.on_conflict_do_nothing(constraint=table.org_constraint)
+    # xmax is 0 for a freshly inserted row and set for one updated in place
+    return statement.returning(literal_column("xmax = 0").label("inserted"))
+
+
+async def import_contacts(
     db: AsyncSession,
     df: pd.DataFrame,
-    client_id
+    client_id,
+    table: ContactTable,
+    update_existing: bool = False
 ) -> ContactImportResult:
-    """
-    Bulk import suppliers from DataFrame
-    
-    Expected columns:
-    - navn (required)
-    - org_nummer (required)
-    - epost
-    - telefon
-    - adresse
-    - postnummer
-    - poststed
-    - land
-    - kontonummer
-    - betalingsbetingelser (e.g., "30 dager")
-    - leverandor_type (goods/services)
-    """
+    """Validate, number and upsert one uploaded register (see import_suppliers/import_customers)"""
     result = ContactImportResult()
-    
-    # Validate required columns
-    required_cols = ['navn', 'org_nummer']
+
+    required_cols = ['navn', 'org_nummer'] if table.org_required else ['navn']
     missing_cols = [col for col in required_cols if col not in df.columns]
     if missing_cols:
         result.errors.append({
@@ -180,146 +403,92 @@ async def import_suppliers(
             "error": f"Missing required columns: {', '.join(missing_cols)}"
         })
         return result
-    
-    # Get starting supplier number
-    last_result = await db.execute(
-        select(Supplier)
-        .where(Supplier.client_id == client_id)
-        .order_by(Supplier.supplier_number.desc())
-        .limit(1)
-    )
-    last_supplier = last_result.scalar_one_or_none()
-    
-    if last_supplier and last_supplier.supplier_number.isdigit():
-        current_number = int(last_supplier.supplier_number)
-    else:
-        current_number = 0
-    
-    for idx, row in df.iterrows():
-        row_num = idx + 2  # Excel row (header = 1, first data = 2)
-        
-        try:
-            # Validate required fields
-            navn = row.get('navn')
-            if not navn or pd.isna(navn):
-                result.errors.append({
-                    "row": row_num,
-                    "error": "Navn er påkrevd"
-                })
-                continue
-            
-            org_nummer = validate_org_number(row.get('org_nummer'))
-            if not org_nummer:
-                result.errors.append({
-                    "row": row_num,
-                    "error": "Ugyldig organisasjonsnummer (må være 9 siffer)"
-                })
-                continue
-            
-            # Check if supplier already exists
-            existing = await db.execute(
-                select(Supplier).where(
-                    Supplier.client_id == client_id,
-                    Supplier.org_number == org_nummer
-                )
-            )
-            if existing.scalar_one_or_none():
-                result.skipped += 1
-                continue
-            
-            # Parse payment terms (e.g., "30 dager" -> 30)
-            betalingsbetingelser = row.get('betalingsbetingelser', '30 dager')
-            payment_days = 30
-            if betalingsbetingelser:
-                match = re.search(r'(\d+)', str(betalingsbetingelser))
-                if match:
-                    payment_days = int(match.group(1))
-            
-            # Build address
-            address = {}
-            if row.get('adresse'):
-                address['line1'] = str(row.get('adresse'))
-            if row.get('postnummer'):
-                address['postal_code'] = str(row.get('postnummer'))
-            if row.get('poststed'):
-                address['city'] = str(row.get('poststed'))
-            if row.get('land'):
-                address['country'] = str(row.get('land'))
-            else:
-                address['country'] = 'Norge'
-            
-            # Build contact
-            contact = {}
-            if row.get('epost'):
-                email = validate_email(row.get('epost'))
-                if email:
-                    contact['email'] = email
-            if row.get('telefon'):
-                phone = validate_phone(row.get('telefon'))
-                if phone:
-                    contact['phone'] = phone
-            
-            # Build financial
-            financial = {
-                'payment_terms_days': payment_days,
-                'currency': 'NOK'
-            }
-            if row.get('kontonummer'):
-                financial['bank_account'] = str(row.get('kontonummer'))
-            
-            # Generate supplier number
-            current_number += 1
-            supplier_number = str(current_number).zfill(5)
-            
-            # Create supplier
-            supplier = Supplier(
-                client_id=client_id,
-                supplier_number=supplier_number,
-                company_name=str(navn),
-                org_number=org_nummer,
-                address_line1=address.get('line1') if address else None,
-                postal_code=address.get('postal_code') if address else None,
-                city=address.get('city') if address else None,
-                country=address.get('country', 'Norge') if address else 'Norge',
-                email=contact.get('email') if contact else None,
-                phone=contact.get('phone') if contact else None,
-                bank_account=financial.get('bank_account') if financial else None,
-                payment_terms_days=financial.get('payment_terms_days', 30),
-                currency=financial.get('currency', 'NOK'),
-                status='active'
-            )
-            
-            db.add(supplier)
-            result.created += 1
-        
-        except Exception as e:
-            result.errors.append({
-                "row": row_num,
-                "error": str(e)
-            })
-    
-    # Commit all at once
+
+    contacts, result.errors, result.warnings = prepare_contacts(df, table)
+
     try:
+        existing = await existing_contacts(
+            db, table, client_id, contacts['org_number'].dropna().tolist()
+        )
+        known = contacts['org_number'].isin(list(existing)).to_numpy()
+        if not update_existing:
+            result.skipped += int(known.sum())
+            contacts = contacts[~known]
+            known = known[~known]
+
+        # Existing contacts keep their number, new ones get the next block
+        new_count = int((~known).sum())
+        new_numbers = iter(await allocate_numbers(db, table, client_id, new_count) if new_count else [])
+        numbers = [
+            existing[org_number] if is_known else next(new_numbers)
+            for org_number, is_known in zip(contacts['org_number'], known)
+        ]
+        records = contact_records(contacts, table, client_id, numbers)
+
+        statement = upsert_statement(table, update_existing)
+        for start in range(0, len(records), IMPORT_CHUNK_SIZE):
+            chunk = records[start:start + IMPORT_CHUNK_SIZE]
+            inserted = (await db.execute(statement, chunk)).scalars().all()
+            result.created += sum(inserted)
+            result.updated += len(inserted) - sum(inserted)
+            # Rows registered by someone else since the lookup
+            result.skipped += len(chunk) - len(inserted)
+
         await db.commit()
     except Exception as e:
         await db.rollback()
+        logger.error(f"Bulk import into {table.model.__tablename__} failed for client {client_id}: {e}")
         result.errors.append({
             "row": 0,
             "error": f"Database error: {str(e)}"
         })
         result.created = 0
-    
+        result.updated = 0
+
+    logger.info(
+        f"Imported {table.model.__tablename__} for client {client_id}: {result.created} created, "
+        f"{result.updated} updated, {result.skipped} skipped, {len(result.errors)} errors"
+    )
     return result
 
 
+async def import_suppliers(
+    db: AsyncSession,
+    df: pd.DataFrame,
+    client_id,
+    update_existing: bool = False
+) -> ContactImportResult:
+    """
+    Bulk import suppliers from DataFrame
+
+    Expected columns:
+    - navn (required)
+    - org_nummer (required)
+    - epost
+    - telefon
+    - adresse
+    - postnummer
+    - poststed
+    - land
+    - kontonummer
+    - betalingsbetingelser (e.g., "30 dager")
+    - leverandor_type (goods/services)
+
+    Suppliers whose org number is already registered are skipped, or
+    updated from the file when update_existing is set.
+    """
+    return await import_contacts(db, df, client_id, SUPPLIERS, update_existing)
+
+
 async def import_customers(
     db: AsyncSession,
     df: pd.DataFrame,
-    client_id
+    client_id,
+    update_existing: bool = False
 ) -> ContactImportResult:
     """
     Bulk import customers from DataFrame
-    
+
     Expected columns:
     - navn (required)
     - org_nummer (required for B2B)
@@ -332,147 +501,9 @@ async def import_customers(
     - kontonummer
     - betalingsbetingelser (e.g., "14 dager")
     - kunde_type (b2b/b2c)
+
+    Customers with a valid org number are companies; the others are
+    imported as private persons. Existing org numbers are skipped, or
+    updated when update_existing is set.
     """
-    result = ContactImportResult()
-    
-    # Validate required columns
-    required_cols = ['navn']
-    missing_cols = [col for col in required_cols if col not in df.columns]
-    if missing_cols:
-        result.errors.append({
-            "row": 0,
-            "error": f"Missing required columns: {', '.join(missing_cols)}"
-        })
-        return result
-    
-    # Get starting customer number
-    last_result = await db.execute(
-        select(Customer)
-        .where(Customer.client_id == client_id)
-        .order_by(Customer.customer_number.desc())
-        .limit(1)
-    )
-    last_customer = last_result.scalar_one_or_none()
-    
-    if last_customer and last_customer.customer_number.isdigit():
-        current_number = int(last_customer.customer_number)
-    else:
-        current_number = 0
-    
-    for idx, row in df.iterrows():
-        row_num = idx + 2  # Excel row (header = 1, first data = 2)
-        
-        try:
-            # Validate required fields
-            navn = row.get('navn')
-            if not navn or pd.isna(navn):
-                result.errors.append({
-                    "row": row_num,
-                    "error": "Navn er påkrevd"
-                })
-                continue
-            
-            # Org number validation (optional for B2C)
-            org_nummer = None
-            if row.get('org_nummer'):
-                org_nummer = validate_org_number(row.get('org_nummer'))
-                
-                # Check if customer already exists
-                if org_nummer:
-                    existing = await db.execute(
-                        select(Customer).where(
-                            Customer.client_id == client_id,
-                            Customer.org_number == org_nummer
-                        )
-                    )
-                    if existing.scalar_one_or_none():
-                        result.skipped += 1
-                        continue
-            
-            # Parse payment terms
-            betalingsbetingelser = row.get('betalingsbetingelser', '14 dager')
-            payment_days = 14
-            if betalingsbetingelser:
-                match = re.search(r'(\d+)', str(betalingsbetingelser))
-                if match:
-                    payment_days = int(match.group(1))
-            
-            # Build address
-            address = {}
-            if row.get('adresse'):
-                address['line1'] = str(row.get('adresse'))
-            if row.get('postnummer'):
-                address['postal_code'] = str(row.get('postnummer'))
-            if row.get('poststed'):
-                address['city'] = str(row.get('poststed'))
-            if row.get('land'):
-                address['country'] = str(row.get('land'))
-            else:
-                address['country'] = 'Norge'
-            
-            # Build contact
-            contact = {}
-            if row.get('epost'):
-                email = validate_email(row.get('epost'))
-                if email:
-                    contact['email'] = email
-            if row.get('telefon'):
-                phone = validate_phone(row.get('telefon'))
-                if phone:
-                    contact['phone'] = phone
-            
-            # Build financial
-            financial = {
-                'payment_terms_days': payment_days,
-                'currency': 'NOK',
-                'reminder_fee': 0
-            }
-            
-            # Customer type
-            is_company = bool(org_nummer)  # If has org_number, it's a company
-            
-            # Generate customer number
-            current_number += 1
-            customer_number = str(current_number).zfill(5)
-            
-            # Create customer
-            customer = Customer(
-                client_id=client_id,
-                customer_number=customer_number,
-                is_company=is_company,
-                name=str(navn),
-                org_number=org_nummer,
-                address_line1=address.get('line1') if address else None,
-                postal_code=address.get('postal_code') if address else None,
-                city=address.get('city') if address else None,
-                country=address.get('country', 'Norge') if address else 'Norge',
-                email=contact.get('email') if contact else None,
-                phone=contact.get('phone') if contact else None,
-                payment_terms_days=financial.get('payment_terms_days', 14),
-                currency=financial.get('currency', 'NOK'),
-                reminder_fee=financial.get('reminder_fee', 0),
-                use_kid=False,
-                status='active'
-            )
-            
-            db.add(customer)
-            result.created += 1
-        
-        except Exception as e:
-            result.errors.append({
-                "row": row_num,
-                "error": str(e)
-            })
-    
-    # Commit all at once
-    try:
-        await db.commit()
-    except Exception as e:
-        await db.rollback()
-        result.errors.append({
-            "row": 0,
-            "error": f"Database error: {str(e)}"
-        })
-        result.created = 0
-    
-    return result
+    return await import_contacts(db, df, client_id, CUSTOMERS, update_existing)
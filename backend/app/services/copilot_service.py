@@ -17,6 +17,7 @@ from app.models.review_queue import ReviewQueue
 from app.models.chart_of_accounts import Account
 from app.models.accrual import Accrual
 from app.config import settings
+from app.utils.sse import EventEmitter
 import anthropic
 
 
@@ -29,7 +30,7 @@ class CopilotService:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not configured")
         
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
         self.model = "claude-sonnet-4-5"
     
     async def chat(
@@ -54,7 +55,7 @@ class CopilotService:
         system_prompt = await self._build_system_prompt(context, db)
         
         # Call Claude
-        response = self.client.messages.create(
+        response = await self.client.messages.create(
             model=self.model,
             max_tokens=1024,
             system=system_prompt,
@@ -73,6 +74,57 @@ class CopilotService:
             "suggestions": suggestions
         }
     
+    async def chat_stream(
+        self,
+        message: str,
+        context: Dict[str, Any],
+        db: AsyncSession,
+        emit: EventEmitter
+    ) -> Dict[str, Any]:
+        """
+        Streaming variant of chat().
+        
+        Proactive suggestions for the current item are sent as an "action"
+        event before the model is called, then the answer is sent as
+        "token" events while it is generated.
+        
+        Returns:
+            Dict with response and suggestions (proactive + extracted)
+        """
+        
+        proactive = []
+        if context.get("page"):
+            item_id = context.get("item_id")
+            proactive = (await self.suggest(
+                context=context["page"],
+                item_id=UUID(item_id) if item_id else None,
+                db=db
+            ))["suggestions"]
+            if proactive:
+                await emit("action", {"type": "suggestions", "data": {"suggestions": proactive}})
+        
+        system_prompt = await self._build_system_prompt(context, db)
+        
+        parts = []
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=1024,
+            system=system_prompt,
+            messages=[
+                {"role": "user", "content": message}
+            ]
+        ) as stream:
+            async for text in stream.text_stream:
+                parts.append(text)
+                await emit("token", {"text": text})
+        
+        response_text = "".join(parts)
+        
+        return {
+            "response": response_text,
+            "suggestions": proactive + self._extract_suggestions(response_text)
+        }
+    
     async def suggest(
         self,
         context: str,
@@ -71,7 +71,9 @@ class CorrectionsLearner:
             # 3. Create General Ledger entry with corrected booking
             from app.services.booking_service import _generate_voucher_number
             
-            voucher_number = await _generate_voucher_number(self.db, invoice.client_id)
+            voucher_number = await _generate_voucher_number(
+                self.db, invoice.client_id, invoice.invoice_date.year
+            )
             
             gl_entry = GeneralLedger(
                 id=uuid4(),
@@ -4,11 +4,12 @@ Currency Rate Service - Fetch and manage exchange rates
 import httpx
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, desc, select
+from sqlalchemy import and_, select
 
 from app.models.currency_rate import CurrencyRate
+from app.services.currency_rate_table import TableRate, rate_table
 
 
 class CurrencyRateService:
@@ -19,6 +20,9 @@ class CurrencyRateService:
     - Norges Bank API: USD, EUR, SEK, DKK
     - CoinGecko API: BTC
     - Base currency: NOK
+    
+    Lookups and conversions read the process-wide rate table
+    (app/services/currency_rate_table.py), loaded from currency_rates once.
     """
     
     # Supported currencies
@@ -191,6 +195,7 @@ class CurrencyRateService:
             existing.updated_at = datetime.utcnow()
             await self.db.commit()
             await self.db.refresh(existing)
+            rate_table.invalidate()
             return existing
         else:
             # Create new rate
@@ -204,6 +209,7 @@ class CurrencyRateService:
             self.db.add(new_rate)
             await self.db.commit()
             await self.db.refresh(new_rate)
+            rate_table.invalidate()
             return new_rate
     
     async def update_all_rates(self) -> Dict[str, bool]:
@@ -229,31 +235,23 @@ class CurrencyRateService:
                 print(f"Error saving rate for {currency}: {e}")
                 results[currency] = False
         
+        if any(results.values()):
+            await rate_table.reload(self.db)
+        
         return results
     
-    async def get_latest_rates(self) -> Dict[str, CurrencyRate]:
+    async def get_latest_rates(self) -> Dict[str, TableRate]:
         """
         Get the latest rates for all currencies
         
         Returns:
-            Dict mapping currency code to CurrencyRate object
+            Dict mapping currency code to its most recent rate
         """
-        rates = {}
-        
-        for currency in self.ALL_CURRENCIES:
-            result = await self.db.execute(
-                select(CurrencyRate)
-                .filter(CurrencyRate.currency_code == currency)
-                .order_by(desc(CurrencyRate.rate_date))
-            )
-            latest = result.scalars().first()
-            
-            if latest:
-                rates[currency] = latest
-        
-        return rates
+        await rate_table.ensure_loaded(self.db)
+        latest = rate_table.latest()
+        return {currency: latest[currency] for currency in self.ALL_CURRENCIES if currency in latest}
     
-    async def get_rate_on_date(self, currency: str, target_date: date) -> Optional[CurrencyRate]:
+    async def get_rate_on_date(self, currency: str, target_date: date) -> Optional[TableRate]:
         """
         Get the rate for a specific currency on a specific date
         Falls back to most recent rate before that date if exact match not found
@@ -263,43 +261,17 @@ class CurrencyRateService:
             target_date: Date to get rate for
         
         Returns:
-            CurrencyRate object or None
+            Rate (same attributes as CurrencyRate) or None
         """
-        # Try exact match first
-        result = await self.db.execute(
-            select(CurrencyRate).filter(
-                and_(
-                    CurrencyRate.currency_code == currency,
-                    CurrencyRate.rate_date == target_date
-                )
-            )
-        )
-        exact = result.scalars().first()
-        
-        if exact:
-            return exact
-        
-        # Fall back to most recent rate before target date
-        result = await self.db.execute(
-            select(CurrencyRate)
-            .filter(
-                and_(
-                    CurrencyRate.currency_code == currency,
-                    CurrencyRate.rate_date <= target_date
-                )
-            )
-            .order_by(desc(CurrencyRate.rate_date))
-        )
-        previous = result.scalars().first()
-        
-        return previous
+        await rate_table.ensure_loaded(self.db)
+        return rate_table.rate_on(currency, target_date)
     
     async def get_historical_rates(
         self,
         currency: str,
         start_date: date,
         end_date: date
-    ) -> List[CurrencyRate]:
+    ) -> List[TableRate]:
         """
         Get historical rates for a currency within a date range
         
@@ -309,20 +281,10 @@ class CurrencyRateService:
             end_date: End date
         
         Returns:
-            List of CurrencyRate objects
+            List of rates, oldest first
         """
-        result = await self.db.execute(
-            select(CurrencyRate)
-            .filter(
-                and_(
-                    CurrencyRate.currency_code == currency,
-                    CurrencyRate.rate_date >= start_date,
-                    CurrencyRate.rate_date <= end_date
-                )
-            )
-            .order_by(CurrencyRate.rate_date)
-        )
-        return result.scalars().all()
+        await rate_table.ensure_loaded(self.db)
+        return rate_table.history(currency, start_date, end_date)
     
     async def convert_amount(
         self,
@@ -350,26 +312,21 @@ class CurrencyRateService:
         if from_currency == to_currency:
             return amount
         
-        # If one is NOK, only need one rate
-        if from_currency == "NOK":
-            to_rate = await self.get_rate_on_date(to_currency, target_date)
-            if not to_rate:
-                return None
-            return amount / to_rate.rate
-        
-        if to_currency == "NOK":
-            from_rate = await self.get_rate_on_date(from_currency, target_date)
-            if not from_rate:
-                return None
-            return amount * from_rate.rate
-        
-        # Both are non-NOK currencies, convert through NOK
-        from_rate = await self.get_rate_on_date(from_currency, target_date)
-        to_rate = await self.get_rate_on_date(to_currency, target_date)
-        
-        if not from_rate or not to_rate:
-            return None
+        await rate_table.ensure_loaded(self.db)
+        return rate_table.convert(amount, from_currency, to_currency, target_date)
+    
+    async def convert_many(
+        self,
+        amounts: Sequence[Decimal],
+        currencies: Sequence[str],
+        dates: Sequence[date],
+        to_currency: str = "NOK"
+    ) -> List[Optional[Decimal]]:
+        """
+        Convert a batch of amounts, each from its own currency at the rate on its own date
         
-        # Convert to NOK first, then to target currency
-        nok_amount = amount * from_rate.rate
-        return nok_amount / to_rate.rate
+        Returns:
+            Converted amounts in input order; None where no rate exists
+        """
+        await rate_table.ensure_loaded(self.db)
+        return rate_table.convert_many(amounts, currencies, dates, to_currency)
@@ -0,0 +1,276 @@
+"""
+Currency Rate Table - Process-wide in-memory exchange rates
+
+CurrencyRateService.get_rate_on_date used to cost up to two queries per
+lookup, and conversions looked rates up one amount at a time. The rate
+table loads every CurrencyRate row once per process and keeps, per
+currency, a sorted array of rate dates next to the rates:
+
+- As-of lookup ("rate on the date, or the latest before it") is a binary
+  search (numpy.searchsorted) instead of a query
+- convert_many() converts a whole batch of amounts with one search per
+  currency
+
+Rates are kept as quoted by Norges Bank, which quotes some currencies per
+100 units (QUOTE_UNITS). Conversions (rates_many, convert_many) and
+TableRate.unit_rate are per unit of the currency.
+
+The table is reloaded when update_all_rates() writes new rates, and after
+CURRENCY_RATE_TABLE_TTL_SECONDS so rates written by another process (the
+daily cron job) are picked up.
+
+Usage:
+    await rate_table.ensure_loaded(db)
+    rate = rate_table.rate_on("EUR", date(2026, 1, 31))
+    nok = rate_table.convert_many(amounts, currencies, dates)
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.currency_rate import CurrencyRate
+
+logger = logging.getLogger(__name__)
+
+BASE_CURRENCY = "NOK"
+
+# Currencies Norges Bank quotes per 100 units (UNIT_MULT 2): NOK per 100 SEK etc.
+QUOTE_UNITS = {"SEK": 100, "DKK": 100, "JPY": 100, "ISK": 100}
+
+
+def quote_unit(currency: str) -> int:
+    """Units of the currency a stored rate is quoted for"""
+    return QUOTE_UNITS.get(currency, 1)
+
+
+@dataclass(frozen=True)
+class TableRate:
+    """A CurrencyRate row held by the rate table (same attributes as the model)"""
+    currency_code: str
+    base_currency: str
+    rate: Decimal
+    rate_date: date
+    source: str
+    created_at: datetime
+    updated_at: datetime
+
+    @property
+    def unit(self) -> int:
+        return quote_unit(self.currency_code)
+
+    @property
+    def unit_rate(self) -> Decimal:
+        """NOK per one unit of the currency"""
+        return self.rate / self.unit
+
+    def to_dict(self):
+        return {
+            "currency_code": self.currency_code,
+            "base_currency": self.base_currency,
+            "rate": float(self.rate),
+            "unit": self.unit,
+            "rate_date": self.rate_date.isoformat(),
+            "source": self.source,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+class _RateSeries:
+    """One currency's rates, sorted by date"""
+
+    def __init__(self, rates: List[TableRate]):
+        self.rates = rates
+        self.dates = np.array([r.rate_date for r in rates], dtype="datetime64[D]")
+
+    def index_on(self, dates: np.ndarray) -> np.ndarray:
+        """Index of the rate in effect on each date (-1 when there is none)"""
+        return np.searchsorted(self.dates, dates, side="right") - 1
+
+
+def _as_date_array(dates: Sequence[date]) -> np.ndarray:
+    return np.array(dates, dtype="datetime64[D]")
+
+
+class CurrencyRateTable:
+    """Exchange rates against NOK for every currency, as-of lookups in memory"""
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.CURRENCY_RATE_TABLE_TTL_SECONDS
+        self._series: Dict[str, _RateSeries] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _loading_lock(self) -> asyncio.Lock:
+        """Lock for (re)loading, created in the running event loop (the table is created at import)"""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """Load the table unless a fresh copy is already in memory"""
+        if self.is_fresh:
+            return
+        async with self._loading_lock():
+            if not self.is_fresh:
+                await self._load(db)
+
+    async def reload(self, db: AsyncSession) -> None:
+        """Reload now (after rates were written)"""
+        async with self._loading_lock():
+            await self._load(db)
+
+    def invalidate(self) -> None:
+        """Reload on the next ensure_loaded()"""
+        self._loaded_at = None
+
+    def load_rates(self, rates: List[TableRate]) -> None:
+        """Replace the table's contents (one row per currency and date; the last one wins)"""
+        by_currency: Dict[str, Dict[date, TableRate]] = {}
+        for rate in rates:
+            by_currency.setdefault(rate.currency_code, {})[rate.rate_date] = rate
+        self._series = {
+            currency: _RateSeries([per_date[d] for d in sorted(per_date)])
+            for currency, per_date in by_currency.items()
+        }
+        self._loaded_at = time.monotonic()
+
+    async def _load(self, db: AsyncSession) -> None:
+        start = time.perf_counter()
+        result = await db.execute(
+            select(
+                CurrencyRate.currency_code,
+                CurrencyRate.base_currency,
+                CurrencyRate.rate,
+                CurrencyRate.rate_date,
+                CurrencyRate.source,
+                CurrencyRate.created_at,
+                CurrencyRate.updated_at,
+            ).order_by(CurrencyRate.currency_code, CurrencyRate.rate_date, CurrencyRate.updated_at)
+        )
+        rates = [TableRate(*row) for row in result.all()]
+        self.load_rates(rates)
+        logger.info(
+            f"Loaded currency rate table: {len(rates)} rates, {len(self._series)} currencies "
+            f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+    def currencies(self) -> List[str]:
+        return sorted(self._series)
+
+    def rate_on(self, currency: str, on_date: date) -> Optional[TableRate]:
+        """Rate on the date, or the most recent rate before it"""
+        series = self._series.get(currency)
+        if series is None:
+            return None
+        index = int(series.index_on(np.datetime64(on_date, "D")))
+        return series.rates[index] if index >= 0 else None
+
+    def latest(self) -> Dict[str, TableRate]:
+        """Most recent rate per currency"""
+        return {currency: series.rates[-1] for currency, series in self._series.items() if series.rates}
+
+    def history(self, currency: str, start_date: date, end_date: date) -> List[TableRate]:
+        """Rates dated within [start_date, end_date], oldest first"""
+        series = self._series.get(currency)
+        if series is None:
+            return []
+        lo = int(np.searchsorted(series.dates, np.datetime64(start_date, "D"), side="left"))
+        hi = int(np.searchsorted(series.dates, np.datetime64(end_date, "D"), side="right"))
+        return series.rates[lo:hi]
+
+    def rates_many(self, currencies: Sequence[str], dates: Sequence[date]) -> List[Optional[Decimal]]:
+        """
+        NOK per unit of the currency for each (currency, date) pair, one
+        binary search per currency
+
+        Per-100 quotes are divided by their unit. NOK itself has rate 1;
+        pairs without a rate on or before the date get None.
+        """
+        if len(currencies) != len(dates):
+            raise ValueError("currencies and dates must have the same length")
+
+        rates: List[Optional[Decimal]] = [None] * len(currencies)
+        positions: Dict[str, List[int]] = {}
+        for position, currency in enumerate(currencies):
+            positions.setdefault(currency, []).append(position)
+
+        for currency, currency_positions in positions.items():
+            if currency == BASE_CURRENCY:
+                for position in currency_positions:
+                    rates[position] = Decimal("1")
+                continue
+            series = self._series.get(currency)
+            if series is None:
+                continue
+            indexes = series.index_on(_as_date_array([dates[position] for position in currency_positions]))
+            for position, index in zip(currency_positions, indexes.tolist()):
+                if index >= 0:
+                    rates[position] = series.rates[index].unit_rate
+        return rates
+
+    def convert_many(
+        self,
+        amounts: Sequence[Decimal],
+        currencies: Sequence[str],
+        dates: Sequence[date],
+        to_currency: str = BASE_CURRENCY
+    ) -> List[Optional[Decimal]]:
+        """
+        Convert amounts[i] from currencies[i] to to_currency at the rate on dates[i]
+
+        Returns:
+            Converted amounts (unrounded, like convert_amount); None where a
+            rate is missing
+        """
+        if len(amounts) != len(currencies):
+            raise ValueError("amounts and currencies must have the same length")
+
+        from_rates = self.rates_many(currencies, dates)
+        if to_currency == BASE_CURRENCY:
+            to_rates: List[Optional[Decimal]] = [Decimal("1")] * len(amounts)
+        else:
+            to_rates = self.rates_many([to_currency] * len(amounts), dates)
+
+        converted: List[Optional[Decimal]] = []
+        for amount, currency, from_rate, to_rate in zip(amounts, currencies, from_rates, to_rates):
+            if currency == to_currency:
+                converted.append(amount)
+            elif from_rate is None or to_rate is None:
+                converted.append(None)
+            elif to_currency == BASE_CURRENCY:
+                converted.append(amount * from_rate)
+            elif currency == BASE_CURRENCY:
+                converted.append(amount / to_rate)
+            else:
+                converted.append(amount * from_rate / to_rate)
+        return converted
+
+    def convert(
+        self,
+        amount: Decimal,
+        from_currency: str,
+        to_currency: str,
+        on_date: date
+    ) -> Optional[Decimal]:
+        return self.convert_many([amount], [from_currency], [on_date], to_currency)[0]
+
+
+# Process-wide table
+rate_table = CurrencyRateTable()
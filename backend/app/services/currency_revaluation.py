@@ -0,0 +1,437 @@
+"""
+Currency Revaluation - Period-end revaluation of open foreign-currency items
+
+Open supplier and customer items in a foreign currency (SupplierLedger /
+CustomerLedger with currency != NOK) are carried at the rate on the
+invoice date. At period end they are revalued to the closing rate and the
+difference is booked as unrealized agio (8060 Valutagevinst) or disagio
+(8160 Valutatap) against the control account (2400 / 1500).
+
+The run has four steps:
+
+1. Stream the open foreign-currency items of a client or tenant in chunks
+   (server-side cursor, plain columns)
+2. Look up invoice-date and closing rates for a whole chunk at once from
+   the in-memory rate table (loaded from currency_rates)
+3. Compute book value, revalued value and adjustment per item with numpy
+   (integer øre, so the sums are exact) and add them up per client,
+   ledger and currency
+4. Post one summarized voucher per client (series VAL), reversed on the
+   following day so the next revaluation starts from the invoice-date
+   rates again
+
+preview() stops after step 3 and writes nothing.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.client import Client
+from app.models.customer_ledger import CustomerLedger
+from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
+from app.models.supplier_ledger import SupplierLedger
+from app.services.currency_rate_table import BASE_CURRENCY, CurrencyRateTable, rate_table
+from app.services.voucher_numbering import VoucherNumberAllocator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+VOUCHER_SERIES = "VAL"  # Valutaomregning
+SOURCE_TYPE = "currency_revaluation"
+REVERSAL_SOURCE_TYPE = "currency_revaluation_reversal"
+
+AGIO_ACCOUNT = "8060"     # Valutagevinst (agio)
+DISAGIO_ACCOUNT = "8160"  # Valutatap (disagio)
+
+# ledger -> (model, control account, sign)
+# sign: +1 when a higher NOK value is a gain (receivables), -1 when it is a loss (payables)
+LEDGERS = {
+    "customer": (CustomerLedger, "1500", 1),
+    "supplier": (SupplierLedger, "2400", -1),
+}
+
+
+@dataclass
+class RevaluationGroup:
+    """Open items of one client, ledger and currency, revalued"""
+    client_id: UUID
+    ledger: str
+    currency: str
+    closing_rate: Decimal
+    item_count: int = 0
+    open_amount_cents: int = 0
+    book_value_cents: int = 0
+    revalued_cents: int = 0
+
+    @property
+    def adjustment_cents(self) -> int:
+        """Change in NOK value (positive: the item is worth more NOK)"""
+        return self.revalued_cents - self.book_value_cents
+
+    @property
+    def gain_cents(self) -> int:
+        """Unrealized gain (positive) or loss (negative) for the client"""
+        return LEDGERS[self.ledger][2] * self.adjustment_cents
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "client_id": str(self.client_id),
+            "ledger": self.ledger,
+            "currency": self.currency,
+            "closing_rate": float(self.closing_rate),
+            "item_count": self.item_count,
+            "open_amount": _amount(self.open_amount_cents),
+            "book_value_nok": _amount(self.book_value_cents),
+            "revalued_nok": _amount(self.revalued_cents),
+            "adjustment_nok": _amount(self.adjustment_cents),
+            "gain_loss_nok": _amount(self.gain_cents),
+        }
+
+
+def _amount(cents: int) -> float:
+    return float(Decimal(cents) / 100)
+
+
+def _cents(cents: int) -> Decimal:
+    return Decimal(cents) / 100
+
+
+def revalue_cents(
+    open_amounts: np.ndarray,
+    historical_rates: np.ndarray,
+    closing_rates: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Open amount, book value and revalued value per item, in integer øre
+
+    Each item's NOK values are rounded to øre before they are added up, so
+    the totals equal the sum of the rounded item values.
+    """
+    open_cents = np.rint(open_amounts * 100).astype(np.int64)
+    book_cents = np.rint(open_amounts * historical_rates * 100).astype(np.int64)
+    revalued_cents = np.rint(open_amounts * closing_rates * 100).astype(np.int64)
+    return open_cents, book_cents, revalued_cents
+
+
+def revaluation_lines(groups: List[RevaluationGroup]) -> List[Dict[str, Any]]:
+    """
+    Voucher lines for one client's revaluation
+
+    One control account line per ledger and currency, and one agio and/or
+    one disagio line for the total gains and losses.
+    """
+    lines = []
+    gains = losses = 0
+    for group in groups:
+        adjustment = group.adjustment_cents
+        if adjustment == 0:
+            continue
+        control_account = LEDGERS[group.ledger][1]
+        # Receivables worth more and payables worth less are debited
+        debit = adjustment if group.ledger == "customer" else -adjustment
+        lines.append({
+            "account_number": control_account,
+            "debit_cents": max(debit, 0),
+            "credit_cents": max(-debit, 0),
+            "description": (
+                f"Valutaomregning {group.currency} {group.ledger}: {group.item_count} poster, "
+                f"kurs {group.closing_rate}"
+            ),
+        })
+        if group.gain_cents > 0:
+            gains += group.gain_cents
+        else:
+            losses -= group.gain_cents
+
+    if gains:
+        lines.append({
+            "account_number": AGIO_ACCOUNT, "debit_cents": 0, "credit_cents": gains,
+            "description": "Urealisert valutagevinst (agio)",
+        })
+    if losses:
+        lines.append({
+            "account_number": DISAGIO_ACCOUNT, "debit_cents": losses, "credit_cents": 0,
+            "description": "Urealisert valutatap (disagio)",
+        })
+    return lines
+
+
+class CurrencyRevaluationService:
+    """Revalue open foreign-currency items of a client or a tenant"""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        rates: CurrencyRateTable = rate_table
+    ):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.rates = rates
+
+    async def preview(
+        self,
+        as_of_date: date,
+        client_id: Optional[UUID] = None,
+        tenant_id: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Revaluation at as_of_date without posting anything
+
+        Returns:
+            Dict with per-group results, totals and items/currencies
+            without a rate
+        """
+        groups, missing, timings = await self._compute(as_of_date, client_id, tenant_id)
+        return self._summary(as_of_date, groups, missing, timings)
+
+    async def post(
+        self,
+        as_of_date: date,
+        client_id: Optional[UUID] = None,
+        tenant_id: Optional[UUID] = None,
+        reverse: bool = True,
+        created_by_type: str = "user",
+        created_by_id: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Revalue and post one voucher per client (plus its reversal the next day), then commit
+
+        Clients that already have a revaluation voucher dated as_of_date are skipped.
+        """
+        groups, missing, timings = await self._compute(as_of_date, client_id, tenant_id)
+
+        by_client: Dict[UUID, List[RevaluationGroup]] = {}
+        for group in groups:
+            by_client.setdefault(group.client_id, []).append(group)
+
+        already = set()
+        if by_client:
+            result = await self.db.execute(
+                select(GeneralLedger.client_id).where(
+                    GeneralLedger.client_id.in_(list(by_client)),
+                    GeneralLedger.source_type == SOURCE_TYPE,
+                    GeneralLedger.accounting_date == as_of_date,
+                    GeneralLedger.status == "posted",
+                )
+            )
+            already = set(result.scalars().all())
+
+        start = time.perf_counter()
+        allocator = VoucherNumberAllocator(self.db)
+        vouchers = []
+        # Sorted so concurrent runs lock the voucher counters in the same order
+        for cid in sorted(by_client, key=str):
+            if cid in already:
+                continue
+            lines = revaluation_lines(by_client[cid])
+            if not lines:
+                continue
+            entry = await self._add_voucher(
+                allocator, cid, as_of_date, lines, SOURCE_TYPE, None,
+                f"Valutaomregning åpne poster pr. {as_of_date.isoformat()}",
+                created_by_type, created_by_id
+            )
+            voucher = {"client_id": str(cid), "gl_entry_id": str(entry.id), "voucher_number": entry.voucher_number}
+            if reverse:
+                reversal_date = as_of_date + timedelta(days=1)
+                reversal_lines = [
+                    {**line, "debit_cents": line["credit_cents"], "credit_cents": line["debit_cents"]}
+                    for line in lines
+                ]
+                reversal = await self._add_voucher(
+                    allocator, cid, reversal_date, reversal_lines, REVERSAL_SOURCE_TYPE, entry.id,
+                    f"Tilbakeføring valutaomregning pr. {as_of_date.isoformat()}",
+                    created_by_type, created_by_id
+                )
+                voucher["reversal_gl_entry_id"] = str(reversal.id)
+                voucher["reversal_voucher_number"] = reversal.voucher_number
+            vouchers.append(voucher)
+
+        await self.db.commit()
+        timings["post_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+        logger.info(
+            f"Currency revaluation {as_of_date}: {len(vouchers)} vouchers posted, "
+            f"{len(already)} clients already revalued"
+        )
+        return {
+            **self._summary(as_of_date, groups, missing, timings),
+            "vouchers": vouchers,
+            "skipped_clients": [str(cid) for cid in sorted(already, key=str)],
+        }
+
+    async def _add_voucher(
+        self,
+        allocator: VoucherNumberAllocator,
+        client_id: UUID,
+        accounting_date: date,
+        lines: List[Dict[str, Any]],
+        source_type: str,
+        source_id: Optional[UUID],
+        description: str,
+        created_by_type: str,
+        created_by_id: Optional[UUID]
+    ) -> GeneralLedger:
+        entry = GeneralLedger(
+            id=uuid4(),
+            client_id=client_id,
+            entry_date=date.today(),
+            accounting_date=accounting_date,
+            period=accounting_date.strftime("%Y-%m"),
+            fiscal_year=accounting_date.year,
+            voucher_number=await allocator.next_number(client_id, VOUCHER_SERIES, accounting_date.year),
+            voucher_series=VOUCHER_SERIES,
+            description=description,
+            source_type=source_type,
+            source_id=source_id,
+            created_by_type=created_by_type,
+            created_by_id=created_by_id,
+            status="posted",
+            locked=False
+        )
+        for line_number, line in enumerate(lines, start=1):
+            GeneralLedgerLine(
+                id=uuid4(),
+                general_ledger_entry=entry,
+                line_number=line_number,
+                account_number=line["account_number"],
+                debit_amount=_cents(line["debit_cents"]),
+                credit_amount=_cents(line["credit_cents"]),
+                line_description=line["description"],
+            )
+        self.db.add(entry)  # lines cascade via general_ledger_entry
+        return entry
+
+    async def _compute(
+        self,
+        as_of_date: date,
+        client_id: Optional[UUID],
+        tenant_id: Optional[UUID]
+    ) -> Tuple[List[RevaluationGroup], Dict[str, Any], Dict[str, float]]:
+        if client_id is None and tenant_id is None:
+            raise ValueError("client_id or tenant_id is required")
+
+        await self.rates.ensure_loaded(self.db)
+
+        groups: Dict[Tuple[UUID, str, str], RevaluationGroup] = {}
+        missing: Dict[str, Any] = {"closing_rate": {}, "invoice_date_rate": 0}
+        timings = {"stream_ms": 0.0, "compute_ms": 0.0}
+        item_count = 0
+
+        for ledger, (model, _, _) in LEDGERS.items():
+            query = (
+                select(model.client_id, model.currency, model.invoice_date, model.remaining_amount)
+                .where(
+                    model.currency != BASE_CURRENCY,
+                    model.status != "paid",
+                    model.remaining_amount != 0,
+                    model.invoice_date <= as_of_date,
+                )
+            )
+            if client_id is not None:
+                query = query.where(model.client_id == client_id)
+            if tenant_id is not None:
+                query = query.where(model.client_id.in_(select(Client.id).where(Client.tenant_id == tenant_id)))
+
+            start = time.perf_counter()
+            result = await self.db.stream(query.execution_options(yield_per=self.chunk_size))
+            async for rows in result.partitions(self.chunk_size):
+                timings["stream_ms"] += (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+                self._add_chunk(ledger, rows, as_of_date, groups, missing)
+                item_count += len(rows)
+                timings["compute_ms"] += (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+
+        timings = {key: round(value, 1) for key, value in timings.items()}
+        timings["items"] = item_count
+        ordered = sorted(groups.values(), key=lambda g: (str(g.client_id), g.ledger, g.currency))
+        return ordered, missing, timings
+
+    def _add_chunk(
+        self,
+        ledger: str,
+        rows,
+        as_of_date: date,
+        groups: Dict[Tuple[UUID, str, str], RevaluationGroup],
+        missing: Dict[str, Any]
+    ) -> None:
+        """Revalue one chunk of items and add them to their groups"""
+        client_ids = [row[0] for row in rows]
+        currencies = [row[1] for row in rows]
+
+        historical = self.rates.rates_many(currencies, [row[2] for row in rows])
+        closing_by_currency = {}
+        for currency in set(currencies):
+            closing = self.rates.rate_on(currency, as_of_date)
+            closing_by_currency[currency] = closing.unit_rate if closing else None
+
+        keep = []
+        for position, currency in enumerate(currencies):
+            if closing_by_currency[currency] is None:
+                missing["closing_rate"][currency] = missing["closing_rate"].get(currency, 0) + 1
+            elif historical[position] is None:
+                missing["invoice_date_rate"] += 1
+            else:
+                keep.append(position)
+        if not keep:
+            return
+
+        open_amounts = np.array([float(rows[p][3]) for p in keep])
+        historical_rates = np.array([float(historical[p]) for p in keep])
+        closing_rates = np.array([float(closing_by_currency[currencies[p]]) for p in keep])
+        open_cents, book_cents, revalued_cents = revalue_cents(open_amounts, historical_rates, closing_rates)
+
+        # Sum per (client, currency) with one pass over the arrays
+        keys = [(client_ids[p], currencies[p]) for p in keep]
+        unique_keys = sorted(set(keys), key=lambda k: (str(k[0]), k[1]))
+        key_index = {key: index for index, key in enumerate(unique_keys)}
+        inverse = np.array([key_index[key] for key in keys])
+        counts = np.bincount(inverse, minlength=len(unique_keys))
+        sums = {}
+        for name, values in (("open", open_cents), ("book", book_cents), ("revalued", revalued_cents)):
+            totals = np.zeros(len(unique_keys), dtype=np.int64)
+            np.add.at(totals, inverse, values)
+            sums[name] = totals
+
+        for index, (cid, currency) in enumerate(unique_keys):
+            group = groups.get((cid, ledger, currency))
+            if group is None:
+                group = groups[(cid, ledger, currency)] = RevaluationGroup(
+                    client_id=cid, ledger=ledger, currency=currency,
+                    closing_rate=closing_by_currency[currency],
+                )
+            group.item_count += int(counts[index])
+            group.open_amount_cents += int(sums["open"][index])
+            group.book_value_cents += int(sums["book"][index])
+            group.revalued_cents += int(sums["revalued"][index])
+
+    def _summary(
+        self,
+        as_of_date: date,
+        groups: List[RevaluationGroup],
+        missing: Dict[str, Any],
+        timings: Dict[str, float]
+    ) -> Dict[str, Any]:
+        gains = sum(g.gain_cents for g in groups if g.gain_cents > 0)
+        losses = -sum(g.gain_cents for g in groups if g.gain_cents < 0)
+        return {
+            "as_of_date": as_of_date.isoformat(),
+            "client_count": len({g.client_id for g in groups}),
+            "item_count": sum(g.item_count for g in groups),
+            "total_agio": _amount(gains),
+            "total_disagio": _amount(losses),
+            "net_gain_loss": _amount(gains - losses),
+            "groups": [g.to_dict() for g in groups],
+            "missing_rates": missing,
+            "timings": timings,
+        }
@@ -14,6 +14,7 @@ from app.services.dnb.oauth_client import DNBOAuth2Client
 from app.services.dnb.api_client import DNBAPIClient
 from app.services.dnb.encryption import token_encryption
 from app.config import settings
+from app.utils.metrics import track_bank_sync
 
 
 logger = logging.getLogger(__name__)
@@ -181,6 +182,7 @@ class DNBService:
         finally:
             await oauth_client.close()
     
+    @track_bank_sync("dnb")
     async def fetch_and_store_transactions(
         self,
         db: AsyncSession,
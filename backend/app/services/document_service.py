@@ -0,0 +1,131 @@
+"""
+Document Service - Upload, deduplication and retrieval of stored documents
+"""
+import logging
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+from uuid import UUID
+
+from fastapi import UploadFile
+from sqlalchemy import and_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.document import Document
+from app.services.storage import get_document_storage
+from app.services.storage.s3 import PRESIGNED_URL_RENEW_MARGIN
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentService:
+    """
+    Stores documents through the configured storage backend
+
+    Documents are deduplicated per client by SHA-256 content hash: uploading
+    the same file twice returns the existing Document row.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def store_upload(
+        self,
+        client_id: UUID,
+        upload: UploadFile,
+        document_type: str,
+        uploaded_by_user_id: Optional[UUID] = None,
+        max_size: Optional[int] = None,
+    ) -> Tuple[Document, bool]:
+        """
+        Stream an upload to storage and register it
+
+        Returns:
+            (document, created) - created is False when an identical file
+            already existed for the client
+        """
+        storage = get_document_storage()
+        ext = Path(upload.filename or "").suffix.lower()
+        key = f"clients/{client_id}/documents/{uuid.uuid4()}{ext}"
+
+        stored = await storage.save_upload(key, upload, max_size=max_size)
+
+        existing = await self.find_by_hash(client_id, stored.sha256)
+        if existing:
+            # Same content already stored - drop the new copy
+            await storage.delete(key)
+            logger.info(
+                f"Deduplicated upload {upload.filename} -> document {existing.id}"
+            )
+            return existing, False
+
+        document = Document(
+            id=uuid.uuid4(),
+            client_id=client_id,
+            s3_bucket=storage.bucket,
+            s3_key=key,
+            filename=upload.filename or key.rsplit("/", 1)[-1],
+            mime_type=upload.content_type or "application/octet-stream",
+            file_size=stored.size,
+            file_hash=stored.sha256,
+            document_type=document_type,
+            uploaded_at=datetime.utcnow(),
+            uploaded_by_user_id=uploaded_by_user_id,
+        )
+        try:
+            # Savepoint so a concurrent identical upload only loses this insert
+            async with self.db.begin_nested():
+                self.db.add(document)
+        except IntegrityError:
+            await storage.delete(key)
+            existing = await self.find_by_hash(client_id, stored.sha256)
+            if existing is None:
+                raise
+            return existing, False
+
+        return document, True
+
+    async def find_by_hash(self, client_id: UUID, file_hash: str) -> Optional[Document]:
+        """Find an existing document for the client with the same content"""
+        result = await self.db.execute(
+            select(Document).where(
+                and_(
+                    Document.client_id == client_id,
+                    Document.file_hash == file_hash,
+                )
+            )
+        )
+        return result.scalars().first()
+
+    async def get_download_url(self, document: Document) -> Optional[str]:
+        """
+        Return a presigned download URL for the document
+
+        The URL stored on the document is reused until shortly before it
+        expires, so repeated viewer requests do not re-sign or write. The
+        stored expiry is the one the backend signed the URL with (S3Storage
+        may hand out a URL it signed earlier); URLs of backends that do not
+        report an expiry are not stored.
+        Returns None for backends without direct URLs (local storage).
+        """
+        now = datetime.utcnow()
+        if (
+            document.download_url
+            and document.download_url_expires_at
+            and document.download_url_expires_at - PRESIGNED_URL_RENEW_MARGIN > now
+        ):
+            return document.download_url
+
+        storage = get_document_storage(document.s3_bucket)
+        expires_in = settings.PRESIGNED_URL_EXPIRES_SECONDS
+        with_expiry = getattr(storage, "presigned_url_with_expiry", None)
+        if with_expiry is None:
+            return await storage.presigned_url(document.s3_key, expires_in)
+
+        url, expires_at = with_expiry(document.s3_key, expires_in)
+        document.download_url = url
+        document.download_url_expires_at = expires_at
+        return url
@@ -8,7 +8,8 @@ from datetime import date
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-from app.models import GeneralLedger, GeneralLedgerLine
+from app.models import GeneralLedgerLine
+from app.services.ledger_lines import line_filters
 
 
 class IncomeStatementService:
@@ -125,14 +126,7 @@ class IncomeStatementService:
                 func.sum(GeneralLedgerLine.debit_amount).label('total_debit'),
                 func.sum(GeneralLedgerLine.credit_amount).label('total_credit')
             )
-            .join(GeneralLedger, GeneralLedgerLine.general_ledger_id == GeneralLedger.id)
-            .where(
-                and_(
-                    GeneralLedger.client_id == client_id,
-                    GeneralLedger.accounting_date >= start_date,
-                    GeneralLedger.accounting_date <= end_date
-                )
-            )
+            .where(and_(*line_filters(client_id, start_date, end_date, status=None)))
             .group_by(GeneralLedgerLine.account_number)
         )
         
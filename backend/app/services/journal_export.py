@@ -0,0 +1,240 @@
+"""
+Journal Export - Streaming bilagsjournal export (CSV, NDJSON, XLSX)
+
+The voucher journal export used to load every voucher of the client, run one
+line query per voucher and build the whole file in memory. Here:
+
+- One query joins general_ledger_lines to general_ledger (line filters on
+  the denormalized columns, so only the requested fiscal-year partitions
+  are scanned) and is read through a server-side cursor in chunks of
+  EXPORT_CHUNK_SIZE rows
+- Each chunk is encoded and handed to the StreamingResponse; the next chunk
+  is only fetched once the client has taken the previous one, so a slow
+  client holds back the query instead of filling memory
+- Rows are ordered by (accounting date, series, voucher number, line) and
+  every row carries an opaque cursor; passing the last cursor received as
+  `after` resumes an interrupted export
+
+XLSX is written with openpyxl's write-only workbook (rows go to a temporary
+file, not memory) and streamed once the file is complete.
+
+Usage:
+    query = journal_export_query(client_id, date_from=date(2026, 1, 1))
+    return StreamingResponse(stream_journal_export(query, "csv"), ...)
+"""
+import asyncio
+import base64
+import csv
+import io
+import json
+import logging
+import tempfile
+from datetime import date
+from decimal import Decimal
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from openpyxl import Workbook
+from sqlalchemy import func, select, tuple_
+
+from app.database import read_only_session
+from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
+from app.services.ledger_lines import line_filters
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 2000
+XLSX_READ_SIZE = 64 * 1024
+
+EXPORT_COLUMNS = (
+    "accounting_date",
+    "voucher_number",
+    "voucher_type",
+    "description",
+    "account_number",
+    "debit",
+    "credit",
+    "vat_code",
+    "vat_amount",
+    "line_description",
+    "posted_by",
+    "created_at",
+    "cursor",
+)
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Position of a line in the export: (accounting_date, series, voucher_number, line_number)
+ExportCursor = Tuple[date, str, str, int]
+
+
+def encode_cursor(cursor: ExportCursor) -> str:
+    accounting_date, series, voucher_number, line_number = cursor
+    payload = json.dumps([accounting_date.isoformat(), series, voucher_number, line_number])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> ExportCursor:
+    """Cursor from encode_cursor(); ValueError if it is malformed"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        accounting_date, series, voucher_number, line_number = json.loads(base64.urlsafe_b64decode(padded))
+        return date.fromisoformat(accounting_date), str(series), str(voucher_number), int(line_number)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid export cursor: {token}") from e
+
+
+def journal_export_query(
+    client_id: UUID,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    series: Optional[Sequence[str]] = None,
+    after: Optional[ExportCursor] = None,
+    limit: Optional[int] = None,
+):
+    """
+    Journal lines with their voucher, in export order
+
+    Args:
+        client_id: Client UUID
+        date_from: Inclusive start (accounting date)
+        date_to: Inclusive end (accounting date)
+        series: Only these voucher series
+        after: Resume after this cursor
+        limit: Maximum number of lines
+    """
+    series_key = func.coalesce(GeneralLedger.voucher_series, "")
+    query = (
+        select(
+            GeneralLedger.accounting_date,
+            series_key.label("voucher_series"),
+            GeneralLedger.voucher_number,
+            GeneralLedger.source_type,
+            GeneralLedger.description,
+            GeneralLedger.created_by_type,
+            GeneralLedger.created_at,
+            GeneralLedgerLine.line_number,
+            GeneralLedgerLine.account_number,
+            GeneralLedgerLine.debit_amount,
+            GeneralLedgerLine.credit_amount,
+            GeneralLedgerLine.vat_code,
+            GeneralLedgerLine.vat_amount,
+            GeneralLedgerLine.line_description,
+        )
+        .select_from(GeneralLedgerLine)
+        .join(GeneralLedger, GeneralLedgerLine.general_ledger_id == GeneralLedger.id)
+        .where(*line_filters(client_id, date_from, date_to, status=None))
+    )
+    if series:
+        query = query.where(GeneralLedger.voucher_series.in_(list(series)))
+    if after:
+        position = tuple_(
+            GeneralLedger.accounting_date, series_key,
+            GeneralLedger.voucher_number, GeneralLedgerLine.line_number
+        )
+        query = query.where(position > tuple_(*after))
+
+    query = query.order_by(
+        GeneralLedger.accounting_date, series_key,
+        GeneralLedger.voucher_number, GeneralLedgerLine.line_number
+    )
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def export_row(row) -> tuple:
+    """One exported line in EXPORT_COLUMNS order (dates as ISO strings, amounts as Decimal)"""
+    cursor = encode_cursor((row.accounting_date, row.voucher_series, row.voucher_number, row.line_number))
+    return (
+        row.accounting_date.isoformat(),
+        f"{row.voucher_series}-{row.voucher_number}",
+        row.source_type,
+        row.description,
+        row.account_number,
+        row.debit_amount,
+        row.credit_amount,
+        row.vat_code,
+        row.vat_amount or Decimal("0.00"),
+        row.line_description,
+        row.created_by_type,
+        row.created_at.isoformat(),
+        cursor,
+    )
+
+
+async def export_chunks(query) -> AsyncIterator[List[tuple]]:
+    """Run the query on a server-side cursor and yield formatted rows chunk by chunk"""
+    async with read_only_session() as session:
+        result = await session.stream(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        exported = 0
+        async for partition in result.partitions():
+            exported += len(partition)
+            yield [export_row(row) for row in partition]
+        logger.info(f"Journal export streamed {exported} lines")
+
+
+def csv_chunk(rows: List[tuple], header: bool = False) -> str:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(rows)
+    return output.getvalue()
+
+
+def ndjson_chunk(rows: List[tuple]) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=float, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+async def _csv_stream(chunks: AsyncIterator[List[tuple]]) -> AsyncIterator[str]:
+    header = True
+    async for rows in chunks:
+        yield csv_chunk(rows, header)
+        header = False
+    if header:
+        yield csv_chunk([], header=True)
+
+
+async def _ndjson_stream(chunks: AsyncIterator[List[tuple]]) -> AsyncIterator[str]:
+    async for rows in chunks:
+        yield ndjson_chunk(rows)
+
+
+async def _xlsx_stream(chunks: AsyncIterator[List[tuple]]) -> AsyncIterator[bytes]:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Bilagsjournal")
+    sheet.append(EXPORT_COLUMNS)
+    async for rows in chunks:
+        for row in rows:
+            sheet.append(row)
+
+    with tempfile.TemporaryFile() as output:
+        await asyncio.to_thread(workbook.save, output)
+        output.seek(0)
+        while True:
+            data = output.read(XLSX_READ_SIZE)
+            if not data:
+                break
+            yield data
+
+
+STREAM_WRITERS = {
+    "csv": _csv_stream,
+    "ndjson": _ndjson_stream,
+    "xlsx": _xlsx_stream,
+}
+
+
+def stream_journal_export(query, export_format: str):
+    """Response body for the export query in the given format (csv, ndjson or xlsx)"""
+    if export_format not in STREAM_WRITERS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    return STREAM_WRITERS[export_format](export_chunks(query))
@@ -0,0 +1,110 @@
+"""
+Ledger line filters - report predicates on the denormalized line columns
+
+general_ledger_lines carries client_id, accounting_date, fiscal_year and
+status from its entry and is range-partitioned by fiscal_year. Report
+aggregates filter the lines directly (no join to general_ledger) and add a
+fiscal_year bound so PostgreSQL only scans the partitions for the
+requested period.
+"""
+import logging
+from datetime import date
+from typing import Iterable, List, Optional, Union
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.general_ledger import GeneralLedgerLine
+
+logger = logging.getLogger(__name__)
+
+# fiscal_year is normally accounting_date.year, but some postings (e.g.
+# booking at year end) use a neighbouring year; keep one year of slack
+FISCAL_YEAR_SLACK = 1
+
+
+def line_filters(
+    client_id: UUID,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    status: Optional[str] = "posted",
+) -> List[ColumnElement]:
+    """
+    WHERE clauses for a client's ledger lines in a date range
+
+    Args:
+        client_id: Client UUID
+        from_date: Inclusive start (accounting date)
+        to_date: Inclusive end (accounting date)
+        status: Entry status to include, or None for all statuses
+
+    Returns:
+        List of predicates on GeneralLedgerLine
+    """
+    filters = [GeneralLedgerLine.client_id == client_id]
+    if status is not None:
+        filters.append(GeneralLedgerLine.status == status)
+    if from_date:
+        filters.append(GeneralLedgerLine.accounting_date >= from_date)
+        filters.append(GeneralLedgerLine.fiscal_year >= from_date.year - FISCAL_YEAR_SLACK)
+    if to_date:
+        filters.append(GeneralLedgerLine.accounting_date <= to_date)
+        filters.append(GeneralLedgerLine.fiscal_year <= to_date.year + FISCAL_YEAR_SLACK)
+    return filters
+
+
+def partition_name(year: int) -> str:
+    return f"general_ledger_lines_y{int(year)}"
+
+
+async def ensure_partitions(db: Union[AsyncSession, AsyncConnection], years: Iterable[int]) -> List[str]:
+    """
+    Create missing fiscal-year partitions of general_ledger_lines
+
+    Rows for the year already in the default partition are moved into the
+    new partition before it is attached. Run inside a transaction; the
+    move holds an exclusive lock on the default partition, and the
+    existence check is repeated under it so workers starting at the same
+    time do not race on CREATE TABLE.
+
+    Args:
+        db: Session or connection
+        years: Fiscal years that need their own partition
+
+    Returns:
+        Names of the partitions created
+    """
+    async def exists(name: str) -> bool:
+        result = await db.execute(text("SELECT to_regclass(CAST(:name AS text))"), {"name": name})
+        return result.scalar() is not None
+
+    missing = [int(year) for year in sorted(set(years)) if not await exists(partition_name(year))]
+    if not missing:
+        return []
+
+    await db.execute(text("LOCK TABLE general_ledger_lines_default IN ACCESS EXCLUSIVE MODE"))
+    created = []
+    for year in missing:
+        name = partition_name(year)
+        if await exists(name):
+            continue
+        await db.execute(text(
+            f"CREATE TABLE {name} (LIKE general_ledger_lines INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        await db.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM general_ledger_lines_default
+                WHERE fiscal_year = {year}
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """))
+        await db.execute(text(
+            f"ALTER TABLE general_ledger_lines ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ({year}) TO ({year + 1})"
+        ))
+        created.append(name)
+        logger.info(f"Created ledger line partition {name}")
+    return created
@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from decimal import Decimal
 from datetime import date
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import uuid
 
 from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
@@ -117,7 +117,21 @@ class LedgerSyncService:
             journal_entry
         )
         
-        # Create supplier ledger entry
+        self.db.add_all(self._build_supplier_ledger_entry(
+            journal_entry, total_amount, supplier_id, invoice_number, invoice_date, due_date
+        ))
+        await self.db.flush()
+    
+    def _build_supplier_ledger_entry(
+        self,
+        journal_entry: GeneralLedger,
+        total_amount: Decimal,
+        supplier_id: uuid.UUID,
+        invoice_number: Optional[str],
+        invoice_date: Optional[date],
+        due_date: Optional[date]
+    ) -> Tuple[SupplierLedger, SupplierLedgerTransaction]:
+        """Supplier ledger entry and its initial invoice transaction (not added)"""
         ledger_entry = SupplierLedger(
             id=uuid.uuid4(),
             client_id=journal_entry.client_id,
@@ -132,8 +146,6 @@ class LedgerSyncService:
             status="open"
         )
         
-        self.db.add(ledger_entry)
-        
         # Create initial transaction (the invoice itself)
         transaction = SupplierLedgerTransaction(
             id=uuid.uuid4(),
@@ -143,9 +155,39 @@ class LedgerSyncService:
             amount=total_amount,
             type="invoice"
         )
+        return ledger_entry, transaction
+    
+    def add_vendor_invoice_entries(
+        self,
+        entries: List[Tuple[GeneralLedger, List[GeneralLedgerLine], VendorInvoice]]
+    ) -> int:
+        """
+        Batch variant of the supplier ledger sync for vendor invoice vouchers
         
-        self.db.add(transaction)
-        await self.db.flush()
+        The invoices are already loaded, so no lookups are needed; rows are
+        only added to the session and written with the caller's next flush.
+        
+        Args:
+            entries: (journal entry, its lines, source invoice) tuples
+            
+        Returns:
+            Number of supplier ledger entries added
+        """
+        added = 0
+        for journal_entry, lines, invoice in entries:
+            total_amount = sum(
+                line.credit_amount for line in lines
+                if line.account_number == ACCOUNT_SUPPLIER_DEBT and line.credit_amount > 0
+            )
+            if not total_amount or not invoice.vendor_id:
+                continue
+            
+            self.db.add_all(self._build_supplier_ledger_entry(
+                journal_entry, total_amount, invoice.vendor_id,
+                invoice.invoice_number, invoice.invoice_date, invoice.due_date
+            ))
+            added += 1
+        return added
     
     async def _create_customer_ledger_entry(
         self,
@@ -0,0 +1,18 @@
+"""
+NLQ execution engine - sandboxed, cached execution of generated SQL
+"""
+from .cache import LRUCache, ledger_version, schema_version
+from .executor import QueryResult, QueryTimeoutError, ReadOnlyExecutor, is_safe_query
+from .mirror import DuckDBMirror, duckdb_available
+
+__all__ = [
+    "LRUCache",
+    "ledger_version",
+    "schema_version",
+    "QueryResult",
+    "QueryTimeoutError",
+    "ReadOnlyExecutor",
+    "is_safe_query",
+    "DuckDBMirror",
+    "duckdb_available",
+]
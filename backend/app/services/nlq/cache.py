@@ -0,0 +1,101 @@
+"""
+NLQ caches - generated SQL and query results
+
+- SQL cache: normalized question + schema version -> SQL template. The
+  client id is stored as a placeholder so one generated query serves
+  every client asking the same question.
+- Result cache: (engine, SQL, data version) -> rows. The data version
+  changes whenever the client's ledger, invoices, vendors or accruals
+  change, so stale results are never served.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.chat.intent_tiers import normalize_message
+
+V = TypeVar("V")
+
+CLIENT_ID_PLACEHOLDER = "__CLIENT_ID__"
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe LRU cache with hit/miss counters"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def schema_version(schema: str) -> str:
+    """Short fingerprint of the schema description given to the LLM"""
+    return hashlib.sha256(schema.encode("utf-8")).hexdigest()[:16]
+
+
+def sql_cache_key(question: str, schema_ver: str) -> Tuple[str, str]:
+    return (normalize_message(question), schema_ver)
+
+
+def to_template(sql: str, client_id: UUID) -> str:
+    """Replace the client id literal with a placeholder"""
+    return sql.replace(str(client_id), CLIENT_ID_PLACEHOLDER)
+
+
+def from_template(template: str, client_id: UUID) -> str:
+    return template.replace(CLIENT_ID_PLACEHOLDER, str(client_id))
+
+
+_DATA_VERSION_SQL = text("""
+    SELECT
+        (SELECT count(*) FROM general_ledger WHERE client_id = :client_id),
+        (SELECT max(created_at) FROM general_ledger WHERE client_id = :client_id),
+        (SELECT max(updated_at) FROM vendor_invoices WHERE client_id = :client_id),
+        (SELECT max(updated_at) FROM vendors WHERE client_id = :client_id),
+        (SELECT max(updated_at) FROM accruals WHERE client_id = :client_id)
+""")
+
+
+async def ledger_version(db: AsyncSession, client_id: UUID) -> Tuple[Any, ...]:
+    """
+    Cheap version stamp of the client's queryable data
+
+    Uses indexed client_id lookups only; any posting, invoice, vendor or
+    accrual change produces a new tuple.
+    """
+    result = await db.execute(_DATA_VERSION_SQL, {"client_id": client_id})
+    return tuple(result.one())
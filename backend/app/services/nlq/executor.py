@@ -0,0 +1,113 @@
+"""
+Sandboxed execution of generated SQL against PostgreSQL
+
+Every query runs on its own pooled connection in a READ ONLY transaction
+with a statement_timeout, wrapped in an outer LIMIT so at most max_rows
+rows are ever transferred. The transaction is always rolled back.
+"""
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+_FORBIDDEN_RE = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|DROP|ALTER|CREATE|TRUNCATE|GRANT|REVOKE|EXEC|EXECUTE|"
+    r"CALL|DO|COPY|VACUUM|ANALYZE|SET|RESET|LOCK|LISTEN|NOTIFY|"
+    r"ATTACH|DETACH|INSTALL|LOAD|PRAGMA|EXPORT|IMPORT)\b",
+    re.IGNORECASE,
+)
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_QUOTED_IDENT_RE = re.compile(r'"(?:[^"]|"")*"')
+
+
+class QueryTimeoutError(Exception):
+    """Query exceeded the NLQ statement timeout"""
+
+
+@dataclass
+class QueryResult:
+    """Rows returned by a sandboxed query"""
+    columns: List[str]
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    truncated: bool = False
+    engine: str = "postgres"
+
+
+def strip_sql(sql: str) -> str:
+    """Trim whitespace and a single trailing semicolon"""
+    sql = sql.strip()
+    if sql.endswith(";"):
+        sql = sql[:-1].rstrip()
+    return sql
+
+
+def is_safe_query(sql: str) -> bool:
+    """
+    Validate that a generated query is a single read-only SELECT
+
+    Keywords are matched as whole words outside string literals and quoted
+    aliases, so columns like created_at/updated_at and search terms are not
+    rejected.
+    """
+    sql = strip_sql(sql)
+    code = _QUOTED_IDENT_RE.sub('""', _STRING_LITERAL_RE.sub("''", sql))
+    head = code.lstrip("( \n\t").upper()
+
+    if not (head.startswith("SELECT") or head.startswith("WITH")):
+        return False
+    if ";" in code or "--" in code or "/*" in code:
+        return False
+    if _FORBIDDEN_RE.search(code):
+        return False
+    return True
+
+
+def with_row_cap(sql: str, max_rows: int) -> str:
+    """Wrap query so the database stops after max_rows + 1 rows"""
+    return f"SELECT * FROM (\n{strip_sql(sql)}\n) AS nlq_result LIMIT {int(max_rows) + 1}"
+
+
+def rows_to_result(columns: List[str], rows: List[Any], max_rows: int, engine: str) -> QueryResult:
+    truncated = len(rows) > max_rows
+    return QueryResult(
+        columns=columns,
+        rows=[dict(zip(columns, row)) for row in rows[:max_rows]],
+        truncated=truncated,
+        engine=engine,
+    )
+
+
+class ReadOnlyExecutor:
+    """Run generated SQL in a read-only, time- and row-limited transaction"""
+
+    def __init__(self, engine: AsyncEngine, timeout_ms: int, max_rows: int):
+        self.engine = engine
+        self.timeout_ms = timeout_ms
+        self.max_rows = max_rows
+
+    async def execute(self, sql: str, max_rows: Optional[int] = None) -> QueryResult:
+        max_rows = max_rows or self.max_rows
+
+        async with self.engine.connect() as conn:
+            try:
+                # Must be the first statement of the transaction
+                await conn.execute(text("SET TRANSACTION READ ONLY"))
+                await conn.execute(text(f"SET LOCAL statement_timeout = {int(self.timeout_ms)}"))
+                result = await conn.execute(text(with_row_cap(sql, max_rows)))
+                columns = list(result.keys())
+                rows = result.fetchall()
+            except Exception as e:
+                if "statement timeout" in str(e).lower():
+                    raise QueryTimeoutError(
+                        f"Query exceeded {self.timeout_ms} ms limit"
+                    ) from e
+                raise
+            finally:
+                await conn.rollback()
+
+        return rows_to_result(columns, rows, max_rows, engine="postgres")
@@ -0,0 +1,306 @@
+"""
+DuckDB Mirror - Embedded analytical copy of the ledger tables for NLQ
+
+Aggregations over general_ledger_lines run in-process on a columnar copy
+instead of on the primary OLTP database. The mirror holds only the
+columns described in the NLQ schema and is refreshed incrementally:
+- general_ledger / general_ledger_lines: entries created since the last watermark
+- vendor_invoices / vendors / accruals: rows updated since the last watermark
+- clients: copied in full (small)
+
+Postings are immutable apart from reversal flags; call refresh(full=True)
+(e.g. nightly) to pick those up.
+
+duckdb is an optional dependency - only needed with NLQ_ENGINE=duckdb.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.nlq.executor import QueryTimeoutError, QueryResult, rows_to_result, with_row_cap
+
+logger = logging.getLogger(__name__)
+
+FETCH_BATCH_SIZE = 5000
+
+
+@dataclass
+class MirrorTable:
+    """
+    One mirrored table
+
+    source_sql selects the mirrored columns followed by a "_watermark"
+    column; it takes a :since parameter unless watermarked is False.
+    The bound is inclusive - upserts are keyed by id, so re-reading rows
+    at the watermark is harmless and late commits with the same timestamp
+    are not missed.
+    """
+    name: str
+    columns: List[Tuple[str, str]]  # (name, DuckDB type)
+    source_sql: str
+    watermarked: bool = True
+
+
+MIRROR_TABLES: List[MirrorTable] = [
+    MirrorTable(
+        name="general_ledger",
+        columns=[
+            ("id", "VARCHAR"), ("client_id", "VARCHAR"), ("accounting_date", "DATE"),
+            ("entry_date", "DATE"), ("period", "VARCHAR"), ("fiscal_year", "INTEGER"),
+            ("voucher_number", "VARCHAR"), ("voucher_series", "VARCHAR"),
+            ("description", "VARCHAR"), ("source_type", "VARCHAR"),
+            ("created_by_type", "VARCHAR"), ("status", "VARCHAR"),
+        ],
+        source_sql="""
+            SELECT id, client_id, accounting_date, entry_date, period, fiscal_year,
+                   voucher_number, voucher_series, description, source_type,
+                   created_by_type, status, created_at AS _watermark
+            FROM general_ledger
+            WHERE created_at >= :since
+        """,
+    ),
+    MirrorTable(
+        name="general_ledger_lines",
+        columns=[
+            ("id", "VARCHAR"), ("general_ledger_id", "VARCHAR"), ("account_number", "VARCHAR"),
+            ("debit_amount", "DECIMAL(15,2)"), ("credit_amount", "DECIMAL(15,2)"),
+            ("line_description", "VARCHAR"),
+        ],
+        source_sql="""
+            SELECT l.id, l.general_ledger_id, l.account_number, l.debit_amount,
+                   l.credit_amount, l.line_description, g.created_at AS _watermark
+            FROM general_ledger_lines l
+            JOIN general_ledger g ON g.id = l.general_ledger_id
+            WHERE g.created_at >= :since
+        """,
+    ),
+    MirrorTable(
+        name="vendor_invoices",
+        columns=[
+            ("id", "VARCHAR"), ("client_id", "VARCHAR"), ("vendor_id", "VARCHAR"),
+            ("invoice_number", "VARCHAR"), ("invoice_date", "DATE"), ("due_date", "DATE"),
+            ("amount_excl_vat", "DECIMAL(15,2)"), ("vat_amount", "DECIMAL(15,2)"),
+            ("total_amount", "DECIMAL(15,2)"), ("payment_status", "VARCHAR"),
+            ("review_status", "VARCHAR"),
+        ],
+        source_sql="""
+            SELECT id, client_id, vendor_id, invoice_number, invoice_date, due_date,
+                   amount_excl_vat, vat_amount, total_amount, payment_status,
+                   review_status, updated_at AS _watermark
+            FROM vendor_invoices
+            WHERE updated_at >= :since
+        """,
+    ),
+    MirrorTable(
+        name="vendors",
+        columns=[
+            ("id", "VARCHAR"), ("client_id", "VARCHAR"), ("name", "VARCHAR"),
+            ("org_number", "VARCHAR"),
+        ],
+        source_sql="""
+            SELECT id, client_id, name, org_number, updated_at AS _watermark
+            FROM vendors
+            WHERE updated_at >= :since
+        """,
+    ),
+    MirrorTable(
+        name="accruals",
+        columns=[
+            ("id", "VARCHAR"), ("client_id", "VARCHAR"), ("description", "VARCHAR"),
+            ("from_date", "DATE"), ("to_date", "DATE"), ("total_amount", "DECIMAL(15,2)"),
+            ("balance_account", "VARCHAR"), ("result_account", "VARCHAR"),
+            ("frequency", "VARCHAR"), ("status", "VARCHAR"),
+        ],
+        source_sql="""
+            SELECT id, client_id, description, from_date, to_date, total_amount,
+                   balance_account, result_account, frequency, status,
+                   updated_at AS _watermark
+            FROM accruals
+            WHERE updated_at >= :since
+        """,
+    ),
+    MirrorTable(
+        name="clients",
+        columns=[
+            ("id", "VARCHAR"), ("name", "VARCHAR"), ("org_number", "VARCHAR"),
+            ("base_currency", "VARCHAR"),
+        ],
+        source_sql="""
+            SELECT id, name, org_number, base_currency, NULL AS _watermark
+            FROM clients
+        """,
+        watermarked=False,
+    ),
+]
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def duckdb_available() -> bool:
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class DuckDBMirror:
+    """
+    Embedded DuckDB copy of the NLQ tables
+
+    One DuckDB database per process. Queries run in worker threads on
+    their own cursor; the database has external file access disabled so
+    generated SQL cannot read or attach files.
+    """
+
+    def __init__(self, path: str, refresh_interval: int = 300, tables: Optional[List[MirrorTable]] = None):
+        import duckdb
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.tables = tables or MIRROR_TABLES
+        self._con = duckdb.connect(path)
+        self._write_lock = threading.Lock()
+        self._refresh_lock = asyncio.Lock()
+        self._last_refresh = 0.0
+        # Table watermarks after the last refresh; part of the result cache key
+        self.version: Tuple[Any, ...] = ()
+        self._create_tables()
+        self._con.execute("SET enable_external_access = false")
+
+    def _create_tables(self) -> None:
+        with self._write_lock:
+            self._con.execute(
+                "CREATE TABLE IF NOT EXISTS _mirror_state (table_name VARCHAR PRIMARY KEY, watermark TIMESTAMP)"
+            )
+            for table in self.tables:
+                cols = ", ".join(f"{name} {type_}" for name, type_ in table.columns)
+                self._con.execute(f"CREATE TABLE IF NOT EXISTS {table.name} ({cols})")
+
+    def _watermark(self, table: str) -> datetime:
+        row = self._con.cursor().execute(
+            "SELECT watermark FROM _mirror_state WHERE table_name = ?", [table]
+        ).fetchone()
+        return row[0] if row and row[0] else _EPOCH
+
+    def _state(self) -> Tuple[Any, ...]:
+        return tuple(self._con.cursor().execute(
+            "SELECT table_name, watermark FROM _mirror_state ORDER BY table_name"
+        ).fetchall())
+
+    def _apply_batch(self, table: MirrorTable, rows: List[Any], replace_all: bool) -> Optional[datetime]:
+        """Upsert one batch (blocking); returns the highest watermark in it"""
+        import pandas as pd
+
+        names = [name for name, _ in table.columns]
+        records = [
+            tuple(str(v) if isinstance(v, UUID) else v for v in row[:-1])
+            for row in rows
+        ]
+        batch = pd.DataFrame.from_records(records, columns=names)
+        watermarks = [row[-1] for row in rows if row[-1] is not None]
+
+        with self._write_lock:
+            cur = self._con.cursor()
+            cur.execute("BEGIN TRANSACTION")
+            try:
+                cur.register("mirror_batch", batch)
+                if replace_all:
+                    cur.execute(f"DELETE FROM {table.name}")
+                else:
+                    cur.execute(f"DELETE FROM {table.name} WHERE id IN (SELECT id FROM mirror_batch)")
+                cur.execute(f"INSERT INTO {table.name} SELECT {', '.join(names)} FROM mirror_batch")
+                high = max(watermarks) if watermarks else None
+                if high is not None:
+                    cur.execute(
+                        "INSERT OR REPLACE INTO _mirror_state VALUES (?, ?)", [table.name, high]
+                    )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            finally:
+                cur.unregister("mirror_batch")
+        return high
+
+    def _reset(self) -> None:
+        with self._write_lock:
+            self._con.execute("DELETE FROM _mirror_state")
+            for table in self.tables:
+                self._con.execute(f"DELETE FROM {table.name}")
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self._last_refresh >= self.refresh_interval
+
+    async def refresh(self, db: AsyncSession, full: bool = False) -> Dict[str, int]:
+        """
+        Pull changed rows from PostgreSQL into the mirror
+
+        Args:
+            db: Session on the source database
+            full: Drop and reload everything instead of an incremental pass
+
+        Returns:
+            Rows copied per table
+        """
+        async with self._refresh_lock:
+            if full:
+                await asyncio.to_thread(self._reset)
+
+            copied: Dict[str, int] = {}
+            for table in self.tables:
+                params = {}
+                if table.watermarked:
+                    params["since"] = await asyncio.to_thread(self._watermark, table.name)
+
+                result = await db.stream(text(table.source_sql), params)
+                count = 0
+                async for partition in result.partitions(FETCH_BATCH_SIZE):
+                    await asyncio.to_thread(
+                        self._apply_batch, table, partition,
+                        not table.watermarked and count == 0,
+                    )
+                    count += len(partition)
+                copied[table.name] = count
+
+            self._last_refresh = time.monotonic()
+            self.version = await asyncio.to_thread(self._state)
+            logger.info(f"NLQ mirror refreshed: {copied}")
+            return copied
+
+    async def refresh_if_stale(self, db: AsyncSession) -> None:
+        if self.is_stale():
+            await self.refresh(db)
+
+    def _query(self, cur, sql: str, max_rows: int) -> QueryResult:
+        cur.execute(with_row_cap(sql, max_rows))
+        columns = [d[0] for d in cur.description]
+        return rows_to_result(columns, cur.fetchall(), max_rows, engine="duckdb")
+
+    async def execute(self, sql: str, max_rows: int, timeout_ms: int) -> QueryResult:
+        """Run a query on the mirror; interrupted after timeout_ms"""
+        cur = self._con.cursor()
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(self._query, cur, sql, max_rows),
+                timeout=timeout_ms / 1000,
+            )
+        except asyncio.TimeoutError:
+            cur.interrupt()
+            raise QueryTimeoutError(f"Query exceeded {timeout_ms} ms limit")
+        finally:
+            cur.close()
+
+    def close(self) -> None:
+        self._con.close()
@@ -2,16 +2,28 @@
 Natural Language Query (NLQ) Service
 
 Allows users to query accounting data using natural language.
-Claude converts NL → SQL, we execute safely.
+Claude converts NL → SQL, we execute safely:
+- read-only transaction with statement_timeout and a row cap
+- generated SQL cached per normalized question and schema version
+- results cached per data version (invalidated by any ledger change)
+- optional routing to an embedded DuckDB mirror (NLQ_ENGINE=duckdb)
 """
 
-from typing import Dict, Any
+import logging
+from typing import Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 from uuid import UUID
 from app.config import settings
+from app.database import engine
+from app.services.nlq.cache import (
+    LRUCache, from_template, ledger_version, schema_version, sql_cache_key, to_template
+)
+from app.services.nlq.executor import QueryResult, QueryTimeoutError, ReadOnlyExecutor, is_safe_query
+from app.services.nlq.mirror import DuckDBMirror, duckdb_available
 import anthropic
 
+logger = logging.getLogger(__name__)
+
 
 class NLQService:
     """Natural Language Query service - converts questions to SQL"""
@@ -21,8 +33,27 @@ class NLQService:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not configured")
         
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
         self.model = "claude-sonnet-4-5"
+        
+        self.schema = self._get_schema_info()
+        self.schema_version = schema_version(self.schema)
+        self.sql_cache: LRUCache[str] = LRUCache(settings.NLQ_SQL_CACHE_SIZE)
+        self.result_cache: LRUCache[QueryResult] = LRUCache(settings.NLQ_RESULT_CACHE_SIZE)
+        self.executor = ReadOnlyExecutor(
+            engine,
+            timeout_ms=settings.NLQ_STATEMENT_TIMEOUT_MS,
+            max_rows=settings.NLQ_MAX_ROWS,
+        )
+        self.mirror: Optional[DuckDBMirror] = None
+        if settings.NLQ_ENGINE == "duckdb":
+            if duckdb_available():
+                self.mirror = DuckDBMirror(
+                    settings.NLQ_DUCKDB_PATH,
+                    refresh_interval=settings.NLQ_MIRROR_REFRESH_SECONDS,
+                )
+            else:
+                logger.warning("NLQ_ENGINE=duckdb but duckdb is not installed; using PostgreSQL")
     
     async def parse_and_execute(
         self,
@@ -39,36 +70,37 @@ class NLQService:
             db: Database session
         
         Returns:
-            Dict with question, SQL, results, count
+            Dict with question, SQL, results, count, truncated, engine, cached
         """
         
-        # Get database schema info
-        schema = self._get_schema_info()
-        
-        # Ask Claude to generate SQL
-        sql = await self._generate_sql(question, schema, client_id)
+        # Generated SQL is cached per normalized question (client id templated out)
+        key = sql_cache_key(question, self.schema_version)
+        template = self.sql_cache.get(key)
+        if template is not None:
+            sql = from_template(template, client_id)
+        else:
+            sql = await self._generate_sql(question, self.schema, client_id)
         
         # Validate (must be SELECT only!)
         if not self._is_safe_query(sql):
             raise ValueError("Unsafe query detected. Only SELECT queries are allowed.")
         
+        if template is None:
+            self.sql_cache.put(key, to_template(sql, client_id))
+        
         # Execute query
         try:
-            result = await db.execute(text(sql))
-            rows = result.fetchall()
-            
-            # Convert to list of dicts
-            results = []
-            if rows:
-                columns = result.keys()
-                results = [dict(zip(columns, row)) for row in rows]
+            result, cached = await self._execute(sql, client_id, db)
             
             return {
                 "success": True,
                 "question": question,
                 "sql": sql,
-                "results": results,
-                "count": len(results)
+                "results": result.rows,
+                "count": len(result.rows),
+                "truncated": result.truncated,
+                "engine": result.engine,
+                "cached": cached
             }
         
         except Exception as e:
@@ -81,6 +113,48 @@ class NLQService:
                 "count": 0
             }
     
+    async def _execute(self, sql: str, client_id: UUID, db: AsyncSession):
+        """
+        Execute via the result cache, the DuckDB mirror or PostgreSQL
+        
+        Returns:
+            (QueryResult, served_from_cache)
+        """
+        if self.mirror is not None:
+            await self.mirror.refresh_if_stale(db)
+            cache_key = ("duckdb", sql, self.mirror.version)
+            result = self.result_cache.get(cache_key)
+            if result is not None:
+                return result, True
+            try:
+                result = await self.mirror.execute(
+                    sql, settings.NLQ_MAX_ROWS, settings.NLQ_STATEMENT_TIMEOUT_MS
+                )
+                self.result_cache.put(cache_key, result)
+                return result, False
+            except QueryTimeoutError:
+                raise
+            except Exception as e:
+                # Dialect gaps between PostgreSQL and DuckDB - fall back to the sandbox
+                logger.info(f"NLQ mirror could not run query, using PostgreSQL: {e}")
+        
+        cache_key = ("postgres", sql, await ledger_version(db, client_id))
+        result = self.result_cache.get(cache_key)
+        if result is not None:
+            return result, True
+        result = await self.executor.execute(sql)
+        self.result_cache.put(cache_key, result)
+        return result, False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics and active engine"""
+        return {
+            "engine": "duckdb" if self.mirror is not None else "postgres",
+            "schema_version": self.schema_version,
+            "sql_cache": self.sql_cache.stats(),
+            "result_cache": self.result_cache.stats()
+        }
+    
     async def _generate_sql(self, question: str, schema: str, client_id: UUID) -> str:
         """
         Use Claude to generate SQL from natural language.
@@ -115,7 +189,7 @@ Common patterns:
 
 Output format: Just the SQL query, nothing else."""
 
-        response = self.client.messages.create(
+        response = await self.client.messages.create(
             model=self.model,
             max_tokens=512,
             system=system_prompt,
@@ -141,22 +215,7 @@ Output format: Just the SQL query, nothing else."""
         Returns:
             True if safe, False otherwise
         """
-        sql_upper = sql.upper().strip()
-        
-        # Must start with SELECT
-        if not sql_upper.startswith("SELECT"):
-            return False
-        
-        # Block dangerous keywords
-        dangerous = [
-            "INSERT", "UPDATE", "DELETE", "DROP", "ALTER", 
-            "CREATE", "TRUNCATE", "GRANT", "REVOKE", "EXEC"
-        ]
-        
-        if any(kw in sql_upper for kw in dangerous):
-            return False
-        
-        return True
+        return is_safe_query(sql)
     
     def _get_schema_info(self) -> str:
         """
@@ -6,24 +6,69 @@ Handles automatic payment status updates for vendor and customer invoices.
 Features:
 - Auto-update on bank transaction matching
 - Partial payment tracking
-- Overdue detection
+- Overdue detection (all clients in one UPDATE ... RETURNING per invoice table)
+- Payment summaries and aging computed in SQL (FILTER aggregates)
 - Payment history tracking for audit compliance (Norwegian accounting)
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, update
-from uuid import UUID
-from datetime import date, datetime
+from sqlalchemy import select, and_, or_, update, insert, func
+from uuid import UUID, uuid4
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 import logging
 
 from app.models.vendor_invoice import VendorInvoice
 from app.models.customer_invoice import CustomerInvoice
 from app.models.bank_transaction import BankTransaction
+from app.models.payment_status_history import PaymentStatusHistory
 
 logger = logging.getLogger(__name__)
 
+INVOICE_MODELS = {"vendor": VendorInvoice, "customer": CustomerInvoice}
+PAYMENT_STATUSES = ("unpaid", "partially_paid", "paid", "overdue")
+OPEN_STATUSES = ("unpaid", "partially_paid")
+HISTORY_CHUNK_SIZE = 1000
+
+
+def aging_buckets(today: date) -> List[Tuple[str, Optional[date], Optional[date]]]:
+    """
+    Aging buckets as due date ranges: (name, earliest due date, latest due date)
+
+    None means unbounded. "current" is not yet due.
+    """
+    return [
+        ("current", today, None),
+        ("1_30", today - timedelta(days=30), today - timedelta(days=1)),
+        ("31_60", today - timedelta(days=60), today - timedelta(days=31)),
+        ("61_90", today - timedelta(days=90), today - timedelta(days=61)),
+        ("over_90", None, today - timedelta(days=91)),
+    ]
+
+
+def _history_row(
+    client_id: UUID,
+    invoice_type: str,
+    invoice_id: UUID,
+    from_status: Optional[str],
+    to_status: str,
+    paid_amount: Optional[Decimal],
+    reason: str,
+    changed_at: datetime
+) -> Dict[str, Any]:
+    return {
+        "id": uuid4(),
+        "client_id": client_id,
+        "invoice_type": invoice_type,
+        "invoice_id": invoice_id,
+        "from_status": from_status,
+        "to_status": to_status,
+        "paid_amount": paid_amount,
+        "reason": reason,
+        "changed_at": changed_at,
+    }
+
 
 class PaymentStatusService:
     """Service for managing invoice payment status"""
@@ -80,6 +125,8 @@ class PaymentStatusService:
             new_status = "unpaid"
             paid_date = None
         
+        previous_status = invoice.payment_status
+        
         # Update invoice
         invoice.paid_amount = new_paid_amount
         invoice.payment_status = new_status
@@ -89,6 +136,12 @@ class PaymentStatusService:
         
         invoice.updated_at = datetime.utcnow()
         
+        if new_status != previous_status:
+            db.add(PaymentStatusHistory(**_history_row(
+                invoice.client_id, "vendor", invoice.id, previous_status, new_status,
+                new_paid_amount, "payment", invoice.updated_at
+            )))
+        
         await db.commit()
         await db.refresh(invoice)
         
@@ -104,7 +157,7 @@ class PaymentStatusService:
             "payment_amount": float(payment_amount),
             "new_paid_amount": float(new_paid_amount),
             "total_amount": float(total_amount),
-            "previous_status": invoice.payment_status,
+            "previous_status": previous_status,
             "new_status": new_status,
             "paid_date": paid_date.isoformat() if paid_date else None,
             "transaction_id": str(transaction_id) if transaction_id else None
@@ -159,6 +212,8 @@ class PaymentStatusService:
             new_status = "unpaid"
             paid_date = None
         
+        previous_status = invoice.payment_status
+        
         # Update invoice
         invoice.paid_amount = new_paid_amount
         invoice.payment_status = new_status
@@ -168,6 +223,12 @@ class PaymentStatusService:
         
         invoice.updated_at = datetime.utcnow()
         
+        if new_status != previous_status:
+            db.add(PaymentStatusHistory(**_history_row(
+                invoice.client_id, "customer", invoice.id, previous_status, new_status,
+                new_paid_amount, "payment", invoice.updated_at
+            )))
+        
         await db.commit()
         await db.refresh(invoice)
         
@@ -183,7 +244,7 @@ class PaymentStatusService:
             "payment_amount": float(payment_amount),
             "new_paid_amount": float(new_paid_amount),
             "total_amount": float(total_amount),
-            "previous_status": invoice.payment_status,
+            "previous_status": previous_status,
             "new_status": new_status,
             "paid_date": paid_date.isoformat() if paid_date else None,
             "transaction_id": str(transaction_id) if transaction_id else None
@@ -232,12 +293,20 @@ class PaymentStatusService:
         if not invoice:
             raise ValueError(f"{invoice_type} invoice {invoice_id} not found")
         
+        previous_status = invoice.payment_status
+        
         # Set to fully paid
         invoice.payment_status = "paid"
         invoice.paid_amount = invoice.total_amount
         invoice.paid_date = paid_date
         invoice.updated_at = datetime.utcnow()
         
+        if previous_status != "paid":
+            db.add(PaymentStatusHistory(**_history_row(
+                invoice.client_id, invoice_type, invoice.id, previous_status, "paid",
+                invoice.total_amount, "manual", invoice.updated_at
+            )))
+        
         await db.commit()
         await db.refresh(invoice)
         
@@ -259,70 +328,90 @@ class PaymentStatusService:
     @staticmethod
     async def detect_overdue_invoices(
         db: AsyncSession,
-        client_id: UUID
+        client_id: Optional[UUID] = None,
+        as_of_date: Optional[date] = None
     ) -> Dict[str, Any]:
         """
         Detect and mark overdue invoices.
         
         Logic:
-        - If due_date < today AND payment_status != 'paid' → mark as 'overdue'
+        - If due_date < today AND payment_status is unpaid/partially_paid → mark as 'overdue'
+        
+        Each invoice table is updated with one UPDATE ... RETURNING for all
+        clients (or one client); a history row per changed invoice is then
+        inserted in bulk, all in one transaction.
         
         Should be run daily via background task.
         
         Args:
-            client_id: Client UUID
+            client_id: Only this client (defaults to all clients)
+            as_of_date: Date to check against (defaults to today)
         
         Returns:
-            Dict with count of invoices marked overdue
+            Dict with count of invoices marked overdue, in total and per client
         """
         
-        today = date.today()
-        
-        # Update overdue vendor invoices
-        vendor_result = await db.execute(
-            update(VendorInvoice)
-            .where(
-                and_(
-                    VendorInvoice.client_id == client_id,
-                    VendorInvoice.due_date < today,
-                    VendorInvoice.payment_status.in_(['unpaid', 'partially_paid'])
+        today = as_of_date or date.today()
+        now = datetime.utcnow()
+        
+        counts = {}
+        by_client: Dict[str, int] = {}
+        history = []
+        for invoice_type, InvoiceModel in INVOICE_MODELS.items():
+            # The subquery reads each row's status before the update
+            previous = (
+                select(InvoiceModel.id, InvoiceModel.payment_status)
+                .where(
+                    InvoiceModel.due_date < today,
+                    InvoiceModel.payment_status.in_(OPEN_STATUSES)
                 )
             )
-            .values(payment_status='overdue', updated_at=datetime.utcnow())
-            .execution_options(synchronize_session=False)
-        )
-        
-        vendor_count = vendor_result.rowcount
-        
-        # Update overdue customer invoices
-        customer_result = await db.execute(
-            update(CustomerInvoice)
-            .where(
-                and_(
-                    CustomerInvoice.client_id == client_id,
-                    CustomerInvoice.due_date < today,
-                    CustomerInvoice.payment_status.in_(['unpaid', 'partially_paid'])
+            if client_id is not None:
+                previous = previous.where(InvoiceModel.client_id == client_id)
+            previous = previous.subquery()
+            
+            result = await db.execute(
+                update(InvoiceModel)
+                .where(
+                    InvoiceModel.id == previous.c.id,
+                    InvoiceModel.payment_status.in_(OPEN_STATUSES)
+                )
+                .values(payment_status='overdue', updated_at=now)
+                .returning(
+                    InvoiceModel.id, InvoiceModel.client_id, InvoiceModel.paid_amount,
+                    previous.c.payment_status
                 )
+                .execution_options(synchronize_session=False)
             )
-            .values(payment_status='overdue', updated_at=datetime.utcnow())
-            .execution_options(synchronize_session=False)
-        )
-        
-        customer_count = customer_result.rowcount
+            rows = result.all()
+            counts[invoice_type] = len(rows)
+            
+            for invoice_id, invoice_client_id, paid_amount, from_status in rows:
+                key = str(invoice_client_id)
+                by_client[key] = by_client.get(key, 0) + 1
+                history.append(_history_row(
+                    invoice_client_id, invoice_type, invoice_id, from_status, "overdue",
+                    paid_amount, "overdue_detection", now
+                ))
+        
+        for start in range(0, len(history), HISTORY_CHUNK_SIZE):
+            await db.execute(insert(PaymentStatusHistory), history[start:start + HISTORY_CHUNK_SIZE])
         
         await db.commit()
         
         logger.info(
-            f"Overdue detection: marked {vendor_count} vendor invoices "
-            f"and {customer_count} customer invoices as overdue"
+            f"Overdue detection: marked {counts['vendor']} vendor invoices "
+            f"and {counts['customer']} customer invoices as overdue "
+            f"({len(by_client)} clients)"
         )
         
         return {
             "success": True,
-            "client_id": str(client_id),
-            "vendor_invoices_overdue": vendor_count,
-            "customer_invoices_overdue": customer_count,
-            "total_overdue": vendor_count + customer_count,
+            "client_id": str(client_id) if client_id else None,
+            "vendor_invoices_overdue": counts["vendor"],
+            "customer_invoices_overdue": counts["customer"],
+            "total_overdue": counts["vendor"] + counts["customer"],
+            "by_client": by_client,
             "check_date": today.isoformat()
         }
     
@@ -330,56 +419,67 @@ class PaymentStatusService:
     async def get_payment_summary(
         db: AsyncSession,
         client_id: UUID,
-        invoice_type: str = "vendor"
+        invoice_type: str = "vendor",
+        as_of_date: Optional[date] = None
     ) -> Dict[str, Any]:
         """
         Get payment status summary for a client.
         
+        Counts and amounts per status and the aging of unpaid amounts are
+        computed in one aggregate query (FILTER per status and bucket).
+        
         Args:
             client_id: Client UUID
             invoice_type: "vendor" or "customer"
+            as_of_date: Date the aging is computed for (defaults to today)
         
         Returns:
-            Dict with payment status counts and amounts
+            Dict with payment status counts and amounts, and aging buckets
         """
         
-        if invoice_type == "vendor":
-            InvoiceModel = VendorInvoice
-        else:
-            InvoiceModel = CustomerInvoice
+        InvoiceModel = INVOICE_MODELS["vendor" if invoice_type == "vendor" else "customer"]
+        today = as_of_date or date.today()
         
-        # Get all invoices for client
-        result = await db.execute(
-            select(InvoiceModel).where(InvoiceModel.client_id == client_id)
-        )
-        invoices = result.scalars().all()
-        
-        # Calculate summary
-        summary = {
-            "unpaid": {"count": 0, "total_amount": Decimal("0.00")},
-            "partially_paid": {"count": 0, "total_amount": Decimal("0.00"), "paid_amount": Decimal("0.00")},
-            "paid": {"count": 0, "total_amount": Decimal("0.00")},
-            "overdue": {"count": 0, "total_amount": Decimal("0.00")}
-        }
+        paid = func.coalesce(InvoiceModel.paid_amount, 0)
+        outstanding = InvoiceModel.total_amount - paid
+        
+        def amount(value, condition):
+            return func.coalesce(func.sum(value).filter(condition), 0)
+        
+        columns = []
+        for status in PAYMENT_STATUSES:
+            is_status = InvoiceModel.payment_status == status
+            columns += [func.count().filter(is_status), amount(InvoiceModel.total_amount, is_status)]
+        columns.append(amount(paid, InvoiceModel.payment_status == "partially_paid"))
+        
+        buckets = aging_buckets(today)
+        for _, earliest, latest in buckets:
+            in_bucket = [InvoiceModel.payment_status != "paid"]
+            if earliest is not None:
+                in_bucket.append(InvoiceModel.due_date >= earliest)
+            if latest is not None:
+                in_bucket.append(InvoiceModel.due_date <= latest)
+            columns += [func.count().filter(and_(*in_bucket)), amount(outstanding, and_(*in_bucket))]
+        
+        result = await db.execute(select(*columns).where(InvoiceModel.client_id == client_id))
+        row = list(result.one())
+        
+        summary = {}
+        for status in PAYMENT_STATUSES:
+            count, total = row.pop(0), row.pop(0)
+            summary[status] = {"count": count, "total_amount": float(total)}
+        summary["partially_paid"]["paid_amount"] = float(row.pop(0))
         
-        for invoice in invoices:
-            status = invoice.payment_status
-            if status in summary:
-                summary[status]["count"] += 1
-                summary[status]["total_amount"] += invoice.total_amount
-                
-                if status == "partially_paid":
-                    summary[status]["paid_amount"] += (invoice.paid_amount or Decimal("0.00"))
-        
-        # Convert Decimal to float for JSON serialization
-        for status in summary:
-            for key in summary[status]:
-                if isinstance(summary[status][key], Decimal):
-                    summary[status][key] = float(summary[status][key])
+        aging = {}
+        for name, _, _ in buckets:
+            count, total = row.pop(0), row.pop(0)
+            aging[name] = {"count": count, "outstanding_amount": float(total)}
         
         return {
             "success": True,
             "client_id": str(client_id),
             "invoice_type": invoice_type,
-            "summary": summary
+            "summary": summary,
+            "aging": aging,
+            "as_of_date": today.isoformat()
         }
@@ -0,0 +1,330 @@
+"""
+Period close jobs - Tenant-wide month-end close
+
+An accounting firm closes the same period for hundreds of clients in one
+night. A job (PeriodCloseJob) holds one item per client and is run by
+run_period_close_job():
+
+- Already-closed clients and the balance check are resolved for all
+  remaining clients with one query each, before any per-client work
+- Up to `concurrency` clients then close in parallel, each on its own
+  connection and under a per-client advisory lock, so two runs (or a run
+  and a manual close) never close the same client at the same time
+- Accruals are posted per client (PeriodCloseService._post_accruals)
+- Each item's status, result and step timings are stored as soon as the
+  client finishes. Running the job again resumes it: only clients that did
+  not succeed (or were not skipped) run again
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.models.client import Client
+from app.models.period_close_job import PeriodCloseJob, PeriodCloseJobItem
+from app.services.period_close_service import PeriodCloseService
+
+logger = logging.getLogger(__name__)
+
+# Items that are not run again when a job is resumed
+DONE_ITEM_STATUSES = ("succeeded", "skipped")
+
+ADVISORY_LOCK_NAMESPACE = "period_close"
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def item_status(result: Dict[str, Any]) -> str:
+    """Job item status for a run_period_close() result"""
+    if result["status"] == "success":
+        return "succeeded"
+    if "Period is already closed" in result["errors"]:
+        return "skipped"
+    return "failed"
+
+
+def summarize_timings(timings: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Average and max milliseconds per step over the items that ran it"""
+    per_step: Dict[str, List[float]] = defaultdict(list)
+    for item_timings in timings:
+        for step, ms in (item_timings or {}).items():
+            per_step[step].append(ms)
+    return {
+        step: {"count": len(values), "avg_ms": round(sum(values) / len(values), 1), "max_ms": max(values)}
+        for step, values in per_step.items()
+    }
+
+
+async def create_period_close_job(
+    db: AsyncSession,
+    tenant_id: UUID,
+    period: str,
+    client_ids: Optional[List[UUID]] = None,
+    concurrency: Optional[int] = None
+) -> PeriodCloseJob:
+    """
+    Create a close job for the tenant's active clients
+
+    Args:
+        db: Database session (committed)
+        tenant_id: Accounting firm
+        period: Period in YYYY-MM format
+        client_ids: Only these clients (defaults to all active clients)
+        concurrency: Clients closed in parallel (capped at the pool size)
+
+    Returns:
+        The job, with one pending item per client
+    """
+    datetime.strptime(period, "%Y-%m")  # ValueError on a malformed period
+
+    query = select(Client.id).where(Client.tenant_id == tenant_id, Client.status == "active")
+    if client_ids is not None:
+        query = query.where(Client.id.in_(client_ids))
+    ids = list((await db.execute(query.order_by(Client.client_number))).scalars().all())
+
+    concurrency = concurrency or settings.PERIOD_CLOSE_CONCURRENCY
+    job = PeriodCloseJob(
+        tenant_id=tenant_id,
+        period=period,
+        status="pending",
+        concurrency=max(1, min(concurrency, settings.DB_POOL_SIZE)),
+        total_clients=len(ids),
+    )
+    db.add(job)
+    await db.flush()
+    db.add_all([PeriodCloseJobItem(job_id=job.id, client_id=client_id, status="pending") for client_id in ids])
+    await db.commit()
+
+    logger.info(f"Created period close job {job.id}: {period}, {len(ids)} clients")
+    return job
+
+
+async def period_close_job_progress(db: AsyncSession, job_id: UUID) -> Optional[Dict[str, Any]]:
+    """
+    Job status with item counts per status, step timings and failed clients
+
+    Returns:
+        Progress dict, or None when the job does not exist
+    """
+    job = await db.get(PeriodCloseJob, job_id)
+    if job is None:
+        return None
+
+    result = await db.execute(
+        select(PeriodCloseJobItem.status, func.count())
+        .where(PeriodCloseJobItem.job_id == job_id)
+        .group_by(PeriodCloseJobItem.status)
+    )
+    by_status = dict(result.all())
+    done = sum(by_status.get(status, 0) for status in DONE_ITEM_STATUSES + ("failed",))
+
+    result = await db.execute(
+        select(PeriodCloseJobItem.timings)
+        .where(PeriodCloseJobItem.job_id == job_id, PeriodCloseJobItem.timings.isnot(None))
+    )
+    step_timings = summarize_timings(result.scalars().all())
+
+    result = await db.execute(
+        select(PeriodCloseJobItem)
+        .where(PeriodCloseJobItem.job_id == job_id, PeriodCloseJobItem.status == "failed")
+        .order_by(PeriodCloseJobItem.finished_at)
+    )
+    failed = [
+        {
+            "client_id": str(item.client_id),
+            "error": item.error_message or "; ".join((item.result or {}).get("errors", [])),
+            "attempts": item.attempts,
+        }
+        for item in result.scalars().all()
+    ]
+
+    return {
+        **job.to_dict(),
+        "progress": {
+            "done": done,
+            "total": job.total_clients,
+            "percent": round(100 * done / job.total_clients, 1) if job.total_clients else 100.0,
+            "by_status": by_status,
+        },
+        "step_timings": step_timings,
+        "failed": failed,
+    }
+
+
+class PeriodCloseJobRunner:
+    """Runs (or resumes) one period close job"""
+
+    def __init__(
+        self,
+        job_id: UUID,
+        db_engine: AsyncEngine = engine,
+        session_factory: async_sessionmaker = AsyncSessionLocal
+    ):
+        self.job_id = job_id
+        self.engine = db_engine
+        self.session_factory = session_factory
+        self.service = PeriodCloseService()
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Close every unfinished client of the job
+
+        Returns:
+            period_close_job_progress() after the run
+        """
+        try:
+            period, concurrency, pending = await self._start()
+            semaphore = asyncio.Semaphore(concurrency)
+            start = time.perf_counter()
+            await asyncio.gather(*(
+                self._close_client(semaphore, period, item_id, client_id, balance_check)
+                for item_id, client_id, balance_check in pending
+            ))
+            await self._finish(_elapsed_ms(start))
+        except Exception as e:
+            logger.error(f"Period close job {self.job_id} failed: {e}", exc_info=True)
+            async with self.session_factory() as db:
+                await db.execute(
+                    update(PeriodCloseJob)
+                    .where(PeriodCloseJob.id == self.job_id)
+                    .values(status="failed", error_message=str(e), finished_at=datetime.utcnow())
+                )
+                await db.commit()
+            raise
+
+        async with self.session_factory() as db:
+            return await period_close_job_progress(db, self.job_id)
+
+    async def _start(self):
+        """Mark the job running; set-based closed and balance checks for the remaining clients"""
+        async with self.session_factory() as db:
+            job = await db.get(PeriodCloseJob, self.job_id)
+            if job is None:
+                raise ValueError(f"Period close job {self.job_id} not found")
+
+            result = await db.execute(
+                select(PeriodCloseJobItem.id, PeriodCloseJobItem.client_id)
+                .where(
+                    PeriodCloseJobItem.job_id == self.job_id,
+                    PeriodCloseJobItem.status.notin_(DONE_ITEM_STATUSES)
+                )
+            )
+            items = result.all()
+            client_ids = [client_id for _, client_id in items]
+
+            timings = {}
+            start = time.perf_counter()
+            closed = set(await self.service.closed_clients(client_ids, job.period, db)) if client_ids else set()
+            timings["closed_check"] = _elapsed_ms(start)
+
+            open_ids = [client_id for client_id in client_ids if client_id not in closed]
+            start = time.perf_counter()
+            checks = await self.service.balance_checks(open_ids, job.period, db) if open_ids else {}
+            timings["balance_check"] = _elapsed_ms(start)
+
+            if closed:
+                await db.execute(
+                    update(PeriodCloseJobItem)
+                    .where(PeriodCloseJobItem.job_id == self.job_id, PeriodCloseJobItem.client_id.in_(closed))
+                    .values(status="skipped", error_message="Period is already closed", finished_at=datetime.utcnow())
+                )
+
+            job.status = "running"
+            job.started_at = job.started_at or datetime.utcnow()
+            job.finished_at = None
+            job.error_message = None
+            job.timings = timings
+            period, concurrency = job.period, job.concurrency
+            await db.commit()
+
+        logger.info(
+            f"Period close job {self.job_id} ({period}): {len(open_ids)} clients to close, "
+            f"{len(closed)} already closed, concurrency {concurrency}"
+        )
+        pending = [
+            (item_id, client_id, checks[client_id])
+            for item_id, client_id in items if client_id not in closed
+        ]
+        return period, concurrency, pending
+
+    async def _close_client(
+        self,
+        semaphore: asyncio.Semaphore,
+        period: str,
+        item_id: UUID,
+        client_id: UUID,
+        balance_check: Dict[str, Any]
+    ) -> None:
+        """Close one client on a dedicated connection holding its advisory lock"""
+        async with semaphore, self.engine.connect() as conn:
+            lock_args = {"namespace": ADVISORY_LOCK_NAMESPACE, "client_id": str(client_id)}
+            locked = await conn.scalar(
+                text("SELECT pg_try_advisory_lock(hashtext(:namespace), hashtext(:client_id))"), lock_args
+            )
+            await conn.commit()
+            if not locked:
+                await self._update_item(
+                    conn, item_id, status="failed", finished_at=datetime.utcnow(),
+                    error_message="Another period close is running for this client",
+                )
+                return
+
+            start = time.perf_counter()
+            try:
+                await self._update_item(
+                    conn, item_id, status="running", started_at=datetime.utcnow(),
+                    attempts=PeriodCloseJobItem.attempts + 1, error_message=None,
+                )
+                # The session reuses the locked connection for every transaction
+                async with AsyncSession(bind=conn, expire_on_commit=False) as db:
+                    result = await self.service.run_period_close(client_id, period, db, balance_check=balance_check)
+                result["timings"]["total"] = _elapsed_ms(start)
+                await self._update_item(
+                    conn, item_id, status=item_status(result), result=result,
+                    timings=result["timings"], finished_at=datetime.utcnow(),
+                )
+            except Exception as e:
+                logger.error(f"Period close failed for client {client_id} ({period}): {e}", exc_info=True)
+                await conn.rollback()
+                await self._update_item(
+                    conn, item_id, status="failed", error_message=str(e),
+                    timings={"total": _elapsed_ms(start)}, finished_at=datetime.utcnow(),
+                )
+            finally:
+                await conn.rollback()
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(hashtext(:namespace), hashtext(:client_id))"), lock_args
+                )
+                await conn.commit()
+
+    async def _update_item(self, conn, item_id: UUID, **values) -> None:
+        await conn.execute(update(PeriodCloseJobItem).where(PeriodCloseJobItem.id == item_id).values(**values))
+        await conn.commit()
+
+    async def _finish(self, clients_ms: float) -> None:
+        async with self.session_factory() as db:
+            job = await db.get(PeriodCloseJob, self.job_id)
+            failed = await db.scalar(
+                select(func.count())
+                .where(PeriodCloseJobItem.job_id == self.job_id, PeriodCloseJobItem.status == "failed")
+            )
+            job.status = "completed_with_errors" if failed else "completed"
+            job.finished_at = datetime.utcnow()
+            job.timings = {**(job.timings or {}), "clients": clients_ms}
+            await db.commit()
+        logger.info(f"Period close job {self.job_id} finished: {failed} failed clients")
+
+
+async def run_period_close_job(job_id: UUID) -> Dict[str, Any]:
+    """Run or resume a period close job (see PeriodCloseJobRunner)"""
+    return await PeriodCloseJobRunner(job_id).run()
@@ -6,9 +6,13 @@ Orchestrates automated period close:
 2. Auto-post accruals
 3. Close period
 4. Generate summary
+
+Closing many clients at once: see app/services/period_close_jobs.py.
 """
 
-from typing import Dict, Any
+import logging
+import time
+from typing import Dict, Any, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
 from uuid import UUID
@@ -17,6 +21,13 @@ from decimal import Decimal
 
 from app.models.accounting_period import AccountingPeriod
 from app.services.accrual_service import AccrualService
+from app.services.ledger_lines import FISCAL_YEAR_SLACK
+
+logger = logging.getLogger(__name__)
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
 
 
 class PeriodCloseService:
@@ -26,7 +37,8 @@ class PeriodCloseService:
         self,
         client_id: UUID,
         period: str,  # YYYY-MM format
-        db: AsyncSession
+        db: AsyncSession,
+        balance_check: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Run automated period close.
@@ -35,9 +47,12 @@ class PeriodCloseService:
             client_id: Client UUID
             period: Period in YYYY-MM format
             db: Database session
+            balance_check: Result of balance_checks() for this client, when
+                already computed for many clients at once
         
         Returns:
-            Dict with status, checks, warnings, summary
+            Dict with status, checks, warnings, summary and per-step
+            timings (milliseconds)
         """
         
         results = {
@@ -46,27 +61,37 @@ class PeriodCloseService:
             "checks": [],
             "warnings": [],
             "errors": [],
-            "summary": ""
+            "summary": "",
+            "timings": {}
         }
+        timings = results["timings"]
         
         # Step 1: Check if already closed
-        if await self._is_period_closed(client_id, period, db):
+        start = time.perf_counter()
+        already_closed = await self._is_period_closed(client_id, period, db)
+        timings["closed_check"] = _elapsed_ms(start)
+        if already_closed:
             results["errors"].append("Period is already closed")
             results["status"] = "failed"
             results["summary"] = f"Periode {period} er allerede lukket"
             return results
         
         # Step 2: Run validation checks
-        print(f"Running balance check for {period}...")
-        balance_check = await self._check_balance(client_id, period, db)
+        logger.info(f"Running balance check for {client_id} {period}")
+        start = time.perf_counter()
+        if balance_check is None:
+            balance_check = await self._check_balance(client_id, period, db)
+        timings["balance_check"] = _elapsed_ms(start)
         results["checks"].append(balance_check)
         
         if balance_check["status"] == "failed":
             results["errors"].append(f"Balance check failed: {balance_check.get('diff', 0)}")
         
         # Step 3: Auto-post accruals
-        print(f"Auto-posting accruals for {period}...")
+        logger.info(f"Auto-posting accruals for {client_id} {period}")
+        start = time.perf_counter()
         accrual_result = await self._post_accruals(client_id, period, db)
+        timings["accruals"] = _elapsed_ms(start)
         results["checks"].append(accrual_result)
         
         if accrual_result["posted_count"] > 0:
@@ -79,14 +104,35 @@ class PeriodCloseService:
             return results
         
         # Step 5: Mark period as closed
-        print(f"Closing period {period}...")
+        logger.info(f"Closing period {period} for {client_id}")
+        start = time.perf_counter()
         await self._close_period(client_id, period, db)
+        timings["close"] = _elapsed_ms(start)
         
         results["status"] = "success"
         results["summary"] = f"✅ Periode {period} lukket. {len(results['checks'])} kontroller utført, {len(results['warnings'])} advarsler."
         
         return results
     
+    async def closed_clients(
+        self,
+        client_ids: List[UUID],
+        period: str,
+        db: AsyncSession
+    ) -> List[UUID]:
+        """Clients among client_ids whose period is already closed (one query)"""
+        
+        from app.models.general_ledger import GeneralLedger
+        
+        result = await db.execute(
+            select(GeneralLedger.client_id).where(
+                GeneralLedger.client_id.in_(client_ids),
+                GeneralLedger.period == period,
+                GeneralLedger.locked == True
+            ).distinct()
+        )
+        return list(result.scalars().all())
+    
     async def _is_period_closed(
         self,
         client_id: UUID,
@@ -108,36 +154,55 @@ class PeriodCloseService:
         
         return locked_entry is not None
     
-    async def _check_balance(
+    async def balance_checks(
         self,
-        client_id: UUID,
+        client_ids: List[UUID],
         period: str,
         db: AsyncSession
-    ) -> Dict[str, Any]:
+    ) -> Dict[UUID, Dict[str, Any]]:
         """
-        Verify all entries balance (Debit = Credit).
+        Verify all entries balance (Debit = Credit) for many clients in one
+        grouped query.
         This is the fundamental accounting equation.
+        
+        Returns:
+            Balance check result per client (clients without entries pass)
         """
         
+        year = int(period.split("-")[0])
         query = """
         SELECT 
+            gll.client_id,
             SUM(gll.debit_amount) - SUM(gll.credit_amount) as diff,
             COUNT(DISTINCT gl.id) as entry_count
         FROM general_ledger_lines gll
         JOIN general_ledger gl ON gll.general_ledger_id = gl.id
-        WHERE gl.client_id = :client_id 
+        WHERE gll.client_id = ANY(:client_ids)
+          AND gll.fiscal_year BETWEEN :min_year AND :max_year
           AND gl.period = :period
           AND gl.status = 'posted'
+        GROUP BY gll.client_id
         """
         
         result = await db.execute(
             text(query),
-            {"client_id": str(client_id), "period": period}
+            {
+                "client_ids": list(client_ids),
+                "period": period,
+                "min_year": year - FISCAL_YEAR_SLACK,
+                "max_year": year + FISCAL_YEAR_SLACK,
+            }
         )
-        row = result.first()
+        totals = {row[0]: (row[1], row[2]) for row in result.all()}
         
-        diff = row[0] if row and row[0] is not None else Decimal("0.00")
-        entry_count = row[1] if row else 0
+        return {
+            client_id: self._balance_result(*totals.get(client_id, (None, 0)))
+            for client_id in client_ids
+        }
+    
+    @staticmethod
+    def _balance_result(diff: Optional[Decimal], entry_count: int) -> Dict[str, Any]:
+        diff = diff if diff is not None else Decimal("0.00")
         
         # Allow for small rounding errors (< 1 kr)
         if abs(float(diff)) < 1.00:
@@ -156,13 +221,24 @@ class PeriodCloseService:
                 "entry_count": entry_count
             }
     
+    async def _check_balance(
+        self,
+        client_id: UUID,
+        period: str,
+        db: AsyncSession
+    ) -> Dict[str, Any]:
+        """Balance check for a single client"""
+        
+        checks = await self.balance_checks([client_id], period, db)
+        return checks[client_id]
+    
     async def _post_accruals(
         self,
         client_id: UUID,
         period: str,
         db: AsyncSession
     ) -> Dict[str, Any]:
-        """Auto-post all pending accruals for this period"""
+        """Auto-post this client's pending accruals for this period"""
         
         # Parse period to get end date
         year, month = period.split("-")
@@ -178,7 +254,7 @@ class PeriodCloseService:
         
         # Use AccrualService to auto-post
         accrual_service = AccrualService()
-        result = await accrual_service.auto_post_due_accruals(db, last_day.date())
+        result = await accrual_service.auto_post_due_accruals(db, last_day.date(), client_id=client_id)
         
         return {
             "name": "Periodiseringer",
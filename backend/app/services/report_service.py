@@ -11,6 +11,7 @@ from decimal import Decimal
 from app.models.chart_of_accounts import Account
 from app.models.account_balance import AccountBalance
 from app.models.general_ledger import GeneralLedgerLine, GeneralLedger
+from app.services.ledger_lines import line_filters
 
 
 async def calculate_saldobalanse(
@@ -66,9 +67,8 @@ async def calculate_saldobalanse(
         .join(GeneralLedger, GeneralLedgerLine.general_ledger_id == GeneralLedger.id)
         .where(
             and_(
-                GeneralLedger.client_id == client_id,
+                *line_filters(client_id),
                 GeneralLedger.source_type == "opening_balance",
-                GeneralLedger.status == "posted"
             )
         )
         .group_by(GeneralLedgerLine.account_number)
@@ -88,26 +88,11 @@ async def calculate_saldobalanse(
             func.sum(GeneralLedgerLine.debit_amount).label("total_debit"),
             func.sum(GeneralLedgerLine.credit_amount).label("total_credit"),
         )
-        .join(GeneralLedger, GeneralLedgerLine.general_ledger_id == GeneralLedger.id)
-        .where(
-            and_(
-                GeneralLedger.client_id == client_id,
-                GeneralLedger.status == "posted"  # Only posted entries
-            )
-        )
+        # Only posted entries; no join - lines carry the entry columns
+        .where(and_(*line_filters(client_id, from_date, to_date)))
         .group_by(GeneralLedgerLine.account_number)
     )
     
-    # Apply date filters if provided
-    date_filters = []
-    if from_date:
-        date_filters.append(GeneralLedger.accounting_date >= from_date)
-    if to_date:
-        date_filters.append(GeneralLedger.accounting_date <= to_date)
-    
-    if date_filters:
-        transactions_query = transactions_query.where(and_(*date_filters))
-    
     # Filter by account class if provided
     if account_class:
         transactions_query = transactions_query.where(
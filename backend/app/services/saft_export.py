@@ -0,0 +1,708 @@
+"""
+SAF-T Financial Export - Norwegian Standard Audit File (Skatteetaten, v1.30)
+
+Writes the AuditFile incrementally with lxml.etree.xmlfile, so a year with
+millions of ledger lines is exported in constant memory:
+
+- Header: company (Client), selection period, control totals
+- MasterFiles: GeneralLedgerAccounts (chart of accounts with opening and
+  closing balances), Customers and Suppliers (balance on their control
+  account 1500/2400 from the sub-ledgers) and the TaxTable (TaxCode)
+- GeneralLedgerEntries: one Journal per voucher series, one Transaction
+  per voucher, read through a server-side cursor
+
+The control totals (NumberOfEntries, TotalDebit, TotalCredit) come first in
+the file, so they are taken from one aggregate query up front. The entries
+are summed again while they are written; a mismatch means the ledger
+changed under the export and the file is rejected. Both queries run in one
+REPEATABLE READ transaction, so that only happens on a broken ledger.
+
+validate_saft_file() is a separate streaming pass over the written file:
+XSD validation against Skatteetaten's schema (app/resources/saft/, installed
+by scripts/fetch_saft_xsd.py, or SAFT_XSD_PATH) with iterparse, and the
+control totals and per-transaction balance recomputed from the XML.
+
+Usage:
+    exporter = SaftExporter(db)
+    totals = await exporter.write(client_id, date(2025, 1, 1), date(2025, 12, 31), output)
+    result = await asyncio.to_thread(validate_saft_file, path)
+"""
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
+from uuid import UUID
+
+from lxml import etree
+from sqlalchemy import case, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.chart_of_accounts import Account
+from app.models.client import Client
+from app.models.customer import Customer
+from app.models.general_ledger import GeneralLedger, GeneralLedgerLine
+from app.models.supplier import Supplier
+from app.models.tax_code import TaxCode
+from app.models.voucher_series import VoucherSeries
+from app.services.ledger_lines import line_filters
+from app.services.subledger_analytics import SUBLEDGERS, Subledger
+
+logger = logging.getLogger(__name__)
+
+SAFT_NAMESPACE = "urn:StandardAuditFile-Taxation-Financial:NO"
+SAFT_VERSION = "1.30"
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+SAFT_XSD_FILENAME = "Norwegian_SAF-T_Financial_Schema_v_1.30.xsd"
+BUNDLED_XSD_PATH = BACKEND_DIR / "app" / "resources" / "saft" / SAFT_XSD_FILENAME
+SOFTWARE_COMPANY_NAME = "Kontali"
+
+STREAM_CHUNK_SIZE = 2000
+
+# Values of a (tag, value) tree: text, nested children, or None (omitted)
+Node = Tuple[str, Any]
+
+NORWAY_NAMES = {"no", "nor", "norge", "norway", "noreg"}
+
+# Opening and closing balance of a customer/supplier without sub-ledger entries
+NO_BALANCE = (Decimal("0.00"), Decimal("0.00"))
+
+
+class SaftExportError(Exception):
+    """The audit file could not be produced"""
+    pass
+
+
+class SaftSchemaUnavailableError(SaftExportError):
+    """The SAF-T XSD is not installed, so files cannot be validated"""
+    pass
+
+
+def saft_xsd_path() -> Path:
+    """SAFT_XSD_PATH (relative paths from the backend directory), else the bundled schema"""
+    if not settings.SAFT_XSD_PATH:
+        return BUNDLED_XSD_PATH
+    path = Path(settings.SAFT_XSD_PATH)
+    return path if path.is_absolute() else BACKEND_DIR / path
+
+
+@lru_cache(maxsize=None)
+def q(tag: str) -> str:
+    return f"{{{SAFT_NAMESPACE}}}{tag}"
+
+
+def amount(value: Optional[Decimal]) -> str:
+    return f"{(value or Decimal('0')):.2f}"
+
+
+def write_node(xf, tag: str, value: Any) -> None:
+    """Write a (tag, value) tree; None values and empty child lists are skipped"""
+    if value is None or value == "" or value == []:
+        return
+    with xf.element(q(tag)):
+        if isinstance(value, list):
+            for child_tag, child_value in value:
+                write_node(xf, child_tag, child_value)
+        else:
+            xf.write(str(value))
+
+
+def country_code(country: Optional[str]) -> Optional[str]:
+    """ISO country code for the country names stored on contacts"""
+    if not country:
+        return None
+    if country.strip().lower() in NORWAY_NAMES:
+        return "NO"
+    return country.upper() if len(country) == 2 else None
+
+
+def address_node(
+    street: Optional[str],
+    postal_code: Optional[str],
+    city: Optional[str],
+    country: Optional[str] = "NO",
+) -> List[Node]:
+    return [
+        ("StreetName", street),
+        ("City", city or "NotUsed"),
+        ("PostalCode", postal_code or "NotUsed"),
+        ("Country", country_code(country)),
+    ]
+
+
+def split_address(address: Optional[str]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """'Storgata 1, 0150 Oslo' -> ('Storgata 1', '0150', 'Oslo')"""
+    if not address:
+        return None, None, None
+    parts = [part.strip() for part in address.split(",") if part.strip()]
+    match = re.match(r"^(\d{4})\s+(.+)$", parts[-1]) if parts else None
+    if not match:
+        return address, None, None
+    street = ", ".join(parts[:-1]) or None
+    return street, match.group(1), match.group(2)
+
+
+def contact_node(person: Optional[str], phone: Optional[str] = None, email: Optional[str] = None) -> List[Node]:
+    names = (person or "").split()
+    return [
+        ("ContactPerson", [
+            ("FirstName", " ".join(names[:-1]) or (names[0] if names else "NotUsed")),
+            ("LastName", names[-1] if len(names) > 1 else "NotUsed"),
+        ]),
+        ("Telephone", phone),
+        ("Email", email),
+    ]
+
+
+def optional_contact(person: Optional[str], phone: Optional[str], email: Optional[str]) -> Optional[List[Node]]:
+    """Contact for customers/suppliers, where it may be left out"""
+    if not (person or phone or email):
+        return None
+    return contact_node(person, phone, email)
+
+
+def balance_nodes(prefix: str, balance: Decimal) -> List[Node]:
+    """OpeningDebitBalance/OpeningCreditBalance (or Closing...) for a debit-positive balance"""
+    if balance < 0:
+        return [(f"{prefix}CreditBalance", amount(-balance))]
+    return [(f"{prefix}DebitBalance", amount(balance))]
+
+
+@dataclass
+class ControlTotals:
+    """NumberOfEntries/TotalDebit/TotalCredit of GeneralLedgerEntries"""
+    entries: int = 0
+    debit: Decimal = Decimal("0.00")
+    credit: Decimal = Decimal("0.00")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "number_of_entries": self.entries,
+            "total_debit": float(self.debit),
+            "total_credit": float(self.credit),
+        }
+
+
+@dataclass
+class SaftValidationResult:
+    valid: bool
+    errors: List[str] = field(default_factory=list)
+    totals: ControlTotals = field(default_factory=ControlTotals)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"valid": self.valid, "errors": self.errors, **self.totals.to_dict()}
+
+
+class SaftExporter:
+    """Streams a client's SAF-T Financial file for a period"""
+
+    def __init__(self, db: AsyncSession, chunk_size: int = STREAM_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    async def write(
+        self,
+        client_id: UUID,
+        start_date: date,
+        end_date: date,
+        output: Union[str, BinaryIO],
+    ) -> ControlTotals:
+        """
+        Write the audit file for [start_date, end_date] to output
+
+        Call on a fresh session: the export switches the transaction to
+        REPEATABLE READ, which must happen before its first query.
+
+        Returns:
+            Control totals of the GeneralLedgerEntries section
+
+        Raises:
+            SaftExportError: Unknown client, or the entries did not add up to
+                the control totals
+        """
+        await self.db.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ"))
+
+        client = (await self.db.execute(select(Client).where(Client.id == client_id))).scalar_one_or_none()
+        if client is None:
+            raise SaftExportError(f"Client {client_id} not found")
+
+        totals = await self.control_totals(client_id, start_date, end_date)
+        balances = await self.account_balances(client_id, start_date, end_date)
+        customer_balances = await self.contact_balances(SUBLEDGERS["customer"], client_id, start_date, end_date)
+        supplier_balances = await self.contact_balances(SUBLEDGERS["supplier"], client_id, start_date, end_date)
+        tax_codes = await self.tax_codes()
+
+        with etree.xmlfile(output, encoding="UTF-8") as xf:
+            xf.write_declaration()
+            with xf.element(q("AuditFile"), nsmap={None: SAFT_NAMESPACE}):
+                write_node(xf, "Header", self.header(client, start_date, end_date))
+                with xf.element(q("MasterFiles")):
+                    await self._write_accounts(xf, client_id, balances)
+                    await self._write_contacts(
+                        xf, "Customers", self._customer_rows(client_id), self.customer_node, customer_balances
+                    )
+                    await self._write_contacts(
+                        xf, "Suppliers", self._supplier_rows(client_id), self.supplier_node, supplier_balances
+                    )
+                    write_node(xf, "TaxTable", self.tax_table(tax_codes))
+                with xf.element(q("GeneralLedgerEntries")):
+                    write_node(xf, "NumberOfEntries", totals.entries)
+                    write_node(xf, "TotalDebit", amount(totals.debit))
+                    write_node(xf, "TotalCredit", amount(totals.credit))
+                    written = await self._write_entries(xf, client_id, start_date, end_date, tax_codes)
+
+        if written != totals:
+            raise SaftExportError(
+                f"Ledger entries changed during export: control totals {totals.to_dict()}, "
+                f"written {written.to_dict()}"
+            )
+        logger.info(
+            f"SAF-T export for client {client_id} {start_date}..{end_date}: "
+            f"{totals.entries} entries, debit {totals.debit}, credit {totals.credit}"
+        )
+        return totals
+
+    # ---- Aggregates ----
+
+    async def control_totals(self, client_id: UUID, start_date: date, end_date: date) -> ControlTotals:
+        result = await self.db.execute(
+            select(
+                func.count(func.distinct(GeneralLedgerLine.general_ledger_id)),
+                func.coalesce(func.sum(GeneralLedgerLine.debit_amount), 0),
+                func.coalesce(func.sum(GeneralLedgerLine.credit_amount), 0),
+            ).where(*line_filters(client_id, start_date, end_date))
+        )
+        entries, debit, credit = result.one()
+        return ControlTotals(entries, Decimal(debit), Decimal(credit))
+
+    def account_balances_query(self, client_id: UUID, start_date: date, end_date: date):
+        """
+        Opening and closing balance (debit - credit) per account
+
+        Balance sheet accounts (1xxx/2xxx) carry everything before the
+        period; result accounts only what was posted earlier in the same
+        year.
+        """
+        net = GeneralLedgerLine.debit_amount - GeneralLedgerLine.credit_amount
+        is_balance_account = GeneralLedgerLine.account_number < "3"
+        before_start = GeneralLedgerLine.accounting_date < start_date
+        opening_filter = before_start & (
+            is_balance_account | (GeneralLedgerLine.accounting_date >= date(start_date.year, 1, 1))
+        )
+        closing_filter = ~before_start | opening_filter
+        return select(
+            GeneralLedgerLine.account_number,
+            func.coalesce(func.sum(net).filter(opening_filter), 0).label("opening"),
+            func.coalesce(func.sum(net).filter(closing_filter), 0).label("closing"),
+        ).where(
+            GeneralLedgerLine.client_id == client_id,
+            GeneralLedgerLine.status == "posted",
+            GeneralLedgerLine.accounting_date <= end_date,
+        ).group_by(GeneralLedgerLine.account_number)
+
+    async def account_balances(self, client_id: UUID, start_date: date, end_date: date) -> Dict[str, Tuple[Decimal, Decimal]]:
+        result = await self.db.execute(self.account_balances_query(client_id, start_date, end_date))
+        return {row.account_number: (Decimal(row.opening), Decimal(row.closing)) for row in result}
+
+    def contact_balances_query(self, subledger: Subledger, client_id: UUID, start_date: date, end_date: date):
+        """
+        Opening and closing balance (debit - credit) per customer or supplier
+
+        Taken from the sub-ledger transactions: invoices add to the balance,
+        payments and credit notes reduce it. Supplier debt comes out as a
+        credit balance.
+        """
+        transactions = subledger.transaction_model
+        signed = case(
+            (transactions.type == "invoice", transactions.amount),
+            else_=-transactions.amount,
+        ) * subledger.sign
+        return (
+            select(
+                subledger.counterparty_id.label("contact_id"),
+                func.coalesce(func.sum(signed).filter(transactions.transaction_date < start_date), 0).label("opening"),
+                func.coalesce(func.sum(signed), 0).label("closing"),
+            )
+            .select_from(subledger.model)
+            .join(transactions, transactions.ledger_id == subledger.model.id)
+            .where(
+                subledger.model.client_id == client_id,
+                subledger.counterparty_id.isnot(None),
+                transactions.transaction_date <= end_date,
+            )
+            .group_by(subledger.counterparty_id)
+        )
+
+    async def contact_balances(
+        self, subledger: Subledger, client_id: UUID, start_date: date, end_date: date
+    ) -> Dict[UUID, Tuple[Decimal, Decimal]]:
+        result = await self.db.execute(self.contact_balances_query(subledger, client_id, start_date, end_date))
+        return {row.contact_id: (Decimal(row.opening), Decimal(row.closing)) for row in result}
+
+    async def tax_codes(self) -> Dict[str, Any]:
+        result = await self.db.execute(
+            select(TaxCode).where(TaxCode.country_code == "NO").order_by(TaxCode.code)
+        )
+        return {tax_code.code: tax_code for tax_code in result.scalars()}
+
+    # ---- Header and master files ----
+
+    def header(self, client: Client, start_date: date, end_date: date) -> List[Node]:
+        street, postal_code, city = split_address(client.address)
+        company: List[Node] = [
+            ("RegistrationNumber", client.org_number),
+            ("Name", client.name),
+            ("Address", address_node(street, postal_code, city)),
+            ("Contact", contact_node(client.contact_person, email=client.contact_email)),
+        ]
+        if client.vat_registered:
+            company.append(("TaxRegistration", [
+                ("TaxRegistrationNumber", f"{client.org_number}MVA"),
+                ("TaxAuthority", "Skatteetaten"),
+            ]))
+        return [
+            ("AuditFileVersion", SAFT_VERSION),
+            ("AuditFileCountry", "NO"),
+            ("AuditFileDateCreated", date.today().isoformat()),
+            ("SoftwareCompanyName", SOFTWARE_COMPANY_NAME),
+            ("SoftwareID", settings.APP_NAME),
+            ("SoftwareVersion", settings.APP_VERSION),
+            ("Company", company),
+            ("DefaultCurrencyCode", client.base_currency or "NOK"),
+            ("SelectionCriteria", [
+                ("SelectionStartDate", start_date.isoformat()),
+                ("SelectionEndDate", end_date.isoformat()),
+            ]),
+            ("TaxAccountingBasis", "A"),
+        ]
+
+    @staticmethod
+    def account_node(account_number: str, name: str, opening: Decimal, closing: Decimal) -> List[Node]:
+        return [
+            ("AccountID", account_number),
+            ("AccountDescription", name),
+            ("StandardAccountID", account_number[:2]),
+            ("AccountType", "GL"),
+            *balance_nodes("Opening", opening),
+            *balance_nodes("Closing", closing),
+        ]
+
+    async def _write_accounts(self, xf, client_id: UUID, balances: Dict[str, Tuple[Decimal, Decimal]]) -> None:
+        """Chart of accounts, plus accounts with postings that are missing from it"""
+        zero = (Decimal("0.00"), Decimal("0.00"))
+        remaining = dict(balances)
+        result = await self.db.stream(
+            select(Account.account_number, Account.account_name)
+            .where(Account.client_id == client_id)
+            .order_by(Account.account_number)
+            .execution_options(yield_per=self.chunk_size)
+        )
+        with xf.element(q("GeneralLedgerAccounts")):
+            seen = set()
+            async for account_number, account_name in result:
+                if account_number in seen:
+                    continue
+                seen.add(account_number)
+                opening, closing = remaining.pop(account_number, zero)
+                write_node(xf, "Account", self.account_node(account_number, account_name, opening, closing))
+            for account_number in sorted(remaining):
+                opening, closing = remaining[account_number]
+                write_node(xf, "Account", self.account_node(account_number, f"Konto {account_number}", opening, closing))
+
+    def _customer_rows(self, client_id: UUID):
+        return select(Customer).where(Customer.client_id == client_id).order_by(Customer.customer_number)
+
+    def _supplier_rows(self, client_id: UUID):
+        return select(Supplier).where(Supplier.client_id == client_id).order_by(Supplier.supplier_number)
+
+    @staticmethod
+    def balance_account(account_number: str, balance: Tuple[Decimal, Decimal]) -> Node:
+        """BalanceAccount: control account of a customer/supplier with its balances"""
+        opening, closing = balance
+        return ("BalanceAccount", [
+            ("AccountID", account_number),
+            *balance_nodes("Opening", opening),
+            *balance_nodes("Closing", closing),
+        ])
+
+    @classmethod
+    def customer_node(cls, customer: Customer, balance: Tuple[Decimal, Decimal] = NO_BALANCE) -> Tuple[str, List[Node]]:
+        return "Customer", [
+            ("RegistrationNumber", customer.org_number if customer.is_company else None),
+            ("Name", customer.name),
+            ("Address", address_node(customer.address_line1, customer.postal_code, customer.city, customer.country)),
+            ("Contact", optional_contact(customer.contact_person, customer.phone, customer.email)),
+            ("CustomerID", customer.customer_number),
+            cls.balance_account(SUBLEDGERS["customer"].account_number, balance),
+        ]
+
+    @classmethod
+    def supplier_node(cls, supplier: Supplier, balance: Tuple[Decimal, Decimal] = NO_BALANCE) -> Tuple[str, List[Node]]:
+        return "Supplier", [
+            ("RegistrationNumber", supplier.org_number),
+            ("Name", supplier.company_name),
+            ("Address", address_node(supplier.address_line1, supplier.postal_code, supplier.city, supplier.country)),
+            ("Contact", optional_contact(supplier.contact_person, supplier.phone, supplier.email)),
+            ("SupplierID", supplier.supplier_number),
+            cls.balance_account(SUBLEDGERS["supplier"].account_number, balance),
+        ]
+
+    async def _write_contacts(
+        self, xf, tag: str, query, to_node, balances: Dict[UUID, Tuple[Decimal, Decimal]]
+    ) -> None:
+        result = await self.db.stream(query.execution_options(yield_per=self.chunk_size))
+        with xf.element(q(tag)):
+            async for contact in result.scalars():
+                write_node(xf, *to_node(contact, balances.get(contact.id, NO_BALANCE)))
+
+    @staticmethod
+    def tax_table(tax_codes: Dict[str, Any]) -> Optional[List[Node]]:
+        if not tax_codes:
+            return None
+        return [("TaxTableEntry", [
+            ("TaxType", "MVA"),
+            ("Description", "Merverdiavgift"),
+            *[
+                ("TaxCodeDetails", [
+                    ("TaxCode", tax_code.code),
+                    ("Description", tax_code.description),
+                    ("TaxPercentage", amount(tax_code.rate)),
+                    ("Country", "NO"),
+                    ("StandardTaxCode", tax_code.code),
+                    ("BaseRate", "100"),
+                ])
+                for tax_code in tax_codes.values()
+            ],
+        ])]
+
+    # ---- General ledger entries ----
+
+    def entries_query(self, client_id: UUID, start_date: date, end_date: date):
+        """Posted lines with their voucher: series, then date and voucher number"""
+        series_key = func.coalesce(GeneralLedger.voucher_series, "")
+        return (
+            select(
+                GeneralLedger.id,
+                series_key.label("voucher_series"),
+                GeneralLedger.voucher_number,
+                GeneralLedger.accounting_date,
+                GeneralLedger.description,
+                GeneralLedger.created_at,
+                GeneralLedgerLine.line_number,
+                GeneralLedgerLine.account_number,
+                GeneralLedgerLine.debit_amount,
+                GeneralLedgerLine.credit_amount,
+                GeneralLedgerLine.vat_code,
+                GeneralLedgerLine.vat_amount,
+                GeneralLedgerLine.vat_base_amount,
+                GeneralLedgerLine.line_description,
+            )
+            .select_from(GeneralLedgerLine)
+            .join(GeneralLedger, GeneralLedgerLine.general_ledger_id == GeneralLedger.id)
+            .where(*line_filters(client_id, start_date, end_date))
+            .order_by(
+                series_key, GeneralLedger.accounting_date,
+                GeneralLedger.voucher_number, GeneralLedger.id, GeneralLedgerLine.line_number
+            )
+        )
+
+    @staticmethod
+    def line_node(row, tax_codes: Dict[str, Any]) -> List[Node]:
+        if row.debit_amount > 0:
+            side = ("DebitAmount", [("Amount", amount(row.debit_amount))])
+        else:
+            side = ("CreditAmount", [("Amount", amount(row.credit_amount))])
+        tax_information = None
+        if row.vat_code and row.vat_amount:
+            tax_code = tax_codes.get(row.vat_code)
+            tax_information = [
+                ("TaxType", "MVA"),
+                ("TaxCode", row.vat_code),
+                ("TaxPercentage", amount(tax_code.rate) if tax_code is not None else None),
+                ("TaxBase", amount(row.vat_base_amount) if row.vat_base_amount is not None else None),
+                ("TaxAmount", [("Amount", amount(abs(row.vat_amount)))]),
+            ]
+        return [
+            ("RecordID", row.line_number),
+            ("AccountID", row.account_number),
+            ("Description", row.line_description or row.description),
+            side,
+            ("TaxInformation", tax_information),
+        ]
+
+    @staticmethod
+    def transaction_node(first, lines: List[Node]) -> List[Node]:
+        return [
+            ("TransactionID", f"{first.voucher_series}-{first.voucher_number}" if first.voucher_series else first.voucher_number),
+            ("Period", first.accounting_date.month),
+            ("PeriodYear", first.accounting_date.year),
+            ("TransactionDate", first.accounting_date.isoformat()),
+            ("Description", first.description),
+            ("SystemEntryDate", first.created_at.date().isoformat()),
+            ("GLPostingDate", first.accounting_date.isoformat()),
+            *lines,
+        ]
+
+    async def _series_names(self, client_id: UUID) -> Dict[str, str]:
+        result = await self.db.execute(
+            select(VoucherSeries.code, VoucherSeries.name)
+            .where(VoucherSeries.client_id == client_id, VoucherSeries.fiscal_year.is_(None))
+        )
+        return dict(result.all())
+
+    async def _write_entries(
+        self,
+        xf,
+        client_id: UUID,
+        start_date: date,
+        end_date: date,
+        tax_codes: Dict[str, Any],
+    ) -> ControlTotals:
+        """Journals and transactions from one streamed query; returns the totals written"""
+        series_names = await self._series_names(client_id)
+        result = await self.db.stream(
+            self.entries_query(client_id, start_date, end_date).execution_options(yield_per=self.chunk_size)
+        )
+        return await self.write_journals(xf, result.partitions(), series_names, tax_codes)
+
+    @classmethod
+    async def write_journals(
+        cls,
+        xf,
+        partitions: AsyncIterator[Sequence[Any]],
+        series_names: Dict[str, str],
+        tax_codes: Dict[str, Any],
+    ) -> ControlTotals:
+        """
+        Write Journal elements from entries_query() rows, chunk by chunk
+
+        Rows arrive ordered by series and voucher: a new series opens a new
+        Journal, a new voucher flushes the previous Transaction. Only one
+        voucher's lines are held at a time.
+        """
+        written = ControlTotals()
+        journal = None
+        journal_series = None
+        voucher_id = None
+        voucher_first = None
+        voucher_lines: List[Node] = []
+
+        def flush_voucher():
+            if voucher_first is not None:
+                write_node(xf, "Transaction", cls.transaction_node(voucher_first, voucher_lines))
+                written.entries += 1
+
+        try:
+            async for partition in partitions:
+                for row in partition:
+                    if row.id != voucher_id:
+                        flush_voucher()
+                        voucher_id, voucher_first, voucher_lines = row.id, row, []
+                        if journal is None or row.voucher_series != journal_series:
+                            if journal is not None:
+                                journal.__exit__(None, None, None)
+                            journal_series = row.voucher_series
+                            journal = xf.element(q("Journal"))
+                            journal.__enter__()
+                            series = journal_series or "GL"
+                            write_node(xf, "JournalID", series)
+                            write_node(xf, "Description", series_names.get(journal_series) or f"Bilagsserie {series}")
+                            write_node(xf, "Type", series)
+                    voucher_lines.append(("Line", cls.line_node(row, tax_codes)))
+                    written.debit += row.debit_amount
+                    written.credit += row.credit_amount
+            flush_voucher()
+        finally:
+            if journal is not None:
+                journal.__exit__(None, None, None)
+        return written
+
+
+CONTROL_TOTAL_TAGS = ("NumberOfEntries", "TotalDebit", "TotalCredit")
+RECORD_TAGS = ("Transaction", "Account", "Customer", "Supplier", "TaxTableEntry")
+
+
+def _sum_amounts(transaction, side: str) -> Decimal:
+    return sum(
+        (Decimal(value.text) for value in transaction.iterfind(f"{q('Line')}/{q(side)}/{q('Amount')}")),
+        Decimal("0.00"),
+    )
+
+
+def validate_saft_file(
+    path: str,
+    xsd_path: Optional[str] = None,
+    check_schema: bool = True
+) -> SaftValidationResult:
+    """
+    Streaming validation pass over a written audit file
+
+    Validates against the SAF-T XSD while parsing (xsd_path, else
+    saft_xsd_path()), recomputes NumberOfEntries/TotalDebit/TotalCredit
+    and checks that every transaction balances. Only records and control
+    totals are reported by the parser and each record is dropped once read,
+    so memory stays flat.
+
+    Raises:
+        SaftSchemaUnavailableError: check_schema and the XSD is not installed
+    """
+    schema = None
+    if check_schema:
+        schema_path = Path(xsd_path) if xsd_path else saft_xsd_path()
+        if not schema_path.is_file():
+            raise SaftSchemaUnavailableError(
+                f"SAF-T XSD not found at {schema_path}; install it with scripts/fetch_saft_xsd.py"
+            )
+        schema = etree.XMLSchema(etree.parse(str(schema_path)))
+
+    errors: List[str] = []
+    declared: Dict[str, str] = {}
+    totals = ControlTotals()
+
+    parser_options = {
+        "events": ("end",),
+        "tag": [q(tag) for tag in CONTROL_TOTAL_TAGS + RECORD_TAGS],
+        "huge_tree": True,
+    }
+    if schema is not None:
+        parser_options["schema"] = schema
+    try:
+        for _, element in etree.iterparse(path, **parser_options):
+            tag = element.tag
+            if tag == q("Transaction"):
+                debit = _sum_amounts(element, "DebitAmount")
+                credit = _sum_amounts(element, "CreditAmount")
+                if debit != credit:
+                    errors.append(
+                        f"Transaction {element.findtext(q('TransactionID'))} does not balance: "
+                        f"debit {debit}, credit {credit}"
+                    )
+                totals.entries += 1
+                totals.debit += debit
+                totals.credit += credit
+            elif tag in (q("NumberOfEntries"), q("TotalDebit"), q("TotalCredit")):
+                declared[tag.rsplit("}", 1)[-1]] = element.text
+                continue
+
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        errors.append(f"Schema/XML error: {e}")
+        return SaftValidationResult(valid=False, errors=errors, totals=totals)
+
+    expected = {
+        "NumberOfEntries": str(totals.entries),
+        "TotalDebit": amount(totals.debit),
+        "TotalCredit": amount(totals.credit),
+    }
+    for tag, value in expected.items():
+        if declared.get(tag) != value:
+            errors.append(f"{tag} is {declared.get(tag)}, entries add up to {value}")
+
+    return SaftValidationResult(valid=not errors, errors=errors, totals=totals)
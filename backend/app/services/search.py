@@ -0,0 +1,337 @@
+"""
+Search - Full-text and trigram search with keyset pagination
+
+audit_trail, general_ledger (vouchers) and vendor_invoices carry a
+generated search_vector column (to_tsvector('simple', ...)) with a GIN
+index, and the identifier/name columns people search by partially
+(voucher numbers, invoice numbers, vendor and user names) have pg_trgm GIN
+indexes. search_condition() combines both so that every branch of the
+OR can use an index, instead of ILIKE '%term%' scanning the whole table.
+
+Lists are paginated with an opaque keyset cursor on (sort column, id),
+and counting can fall back to the planner's row estimate when the exact
+count would be expensive.
+"""
+import base64
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, literal_column, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.audit_trail import AuditTrail
+from app.models.general_ledger import GeneralLedger
+from app.models.vendor import Vendor
+from app.models.vendor_invoice import VendorInvoice
+from app.utils.query_plans import explain
+
+logger = logging.getLogger(__name__)
+
+# Must match the configuration in the generated search_vector columns
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+# pg_trgm cannot use its index for patterns shorter than three characters
+TRIGRAM_MIN_LENGTH = 3
+
+# Count modes: exact counts up to this many rows, then the planner estimate
+EXACT_COUNT_LIMIT = 10000
+COUNT_MODES = ("auto", "exact", "estimate", "none")
+
+# LIKE escape character; "!" rather than backslash so literal rendering (EXPLAIN) keeps it intact
+LIKE_ESCAPE = "!"
+
+
+def ts_query(term: str) -> ColumnElement:
+    """websearch_to_tsquery: quoted phrases, OR and -exclusions like a search box"""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, term)
+
+
+def escape_like(term: str) -> str:
+    """Term with LIKE wildcards escaped (use with escape=LIKE_ESCAPE)"""
+    return term.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def _like_pattern(term: str) -> str:
+    return f"%{escape_like(term)}%"
+
+
+def search_condition(
+    vector: ColumnElement,
+    term: str,
+    trigram_columns: Optional[List[ColumnElement]] = None
+) -> ColumnElement:
+    """
+    Full-text match on the search vector, or substring match on trigram
+    indexed columns
+
+    Args:
+        vector: Generated tsvector column
+        term: User search input
+        trigram_columns: Columns with a gin_trgm_ops index
+
+    Returns:
+        WHERE clause
+    """
+    term = term.strip()
+    conditions = [vector.op("@@")(ts_query(term))]
+    if len(term) >= TRIGRAM_MIN_LENGTH:
+        pattern = _like_pattern(term)
+        conditions.extend(column.ilike(pattern, escape=LIKE_ESCAPE) for column in trigram_columns or [])
+    return or_(*conditions)
+
+
+def rank(vector: ColumnElement, term: str) -> ColumnElement:
+    return func.ts_rank(vector, ts_query(term.strip()))
+
+
+def audit_search(term: str) -> ColumnElement:
+    return search_condition(
+        AuditTrail.search_vector, term,
+        [AuditTrail.changed_by_name, AuditTrail.reason],
+    )
+
+
+def voucher_search(term: str) -> ColumnElement:
+    return search_condition(
+        GeneralLedger.search_vector, term,
+        [GeneralLedger.voucher_number, GeneralLedger.description],
+    )
+
+
+def invoice_search(term: str, client_id: UUID) -> ColumnElement:
+    """Invoice number/category, or an invoice from a vendor whose name matches"""
+    condition = search_condition(
+        VendorInvoice.search_vector, term, [VendorInvoice.invoice_number]
+    )
+    if len(term.strip()) < TRIGRAM_MIN_LENGTH:
+        return condition
+    vendors = select(Vendor.id).where(
+        Vendor.client_id == client_id,
+        Vendor.name.ilike(_like_pattern(term.strip()), escape=LIKE_ESCAPE),
+    )
+    return or_(condition, VendorInvoice.vendor_id.in_(vendors))
+
+
+# Keyset pagination
+
+def encode_cursor(sort_value: Any, row_id: UUID) -> str:
+    """Opaque cursor for the row after which the next page starts (date/timestamp sort keys)"""
+    if isinstance(sort_value, (datetime, date)):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, UUID]:
+    """
+    Decode a cursor from encode_cursor
+
+    Raises:
+        ValueError: Malformed cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if isinstance(sort_value, str):
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, UUID(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_condition(
+    sort_column: ColumnElement,
+    id_column: ColumnElement,
+    cursor: str,
+    descending: bool = True
+) -> ColumnElement:
+    """Rows after the cursor in (sort_column, id) order - a row comparison the index can seek to"""
+    sort_value, row_id = decode_cursor(cursor)
+    key = tuple_(sort_column, id_column)
+    return key < (sort_value, row_id) if descending else key > (sort_value, row_id)
+
+
+def keyset_order(sort_column: ColumnElement, id_column: ColumnElement, descending: bool = True) -> list:
+    if descending:
+        return [sort_column.desc(), id_column.desc()]
+    return [sort_column.asc(), id_column.asc()]
+
+
+@dataclass
+class Page:
+    """One page of results with the cursor for the next page"""
+    rows: List[Any]
+    next_cursor: Optional[str]
+
+
+def page_from_rows(rows: List[Any], page_size: int, sort_attr: str) -> Page:
+    """
+    Build a page from page_size + 1 fetched rows
+
+    Args:
+        rows: Query result, fetched with LIMIT page_size + 1
+        page_size: Requested page size
+        sort_attr: Attribute of the row used as sort key
+    """
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_attr), last.id)
+    return Page(rows=rows, next_cursor=next_cursor)
+
+
+# Counting
+
+async def count_results(
+    db: AsyncSession,
+    query: Select,
+    mode: str = "auto",
+    exact_limit: int = EXACT_COUNT_LIMIT
+) -> Dict[str, Any]:
+    """
+    Count the rows of a query
+
+    Args:
+        db: Database session
+        query: The (unpaginated) list query
+        mode: "exact" (COUNT), "estimate" (planner row estimate), "auto"
+              (exact up to exact_limit rows, estimate beyond) or "none"
+        exact_limit: Row cap for exact counting in auto mode
+
+    Returns:
+        {"count": int or None, "estimated": bool}
+    """
+    if mode not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode {mode!r}, expected one of {COUNT_MODES}")
+    if mode == "none":
+        return {"count": None, "estimated": False}
+
+    query = query.order_by(None)
+    if mode in ("exact", "auto"):
+        counted = query.limit(exact_limit + 1) if mode == "auto" else query
+        count = (await db.execute(
+            select(func.count()).select_from(counted.subquery())
+        )).scalar() or 0
+        if mode == "exact" or count <= exact_limit:
+            return {"count": count, "estimated": False}
+
+    plan = await explain(db, query)
+    estimate = int(plan.get("Plan Rows", 0))
+    if mode == "auto":
+        # The exact count already proved there are more than exact_limit rows
+        estimate = max(estimate, exact_limit + 1)
+    return {"count": estimate, "estimated": True}
+
+
+# Global search
+
+SEARCH_TYPES = ("vouchers", "invoices", "audit")
+
+
+async def global_search(
+    db: AsyncSession,
+    client_id: UUID,
+    term: str,
+    types: Optional[List[str]] = None,
+    limit: int = 10
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Best matches per type, using the same indexes as the list endpoints
+
+    Args:
+        db: Database session
+        client_id: Client UUID
+        term: Search input
+        types: Subset of SEARCH_TYPES (default: all)
+        limit: Max results per type
+
+    Returns:
+        {type: [result dicts ordered by relevance, newest first]}
+    """
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for search_type in types or SEARCH_TYPES:
+        if search_type == "vouchers":
+            rows = await db.execute(
+                select(
+                    GeneralLedger.id, GeneralLedger.voucher_series, GeneralLedger.voucher_number,
+                    GeneralLedger.accounting_date, GeneralLedger.description, GeneralLedger.status,
+                )
+                .where(GeneralLedger.client_id == client_id, voucher_search(term))
+                .order_by(
+                    rank(GeneralLedger.search_vector, term).desc(),
+                    GeneralLedger.accounting_date.desc(),
+                )
+                .limit(limit)
+            )
+            results[search_type] = [
+                {
+                    "id": str(row.id),
+                    "voucher_number": row.voucher_number,
+                    "voucher_series": row.voucher_series,
+                    "accounting_date": row.accounting_date.isoformat(),
+                    "description": row.description,
+                    "status": row.status,
+                }
+                for row in rows
+            ]
+        elif search_type == "invoices":
+            rows = await db.execute(
+                select(
+                    VendorInvoice.id, VendorInvoice.invoice_number, VendorInvoice.invoice_date,
+                    VendorInvoice.total_amount, VendorInvoice.currency, Vendor.name.label("vendor_name"),
+                )
+                .outerjoin(Vendor, VendorInvoice.vendor_id == Vendor.id)
+                .where(VendorInvoice.client_id == client_id, invoice_search(term, client_id))
+                .order_by(
+                    rank(VendorInvoice.search_vector, term).desc(),
+                    VendorInvoice.invoice_date.desc(),
+                )
+                .limit(limit)
+            )
+            results[search_type] = [
+                {
+                    "id": str(row.id),
+                    "invoice_number": row.invoice_number,
+                    "invoice_date": row.invoice_date.isoformat(),
+                    "vendor_name": row.vendor_name,
+                    "total_amount": float(row.total_amount),
+                    "currency": row.currency,
+                }
+                for row in rows
+            ]
+        elif search_type == "audit":
+            rows = await db.execute(
+                select(
+                    AuditTrail.id, AuditTrail.table_name, AuditTrail.record_id, AuditTrail.action,
+                    AuditTrail.changed_by_name, AuditTrail.reason, AuditTrail.timestamp,
+                )
+                .where(AuditTrail.client_id == client_id, audit_search(term))
+                .order_by(
+                    rank(AuditTrail.search_vector, term).desc(),
+                    AuditTrail.timestamp.desc(),
+                )
+                .limit(limit)
+            )
+            results[search_type] = [
+                {
+                    "id": str(row.id),
+                    "table_name": row.table_name,
+                    "record_id": str(row.record_id),
+                    "action": row.action,
+                    "changed_by_name": row.changed_by_name,
+                    "reason": row.reason,
+                    "timestamp": row.timestamp.isoformat(),
+                }
+                for row in rows
+            ]
+        else:
+            raise ValueError(f"Unknown search type {search_type!r}, expected one of {SEARCH_TYPES}")
+    return results
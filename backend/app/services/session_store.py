@@ -0,0 +1,259 @@
+"""
+Session Store - Bounded key/value store for short-lived session state
+
+Used for chat conversation context and OAuth CSRF state. Two backends:
+- InMemorySessionStore: per-process, LRU capacity limit + background TTL sweeper
+- RedisSessionStore: shared across uvicorn workers, native key expiry
+
+Select the backend with settings.SESSION_STORE_BACKEND (memory/redis).
+"""
+import asyncio
+import logging
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(ABC):
+    """
+    Async key/value store with per-key expiry
+
+    Values are JSON-like dicts. Keys live in a namespace so several
+    features can share one Redis database.
+    """
+
+    def __init__(self, namespace: str, default_ttl: int):
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the value, or None if missing or expired"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Store value, (re)starting its TTL"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove key if present"""
+
+    @abstractmethod
+    async def pop(self, key: str) -> Optional[Dict[str, Any]]:
+        """Atomically get and remove key"""
+
+    async def close(self) -> None:
+        """Release background resources"""
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local store with LRU eviction and a background TTL sweeper
+
+    Expired entries are dropped lazily on access and by a sweeper task
+    that runs every sweep_interval seconds, so idle sessions do not
+    accumulate. When max_entries is reached the least recently used
+    entry is evicted.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        default_ttl: int,
+        max_entries: int = 10_000,
+        sweep_interval: float = 60.0,
+    ):
+        super().__init__(namespace, default_ttl)
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        # key -> (expires_at monotonic, value); order = least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        self._ensure_sweeper()
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        self._ensure_sweeper()
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def pop(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self.get(key)
+        self._entries.pop(key, None)
+        return value
+
+    def sweep(self) -> int:
+        """Drop all expired entries; returns number removed"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _ensure_sweeper(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if (
+            self._sweeper is not None
+            and not self._sweeper.done()
+            and self._sweeper.get_loop() is loop
+        ):
+            return
+        self._sweeper = loop.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            removed = self.sweep()
+            if removed:
+                logger.debug(f"Session store '{self.namespace}': expired {removed} entries")
+
+    async def close(self) -> None:
+        sweeper, self._sweeper = self._sweeper, None
+        if sweeper is None or sweeper.done():
+            return
+        sweeper.cancel()
+        if sweeper.get_loop() is asyncio.get_running_loop():
+            try:
+                await sweeper
+            except asyncio.CancelledError:
+                pass
+
+
+# Values above this size are zlib-compressed before being sent to Redis
+COMPRESS_THRESHOLD = 1024
+
+
+def _encode_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return {"$dt": obj.isoformat()}
+    if isinstance(obj, date):
+        return {"$d": obj.isoformat()}
+    if isinstance(obj, Decimal):
+        return {"$dec": str(obj)}
+    raise TypeError(f"Type is not serializable: {type(obj)}")
+
+
+def _decode_hook(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        if len(obj) == 1:
+            if "$dt" in obj:
+                return datetime.fromisoformat(obj["$dt"])
+            if "$d" in obj:
+                return date.fromisoformat(obj["$d"])
+            if "$dec" in obj:
+                return Decimal(obj["$dec"])
+        return {k: _decode_hook(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_decode_hook(v) for v in obj]
+    return obj
+
+
+def serialize(value: Dict[str, Any]) -> bytes:
+    """Compact binary encoding: b"j" + JSON, or b"z" + zlib(JSON) for large values"""
+    payload = orjson.dumps(
+        value,
+        default=_encode_default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+    )
+    if len(payload) > COMPRESS_THRESHOLD:
+        return b"z" + zlib.compress(payload, 1)
+    return b"j" + payload
+
+
+def deserialize(data: bytes) -> Dict[str, Any]:
+    """Inverse of serialize()"""
+    payload = zlib.decompress(data[1:]) if data[:1] == b"z" else data[1:]
+    return _decode_hook(orjson.loads(payload))
+
+
+_redis_clients: Dict[str, Any] = {}
+
+
+def get_redis_client(url: str):
+    """Shared redis.asyncio client (one connection pool per URL)"""
+    client = _redis_clients.get(url)
+    if client is None:
+        import redis.asyncio as aioredis
+        client = aioredis.from_url(url, decode_responses=False)
+        _redis_clients[url] = client
+    return client
+
+
+class RedisSessionStore(SessionStore):
+    """Redis-backed store shared by all workers; expiry uses Redis TTLs"""
+
+    def __init__(self, namespace: str, default_ttl: int, url: Optional[str] = None, client=None):
+        super().__init__(namespace, default_ttl)
+        self._client = client or get_redis_client(url or settings.REDIS_URL)
+
+    def _key(self, key: str) -> str:
+        return f"session:{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        data = await self._client.get(self._key(key))
+        return deserialize(data) if data is not None else None
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        await self._client.set(self._key(key), serialize(value), ex=ttl or self.default_ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._key(key))
+
+    async def pop(self, key: str) -> Optional[Dict[str, Any]]:
+        data = await self._client.getdel(self._key(key))
+        return deserialize(data) if data is not None else None
+
+
+def create_session_store(
+    namespace: str,
+    default_ttl: int,
+    max_entries: int = 10_000,
+) -> SessionStore:
+    """Create a store using the configured backend"""
+    if settings.SESSION_STORE_BACKEND == "redis":
+        return RedisSessionStore(namespace, default_ttl)
+    return InMemorySessionStore(namespace, default_ttl, max_entries=max_entries)
@@ -0,0 +1,17 @@
+"""
+Document storage backends (S3 / local filesystem)
+"""
+from .base import DocumentStorage, StoredObject, ByteRange, parse_range_header
+from .s3 import S3Storage
+from .local import LocalStorage
+from .factory import get_document_storage
+
+__all__ = [
+    "DocumentStorage",
+    "StoredObject",
+    "ByteRange",
+    "parse_range_header",
+    "S3Storage",
+    "LocalStorage",
+    "get_document_storage",
+]
@@ -0,0 +1,199 @@
+"""
+Document storage abstraction
+
+Backends store opaque objects under a key and expose:
+- Chunked uploads with SHA-256 hashing on the fly (bounded memory)
+- Byte-range reads for HTTP Range requests (PDF viewers)
+- Pre-signed download URLs where the backend supports them
+"""
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from fastapi import UploadFile
+
+# Read/write granularity for streamed uploads and downloads
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class FileTooLargeError(ValueError):
+    """Raised when a streamed upload exceeds the allowed size"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"File exceeds maximum size of {max_size} bytes")
+
+
+class RangeNotSatisfiableError(ValueError):
+    """Raised when a Range header cannot be served for the object"""
+
+
+@dataclass
+class StoredObject:
+    """Result of a completed upload"""
+    key: str
+    size: int
+    sha256: str
+    content_type: Optional[str] = None
+
+
+@dataclass
+class ByteRange:
+    """Inclusive byte range within an object of known size"""
+    start: int
+    end: int
+    total: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    @property
+    def content_range(self) -> str:
+        return f"bytes {self.start}-{self.end}/{self.total}"
+
+
+def parse_range_header(header: Optional[str], total: int) -> Optional[ByteRange]:
+    """
+    Parse a single-range HTTP Range header
+
+    Supports "bytes=a-b", "bytes=a-" and suffix ranges "bytes=-n".
+    Multi-range requests are served as a full response (returns None),
+    which is allowed by RFC 9110.
+
+    Raises:
+        RangeNotSatisfiableError: If the range lies outside the object
+    """
+    if not header:
+        return None
+
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: last N bytes
+        suffix = int(last)
+        if suffix == 0 or total == 0:
+            raise RangeNotSatisfiableError(header)
+        start = max(total - suffix, 0)
+        end = total - 1
+    else:
+        start = int(first)
+        end = int(last) if last else total - 1
+        if start >= total or end < start:
+            raise RangeNotSatisfiableError(header)
+        end = min(end, total - 1)
+
+    return ByteRange(start=start, end=end, total=total)
+
+
+async def iter_upload(upload: UploadFile, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield an UploadFile in chunks without reading it fully into memory"""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class DocumentStorage(ABC):
+    """
+    Base class for document storage backends
+
+    Subclasses implement the raw I/O (_write, open_range, size, delete);
+    hashing and size enforcement are shared here.
+    """
+
+    #: Value stored in Document.s3_bucket for objects in this backend
+    bucket: str
+
+    async def save_stream(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str] = None,
+        max_size: Optional[int] = None,
+    ) -> StoredObject:
+        """
+        Store a stream of chunks under key
+
+        The SHA-256 hash and size are computed while the data flows
+        through, so the payload is never held in memory as a whole.
+
+        Raises:
+            FileTooLargeError: If max_size is exceeded (nothing is stored)
+        """
+        hasher = hashlib.sha256()
+        counter = {"size": 0}
+
+        async def hashed() -> AsyncIterator[bytes]:
+            async for chunk in chunks:
+                counter["size"] += len(chunk)
+                if max_size is not None and counter["size"] > max_size:
+                    raise FileTooLargeError(max_size)
+                hasher.update(chunk)
+                yield chunk
+
+        await self._write(key, hashed(), content_type)
+
+        return StoredObject(
+            key=key,
+            size=counter["size"],
+            sha256=hasher.hexdigest(),
+            content_type=content_type,
+        )
+
+    async def save_upload(
+        self,
+        key: str,
+        upload: UploadFile,
+        max_size: Optional[int] = None,
+    ) -> StoredObject:
+        """Store a FastAPI UploadFile in chunks"""
+        return await self.save_stream(
+            key,
+            iter_upload(upload),
+            content_type=upload.content_type,
+            max_size=max_size,
+        )
+
+    @abstractmethod
+    async def _write(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str],
+    ) -> None:
+        """Write chunks to key; must leave no partial object behind on error"""
+
+    @abstractmethod
+    async def open_range(
+        self,
+        key: str,
+        byte_range: Optional[ByteRange] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield the object (or the given byte range) in chunks"""
+
+    @abstractmethod
+    async def size(self, key: str) -> int:
+        """Return object size in bytes"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete the object (no error if it does not exist)"""
+
+    async def presigned_url(self, key: str, expires_in: int) -> Optional[str]:
+        """
+        Return a temporary direct-download URL, or None when the backend
+        can only be read through the API (e.g. local filesystem)
+        """
+        return None
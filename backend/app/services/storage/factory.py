@@ -0,0 +1,37 @@
+"""
+Storage backend selection
+"""
+from typing import Dict, Optional
+
+from app.config import settings
+from app.services.storage.base import DocumentStorage
+from app.services.storage.local import LocalStorage
+from app.services.storage.s3 import S3Storage
+
+_backends: Dict[str, DocumentStorage] = {}
+
+
+def get_document_storage(bucket: Optional[str] = None) -> DocumentStorage:
+    """
+    Return the shared storage backend
+
+    Args:
+        bucket: Document.s3_bucket of an existing document. "local" selects
+            the filesystem backend, any other value the S3 bucket of that
+            name. Defaults to the configured backend for new uploads.
+    """
+    if bucket is None:
+        bucket = (
+            LocalStorage.bucket
+            if settings.DOCUMENT_STORAGE_BACKEND == "local"
+            else settings.S3_BUCKET_DOCUMENTS
+        )
+
+    backend = _backends.get(bucket)
+    if backend is None:
+        if bucket == LocalStorage.bucket:
+            backend = LocalStorage(settings.LOCAL_STORAGE_ROOT)
+        else:
+            backend = S3Storage(bucket)
+        _backends[bucket] = backend
+    return backend
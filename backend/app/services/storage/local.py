@@ -0,0 +1,84 @@
+"""
+Local filesystem document storage backend
+
+Used in development and for on-premise installs. Keys are relative
+paths below the storage root.
+"""
+import asyncio
+import os
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Optional, Union
+
+from app.services.storage.base import CHUNK_SIZE, ByteRange, DocumentStorage
+
+
+class LocalStorage(DocumentStorage):
+    """Document storage in a directory on local disk"""
+
+    bucket = "local"
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root).resolve()
+
+    def path_for(self, key: str) -> Path:
+        """Resolve key to a path, refusing keys that escape the root"""
+        path = (self.root / key).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    async def _write(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str],
+    ) -> None:
+        path = self.path_for(key)
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+
+        # Write to a temp file in the same directory, then rename atomically
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.part")
+        handle = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(handle.write, chunk)
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(os.replace, tmp_path, path)
+        except BaseException:
+            handle.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    async def open_range(
+        self,
+        key: str,
+        byte_range: Optional[ByteRange] = None,
+    ) -> AsyncIterator[bytes]:
+        path = self.path_for(key)
+        handle = await asyncio.to_thread(open, path, "rb")
+        try:
+            if byte_range is not None:
+                await asyncio.to_thread(handle.seek, byte_range.start)
+                remaining = byte_range.length
+            else:
+                remaining = None
+
+            while remaining is None or remaining > 0:
+                size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+                chunk = await asyncio.to_thread(handle.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            handle.close()
+
+    async def size(self, key: str) -> int:
+        stat = await asyncio.to_thread(os.stat, self.path_for(key))
+        return stat.st_size
+
+    async def delete(self, key: str) -> None:
+        path = self.path_for(key)
+        await asyncio.to_thread(path.unlink, True)
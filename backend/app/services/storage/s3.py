@@ -0,0 +1,191 @@
+"""
+S3 document storage backend
+
+Uses one process-wide boto3 client (boto3 clients are thread-safe and
+keep an HTTP connection pool), multipart uploads for streamed writes and
+ranged GETs for partial reads. Blocking boto3 calls run in worker threads.
+"""
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+from app.config import settings
+from app.services.storage.base import CHUNK_SIZE, ByteRange, DocumentStorage
+
+logger = logging.getLogger(__name__)
+
+# S3 requires multipart parts of at least 5MB (except the last one)
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+# Presigned URLs are reused until this long before they expire
+PRESIGNED_URL_RENEW_MARGIN = timedelta(minutes=5)
+PRESIGNED_URL_CACHE_SIZE = 10_000
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """Return the shared S3 client (created on first use)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = boto3.client(
+                    "s3",
+                    region_name=settings.S3_DOCUMENTS_REGION,
+                    aws_access_key_id=settings.AWS_ACCESS_KEY or None,
+                    aws_secret_access_key=settings.AWS_SECRET_KEY or None,
+                    config=Config(
+                        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                        retries={"max_attempts": 3, "mode": "standard"},
+                    ),
+                )
+    return _client
+
+
+class S3Storage(DocumentStorage):
+    """Document storage in an S3 bucket"""
+
+    def __init__(self, bucket: str, client=None):
+        self.bucket = bucket
+        self._client = client
+        self._url_cache: "OrderedDict[Tuple[str, int], Tuple[str, datetime]]" = OrderedDict()
+        self._url_lock = threading.Lock()
+
+    @property
+    def client(self):
+        return self._client or get_s3_client()
+
+    async def _write(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str],
+    ) -> None:
+        extra: Dict[str, str] = {"ContentType": content_type} if content_type else {}
+        buffer = bytearray()
+        upload_id: Optional[str] = None
+        parts = []
+
+        async def flush_part() -> None:
+            nonlocal upload_id
+            if upload_id is None:
+                response = await asyncio.to_thread(
+                    self.client.create_multipart_upload,
+                    Bucket=self.bucket, Key=key, **extra
+                )
+                upload_id = response["UploadId"]
+            part_number = len(parts) + 1
+            response = await asyncio.to_thread(
+                self.client.upload_part,
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                PartNumber=part_number, Body=bytes(buffer),
+            )
+            parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+            buffer.clear()
+
+        try:
+            async for chunk in chunks:
+                buffer.extend(chunk)
+                if len(buffer) >= MULTIPART_PART_SIZE:
+                    await flush_part()
+
+            if upload_id is None:
+                # Small object - single PUT
+                await asyncio.to_thread(
+                    self.client.put_object,
+                    Bucket=self.bucket, Key=key, Body=bytes(buffer), **extra
+                )
+                return
+
+            if buffer:
+                await flush_part()
+            await asyncio.to_thread(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            if upload_id is not None:
+                try:
+                    await asyncio.to_thread(
+                        self.client.abort_multipart_upload,
+                        Bucket=self.bucket, Key=key, UploadId=upload_id,
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to abort multipart upload for {key}: {e}")
+            raise
+
+    async def open_range(
+        self,
+        key: str,
+        byte_range: Optional[ByteRange] = None,
+    ) -> AsyncIterator[bytes]:
+        params = {"Bucket": self.bucket, "Key": key}
+        if byte_range is not None:
+            params["Range"] = f"bytes={byte_range.start}-{byte_range.end}"
+
+        response = await asyncio.to_thread(self.client.get_object, **params)
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def size(self, key: str) -> int:
+        response = await asyncio.to_thread(
+            self.client.head_object, Bucket=self.bucket, Key=key
+        )
+        return int(response["ContentLength"])
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(
+            self.client.delete_object, Bucket=self.bucket, Key=key
+        )
+
+    async def presigned_url(self, key: str, expires_in: int) -> Optional[str]:
+        """
+        Presigned GET URL, cached until PRESIGNED_URL_RENEW_MARGIN before expiry
+
+        Signing is local (no network call), but reusing URLs keeps them
+        stable for browser caching of the PDF viewer.
+        """
+        url, _ = self.presigned_url_with_expiry(key, expires_in)
+        return url
+
+    def presigned_url_with_expiry(self, key: str, expires_in: int) -> Tuple[str, datetime]:
+        """Presigned GET URL and the time it expires"""
+        cache_key = (key, expires_in)
+        now = datetime.utcnow()
+
+        with self._url_lock:
+            cached = self._url_cache.get(cache_key)
+            if cached and cached[1] - PRESIGNED_URL_RENEW_MARGIN > now:
+                self._url_cache.move_to_end(cache_key)
+                return cached
+
+        url = self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
+        entry = (url, now + timedelta(seconds=expires_in))
+
+        with self._url_lock:
+            self._url_cache[cache_key] = entry
+            self._url_cache.move_to_end(cache_key)
+            while len(self._url_cache) > PRESIGNED_URL_CACHE_SIZE:
+                self._url_cache.popitem(last=False)
+
+        return entry
@@ -0,0 +1,306 @@
+"""
+Sub-ledger Analytics - Aging and reconciliation of Leverandørreskontro/Kundereskontro
+
+The aging endpoints used to load every open ledger row and bucket it by
+days overdue in Python; reconciliation ran one query for the ledger and
+another for the GL account. Here the database does the work:
+
+- Aging is one GROUP BY GROUPING SETS query: FILTER aggregates per bucket,
+  one row per counterparty plus the grand total row
+- Reconciliation is one SELECT of two scalar subqueries (open ledger total
+  and the 2400/1500 balance from the denormalized GL line columns)
+- Ledger listings (and the PDF/Excel exports built from them) stream rows
+  with days overdue computed in SQL
+
+Everything can be computed as of an earlier date: entries invoiced after it
+are left out, and payments/credit notes dated after it are added back to
+the remaining amount.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, Optional, Type
+from uuid import UUID
+
+from sqlalchemy import Date, and_, case, cast, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.customer_ledger import CustomerLedger, CustomerLedgerTransaction
+from app.models.general_ledger import GeneralLedgerLine
+from app.models.supplier_ledger import SupplierLedger, SupplierLedgerTransaction
+from app.models.vendor import Vendor
+from app.services.ledger_lines import line_filters
+from app.services.payment_status_service import aging_buckets
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ("open", "partially_paid")
+
+# aging_buckets() name -> key used in the sub-ledger aging responses
+BUCKET_KEYS = {
+    "current": "not_due",
+    "1_30": "0_30_days",
+    "31_60": "31_60_days",
+    "61_90": "61_90_days",
+    "over_90": "90_plus_days",
+}
+
+STREAM_CHUNK_SIZE = 500
+
+
+@dataclass(frozen=True)
+class Subledger:
+    """How a sub-ledger maps onto its tables and GL account"""
+    counterparty: str
+    model: Type
+    transaction_model: Type
+    account_number: str
+    sign: int  # +1: balance is debit - credit (receivables), -1: credit - debit (payables)
+
+    @property
+    def counterparty_id(self):
+        return getattr(self.model, f"{self.counterparty}_id")
+
+    @property
+    def counterparty_name(self):
+        if self.model is SupplierLedger:
+            return Vendor.name
+        return CustomerLedger.customer_name
+
+
+SUBLEDGERS = {
+    "supplier": Subledger("supplier", SupplierLedger, SupplierLedgerTransaction, "2400", -1),
+    "customer": Subledger("customer", CustomerLedger, CustomerLedgerTransaction, "1500", 1),
+}
+
+
+def bucket_amounts(amounts: Dict[str, Decimal]) -> Dict[str, Any]:
+    """Aging amounts keyed by bucket, their total and each bucket's share in percent"""
+    total = sum(amounts.values(), Decimal("0.00"))
+    return {
+        "aging": {key: float(amount) for key, amount in amounts.items()},
+        "total": float(total),
+        "percentages": {
+            key: round(float(amount / total * 100), 1) if total > 0 else 0
+            for key, amount in amounts.items()
+        },
+    }
+
+
+def reconciliation(ledger_total: Decimal, account_balance: Decimal) -> Dict[str, Any]:
+    """Compare a sub-ledger total with its GL account (1 øre rounding allowed)"""
+    difference = ledger_total - account_balance
+    reconciles = abs(difference) < Decimal("0.01")
+    return {
+        "difference": float(difference),
+        "reconciles": reconciles,
+        "status": "OK" if reconciles else "ERROR - Does not reconcile!",
+    }
+
+
+class SubledgerAnalytics:
+    """Aging, reconciliation and listings for the supplier or customer ledger"""
+
+    def __init__(self, db: AsyncSession, ledger: str):
+        if ledger not in SUBLEDGERS:
+            raise ValueError(f"Unknown sub-ledger: {ledger}")
+        self.db = db
+        self.ledger = SUBLEDGERS[ledger]
+
+    def _from(self, query):
+        """Join the counterparty name source (vendors for the supplier ledger)"""
+        if self.ledger.model is SupplierLedger:
+            return query.join(Vendor, SupplierLedger.supplier_id == Vendor.id)
+        return query
+
+    def _balance(self, as_of_date: date):
+        """
+        Remaining amount as of the date, and the query modifier that provides it
+
+        remaining_amount is the current balance; for an earlier date the
+        payments and credit notes dated after it are added back.
+        """
+        model = self.ledger.model
+        if as_of_date >= date.today():
+            return model.remaining_amount, lambda query: query
+
+        transactions = self.ledger.transaction_model
+        later = (
+            select(transactions.ledger_id, func.sum(transactions.amount).label("amount"))
+            .where(
+                transactions.type != "invoice",
+                transactions.transaction_date > as_of_date,
+            )
+            .group_by(transactions.ledger_id)
+            .subquery("later_transactions")
+        )
+        balance = model.remaining_amount + func.coalesce(later.c.amount, 0)
+        return balance, lambda query: query.outerjoin(later, later.c.ledger_id == model.id)
+
+    def aging_query(self, client_id: UUID, as_of_date: date):
+        """Open amounts per bucket and counterparty, plus the grand total row"""
+        model = self.ledger.model
+        balance, with_balance = self._balance(as_of_date)
+
+        columns = []
+        for name, earliest, latest in aging_buckets(as_of_date):
+            conditions = []
+            if earliest is not None:
+                conditions.append(model.due_date >= earliest)
+            if latest is not None:
+                conditions.append(model.due_date <= latest)
+            in_bucket = and_(*conditions)
+            key = BUCKET_KEYS[name]
+            columns.append(func.coalesce(func.sum(balance).filter(in_bucket), 0).label(key))
+            columns.append(func.count().filter(in_bucket).label(f"{key}_count"))
+
+        counterparty_id = self.ledger.counterparty_id
+        counterparty_name = self.ledger.counterparty_name
+        query = select(
+            counterparty_id.label("counterparty_id"),
+            counterparty_name.label("counterparty_name"),
+            func.grouping(counterparty_name).label("is_total"),
+            *columns,
+        )
+        query = with_balance(self._from(query.select_from(model)))
+        return query.where(
+            model.client_id == client_id,
+            model.invoice_date <= as_of_date,
+            balance != 0,
+        ).group_by(
+            func.grouping_sets(tuple_(counterparty_id, counterparty_name), tuple_())
+        )
+
+    async def aging(self, client_id: UUID, as_of_date: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Aging report: not due, 0-30, 31-60, 61-90 and 90+ days overdue
+
+        Args:
+            client_id: Client UUID
+            as_of_date: Date the aging is computed for (defaults to today)
+
+        Returns:
+            Dict with total aging, percentages and the aging per counterparty
+        """
+        as_of_date = as_of_date or date.today()
+        result = await self.db.execute(self.aging_query(client_id, as_of_date))
+
+        counterparty = self.ledger.counterparty
+        report = bucket_amounts({key: Decimal("0.00") for key in BUCKET_KEYS.values()})
+        by_counterparty = []
+        for row in result.mappings():
+            amounts = {key: row[key] for key in BUCKET_KEYS.values()}
+            if row["is_total"]:
+                report = bucket_amounts(amounts)
+                continue
+            by_counterparty.append({
+                f"{counterparty}_id": str(row["counterparty_id"]) if row["counterparty_id"] else None,
+                f"{counterparty}_name": row["counterparty_name"],
+                "aging": {key: float(amount) for key, amount in amounts.items()},
+                "counts": {key: row[f"{key}_count"] for key in BUCKET_KEYS.values()},
+                "total": float(sum(amounts.values(), Decimal("0.00"))),
+            })
+        by_counterparty.sort(key=lambda item: item["total"], reverse=True)
+
+        return {
+            "as_of_date": as_of_date.isoformat(),
+            **report,
+            f"by_{counterparty}": by_counterparty,
+        }
+
+    def reconcile_query(self, client_id: UUID, as_of_date: date):
+        """Open ledger total and GL account balance in one SELECT"""
+        model = self.ledger.model
+        balance, with_balance = self._balance(as_of_date)
+
+        ledger_total = with_balance(select(func.coalesce(func.sum(balance), 0)).select_from(model)).where(
+            model.client_id == client_id,
+            model.invoice_date <= as_of_date,
+            balance != 0,
+        )
+        if self.ledger.sign > 0:
+            net = GeneralLedgerLine.debit_amount - GeneralLedgerLine.credit_amount
+        else:
+            net = GeneralLedgerLine.credit_amount - GeneralLedgerLine.debit_amount
+        account_balance = select(func.coalesce(func.sum(net), 0)).where(
+            *line_filters(client_id, to_date=as_of_date),
+            GeneralLedgerLine.account_number == self.ledger.account_number,
+        )
+        return select(
+            ledger_total.scalar_subquery().label("ledger_total"),
+            account_balance.scalar_subquery().label("account_balance"),
+        )
+
+    async def reconcile(self, client_id: UUID, as_of_date: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Check that the open sub-ledger total equals the GL account balance
+
+        Args:
+            client_id: Client UUID
+            as_of_date: Date to reconcile at (defaults to today)
+
+        Returns:
+            Dict with both totals, the difference and whether they reconcile
+        """
+        as_of_date = as_of_date or date.today()
+        row = (await self.db.execute(self.reconcile_query(client_id, as_of_date))).one()
+        account = self.ledger.account_number
+        return {
+            "as_of_date": as_of_date.isoformat(),
+            f"{self.ledger.counterparty}_ledger_total": float(row.ledger_total),
+            f"account_{account}_balance": float(row.account_balance),
+            **reconciliation(row.ledger_total, row.account_balance),
+        }
+
+    def entries_query(
+        self,
+        client_id: UUID,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        counterparty_id: Optional[UUID] = None,
+        as_of_date: Optional[date] = None,
+    ):
+        """Ledger rows oldest due date first, with days overdue computed in SQL"""
+        model = self.ledger.model
+        as_of_date = as_of_date or date.today()
+        is_open = model.status.in_(OPEN_STATUSES)
+        days_overdue = case(
+            (and_(is_open, model.due_date < as_of_date), cast(literal(as_of_date), Date) - model.due_date),
+            else_=0,
+        ).label("days_overdue")
+
+        columns = [model, days_overdue]
+        if model is SupplierLedger:
+            columns += [Vendor.name.label("supplier_name"), Vendor.org_number.label("supplier_org_number")]
+        query = self._from(select(*columns)).where(model.client_id == client_id)
+
+        if status == "overdue":
+            query = query.where(is_open, model.due_date < as_of_date)
+        elif status and status != "all":
+            query = query.where(model.status == status)
+        if date_from:
+            query = query.where(model.invoice_date >= date_from)
+        if date_to:
+            query = query.where(model.invoice_date <= date_to)
+        if counterparty_id:
+            query = query.where(self.ledger.counterparty_id == counterparty_id)
+        return query.order_by(model.due_date.asc())
+
+    async def entries(self, client_id: UUID, **filters) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream ledger entries as dicts (to_dict() plus days_overdue)
+
+        Rows are fetched STREAM_CHUNK_SIZE at a time, so exports of large
+        ledgers never hold the full ORM result.
+        """
+        result = await self.db.stream(
+            self.entries_query(client_id, **filters).execution_options(yield_per=STREAM_CHUNK_SIZE)
+        )
+        async for ledger_entry, days_overdue, *supplier in result:
+            entry = ledger_entry.to_dict()
+            entry["days_overdue"] = days_overdue
+            if supplier:
+                entry["supplier_name"], entry["supplier_org_number"] = supplier
+            yield entry
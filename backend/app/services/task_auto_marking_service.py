@@ -9,6 +9,7 @@ from datetime import datetime
 
 from app.models.task import Task, TaskStatus
 from app.models.task_audit_log import TaskAuditLog, TaskAuditAction, TaskAuditResult
+from app.utils.audit import record_audit
 
 
 class TaskAutoMarkingService:
@@ -77,7 +78,9 @@ class TaskAutoMarkingService:
         task.updated_at = datetime.utcnow()
         
         # Create audit log
-        audit_log = TaskAuditLog(
+        record_audit(
+            self.db,
+            TaskAuditLog,
             task_id=task.id,
             action=TaskAuditAction.AUTO_COMPLETED if result == TaskAuditResult.OK else TaskAuditAction.MARKED_DEVIATION,
             performed_by="AI-agent",
@@ -86,7 +89,6 @@ class TaskAutoMarkingService:
             result_description=ai_comment,
             documentation_reference=documentation_url
         )
-        self.db.add(audit_log)
         
         await self.db.commit()
         await self.db.refresh(task)
@@ -212,7 +214,9 @@ class TaskAutoMarkingService:
         task.updated_at = datetime.utcnow()
         
         # Create audit log
-        audit_log = TaskAuditLog(
+        record_audit(
+            self.db,
+            TaskAuditLog,
             task_id=task.id,
             action=TaskAuditAction.AUTO_COMPLETED if result == TaskAuditResult.OK else TaskAuditAction.MARKED_DEVIATION,
             performed_by="AI-agent",
@@ -221,7 +225,6 @@ class TaskAutoMarkingService:
             result_description=ai_comment,
             documentation_reference=documentation_url
         )
-        self.db.add(audit_log)
         
         await self.db.commit()
         await self.db.refresh(task)
@@ -275,7 +278,9 @@ class TaskAutoMarkingService:
         task.updated_at = datetime.utcnow()
         
         # Create audit log
-        audit_log = TaskAuditLog(
+        record_audit(
+            self.db,
+            TaskAuditLog,
             task_id=task.id,
             action=TaskAuditAction.AUTO_COMPLETED if result == TaskAuditResult.OK else TaskAuditAction.MARKED_DEVIATION,
             performed_by="AI-agent",
@@ -284,7 +289,6 @@ class TaskAutoMarkingService:
             result_description=ai_comment,
             documentation_reference=documentation_url
         )
-        self.db.add(audit_log)
         
         await self.db.commit()
         await self.db.refresh(task)
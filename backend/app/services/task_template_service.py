@@ -11,6 +11,7 @@ from calendar import monthrange
 from app.models.task import Task, TaskCategory, TaskFrequency, TaskStatus
 from app.models.task_audit_log import TaskAuditLog, TaskAuditAction
 from app.models.client import Client
+from app.utils.audit import record_audit
 
 
 class TaskTemplateService:
@@ -239,14 +240,15 @@ class TaskTemplateService:
             self.db.flush()
             
             # Create audit log
-            audit_log = TaskAuditLog(
+            record_audit(
+                self.db,
+                TaskAuditLog,
                 task_id=task.id,
                 action=TaskAuditAction.CREATED,
                 performed_by="AI-agent",
                 performed_at=datetime.utcnow(),
                 result_description=f"Auto-created task from template"
             )
-            self.db.add(audit_log)
             
             created_tasks.append(task)
         
@@ -15,6 +15,7 @@ from .oauth_client import TinkOAuth2Client
 from .api_client import TinkAPIClient
 from app.models.bank_connection import BankConnection
 from app.models.bank_transaction import BankTransaction, TransactionType, TransactionStatus
+from app.utils.metrics import track_bank_sync
 
 logger = logging.getLogger(__name__)
 
@@ -135,6 +136,7 @@ class TinkService:
         logger.info(f"Created Tink connection for client {client_id}, account {account_number}")
         return connection
     
+    @track_bank_sync("tink")
     async def sync_transactions(
         self,
         db: AsyncSession,
@@ -0,0 +1,194 @@
+"""
+Voucher Numbering - Gapless voucher number allocation per series and year
+
+Numbers are handed out from a counter row in voucher_series (one row per
+client, series code and fiscal year) instead of scanning general_ledger
+for MAX(voucher_number):
+
+- The counter is advanced with a single UPDATE ... RETURNING, so two
+  concurrent bookings can never receive the same number.
+- The row lock is held until the caller's transaction ends. A rolled-back
+  booking also rolls back its numbers, so committed numbers have no gaps.
+- Bulk jobs reserve a block of numbers with one round trip and hand them
+  out locally; unused numbers at the end of the block can be released.
+
+The counter row is created on first use, seeded from the highest
+"YYYY-NNNN" number already in general_ledger for that series.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Iterator, List
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+_ADVANCE_SQL = text("""
+    UPDATE voucher_series
+    SET next_number = next_number + :count
+    WHERE client_id = :client_id AND code = :series AND fiscal_year = :fiscal_year
+    RETURNING next_number - :count
+""")
+
+# Seed a new counter from existing "YYYY-NNNN" vouchers of the series
+_CREATE_SQL = text("""
+    INSERT INTO voucher_series (id, client_id, code, name, fiscal_year, next_number, is_active, created_at)
+    SELECT gen_random_uuid(), :client_id, :series, :name, :fiscal_year,
+           COALESCE(MAX(CAST(split_part(voucher_number, '-', 2) AS INTEGER)), 0) + 1,
+           true, now()
+    FROM general_ledger
+    WHERE client_id = :client_id
+      AND voucher_series = :series
+      AND voucher_number ~ :number_pattern
+    ON CONFLICT (client_id, code, fiscal_year) DO NOTHING
+""")
+
+# Give back the tail of a block if nothing was allocated after it
+_RELEASE_SQL = text("""
+    UPDATE voucher_series
+    SET next_number = next_number - :unused
+    WHERE client_id = :client_id AND code = :series AND fiscal_year = :fiscal_year
+      AND next_number = :block_end
+    RETURNING next_number
+""")
+
+
+def format_voucher_number(fiscal_year: int, sequence: int) -> str:
+    """Format as YYYY-NNNN (e.g. 2026-0042)"""
+    return f"{fiscal_year}-{sequence:04d}"
+
+
+@dataclass
+class VoucherNumberBlock:
+    """A contiguous range of reserved voucher numbers [start, start + count)"""
+    client_id: UUID
+    series: str
+    fiscal_year: int
+    start: int
+    count: int
+    used: int = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.count - self.used
+
+    def next(self) -> str:
+        """Take the next number from the block"""
+        if self.used >= self.count:
+            raise ValueError(
+                f"Voucher number block {self.series}/{self.fiscal_year} exhausted ({self.count} numbers)"
+            )
+        sequence = self.start + self.used
+        self.used += 1
+        return format_voucher_number(self.fiscal_year, sequence)
+
+    def numbers(self) -> List[str]:
+        return [format_voucher_number(self.fiscal_year, self.start + i) for i in range(self.count)]
+
+    def __iter__(self) -> Iterator[str]:
+        while self.remaining:
+            yield self.next()
+
+
+class VoucherNumberAllocator:
+    """
+    Allocate voucher numbers inside the caller's transaction
+
+    Usage:
+        allocator = VoucherNumberAllocator(db)
+        voucher_number = await allocator.next_number(client_id, "AP", 2026)
+
+        block = await allocator.reserve(client_id, "P", 2026, len(postings))
+        for posting in postings:
+            entry.voucher_number = block.next()
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def reserve(
+        self,
+        client_id: UUID,
+        series: str,
+        fiscal_year: int,
+        count: int,
+    ) -> VoucherNumberBlock:
+        """
+        Reserve count consecutive numbers
+
+        Args:
+            client_id: Client UUID
+            series: Voucher series code (AP, A, P, ...)
+            fiscal_year: Fiscal year the numbers belong to
+            count: Number of vouchers
+
+        Returns:
+            VoucherNumberBlock; numbers are only final once the transaction commits
+        """
+        if count < 1:
+            raise ValueError(f"count must be positive, got {count}")
+
+        params = {
+            "client_id": client_id,
+            "series": series,
+            "fiscal_year": fiscal_year,
+            "count": count,
+        }
+        start = (await self.db.execute(_ADVANCE_SQL, params)).scalar()
+        if start is None:
+            await self.db.execute(_CREATE_SQL, {
+                "client_id": client_id,
+                "series": series,
+                "fiscal_year": fiscal_year,
+                "name": f"{series} {fiscal_year}",
+                "number_pattern": f"^{int(fiscal_year)}-[0-9]+$",
+            })
+            start = (await self.db.execute(_ADVANCE_SQL, params)).scalar_one()
+
+        logger.debug(
+            f"Reserved voucher numbers {series} {format_voucher_number(fiscal_year, start)}"
+            f"..{format_voucher_number(fiscal_year, start + count - 1)} for client {client_id}"
+        )
+        return VoucherNumberBlock(
+            client_id=client_id,
+            series=series,
+            fiscal_year=fiscal_year,
+            start=start,
+            count=count,
+        )
+
+    async def next_number(self, client_id: UUID, series: str, fiscal_year: int) -> str:
+        """Allocate a single voucher number"""
+        block = await self.reserve(client_id, series, fiscal_year, 1)
+        return block.next()
+
+    async def release(self, block: VoucherNumberBlock) -> int:
+        """
+        Return the unused tail of a block to the series
+
+        Only possible while the block is still the most recent allocation,
+        which is always the case within the reserving transaction (the row
+        lock is held until commit).
+
+        Returns:
+            Number of numbers released
+        """
+        unused = block.remaining
+        if not unused:
+            return 0
+
+        result = await self.db.execute(_RELEASE_SQL, {
+            "client_id": block.client_id,
+            "series": block.series,
+            "fiscal_year": block.fiscal_year,
+            "unused": unused,
+            "block_end": block.start + block.count,
+        })
+        if result.scalar() is None:
+            return 0
+
+        block.count = block.used
+        return unused
@@ -11,7 +11,7 @@ import logging
 from uuid import UUID, uuid4
 from typing import Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from datetime import datetime, date
 from decimal import Decimal
@@ -22,6 +22,8 @@ from app.models.vendor import Vendor
 from app.models.chart_of_accounts import Account
 from app.models.audit_trail import AuditTrail
 from app.models.document import Document
+from app.services.voucher_numbering import VoucherNumberAllocator
+from app.services.currency_rate_table import BASE_CURRENCY, rate_table
 from app.schemas.voucher import (
     VoucherLineCreate,
     VoucherDTO,
@@ -142,38 +144,22 @@ class VoucherGenerator:
             if accounting_date is None:
                 accounting_date = invoice.invoice_date
             
-            # OPTIMIZATION 3: Generate voucher number with optimized query
-            current_year = accounting_date.year
+            # OPTIMIZATION 3: Allocate voucher number from the series counter
+            # (row-locked until commit - no MAX() scan, no duplicate numbers)
             series = "AP"
-            
-            # Use ROW_NUMBER instead of SELECT MAX for better performance
-            from sqlalchemy import literal
-            voucher_number_query = select(
-                func.coalesce(func.max(GeneralLedger.voucher_number), literal(f"{current_year}-0000"))
-            ).where(
-                GeneralLedger.client_id == tenant_id,
-                GeneralLedger.voucher_series == series,
-                GeneralLedger.fiscal_year == current_year
+            voucher_number = await VoucherNumberAllocator(self.db).next_number(
+                tenant_id, series, accounting_date.year
             )
             
-            voucher_num_result = await self.db.execute(voucher_number_query)
-            max_number = voucher_num_result.scalar()
-            
-            try:
-                last_seq = int(max_number.split("-")[1])
-                next_seq = last_seq + 1
-            except (IndexError, ValueError):
-                next_seq = 1
-            
-            voucher_number = f"{current_year}-{next_seq:04d}"
-            
             logger.info(f"⏱️  Generated voucher number in {time.time() - start_time:.3f}s")
             
             # 4. Generate voucher lines (Norwegian accounting logic)
             # Note: _generate_voucher_lines is now synchronous (no DB calls)
+            exchange_rates = await self.exchange_rates([invoice])
             lines = self._generate_voucher_lines_sync(
                 invoice, 
-                override_account=override_account
+                override_account=override_account,
+                exchange_rate=exchange_rates.get(invoice.id)
             )
             
             # 5. Validate balance (CRITICAL!)
@@ -217,7 +203,7 @@ class VoucherGenerator:
                     credit_amount=line_data.credit_amount,
                     vat_code=line_data.vat_code,
                     vat_amount=line_data.vat_amount or Decimal("0.00"),
-                    vat_base_amount=invoice.amount_excl_vat if line_data.vat_code else None,
+                    vat_base_amount=lines[0].debit_amount if line_data.vat_code else None,
                     line_description=line_data.line_description,
                     ai_confidence_score=invoice.ai_confidence_score,
                     ai_reasoning=invoice.ai_reasoning
@@ -307,10 +293,29 @@ class VoucherGenerator:
             logger.error(f"❌ Error creating voucher: {str(e)}", exc_info=True)
             raise
     
+    async def exchange_rates(self, invoices: List[VendorInvoice]) -> Dict[UUID, Decimal]:
+        """
+        NOK rate on the invoice date for each foreign-currency invoice
+        
+        Read from the in-memory rate table with one binary search per
+        currency; invoices without a rate on or before their date are left out.
+        """
+        foreign = [invoice for invoice in invoices if (invoice.currency or BASE_CURRENCY) != BASE_CURRENCY]
+        if not foreign:
+            return {}
+        
+        await rate_table.ensure_loaded(self.db)
+        rates = rate_table.rates_many(
+            [invoice.currency for invoice in foreign],
+            [invoice.invoice_date for invoice in foreign]
+        )
+        return {invoice.id: rate for invoice, rate in zip(foreign, rates) if rate is not None}
+    
     def _generate_voucher_lines_sync(
         self, 
         invoice: VendorInvoice,
-        override_account: Optional[str] = None
+        override_account: Optional[str] = None,
+        exchange_rate: Optional[Decimal] = None
     ) -> List[VoucherLineCreate]:
         """
         Generer voucher lines basert på invoice (SYNC - no DB calls)
@@ -329,10 +334,26 @@ class VoucherGenerator:
         Line 3 (Kredit): 2400 Leverandørgjeld  12,500 kr
         
         Total debet = Total kredit = 12,500 kr ✓
+        
+        Foreign-currency invoices are booked in NOK at exchange_rate (the
+        rate on the invoice date, see exchange_rates()).
         """
         lines = []
         line_num = 1
         
+        amount_excl_vat = invoice.amount_excl_vat
+        vat_amount = invoice.vat_amount
+        total_amount = invoice.total_amount
+        if (invoice.currency or BASE_CURRENCY) != BASE_CURRENCY:
+            if exchange_rate is None:
+                raise VoucherValidationError(
+                    f"No {invoice.currency} exchange rate on or before {invoice.invoice_date}"
+                )
+            amount_excl_vat = (amount_excl_vat * exchange_rate).quantize(Decimal("0.01"))
+            vat_amount = (vat_amount * exchange_rate).quantize(Decimal("0.01")) if vat_amount else vat_amount
+            # Credit the sum of the rounded debits so the voucher balances
+            total_amount = amount_excl_vat + (vat_amount or Decimal("0.00"))
+        
         # Determine expense account
         if override_account:
             expense_account = override_account
@@ -352,7 +373,7 @@ class VoucherGenerator:
             account_number=expense_account,
             account_name=expense_account_name,
             line_description=f"Leverandørfaktura {invoice.invoice_number}",
-            debit_amount=invoice.amount_excl_vat,
+            debit_amount=amount_excl_vat,
             credit_amount=Decimal("0.00"),
             vat_code=None,
             vat_amount=None
@@ -360,16 +381,16 @@ class VoucherGenerator:
         line_num += 1
         
         # LINE 2: Debit - Input VAT (if applicable)
-        if invoice.vat_amount and invoice.vat_amount > 0:
+        if vat_amount and vat_amount > 0:
             lines.append(VoucherLineCreate(
                 line_number=line_num,
                 account_number="2740",  # Inngående MVA
                 account_name="Inngående MVA",
                 line_description=f"MVA på faktura {invoice.invoice_number}",
-                debit_amount=invoice.vat_amount,
+                debit_amount=vat_amount,
                 credit_amount=Decimal("0.00"),
-                vat_code=self._determine_vat_code(invoice.vat_amount, invoice.amount_excl_vat),
-                vat_amount=invoice.vat_amount
+                vat_code=self._determine_vat_code(vat_amount, amount_excl_vat),
+                vat_amount=vat_amount
             ))
             line_num += 1
         
@@ -380,7 +401,7 @@ class VoucherGenerator:
             account_name="Leverandørgjeld",
             line_description=f"Leverandør: {invoice.vendor.name if invoice.vendor else 'Ukjent'}",
             debit_amount=Decimal("0.00"),
-            credit_amount=invoice.total_amount,
+            credit_amount=total_amount,
             vat_code=None,
             vat_amount=None
         ))
@@ -436,7 +457,8 @@ class VoucherGenerator:
         """
         Generer neste bilagsnummer (2026-0001, 2026-0002, etc.)
         
-        Format: YYYY-NNNN (year + sequential number)
+        Format: YYYY-NNNN (year + sequential number), allocated from the
+        voucher series counter inside the current transaction.
         
         Args:
             client_id: Client UUID
@@ -445,33 +467,10 @@ class VoucherGenerator:
         Returns:
             Voucher number string (e.g., "2026-0042")
         """
-        current_year = date.today().year
-        
-        # Find highest voucher number for this client, series, and year
-        query = select(func.max(GeneralLedger.voucher_number)).where(
-            GeneralLedger.client_id == client_id,
-            GeneralLedger.voucher_series == series,
-            GeneralLedger.fiscal_year == current_year
+        voucher_number = await VoucherNumberAllocator(self.db).next_number(
+            client_id, series, date.today().year
         )
         
-        result = await self.db.execute(query)
-        max_number = result.scalar()
-        
-        if max_number:
-            # Extract number part (e.g., "2026-0042" -> 42)
-            try:
-                last_seq = int(max_number.split("-")[1])
-                next_seq = last_seq + 1
-            except (IndexError, ValueError):
-                # Fallback if format is unexpected
-                next_seq = 1
-        else:
-            # First voucher of the year
-            next_seq = 1
-        
-        # Format: YYYY-NNNN (zero-padded to 4 digits)
-        voucher_number = f"{current_year}-{next_seq:04d}"
-        
         logger.info(f"Generated voucher number: {voucher_number} (series: {series})")
         return voucher_number
     
@@ -0,0 +1,107 @@
+"""
+Leader lock for scheduled jobs
+
+Every app instance starts the same scheduler (setup_payment_tasks), so
+each job fires once per instance. A job wrapped with run_as_leader() first
+claims its run of the day: an INSERT ... ON CONFLICT DO NOTHING into
+scheduled_job_runs keyed on (job_name, scheduled_date). The instance whose
+insert goes through runs the job; the others skip it, also when they fire
+after that run has finished. A failed run gives its claim back, so the job
+can be run again the same day (e.g. manually).
+"""
+import functools
+import logging
+import os
+import socket
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import engine
+from app.models.scheduled_job_run import ScheduledJobRun
+
+logger = logging.getLogger(__name__)
+
+# Runs fired this close before midnight count for the next day, so clock
+# skew between instances does not split a 00:00 job across two dates
+CLOCK_SKEW_TOLERANCE = timedelta(minutes=5)
+
+
+def scheduled_date(now: Optional[datetime] = None) -> date:
+    """Day (UTC) a run fired at `now` belongs to"""
+    return ((now or datetime.utcnow()) + CLOCK_SKEW_TOLERANCE).date()
+
+
+async def claim_run(name: str, run_date: date, db_engine: Optional[AsyncEngine] = None) -> bool:
+    """
+    Claim the run of job `name` on `run_date`
+
+    Returns:
+        True for the one instance that gets the claim
+    """
+    statement = (
+        insert(ScheduledJobRun)
+        .values(
+            job_name=name,
+            scheduled_date=run_date,
+            claimed_at=datetime.utcnow(),
+            claimed_by=f"{socket.gethostname()}:{os.getpid()}",
+        )
+        .on_conflict_do_nothing(index_elements=[ScheduledJobRun.job_name, ScheduledJobRun.scheduled_date])
+        .returning(ScheduledJobRun.job_name)
+    )
+    async with (db_engine or engine).begin() as conn:
+        return (await conn.scalar(statement)) is not None
+
+
+async def release_run(name: str, run_date: date, db_engine: Optional[AsyncEngine] = None) -> None:
+    """Give back the claim of a failed run"""
+    async with (db_engine or engine).begin() as conn:
+        await conn.execute(
+            delete(ScheduledJobRun).where(
+                ScheduledJobRun.job_name == name,
+                ScheduledJobRun.scheduled_date == run_date,
+            )
+        )
+
+
+def run_as_leader(name: str):
+    """Decorator: run the async job only on the instance that claims today's run"""
+    def decorator(job):
+        @functools.wraps(job)
+        async def wrapper(*args, **kwargs):
+            run_date = scheduled_date()
+            try:
+                claimed = await claim_run(name, run_date)
+            except Exception as e:
+                logger.error(f"Could not claim {name} for {run_date}: {e}")
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+
+            if not claimed:
+                logger.info(f"Skipping {name}: already run for {run_date} by another instance")
+                return {
+                    "success": True,
+                    "skipped": True,
+                    "reason": "not leader",
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+
+            result = None
+            try:
+                result = await job(*args, **kwargs)
+                return result
+            finally:
+                if not (isinstance(result, dict) and result.get("success")):
+                    try:
+                        await release_run(name, run_date)
+                    except Exception as e:
+                        logger.error(f"Could not release claim of failed {name} for {run_date}: {e}")
+        return wrapper
+    return decorator
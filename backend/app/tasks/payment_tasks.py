@@ -13,31 +13,30 @@ Integration options:
 - APScheduler (recommended for standalone)
 - Celery (for distributed systems)
 - Cron job (simple)
+
+Scheduled jobs run under a leader lock (app/tasks/leader_lock.py), so with
+several app instances each job runs on one of them only.
 """
 
 import asyncio
 from datetime import datetime, date
-from typing import List, Dict, Any
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from uuid import UUID
 import logging
 
 from app.services.payment_status_service import PaymentStatusService
-from app.models.client import Client
-from app.database import get_db
-from app.config import settings
+from app.database import AsyncSessionLocal
+from app.tasks.leader_lock import run_as_leader
 
 logger = logging.getLogger(__name__)
 
 
+@run_as_leader("detect_overdue_invoices")
 async def detect_overdue_invoices_task():
     """
     Background task to detect and mark overdue invoices.
     
     Runs daily at 00:00 UTC.
     
-    For each client:
+    For all clients at once:
     - Find invoices with due_date < today
     - Mark as 'overdue' if payment_status is 'unpaid' or 'partially_paid'
     
@@ -47,52 +46,20 @@ async def detect_overdue_invoices_task():
     logger.info("Starting overdue invoice detection task")
     
     try:
-        # Create async database session
-        engine = create_async_engine(settings.DATABASE_URL)
-        async_session = sessionmaker(
-            engine, class_=AsyncSession, expire_on_commit=False
+        async with AsyncSessionLocal() as db:
+            result = await PaymentStatusService.detect_overdue_invoices(db=db)
+        
+        logger.info(
+            f"Overdue detection complete: {result['total_overdue']} invoices marked overdue "
+            f"across {len(result['by_client'])} clients"
         )
         
-        async with async_session() as db:
-            # Get all active clients
-            from sqlalchemy import select
-            result = await db.execute(select(Client))
-            clients = result.scalars().all()
-            
-            total_overdue = 0
-            
-            for client in clients:
-                try:
-                    result = await PaymentStatusService.detect_overdue_invoices(
-                        db=db,
-                        client_id=client.id
-                    )
-                    
-                    client_overdue = result["total_overdue"]
-                    total_overdue += client_overdue
-                    
-                    if client_overdue > 0:
-                        logger.info(
-                            f"Client {client.company_name}: "
-                            f"Marked {client_overdue} invoices as overdue"
-                        )
-                
-                except Exception as e:
-                    logger.error(
-                        f"Error detecting overdue invoices for client {client.id}: {e}"
-                    )
-            
-            logger.info(
-                f"Overdue detection complete: {total_overdue} invoices marked overdue "
-                f"across {len(clients)} clients"
-            )
-            
-            return {
-                "success": True,
-                "total_overdue": total_overdue,
-                "clients_processed": len(clients),
-                "timestamp": datetime.utcnow().isoformat()
-            }
+        return {
+            "success": True,
+            "total_overdue": result["total_overdue"],
+            "clients_affected": len(result["by_client"]),
+            "timestamp": datetime.utcnow().isoformat()
+        }
     
     except Exception as e:
         logger.error(f"Fatal error in overdue detection task: {e}")
@@ -103,6 +70,7 @@ async def detect_overdue_invoices_task():
         }
 
 
+@run_as_leader("payment_reminder_check")
 async def payment_reminder_check_task(days_before_due: int = 7):
     """
     Background task to check for invoices approaching due date.
@@ -123,12 +91,7 @@ async def payment_reminder_check_task(days_before_due: int = 7):
     logger.info(f"Starting payment reminder check (threshold: {days_before_due} days)")
     
     try:
-        engine = create_async_engine(settings.DATABASE_URL)
-        async_session = sessionmaker(
-            engine, class_=AsyncSession, expire_on_commit=False
-        )
-        
-        async with async_session() as db:
+        async with AsyncSessionLocal() as db:
             today = date.today()
             reminder_date = today + timedelta(days=days_before_due)
             
@@ -1,12 +1,175 @@
 """
 Audit Trail Utilities
+
+Audit rows are buffered on the session and written with multi-row INSERTs
+when the transaction commits, instead of one INSERT per event:
+
+- record_audit() adds a row to the buffer of the session's transaction.
+  The buffer is written in the same transaction, right before COMMIT, so a
+  committed booking always has its audit rows; a rollback discards both.
+- AuditSpool is an optional out-of-band sink for non-critical agent
+  telemetry. Rows are appended to a local spool file (fsync'ed) and loaded
+  into the database in batches by AuditSpool.drain(). Workers sharing the
+  spool claim it by renaming it to a per-pid name, and the inserts skip
+  rows that are already loaded.
 """
-from typing import Optional
+import asyncio
+import fcntl
+import glob
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 import uuid
+
+from sqlalchemy import Table, event, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.database import Base
 from app.models.voucher_audit_log import VoucherAuditLog
 
+logger = logging.getLogger(__name__)
+
+AUDIT_BUFFER_KEY = "audit_buffer"
+
+# asyncpg allows 32767 bind parameters per statement
+MAX_INSERT_PARAMS = 30000
+
+
+def _python_defaults(table: Table, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill client-side column defaults (ids, timestamps) the ORM would set"""
+    row = dict(values)
+    for column in table.columns:
+        default = column.default
+        if column.key in row or default is None:
+            continue
+        if default.is_callable:
+            row[column.key] = default.arg(None)
+        elif default.is_scalar:
+            row[column.key] = default.arg
+    return row
+
+
+def _insert_rows(
+    session: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    skip_existing: bool = False
+) -> None:
+    """
+    Multi-row INSERT, grouped by column set and chunked by parameter count
+
+    With skip_existing, rows whose primary key is already present are
+    skipped (INSERT ... ON CONFLICT DO NOTHING, PostgreSQL only).
+    """
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        groups[tuple(sorted(row))].append(row)
+
+    for keys, group in groups.items():
+        chunk_size = max(1, MAX_INSERT_PARAMS // len(keys))
+        for start in range(0, len(group), chunk_size):
+            chunk = group[start:start + chunk_size]
+            if skip_existing:
+                session.execute(pg_insert(table).values(chunk).on_conflict_do_nothing())
+            else:
+                session.execute(insert(table).values(chunk))
+
+
+class AuditBuffer:
+    """Audit rows recorded in the current transaction, written at commit"""
+
+    def __init__(self):
+        self.rows: Dict[Table, List[Dict[str, Any]]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self.rows.values())
+
+    def add(self, table: Table, values: Dict[str, Any]) -> Dict[str, Any]:
+        row = _python_defaults(table, values)
+        self.rows[table].append(row)
+        return row
+
+    def write(self, session: Session) -> int:
+        """Insert all buffered rows on the session's connection"""
+        written = 0
+        while self.rows:
+            table, rows = self.rows.popitem()
+            _insert_rows(session, table, rows)
+            written += len(rows)
+        return written
+
+    def clear(self) -> None:
+        self.rows.clear()
+
+
+def _buffer(session: Union[Session, AsyncSession], create: bool = True) -> Optional[AuditBuffer]:
+    info = session.info
+    buffer = info.get(AUDIT_BUFFER_KEY)
+    if buffer is None and create:
+        buffer = info[AUDIT_BUFFER_KEY] = AuditBuffer()
+    return buffer
+
+
+@event.listens_for(Session, "before_commit")
+def _write_audit_buffer(session: Session) -> None:
+    buffer = _buffer(session, create=False)
+    if not buffer:
+        return
+    # Flush first: audit rows may reference rows added in this transaction
+    session.flush()
+    written = buffer.write(session)
+    logger.debug(f"Wrote {written} buffered audit rows")
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_audit_buffer(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        buffer = _buffer(session, create=False)
+        if buffer:
+            logger.debug(f"Discarding {len(buffer)} audit rows of a rolled back transaction")
+            buffer.clear()
+
+
+def record_audit(
+    db: Union[Session, AsyncSession],
+    model: Type[Base],
+    **values
+) -> Dict[str, Any]:
+    """
+    Buffer an audit row; it is inserted when the transaction commits.
+
+    Args:
+        db: Database session whose transaction the row belongs to
+        model: Audit model (VoucherAuditLog, TaskAuditLog, AuditTrail)
+        **values: Column values
+
+    Returns:
+        The row values, including generated id and timestamps
+    """
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    if not session.in_transaction():
+        # Like Session.add(): the row belongs to the transaction it starts
+        session.begin()
+    return _buffer(session).add(model.__table__, values)
+
+
+async def flush_audit_buffer(db: AsyncSession) -> int:
+    """Write buffered audit rows now (e.g. before reading the audit trail)"""
+    buffer = _buffer(db, create=False)
+    if not buffer:
+        return 0
+    await db.flush()
+    return await db.run_sync(buffer.write)
+
 
 async def log_audit_event(
     db: AsyncSession,
@@ -17,10 +180,12 @@ async def log_audit_event(
     user_id: Optional[uuid.UUID] = None,
     ai_confidence: Optional[float] = None,
     details: Optional[dict] = None
-) -> VoucherAuditLog:
+) -> Dict[str, Any]:
     """
     Log an audit event for a voucher action.
-    
+
+    The row is written when the caller's transaction commits.
+
     Args:
         db: Database session
         voucher_id: ID of the voucher being audited
@@ -30,10 +195,10 @@ async def log_audit_event(
         user_id: User ID if performed by a human (optional)
         ai_confidence: AI confidence score 0-1 if performed by AI (optional)
         details: Additional details as JSON (optional)
-        
+
     Returns:
-        VoucherAuditLog: The created audit log entry
-        
+        The buffered audit row values
+
     Example:
         await log_audit_event(
             db=db,
@@ -45,7 +210,9 @@ async def log_audit_event(
             details={"notes": "Approved with corrections", "changes": {...}}
         )
     """
-    audit = VoucherAuditLog(
+    return record_audit(
+        db,
+        VoucherAuditLog,
         voucher_id=voucher_id,
         voucher_type=voucher_type,
         action=action,
@@ -54,9 +221,6 @@ async def log_audit_event(
         ai_confidence=ai_confidence,
         details=details
     )
-    db.add(audit)
-    await db.flush()  # Flush instead of commit to allow caller to manage transaction
-    return audit
 
 
 async def get_voucher_audit_trail(
@@ -65,21 +229,218 @@ async def get_voucher_audit_trail(
 ) -> list[VoucherAuditLog]:
     """
     Retrieve the complete audit trail for a voucher.
-    
+
     Args:
         db: Database session
         voucher_id: ID of the voucher
-        
+
     Returns:
         List of audit log entries ordered by timestamp (newest first)
     """
-    from sqlalchemy import select
-    
+    await flush_audit_buffer(db)
+
     query = (
         select(VoucherAuditLog)
         .where(VoucherAuditLog.voucher_id == voucher_id)
         .order_by(VoucherAuditLog.timestamp.desc())
     )
-    
+
     result = await db.execute(query)
     return list(result.scalars().all())
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__} in audit spool")
+
+
+def _from_json(table: Table, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert spooled JSON values back to column types"""
+    row = {}
+    for key, value in values.items():
+        column = table.columns.get(key)
+        if column is None:
+            continue
+        if isinstance(value, str):
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                python_type = None
+            if python_type is uuid.UUID:
+                value = uuid.UUID(value)
+            elif python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            elif isinstance(python_type, type) and issubclass(python_type, Enum):
+                value = python_type(value)
+        row[key] = value
+    return row
+
+
+def _is_current(f, path: str) -> bool:
+    """Whether the open file is still the one at path (not renamed away)"""
+    try:
+        return os.fstat(f.fileno()).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def _claim_pid(claim_path: str) -> Optional[int]:
+    pid = claim_path.rsplit(".", 2)[-2]
+    return int(pid) if pid.isdigit() else None
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class AuditSpool:
+    """
+    Out-of-band audit sink backed by an append-only local file
+
+    Only for non-critical telemetry (agent bookkeeping of tasks, parsing,
+    review routing). Anything that documents a booking must use
+    record_audit() so it commits together with the booking.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _append(self, line: str) -> None:
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            while True:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                    if not _is_current(f, self.path):
+                        # Claimed by a drain while we waited: append to the new spool file
+                        continue
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    return
+
+    async def append(self, model: Type[Base], **values) -> Dict[str, Any]:
+        """Durably append an audit row to the spool file"""
+        row = _python_defaults(model.__table__, values)
+        line = json.dumps({"table": model.__tablename__, "values": row}, default=_json_default) + "\n"
+        await asyncio.to_thread(self._append, line)
+        return row
+
+    def _claim_path(self, pid: Optional[int] = None) -> str:
+        return f"{self.path}.{pid or os.getpid()}.draining"
+
+    def _take(self) -> Optional[str]:
+        """
+        Claim a spool file for draining by this process
+
+        Leftovers of this process's failed drain come first, then claims of
+        workers that are no longer running, then the live spool file. A
+        claim is a rename to a name with our pid, so when several workers
+        drain at once exactly one of them gets each file.
+        """
+        claimed = self._claim_path()
+        with self._lock:
+            if os.path.exists(claimed):
+                return claimed
+            abandoned = [
+                candidate for candidate in glob.glob(glob.escape(self.path) + ".*.draining")
+                if not _pid_alive(_claim_pid(candidate))
+            ]
+            for candidate in abandoned + [self.path]:
+                try:
+                    os.rename(candidate, claimed)
+                except FileNotFoundError:
+                    continue  # claimed by another worker
+                # Wait for appends that opened the file before the rename
+                with open(claimed, "a", encoding="utf-8") as f:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                return claimed
+        return None
+
+    @staticmethod
+    def _read(path: str) -> Dict[Table, List[Dict[str, Any]]]:
+        tables = Base.metadata.tables
+        rows: Dict[Table, List[Dict[str, Any]]] = defaultdict(list)
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    entry = json.loads(line)
+                    table = tables[entry["table"]]
+                except (ValueError, KeyError):
+                    logger.warning(f"Skipping unreadable audit spool line {line_number} in {path}")
+                    continue
+                rows[table].append(_from_json(table, entry["values"]))
+        return rows
+
+    async def drain(self, db: AsyncSession) -> int:
+        """
+        Insert spooled rows and commit
+
+        If the insert fails the spooled rows are kept and retried on the
+        next drain. Rows carry the id assigned when they were spooled and
+        are inserted with ON CONFLICT DO NOTHING, so a retry after a crash
+        between commit and removing the file does not duplicate them.
+
+        Returns:
+            Number of rows inserted
+        """
+        draining = await asyncio.to_thread(self._take)
+        if draining is None:
+            return 0
+
+        rows = await asyncio.to_thread(self._read, draining)
+
+        def insert_all(session: Session) -> int:
+            for table, table_rows in rows.items():
+                _insert_rows(session, table, table_rows, skip_existing=True)
+            return sum(len(table_rows) for table_rows in rows.values())
+
+        inserted = await db.run_sync(insert_all)
+        await db.commit()
+        try:
+            os.remove(draining)
+        except FileNotFoundError:
+            pass
+        logger.info(f"Drained {inserted} audit rows from spool")
+        return inserted
+
+
+_spool: Optional[AuditSpool] = None
+
+
+def get_audit_spool() -> AuditSpool:
+    """Process-wide audit spool"""
+    global _spool
+    if _spool is None:
+        _spool = AuditSpool(settings.AUDIT_SPOOL_PATH)
+    return _spool
+
+
+async def drain_spool_periodically(session_maker, interval: float) -> None:
+    """Background task: load the audit spool into the database every interval seconds"""
+    spool = get_audit_spool()
+    while True:
+        try:
+            async with session_maker() as db:
+                await spool.drain(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Audit spool drain failed: {e}", exc_info=True)
+        await asyncio.sleep(interval)
@@ -0,0 +1,213 @@
+"""
+Prometheus metrics
+
+Metric objects for the API, the database pool, agent workers, the
+orchestrator, LLM calls and bank syncs, plus the helpers that record them.
+Everything is exposed by GET /metrics (app/api/routes/metrics.py).
+
+Multiple uvicorn workers: set PROMETHEUS_MULTIPROC_DIR to an empty,
+writable directory before the processes start (wipe it on deploy). Each
+process then writes its samples to memory-mapped files there, and /metrics
+aggregates all of them, whichever worker serves the scrape. Agent workers
+and the orchestrator started with the same directory on the same host are
+included too. Without the variable, metrics are process-local.
+"""
+import functools
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Iterator, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+LAG_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+# --- API ---
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled",
+    multiprocess_mode="livesum",
+)
+
+# --- Database pools (per process; summed over live processes) ---
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections checked out of the SQLAlchemy pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_capacity_connections",
+    "Pool size plus max overflow",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+# --- Agents ---
+AGENT_TASK_DURATION = Histogram(
+    "agent_task_duration_seconds",
+    "Agent task execution time",
+    ["agent_type", "outcome"],
+    buckets=JOB_BUCKETS,
+)
+AGENT_TASK_WAIT = Histogram(
+    "agent_task_wait_seconds",
+    "Time from task creation until a worker claimed it",
+    ["agent_type"],
+    buckets=LAG_BUCKETS,
+)
+AGENT_QUEUE_DEPTH = Gauge(
+    "agent_tasks_queued",
+    "Agent tasks by status (sampled at scrape time)",
+    ["agent_type", "status"],
+    multiprocess_mode="mostrecent",
+)
+
+# --- Orchestrator ---
+ORCHESTRATOR_EVENT_DURATION = Histogram(
+    "orchestrator_event_duration_seconds",
+    "Time to handle one agent event",
+    ["event_type", "outcome"],
+    buckets=JOB_BUCKETS,
+)
+ORCHESTRATOR_EVENT_LAG = Histogram(
+    "orchestrator_event_lag_seconds",
+    "Time from event creation until the orchestrator picked it up",
+    ["event_type"],
+    buckets=LAG_BUCKETS,
+)
+AGENT_EVENTS_UNPROCESSED = Gauge(
+    "agent_events_unprocessed",
+    "Agent events not yet processed (sampled at scrape time)",
+    multiprocess_mode="mostrecent",
+)
+AGENT_EVENTS_OLDEST_AGE = Gauge(
+    "agent_events_oldest_unprocessed_age_seconds",
+    "Age of the oldest unprocessed agent event (sampled at scrape time)",
+    multiprocess_mode="mostrecent",
+)
+
+# --- LLM ---
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "Claude API call latency",
+    ["model", "outcome"],
+    buckets=LLM_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens",
+    "Claude API tokens used",
+    ["model", "kind"],
+)
+
+# --- Bank sync ---
+BANK_SYNC_DURATION = Histogram(
+    "bank_sync_duration_seconds",
+    "Duration of one bank connection transaction sync",
+    ["provider", "outcome"],
+    buckets=JOB_BUCKETS,
+)
+BANK_SYNC_TRANSACTIONS = Counter(
+    "bank_sync_transactions",
+    "Transactions seen by bank syncs",
+    ["provider", "result"],
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get(MULTIPROC_DIR_ENV))
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the duration of the block, labelled outcome=success|error"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        histogram.labels(outcome=outcome, **labels).observe(time.perf_counter() - start)
+
+
+def observe_since(histogram: Histogram, created_at: datetime, **labels: str) -> None:
+    """Observe seconds elapsed since a naive UTC timestamp"""
+    if created_at is not None:
+        histogram.labels(**labels).observe(max((datetime.utcnow() - created_at).total_seconds(), 0.0))
+
+
+def record_llm_usage(model: str, usage: Any) -> None:
+    """Count input/output tokens of an Anthropic response's usage block"""
+    if usage is None:
+        return
+    for kind in ("input", "output"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens:
+            LLM_TOKENS.labels(model=model, kind=kind).inc(tokens)
+
+
+def track_bank_sync(provider: str):
+    """
+    Decorator for a bank sync coroutine: duration and transaction counts
+
+    The coroutine returns either the number of new transactions or a
+    summary dict with new/duplicates/errors counts.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with timed(BANK_SYNC_DURATION, provider=provider):
+                result = await func(*args, **kwargs)
+            counts = result if isinstance(result, dict) else {"new": result}
+            for key in ("new", "duplicates", "errors"):
+                if counts.get(key):
+                    BANK_SYNC_TRANSACTIONS.labels(provider=provider, result=key).inc(counts[key])
+            return result
+        return wrapper
+    return decorator
+
+
+def instrument_pool(engine: Engine, pool: str, capacity: int) -> None:
+    """Track checked-out connections (sync engine; async engines: .sync_engine)"""
+    DB_POOL_CAPACITY.labels(pool=pool).set(capacity)
+    checked_out = DB_POOL_CHECKED_OUT.labels(pool=pool)
+
+    @event.listens_for(engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposition text of all metrics (every process in multiprocess mode) and its content type"""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this process's live gauges from the multiprocess directory (on shutdown)"""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
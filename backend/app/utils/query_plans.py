@@ -0,0 +1,84 @@
+"""
+Query plan inspection helpers
+
+Used by the plan regression tests to assert that hot queries use the
+composite/covering indexes instead of falling back to sequential scans.
+"""
+import json
+import logging
+import re
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+logger = logging.getLogger(__name__)
+
+# general_ledger_lines_y2025, general_ledger_lines_default, ...
+_PARTITION_SUFFIX_RE = re.compile(r"_(y\d{4}|default)$")
+
+
+def render_sql(stmt: Select) -> str:
+    """Render a statement with inlined parameters (for EXPLAIN)"""
+    return str(stmt.compile(
+        dialect=postgresql.asyncpg.dialect(),
+        compile_kwargs={"literal_binds": True},
+    ))
+
+
+async def explain(db: AsyncSession, stmt: Select, analyze: bool = False) -> Dict[str, Any]:
+    """
+    Return the top plan node of EXPLAIN (FORMAT JSON)
+
+    Args:
+        db: Database session
+        stmt: SELECT statement
+        analyze: Execute the query (EXPLAIN ANALYZE) to get actual row counts
+    """
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    result = await db.execute(text(f"EXPLAIN ({options}) {render_sql(stmt)}"))
+    document = result.scalar()
+    if isinstance(document, str):
+        document = json.loads(document)
+    return document[0]["Plan"]
+
+
+def walk(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Depth-first iteration over all plan nodes"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+def parent_table(relation: Optional[str]) -> Optional[str]:
+    """Partitioned table a partition belongs to (the name itself otherwise)"""
+    if relation is None:
+        return None
+    return _PARTITION_SUFFIX_RE.sub("", relation)
+
+
+def scans(plan: Dict[str, Any], node_type: str, tables: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Nodes of node_type (e.g. "Seq Scan"), optionally limited to relations in
+    tables; partitions count as their parent table
+    """
+    return [
+        node for node in walk(plan)
+        if node.get("Node Type") == node_type
+        and (tables is None or parent_table(node.get("Relation Name")) in tables)
+    ]
+
+
+def describe(plan: Dict[str, Any]) -> str:
+    """One line per node: type, relation and index, for assertion messages"""
+    lines = []
+    for node in walk(plan):
+        parts = [node.get("Node Type", "?")]
+        if node.get("Relation Name"):
+            parts.append(f"on {node['Relation Name']}")
+        if node.get("Index Name"):
+            parts.append(f"using {node['Index Name']}")
+        lines.append(" ".join(parts))
+    return "\n".join(lines)
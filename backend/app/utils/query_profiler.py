@@ -0,0 +1,211 @@
+"""
+Per-request query profiling
+
+Engine events (instrument_engine(), registered in app/database.py) report
+every statement to the QueryProfile of the current request (a context
+variable set by QueryProfilerMiddleware). A profile keeps the query count,
+total database time, the slowest statements and how often each statement
+*shape* ran.
+A shape is the SQL with parameters and IN lists collapsed; one shape
+running many times in a single request is the N+1 signature of a loop
+that issues one query per row.
+
+ProfileRegistry aggregates finished profiles per route for the debug
+endpoint (/api/debug/queries).
+"""
+import heapq
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SLOWEST_STATEMENTS = 5
+MAX_SHAPE_LENGTH = 500
+
+current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("current_query_profile", default=None)
+
+_IN_LIST_RE = re.compile(r"\(\s*(?:\$\d+|\?|%\(\w+\)s)(?:\s*,\s*(?:\$\d+|\?|%\(\w+\)s))+\s*\)")
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a statement so executions that differ only in parameter
+    values (or IN list length) compare equal
+    """
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    shape = _STRING_RE.sub("?", shape)
+    shape = _PARAM_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("(?)", shape)
+    shape = _NUMBER_RE.sub("?", shape)
+    return shape[:MAX_SHAPE_LENGTH]
+
+
+@dataclass
+class ShapeStats:
+    count: int = 0
+    total_ms: float = 0.0
+
+
+@dataclass
+class QueryProfile:
+    """Statements executed while handling one request"""
+    queries: int = 0
+    db_ms: float = 0.0
+    shapes: Dict[str, ShapeStats] = field(default_factory=dict)
+    slowest: List[Tuple[float, int, str]] = field(default_factory=list)  # min-heap of (ms, seq, statement)
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.queries += 1
+        self.db_ms += duration_ms
+
+        shape = statement_shape(statement)
+        stats = self.shapes.get(shape)
+        if stats is None:
+            stats = self.shapes[shape] = ShapeStats()
+        stats.count += 1
+        stats.total_ms += duration_ms
+
+        entry = (duration_ms, self.queries, statement[:MAX_SHAPE_LENGTH])
+        if len(self.slowest) < SLOWEST_STATEMENTS:
+            heapq.heappush(self.slowest, entry)
+        elif duration_ms > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def repeated(self, threshold: int) -> List[Dict[str, Any]]:
+        """Shapes executed at least threshold times (N+1 candidates), most frequent first"""
+        return [
+            {"shape": shape, "count": stats.count, "total_ms": round(stats.total_ms, 2)}
+            for shape, stats in sorted(self.shapes.items(), key=lambda item: -item[1].count)
+            if stats.count >= threshold
+        ]
+
+    def slowest_statements(self) -> List[Dict[str, Any]]:
+        return [
+            {"statement": statement, "ms": round(ms, 2)}
+            for ms, _, statement in sorted(self.slowest, reverse=True)
+        ]
+
+    def server_timing(self, total_ms: Optional[float] = None) -> str:
+        """Server-Timing header value (shown in the browser's network panel)"""
+        metrics = [f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"']
+        if total_ms is not None:
+            metrics.append(f"app;dur={max(total_ms - self.db_ms, 0.0):.1f}")
+            metrics.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(metrics)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record statements on the active profile (sync engine; async engines: .sync_engine)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and current_profile.get() is not None:
+            context._profiler_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        start = getattr(context, "_profiler_start", None)
+        if profile is not None and start is not None:
+            profile.record(statement, (time.perf_counter() - start) * 1000)
+
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    queries: int = 0
+    max_queries: int = 0
+    db_ms: float = 0.0
+    max_db_ms: float = 0.0
+    total_ms: float = 0.0
+    n_plus_one_requests: int = 0
+    repeated_shapes: Dict[str, int] = field(default_factory=dict)  # shape -> max count in one request
+
+    def to_dict(self, route: str) -> Dict[str, Any]:
+        requests = self.requests or 1
+        return {
+            "route": route,
+            "requests": self.requests,
+            "avg_queries": round(self.queries / requests, 1),
+            "max_queries": self.max_queries,
+            "avg_db_ms": round(self.db_ms / requests, 2),
+            "max_db_ms": round(self.max_db_ms, 2),
+            "avg_total_ms": round(self.total_ms / requests, 2),
+            "n_plus_one_requests": self.n_plus_one_requests,
+            "repeated_shapes": [
+                {"shape": shape, "max_count": count}
+                for shape, count in sorted(self.repeated_shapes.items(), key=lambda item: -item[1])
+            ],
+        }
+
+
+ROUTE_SORT_KEYS = {
+    "db_time": lambda stats: stats.db_ms / (stats.requests or 1),
+    "queries": lambda stats: stats.queries / (stats.requests or 1),
+    "n_plus_one": lambda stats: stats.n_plus_one_requests,
+    "total": lambda stats: stats.db_ms,
+}
+
+
+class ProfileRegistry:
+    """Per-route aggregates of finished request profiles (process-local)"""
+
+    def __init__(self, max_routes: int = 1000, max_shapes: int = 10):
+        self.max_routes = max_routes
+        self.max_shapes = max_shapes
+        self._routes: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, profile: QueryProfile, total_ms: float, repeated: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                if len(self._routes) >= self.max_routes:
+                    return
+                stats = self._routes[route] = RouteStats()
+            stats.requests += 1
+            stats.queries += profile.queries
+            stats.max_queries = max(stats.max_queries, profile.queries)
+            stats.db_ms += profile.db_ms
+            stats.max_db_ms = max(stats.max_db_ms, profile.db_ms)
+            stats.total_ms += total_ms
+            if repeated:
+                stats.n_plus_one_requests += 1
+                for item in repeated:
+                    shape = item["shape"]
+                    stats.repeated_shapes[shape] = max(stats.repeated_shapes.get(shape, 0), item["count"])
+                if len(stats.repeated_shapes) > self.max_shapes:
+                    keep = sorted(stats.repeated_shapes.items(), key=lambda entry: -entry[1])[:self.max_shapes]
+                    stats.repeated_shapes = dict(keep)
+
+    def worst(self, sort: str = "db_time", limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Routes ordered by a cost measure
+
+        Args:
+            sort: One of ROUTE_SORT_KEYS
+            limit: Max routes returned
+        """
+        key = ROUTE_SORT_KEYS[sort]
+        with self._lock:
+            ranked = sorted(self._routes.items(), key=lambda item: key(item[1]), reverse=True)[:limit]
+            return [stats.to_dict(route) for route, stats in ranked]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+registry = ProfileRegistry()
@@ -0,0 +1,93 @@
+"""
+Server-Sent Events helpers for streaming chat responses
+
+Event stream contract used by all chat endpoints:
+- token:   {"text": "..."}               incremental response text
+- action:  {"type": "...", "data": {...}} structured result (invoice card,
+                                          pending confirmation, queue items)
+- done:    {...}                          final response, same shape as the
+                                          non-streaming endpoint
+- error:   {"message": "..."}
+"""
+import asyncio
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+# Emitter callback passed into services: await emit("action", {...})
+EventEmitter = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+}
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (Decimal, UUID)):
+        return str(obj)
+    return str(obj)
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode one SSE frame"""
+    payload = json.dumps(data, default=_json_default, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def stream_events(
+    producer: Callable[[EventEmitter], Awaitable[Optional[Dict[str, Any]]]],
+) -> AsyncIterator[str]:
+    """
+    Run producer(emit) in a task and yield its events as SSE frames
+
+    The producer's return value is sent as the final "done" event.
+    Exceptions are reported as an "error" event instead of breaking the
+    stream mid-response. If the client disconnects, the producer is cancelled.
+    """
+    queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+    async def emit(event: str, data: Dict[str, Any]) -> None:
+        await queue.put(format_sse(event, data))
+
+    async def run() -> None:
+        try:
+            result = await producer(emit)
+            await queue.put(format_sse("done", result or {}))
+        except Exception as e:
+            logger.error(f"Error in event stream: {e}", exc_info=True)
+            await queue.put(format_sse("error", {"message": str(e)}))
+        finally:
+            await queue.put(None)
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            frame = await queue.get()
+            if frame is None:
+                break
+            yield frame
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def sse_response(
+    producer: Callable[[EventEmitter], Awaitable[Optional[Dict[str, Any]]]],
+) -> StreamingResponse:
+    """StreamingResponse for an event producer (see stream_events)"""
+    return StreamingResponse(
+        stream_events(producer),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Audit archival cron job
+
+Exports the audit rows of fiscal years that every client has closed to
+compressed, checksummed files (AUDIT_ARCHIVE_PATH) and detaches the year's
+partitions from audit_trail, voucher_audit_log and task_audit_log into the
+audit_archive schema.
+Should be scheduled via cron:
+  0 3 1 * * cd /path/to/backend && python scripts/archive_audit_years.py >> logs/audit_archive_cron.log 2>&1
+
+Pass years as arguments to archive specific (closed) years only.
+
+The detached partitions are kept. Once the archive files of a year are
+copied to retention storage, drop them explicitly (never from cron):
+  python scripts/archive_audit_years.py --drop 2023
+"""
+
+import asyncio
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import AsyncSessionLocal
+from app.services.audit_archive import AuditArchiveError, closed_years, get_audit_archive
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def run_archive(requested):
+    """Main cron job function"""
+    logger.info("=" * 60)
+    logger.info(f"Starting audit archive job at {datetime.now()}")
+    logger.info("=" * 60)
+    
+    archive = get_audit_archive()
+    failed = False
+    
+    async with AsyncSessionLocal() as db:
+        closed = await closed_years(db)
+        await db.commit()
+        
+        years = [year for year in closed if year not in archive.years()]
+        if requested:
+            not_closed = sorted(set(requested) - set(closed))
+            if not_closed:
+                logger.warning(f"⚠️  Skipping years that are not closed for all clients: {not_closed}")
+            years = [year for year in years if year in requested]
+        
+        if not years:
+            logger.info("Nothing to archive")
+        
+        for year in years:
+            try:
+                manifest = await archive.archive_year(db, year)
+                rows = sum(entry["rows"] for entry in manifest["tables"].values())
+                logger.info(f"✅ Archived {year}: {rows} audit rows")
+            except AuditArchiveError as e:
+                failed = True
+                logger.error(f"❌ Archiving {year} failed: {e}")
+    
+    logger.info("=" * 60)
+    return failed
+
+
+async def run_drop(years):
+    """Drop the kept partitions of archived years"""
+    archive = get_audit_archive()
+    failed = False
+    
+    async with AsyncSessionLocal() as db:
+        for year in years:
+            try:
+                dropped = await archive.drop_archived_year(db, year)
+                logger.info(f"🗑️  Dropped {len(dropped)} archived partitions of {year}")
+            except AuditArchiveError as e:
+                failed = True
+                await db.rollback()
+                logger.error(f"❌ Dropping {year} failed: {e}")
+    
+    return failed
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--drop"]:
+        if len(args) < 2:
+            sys.exit("Usage: archive_audit_years.py --drop YEAR [YEAR ...]")
+        failed = asyncio.run(run_drop([int(arg) for arg in args[1:]]))
+    else:
+        failed = asyncio.run(run_archive([int(arg) for arg in args]))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Install Skatteetaten's SAF-T Financial XSD (v1.30)
+
+Downloads the schema the SAF-T export is validated against into
+app/resources/saft/ (or the given path). The download must parse as an
+XML Schema before it replaces the installed file.
+
+Usage:
+  python scripts/fetch_saft_xsd.py [--url URL] [--output PATH]
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+import httpx
+from lxml import etree
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.saft_export import BUNDLED_XSD_PATH, SAFT_XSD_FILENAME
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SAFT_XSD_URL = f"https://raw.githubusercontent.com/Skatteetaten/saf-t/master/{SAFT_XSD_FILENAME}"
+
+
+def fetch_xsd(url: str, output: str) -> None:
+    response = httpx.get(url, timeout=60.0, follow_redirects=True)
+    response.raise_for_status()
+    etree.XMLSchema(etree.fromstring(response.content))  # raises if it is not a schema
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    partial = output + ".part"
+    with open(partial, "wb") as f:
+        f.write(response.content)
+    os.replace(partial, output)
+    logger.info(f"Installed SAF-T XSD from {url} at {output} ({len(response.content)} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=SAFT_XSD_URL)
+    parser.add_argument("--output", default=str(BUNDLED_XSD_PATH))
+    args = parser.parse_args()
+
+    try:
+        fetch_xsd(args.url, args.output)
+    except (httpx.HTTPError, etree.XMLSchemaParseError, etree.XMLSyntaxError) as e:
+        logger.error(f"Could not install the SAF-T XSD: {e}")
+        sys.exit(1)
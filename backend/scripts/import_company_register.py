@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Enhetsregisteret bulk import
+
+Loads the full Enhetsregisteret dataset into the local company register
+(company_register), so company search and org number lookups do not go
+to the Brønnøysund API. Download the CSV (enheter_alle.csv.gz) from
+https://data.brreg.no/enhetsregisteret/oppslag/enheter/lastned and run
+nightly via cron:
+  0 4 * * * cd /path/to/backend && python scripts/import_company_register.py /data/enheter_alle.csv.gz >> logs/company_register_cron.log 2>&1
+
+Usage:
+  python scripts/import_company_register.py <enheter_alle.csv[.gz]>
+"""
+
+import asyncio
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.company_register import import_register
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def run_import(path: str):
+    """Main cron job function"""
+    logger.info("=" * 60)
+    logger.info(f"Starting company register import from {path} at {datetime.now()}")
+    logger.info("=" * 60)
+
+    stats = await import_register(path)
+
+    logger.info(f"   Imported: {stats['imported']}  Skipped: {stats['skipped']}  Removed: {stats['removed']}")
+    logger.info("=" * 60)
+    return stats
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(2)
+
+    asyncio.run(run_import(sys.argv[1]))
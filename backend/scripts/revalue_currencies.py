@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Year-end foreign currency revaluation job
+
+Revalues open foreign-currency supplier and customer items of every client
+of a tenant at the closing rate and posts agio/disagio vouchers (reversed
+on the following day). Should be scheduled via cron after the year-end
+rates are in:
+  0 3 2 1 * cd /path/to/backend && python scripts/revalue_currencies.py <tenant_id> >> logs/revaluation_cron.log 2>&1
+
+Usage:
+  python scripts/revalue_currencies.py <tenant_id> [YYYY-MM-DD] [--preview]
+"""
+
+import asyncio
+import sys
+import os
+from datetime import date, datetime
+from uuid import UUID
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import AsyncSessionLocal
+from app.services.currency_revaluation import CurrencyRevaluationService
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def previous_year_end() -> date:
+    return date(date.today().year - 1, 12, 31)
+
+
+async def run_revaluation(tenant_id: UUID, as_of_date: date, preview: bool = False):
+    """Main cron job function"""
+    logger.info("=" * 60)
+    logger.info(f"Starting currency revaluation {'preview ' if preview else ''}at {datetime.now()}")
+    logger.info("=" * 60)
+
+    async with AsyncSessionLocal() as db:
+        service = CurrencyRevaluationService(db)
+        if preview:
+            result = await service.preview(as_of_date, tenant_id=tenant_id)
+        else:
+            result = await service.post(as_of_date, tenant_id=tenant_id, created_by_type="ai_agent")
+
+    logger.info(f"Revaluation pr. {result['as_of_date']}: {result['item_count']} open items, "
+                f"{result['client_count']} clients")
+    logger.info(f"   Agio: {result['total_agio']:.2f}  Disagio: {result['total_disagio']:.2f}  "
+                f"Net: {result['net_gain_loss']:.2f}")
+    logger.info(f"   Timings: {result['timings']}")
+    for currency, count in result["missing_rates"]["closing_rate"].items():
+        logger.warning(f"   ⚠️  No closing rate for {currency}: {count} items not revalued")
+    if result["missing_rates"]["invoice_date_rate"]:
+        logger.warning(f"   ⚠️  {result['missing_rates']['invoice_date_rate']} items without an invoice-date rate")
+    if not preview:
+        logger.info(f"   Vouchers posted: {len(result['vouchers'])}, "
+                    f"clients already revalued: {len(result['skipped_clients'])}")
+
+    logger.info("=" * 60)
+    return result
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--preview"]
+    if not args:
+        print(__doc__)
+        sys.exit(2)
+
+    as_of = date.fromisoformat(args[1]) if len(args) > 1 else previous_year_end()
+    asyncio.run(run_revaluation(UUID(args[0]), as_of, preview="--preview" in sys.argv))
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tenant-wide month-end close cron job
+
+Closes the previous month for every active client of a tenant, several
+clients in parallel (PERIOD_CLOSE_CONCURRENCY). Should be scheduled via cron:
+  0 1 1 * * cd /path/to/backend && python scripts/run_period_close.py <tenant_id> >> logs/period_close_cron.log 2>&1
+
+Usage:
+  python scripts/run_period_close.py <tenant_id> [YYYY-MM]
+  python scripts/run_period_close.py --resume <job_id>
+"""
+
+import asyncio
+import sys
+import os
+from datetime import date, datetime, timedelta
+from uuid import UUID
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import AsyncSessionLocal
+from app.services.period_close_jobs import create_period_close_job, run_period_close_job
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def previous_period() -> str:
+    return (date.today().replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+
+
+async def run_close(tenant_id=None, period=None, job_id=None):
+    """Main cron job function"""
+    logger.info("=" * 60)
+    logger.info(f"Starting period close job at {datetime.now()}")
+    logger.info("=" * 60)
+
+    if job_id is None:
+        async with AsyncSessionLocal() as db:
+            job = await create_period_close_job(db, tenant_id, period or previous_period())
+            job_id = job.id
+
+    progress = await run_period_close_job(job_id)
+
+    logger.info(f"Job {job_id} ({progress['period']}): {progress['status']}")
+    logger.info(f"   Clients: {progress['progress']['by_status']}")
+    for step, timing in progress["step_timings"].items():
+        logger.info(f"   {step}: avg {timing['avg_ms']} ms, max {timing['max_ms']} ms")
+    for failure in progress["failed"]:
+        logger.error(f"   ❌ Client {failure['client_id']}: {failure['error']}")
+    if progress["failed"]:
+        logger.info(f"   Resume with: python scripts/run_period_close.py --resume {job_id}")
+
+    logger.info("=" * 60)
+    return progress
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        sys.exit(2)
+
+    if args[0] == "--resume":
+        progress = asyncio.run(run_close(job_id=UUID(args[1])))
+    else:
+        progress = asyncio.run(run_close(UUID(args[0]), args[1] if len(args) > 1 else None))
+    sys.exit(1 if progress["failed"] else 0)
@@ -44,7 +44,8 @@ async def seed_voucher_series(session, client_id: str) -> int:
         result = await session.execute(
             select(VoucherSeries).where(
                 VoucherSeries.client_id == client_id,
-                VoucherSeries.code == series["code"]
+                VoucherSeries.code == series["code"],
+                VoucherSeries.fiscal_year.is_(None)
             )
         )
         existing = result.scalar_one_or_none()
@@ -123,6 +123,15 @@ pip install -q --upgrade pip
 pip install -q -r requirements.txt
 echo -e "${GREEN}✅ Dependencies installed${NC}"
 
+# SAF-T export validation schema
+echo ""
+echo "📄 Installing SAF-T XSD..."
+if python scripts/fetch_saft_xsd.py; then
+    echo -e "${GREEN}✅ SAF-T XSD installed${NC}"
+else
+    echo -e "${YELLOW}⚠️  SAF-T XSD not installed - validated SAF-T exports are refused until scripts/fetch_saft_xsd.py succeeds${NC}"
+fi
+
 # Check if .env exists
 echo ""
 echo "⚙️  Checking environment configuration..."
@@ -0,0 +1,77 @@
+"""
+Unit Tests for set-based accrual posting
+Run with: pytest tests/services/test_accrual_batch.py -v
+"""
+
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from app.services.accrual_batch import AccrualBatchPoster, PlannedPosting, summarize_plan
+
+
+def _posting(client_id, amount="1000.00", posting_date=date(2026, 1, 31)):
+    return PlannedPosting(
+        posting_id=uuid4(),
+        accrual_id=uuid4(),
+        client_id=client_id,
+        posting_date=posting_date,
+        period=posting_date.strftime("%Y-%m"),
+        amount=Decimal(amount),
+        result_account="6300",
+        balance_account="1580",
+        description="Husleie",
+        voucher_number="2026-0001",
+    )
+
+
+def test_summarize_plan():
+    client_a, client_b = uuid4(), uuid4()
+    summary = summarize_plan([_posting(client_a), _posting(client_a, "500.50"), _posting(client_b, "250.00")])
+
+    assert summary["posting_count"] == 3
+    assert summary["total_amount"] == 1750.5
+    assert summary["by_client"][str(client_a)] == {"posting_count": 2, "total_amount": 1500.5}
+    assert summary["by_client"][str(client_b)] == {"posting_count": 1, "total_amount": 250.0}
+
+
+def test_summarize_empty_plan():
+    assert summarize_plan([]) == {"posting_count": 0, "total_amount": 0.0, "by_client": {}}
+
+
+class TestBuildRows:
+    def test_balanced_entry_per_posting(self):
+        poster = AccrualBatchPoster(db=None)
+        planned = [_posting(uuid4()), _posting(uuid4(), "99.99")]
+
+        entries, lines, posted = poster._build_rows(planned, "ai_agent")
+
+        assert len(entries) == 2 and len(lines) == 4 and len(posted) == 2
+        for entry in entries:
+            entry_lines = [line for line in lines if line["general_ledger_id"] == entry["id"]]
+            assert sum(line["debit_amount"] for line in entry_lines) == sum(line["credit_amount"] for line in entry_lines)
+            assert entry["voucher_series"] == "P"
+            assert entry["source_type"] == "accrual"
+
+    def test_lines_carry_denormalized_entry_fields(self):
+        client_id = uuid4()
+        poster = AccrualBatchPoster(db=None)
+
+        entries, lines, _ = poster._build_rows([_posting(client_id, posting_date=date(2025, 12, 31))], "user")
+
+        for line in lines:
+            assert line["client_id"] == client_id
+            assert line["accounting_date"] == date(2025, 12, 31)
+            assert line["fiscal_year"] == 2025
+            assert line["status"] == "posted"
+        assert {line["account_number"] for line in lines} == {"6300", "1580"}
+
+    def test_posting_updates_link_gl_entry(self):
+        planned = [_posting(uuid4())]
+
+        entries, _, posted = AccrualBatchPoster(db=None)._build_rows(planned, "user")
+
+        assert posted[0]["id"] == planned[0].posting_id
+        assert posted[0]["general_ledger_id"] == entries[0]["id"] == planned[0].general_ledger_id
+        assert posted[0]["status"] == "posted"
+        assert planned[0].to_dict()["gl_entry_id"] == str(entries[0]["id"])
@@ -0,0 +1,217 @@
+"""
+Unit Tests for audit partition naming and reading archived audit years
+Run with: pytest tests/services/test_audit_archive.py -v
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.models.voucher_audit_log import AuditAction, PerformedBy, VoucherAuditLog
+from app.services.audit_archive import (
+    ARCHIVE_SCHEMA,
+    AUDIT_TABLES,
+    MANIFEST,
+    AuditArchive,
+    AuditArchiveError,
+    _sha256,
+    after_cursor,
+    ensure_audit_partitions,
+    month_bounds,
+    next_month,
+    partition_name,
+)
+from app.utils.audit import _json_default
+
+
+def write_archive(root, year, table_name, rows):
+    """Archive files as archive_year() writes them"""
+    directory = os.path.join(root, str(year))
+    os.makedirs(directory)
+    path = os.path.join(directory, f"{table_name}.jsonl.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, default=_json_default) + "\n")
+    manifest = {
+        "year": year,
+        "tables": {table_name: {"file": f"{table_name}.jsonl.gz", "rows": len(rows), "sha256": _sha256(path)}},
+    }
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+    return path
+
+
+def voucher_log(**values):
+    row = {
+        "id": uuid4(),
+        "voucher_id": uuid4(),
+        "voucher_type": "supplier_invoice",
+        "action": AuditAction.APPROVED,
+        "performed_by": PerformedBy.ACCOUNTANT,
+        "timestamp": datetime(2024, 3, 1, 12, 0),
+        "details": {"notes": "ok"},
+    }
+    row.update(values)
+    return row
+
+
+class RecordingConnection:
+    """Records SQL; to_regclass() finds the tables in `existing`"""
+
+    def __init__(self, existing=(), created_while_waiting=()):
+        self.existing = set(existing)
+        self.created_while_waiting = set(created_while_waiting)
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if sql.startswith("LOCK TABLE"):
+            # Another worker created these while this one waited for the lock
+            self.existing |= self.created_while_waiting
+        if "to_regclass" in sql:
+            return SimpleNamespace(scalar=lambda: params["name"] if params["name"] in self.existing else None)
+        return None
+
+    async def commit(self):
+        self.statements.append("COMMIT")
+
+    async def rollback(self):
+        self.statements.append("ROLLBACK")
+
+
+def year_partitions(year):
+    return [
+        partition_name(model.__tablename__, year, month)
+        for model in AUDIT_TABLES for month in range(1, 13)
+    ]
+
+
+async def archive_with_stub_export(tmp_path, year):
+    """Run archive_year() with the table export replaced by an empty file"""
+    archive = AuditArchive(str(tmp_path))
+
+    async def export_table(db, model, export_year, directory):
+        path = os.path.join(directory, f"{model.__tablename__}.jsonl.gz")
+        with gzip.open(path, "wt", encoding="utf-8"):
+            pass
+        return {
+            "file": os.path.basename(path),
+            "rows": 0,
+            "sha256": _sha256(path),
+            "partitions": [partition_name(model.__tablename__, export_year, month) for month in range(1, 13)],
+        }
+
+    archive._export_table = export_table
+    db = RecordingConnection(year_partitions(year))
+    await archive.archive_year(db, year)
+    return archive, db
+
+
+class TestPartitions:
+    def test_names_and_bounds(self):
+        assert partition_name("audit_trail", 2024, 3) == "audit_trail_p2024_03"
+        assert month_bounds(2024, 12) == (datetime(2024, 12, 1), datetime(2025, 1, 1))
+        assert next_month(2024, 12) == (2025, 1)
+        assert next_month(2024, 5) == (2024, 6)
+
+    async def test_partition_copies_generated_columns_and_rechecks_under_lock(self):
+        existing = {partition_name(table, 2026, 3) for table in ("voucher_audit_log", "task_audit_log")}
+        db = RecordingConnection(existing, created_while_waiting={"task_audit_log_p2026_04"})
+
+        created = await ensure_audit_partitions(db, [(2026, 3), (2026, 4)])
+
+        assert created == ["audit_trail_p2026_03", "audit_trail_p2026_04", "voucher_audit_log_p2026_04"]
+        creates = [sql for sql in db.statements if sql.startswith("CREATE TABLE")]
+        assert all("INCLUDING GENERATED" in sql for sql in creates)
+        move = next(sql for sql in db.statements if "INSERT INTO audit_trail_p2026_03" in sql)
+        assert "SELECT *" not in move and "RETURNING *" not in move
+        assert '"search_vector"' not in move and '"changed_by_name"' in move
+        # Nothing is locked when every partition exists
+        db = RecordingConnection(existing | {"audit_trail_p2026_03"})
+        assert await ensure_audit_partitions(db, [(2026, 3)]) == []
+        assert not any(sql.startswith("LOCK") for sql in db.statements)
+
+
+class TestAuditArchive:
+    def test_load_restores_column_types(self, tmp_path):
+        rows = [voucher_log(), voucher_log(action=AuditAction.REJECTED)]
+        write_archive(str(tmp_path), 2024, "voucher_audit_log", rows)
+        archive = AuditArchive(str(tmp_path))
+
+        loaded = archive.load(VoucherAuditLog, [2024])
+
+        assert [log.id for log in loaded] == [row["id"] for row in rows]
+        assert loaded[1].action is AuditAction.REJECTED
+        assert loaded[0].timestamp == datetime(2024, 3, 1, 12, 0)
+        assert loaded[0].details == {"notes": "ok"}
+
+        rejected = archive.load(VoucherAuditLog, [2024], where=lambda log: log.action == AuditAction.REJECTED)
+        assert [log.id for log in rejected] == [rows[1]["id"]]
+
+    def test_years_require_a_manifest(self, tmp_path):
+        write_archive(str(tmp_path), 2023, "voucher_audit_log", [voucher_log()])
+        write_archive(str(tmp_path), 2024, "voucher_audit_log", [voucher_log()])
+        os.makedirs(tmp_path / "2025.tmp")
+        os.makedirs(tmp_path / "2022")
+        archive = AuditArchive(str(tmp_path))
+
+        assert archive.years() == [2023, 2024]
+        assert archive.years_between(datetime(2024, 1, 1).date()) == [2024]
+        assert archive.years_between(None, datetime(2023, 6, 30).date()) == [2023]
+        assert AuditArchive(str(tmp_path / "missing")).years() == []
+
+    def test_checksum_mismatch(self, tmp_path):
+        path = write_archive(str(tmp_path), 2024, "voucher_audit_log", [voucher_log()])
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            f.write("{}\n")
+
+        with pytest.raises(AuditArchiveError):
+            AuditArchive(str(tmp_path)).load(VoucherAuditLog, [2024])
+
+    def test_missing_year(self, tmp_path):
+        with pytest.raises(AuditArchiveError):
+            AuditArchive(str(tmp_path)).load(VoucherAuditLog, [2024])
+
+    async def test_archive_year_keeps_detached_partitions(self, tmp_path):
+        archive, db = await archive_with_stub_export(tmp_path, 2023)
+
+        assert archive.years() == [2023]
+        assert not any(sql.startswith("DROP") for sql in db.statements)
+        assert f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}" in db.statements
+        for partition in year_partitions(2023):
+            assert f"ALTER TABLE {partition} SET SCHEMA {ARCHIVE_SCHEMA}" in db.statements
+        assert db.statements[-1] == "COMMIT"
+
+    async def test_drop_archived_year_is_explicit_and_checks_the_files(self, tmp_path):
+        archive, _ = await archive_with_stub_export(tmp_path, 2023)
+        kept = [f"{ARCHIVE_SCHEMA}.{partition}" for partition in year_partitions(2023)]
+
+        with open(os.path.join(archive.year_dir(2023), "audit_trail.jsonl.gz"), "ab") as f:
+            f.write(b"damaged")
+        db = RecordingConnection(kept)
+        with pytest.raises(AuditArchiveError):
+            await archive.drop_archived_year(db, 2023)
+        assert db.statements == []
+
+        with pytest.raises(AuditArchiveError):
+            await archive.drop_archived_year(RecordingConnection(kept), 2022)
+
+        archive, _ = await archive_with_stub_export(tmp_path / "intact", 2023)
+        db = RecordingConnection(kept[1:])
+        dropped = await archive.drop_archived_year(db, 2023)
+        assert dropped == kept[1:]
+        assert [sql for sql in db.statements if sql.startswith("DROP")] == [f"DROP TABLE {name}" for name in kept[1:]]
+
+
+def test_after_cursor():
+    ids = sorted(uuid4() for _ in range(3))
+    rows = [SimpleNamespace(id=row_id, timestamp=datetime(2024, 1, 1)) for row_id in ids]
+
+    assert after_cursor(rows, "timestamp", datetime(2024, 1, 1), ids[1]) == rows[:1]
+    assert after_cursor(rows, "timestamp", datetime(2024, 1, 1), ids[1], descending=False) == rows[2:]
@@ -0,0 +1,188 @@
+"""
+Unit Tests for the buffered audit writer and the out-of-band audit spool
+Run with: pytest tests/services/test_audit_buffer.py -v
+"""
+
+import json
+import os
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, String, create_engine, event, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, declarative_base
+
+from app.models.audit_trail import AuditTrail
+from app.models.task_audit_log import TaskAuditAction, TaskAuditLog
+from app.utils import audit
+from app.utils.audit import AuditBuffer, AuditSpool, record_audit
+
+LocalBase = declarative_base()
+
+
+class Event(LocalBase):
+    __tablename__ = "test_audit_events"
+
+    id = Column(Integer, primary_key=True)
+    action = Column(String(50), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    LocalBase.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def count_events(session):
+    return session.execute(select(func.count()).select_from(Event)).scalar()
+
+
+class TestTransactionBuffer:
+    def test_rows_are_written_at_commit(self, session):
+        statements = []
+
+        @event.listens_for(session.get_bind(), "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT"):
+                statements.append(statement)
+
+        for i in range(5):
+            record_audit(session, Event, id=i + 1, action="booked")
+        assert count_events(session) == 0
+
+        session.commit()
+
+        assert count_events(session) == 5
+        assert len(statements) == 1  # one multi-row INSERT
+
+    def test_rollback_discards_rows(self, session):
+        record_audit(session, Event, id=1, action="booked")
+        session.rollback()
+        session.commit()
+
+        assert count_events(session) == 0
+
+
+class TestAuditBuffer:
+    def test_fills_python_defaults(self):
+        buffer = AuditBuffer()
+        row = buffer.add(TaskAuditLog.__table__, {"task_id": uuid4(), "action": TaskAuditAction.CREATED})
+
+        assert isinstance(row["id"], UUID)
+        assert isinstance(row["created_at"], datetime)
+        assert len(buffer) == 1
+
+    def test_insert_is_chunked_by_parameter_count(self, monkeypatch):
+        class Recorder:
+            def __init__(self):
+                self.statements = []
+
+            def execute(self, statement):
+                self.statements.append(statement)
+
+        monkeypatch.setattr(audit, "MAX_INSERT_PARAMS", 30)
+        buffer = AuditBuffer()
+        for i in range(25):
+            buffer.add(Event.__table__, {"id": i, "action": "x"})  # 3 columns with created_at
+        recorder = Recorder()
+
+        assert buffer.write(recorder) == 25
+        assert len(recorder.statements) == 3  # 10 rows per statement
+        assert len(buffer) == 0
+
+
+def test_spool_round_trip(tmp_path):
+    spool = AuditSpool(str(tmp_path / "spool.jsonl"))
+    client_id = uuid4()
+
+    line = json.dumps({"table": "audit_trail", "values": {"client_id": str(client_id), "action": "parsed"}})
+    spool._append(line + "\n")
+    spool._append("not json\n")
+
+    draining = spool._take()
+    with open(draining) as f:
+        entries = [json.loads(line) for line in f if line.startswith("{")]
+    row = audit._from_json(AuditTrail.__table__, entries[0]["values"])
+
+    assert row == {"client_id": client_id, "action": "parsed"}
+    assert spool._take() == draining  # kept until a drain succeeds
+
+
+async def test_spool_append_serializes_defaults(tmp_path):
+    spool = AuditSpool(str(tmp_path / "spool.jsonl"))
+
+    row = await spool.append(AuditTrail, record_id=uuid4(), action="task_created", changed_by_type="ai_agent")
+
+    with open(spool.path) as f:
+        entry = json.loads(f.readline())
+    values = audit._from_json(AuditTrail.__table__, entry["values"])
+    assert entry["table"] == "audit_trail"
+    assert values["record_id"] == row["record_id"]
+    assert values["timestamp"] == row["timestamp"]
+
+
+def unused_pid():
+    pid = 4_000_000
+    while audit._pid_alive(pid):
+        pid += 1
+    return pid
+
+
+def test_spool_is_claimed_once_across_processes(tmp_path, monkeypatch):
+    spool = AuditSpool(str(tmp_path / "spool.jsonl"))
+    spool._append('{"table": "audit_trail", "values": {}}\n')
+
+    monkeypatch.setattr(audit.os, "getpid", lambda: 1)  # a live process
+    claimed = spool._take()
+    assert claimed == spool.path + ".1.draining"
+
+    # Another worker gets nothing: the live spool is gone and the claim's owner runs
+    monkeypatch.setattr(audit.os, "getpid", lambda: 2)
+    assert spool._take() is None
+
+    # Appends after the claim go to a new spool file
+    spool._append('{"table": "audit_trail", "values": {}}\n')
+    with open(claimed) as f:
+        assert len(f.readlines()) == 1
+    with open(spool.path) as f:
+        assert len(f.readlines()) == 1
+
+
+def test_claim_of_a_dead_worker_is_taken_over(tmp_path):
+    spool = AuditSpool(str(tmp_path / "spool.jsonl"))
+    abandoned = spool._claim_path(unused_pid())
+    with open(abandoned, "w") as f:
+        f.write('{"table": "audit_trail", "values": {}}\n')
+
+    assert spool._take() == spool._claim_path()
+    assert not (tmp_path / abandoned).exists()
+
+
+async def test_drain_skips_rows_already_loaded(tmp_path):
+    class Database:
+        def __init__(self):
+            self.statements = []
+
+        async def run_sync(self, fn):
+            return fn(self)
+
+        def execute(self, statement):
+            self.statements.append(statement)
+
+        async def commit(self):
+            # Another worker cleaned up the claim (e.g. after taking it over)
+            os.remove(spool._claim_path())
+
+    spool = AuditSpool(str(tmp_path / "spool.jsonl"))
+    row = await spool.append(AuditTrail, record_id=uuid4(), action="task_created", changed_by_type="ai_agent")
+    db = Database()
+
+    assert await spool.drain(db) == 1
+
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert sql.endswith("ON CONFLICT DO NOTHING")
+    assert db.statements[0].compile().params["id_m0"] == row["id"]
@@ -0,0 +1,136 @@
+"""
+Unit Tests for bulk review queue approval (in-memory steps)
+Run with: pytest tests/services/test_bulk_approval.py -v
+"""
+
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.general_ledger import set_line_entry_fields
+from app.models.review_queue import ReviewQueue, ReviewStatus
+from app.models.vendor import Vendor
+from app.models.vendor_invoice import VendorInvoice
+from app.services.bulk_approval_service import BulkApprovalResult, BulkApprovalService
+
+
+def make_item(client_id, invoice, status=ReviewStatus.PENDING, suggestion=None):
+    return ReviewQueue(
+        id=uuid4(),
+        client_id=client_id,
+        source_type="vendor_invoice",
+        source_id=invoice.id,
+        status=status,
+        ai_suggestion=suggestion if suggestion is not None else {"account": "6300"},
+    )
+
+
+def make_invoice(client_id, **overrides):
+    values = dict(
+        id=uuid4(),
+        client_id=client_id,
+        vendor_id=uuid4(),
+        invoice_number="INV-100",
+        invoice_date=date(2026, 2, 14),
+        due_date=date(2026, 3, 14),
+        amount_excl_vat=Decimal("800.00"),
+        vat_amount=Decimal("200.00"),
+        total_amount=Decimal("1000.00"),
+        currency="NOK",
+    )
+    values.update(overrides)
+    invoice = VendorInvoice(**values)
+    invoice.vendor = Vendor(id=invoice.vendor_id, client_id=client_id, name="Kontorservice AS")
+    return invoice
+
+
+class TestPrepare:
+    def setup_method(self):
+        self.service = BulkApprovalService(db=None)
+        self.client_id = uuid4()
+
+    def test_builds_balanced_voucher_with_suggested_account(self):
+        invoice = make_invoice(self.client_id)
+        prepared, error = self.service._prepare(make_item(self.client_id, invoice), invoice)
+
+        assert error is None
+        assert [line.account_number for line in prepared.lines] == ["6300", "2740", "2400"]
+        assert prepared.accounting_date == date(2026, 2, 14)
+
+    def test_rejects_non_pending_and_posted_items(self):
+        invoice = make_invoice(self.client_id)
+        _, error = self.service._prepare(
+            make_item(self.client_id, invoice, status=ReviewStatus.APPROVED), invoice
+        )
+        assert error == "Item already approved"
+
+        posted = make_invoice(self.client_id, general_ledger_id=uuid4())
+        _, error = self.service._prepare(make_item(self.client_id, posted), posted)
+        assert "already posted" in error
+
+    def test_rejects_invoice_of_other_client(self):
+        invoice = make_invoice(uuid4())
+        _, error = self.service._prepare(make_item(self.client_id, invoice), invoice)
+
+        assert "another client" in error
+
+    def test_foreign_currency_invoice_booked_in_nok(self):
+        invoice = make_invoice(
+            self.client_id, currency="EUR", amount_excl_vat=Decimal("80.00"),
+            vat_amount=Decimal("20.00"), total_amount=Decimal("100.00"),
+        )
+        prepared, error = self.service._prepare(
+            make_item(self.client_id, invoice), invoice, exchange_rate=Decimal("11.733")
+        )
+
+        assert error is None
+        assert [line.debit_amount for line in prepared.lines[:2]] == [Decimal("938.64"), Decimal("234.66")]
+        assert prepared.lines[2].credit_amount == Decimal("1173.30")
+
+    def test_foreign_currency_invoice_without_rate(self):
+        invoice = make_invoice(self.client_id, currency="USD")
+        _, error = self.service._prepare(make_item(self.client_id, invoice), invoice)
+
+        assert error == "No USD exchange rate on or before 2026-02-14"
+
+    def test_item_without_suggestion_is_approved_without_booking(self):
+        invoice = make_invoice(self.client_id)
+        prepared, error = self.service._prepare(make_item(self.client_id, invoice, suggestion={}), invoice)
+
+        assert prepared is None
+        assert error is None
+
+
+def test_build_voucher_lines_carry_entry_columns():
+    class Session:
+        def __init__(self):
+            self.added = []
+
+        def add(self, obj):
+            self.added.append(obj)
+
+    service = BulkApprovalService(db=None)
+    service.db = Session()
+    client_id = uuid4()
+    invoice = make_invoice(client_id)
+    prepared, _ = service._prepare(make_item(client_id, invoice), invoice)
+
+    entry, lines = service._build_voucher(prepared, "2026-0007", user_id=None)
+    for line in lines:
+        set_line_entry_fields(None, None, line)
+
+    assert service.db.added == [entry]
+    assert entry.voucher_number == "2026-0007"
+    assert entry.fiscal_year == 2026
+    assert sum(line.debit_amount for line in lines) == sum(line.credit_amount for line in lines)
+    assert {line.fiscal_year for line in lines} == {2026}
+    assert {line.client_id for line in lines} == {client_id}
+
+
+def test_result_counts():
+    result = BulkApprovalResult()
+    result.ok(uuid4(), voucher_number="2026-0001")
+    result.fail(uuid4(), "Review item not found")
+
+    summary = result.to_dict()
+    assert (summary["requested"], summary["approved"], summary["failed"]) == (2, 1, 1)
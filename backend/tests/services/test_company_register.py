@@ -0,0 +1,134 @@
+"""
+Unit Tests for the local Enhetsregisteret mirror and the cached Brønnøysund lookups
+Run with: pytest tests/services/test_company_register.py -v
+"""
+
+from datetime import date, datetime
+
+import httpx
+import pandas as pd
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import brreg
+from app.services.company_register import name_search_query, record_from_entity, register_records
+from app.services.session_store import InMemorySessionStore
+
+
+def entity(org_number, name="Acme AS"):
+    return {
+        "organisasjonsnummer": org_number,
+        "navn": name,
+        "organisasjonsform": {"kode": "AS", "beskrivelse": "Aksjeselskap"},
+        "forretningsadresse": {
+            "adresse": ["Storgata 1", "3. etasje"], "postnummer": "0150", "poststed": "OSLO",
+            "kommune": "OSLO", "kommunenummer": "0301",
+        },
+        "naeringskode1": {"kode": "62.010", "beskrivelse": "Programmeringstjenester"},
+        "registreringsdatoEnhetsregisteret": "2001-03-14",
+        "antallAnsatte": 12,
+    }
+
+
+@pytest.fixture
+async def live_api(monkeypatch):
+    """Route the shared client to a handler and give each test an empty cache"""
+    store = InMemorySessionStore("brreg-test", default_ttl=60)
+    monkeypatch.setattr(brreg, "cache", store)
+
+    def use(handler):
+        monkeypatch.setattr(brreg, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    yield use
+    await brreg.close_client()
+    await store.close()
+
+
+def test_register_records_from_bulk_csv_chunk():
+    frame = pd.DataFrame({
+        "organisasjonsnummer": ["923609016", "974760673", "12345", "923609016"],
+        "navn": ["Acme AS", "Beta AS", "Kort AS", "Acme Holding AS"],
+        "organisasjonsform.kode": ["AS", "AS", "AS", "AS"],
+        "forretningsadresse.adresse": ["Storgata 1", "", "", "Storgata 2"],
+        "forretningsadresse.postnummer": ["0150", "", "", "0150"],
+        "postadresse.adresse": ["", "Postboks 5", "", ""],
+        "postadresse.postnummer": ["", "5003", "", ""],
+        "registreringsdatoEnhetsregisteret": ["2001-03-14", "", "", "2001-03-14"],
+        "antallAnsatte": ["12", "", "", "13"],
+    })
+    imported_at = datetime(2026, 2, 17, 4, 0)
+    rows = {row["org_number"]: row for row in register_records(frame, imported_at)}
+
+    assert sorted(rows) == ["923609016", "974760673"]
+    # Repeated org number: the last row wins
+    assert rows["923609016"]["name"] == "Acme Holding AS"
+    assert rows["923609016"]["employees"] == 13
+    assert rows["923609016"]["registration_date"] == date(2001, 3, 14)
+    # No business address: postal address
+    assert (rows["974760673"]["address"], rows["974760673"]["postal_code"]) == ("Postboks 5", "5003")
+    assert rows["974760673"]["employees"] is None
+    assert rows["974760673"]["municipality"] is None
+    assert rows["974760673"]["imported_at"] == imported_at
+
+
+def test_name_search_query_uses_the_register_indexes():
+    def sql(term):
+        return str(name_search_query(term, 10).compile(dialect=postgresql.dialect()))
+
+    assert "company_register.org_number = " in sql("923 609 016")
+    assert "lower(company_register.name) LIKE" in sql("GH")
+    trigram = sql("ghb regnskap")
+    assert "company_register.name ILIKE" in trigram
+    assert "ORDER BY similarity(company_register.name" in trigram
+
+
+def test_entity_mapping_keeps_response_shapes():
+    record = record_from_entity(entity("923609016"))
+
+    details = brreg.details_result(record)
+    assert details["address"] == "Storgata 1, 3. etasje"
+    assert details["organizational_form"] == "Aksjeselskap"
+    assert details["registration_date"] == "2001-03-14"
+
+    summary = brreg.search_result(record)
+    assert summary["organizational_form"] == "AS"
+    assert summary["municipality_number"] == "0301"
+
+
+async def test_batch_lookup_is_batched_and_cached(live_api):
+    requests = []
+
+    def handler(request):
+        requested = request.url.params["organisasjonsnummer"].split(",")
+        requests.append(requested)
+        registered = [entity(org_number) for org_number in requested if org_number != "000000000"]
+        return httpx.Response(200, json={"_embedded": {"enheter": registered}})
+
+    live_api(handler)
+
+    org_numbers = [f"{n:09d}" for n in range(1, 251)] + ["000000000", "000000001"]
+    companies = await brreg.get_companies(org_numbers)
+
+    assert [len(batch) for batch in requests] == [100, 100, 51]
+    assert len(companies) == 251
+    assert companies["000000001"]["name"] == "Acme AS"
+    assert companies["000000000"] is None
+
+    # Found and not-found answers are both served from the cache
+    assert await brreg.get_company_details("000000000") is None
+    assert (await brreg.get_company_details("000000042"))["org_number"] == "000000042"
+    assert len(requests) == 3
+
+
+async def test_failed_batch_is_not_cached(live_api):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    live_api(handler)
+
+    assert await brreg.get_companies(["923609016"]) == {"923609016": None}
+    assert await brreg.get_company_details("923609016") is None
+    assert len(calls) == 2
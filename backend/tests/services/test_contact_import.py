@@ -0,0 +1,99 @@
+"""
+Unit Tests for the vectorized contact import (validation, report, upsert SQL)
+Run with: pytest tests/services/test_contact_import.py -v
+"""
+
+import uuid
+
+import pandas as pd
+from sqlalchemy.dialects import postgresql
+
+import app.models  # noqa: F401  (register all mappers)
+from app.services.contact_import import (
+    CUSTOMERS,
+    ORG_NUMBER_CHECKSUM,
+    ORG_NUMBER_LENGTH,
+    SUPPLIERS,
+    contact_records,
+    existing_contacts_query,
+    normalize_emails,
+    normalize_org_numbers,
+    normalize_phones,
+    prepare_contacts,
+    upsert_statement,
+)
+
+
+def uploaded(**columns):
+    """DataFrame as returned by parse_file"""
+    df = pd.DataFrame(columns)
+    return df.where(pd.notnull(df), None)
+
+
+def test_org_numbers_checksum_and_float_cells():
+    values = pd.Series([923609016.0, "974 760 673", "987654321", "12345", None])
+    org_numbers, errors = normalize_org_numbers(values)
+
+    assert org_numbers.tolist()[:2] == ["923609016", "974760673"]
+    assert org_numbers[2:].isna().all()
+    assert errors.fillna("").tolist() == ["", "", ORG_NUMBER_CHECKSUM, ORG_NUMBER_LENGTH, ""]
+
+
+def test_phone_and_email_normalization():
+    assert normalize_phones(pd.Series(["+47 912 34 567", 22001234.0, "-", None])).tolist()[:2] == [
+        "4791234567", "22001234"
+    ]
+    emails, rejected = normalize_emails(pd.Series([" post@firma.no ", "ikke-epost", None]))
+    assert emails[0] == "post@firma.no"
+    assert rejected.tolist() == [False, True, False]
+
+
+def test_supplier_report_has_one_error_per_row():
+    df = uploaded(
+        navn=["Acme AS", None, "Beta AS", "Acme Kopi", "Gamma AS"],
+        org_nummer=["923609016", "974760673", "987654321", "923 609 016", None],
+        postnummer=[150.0, None, "5003", None, None],
+        betalingsbetingelser=["10 dager", None, None, None, None],
+    )
+    contacts, errors, warnings = prepare_contacts(df, SUPPLIERS)
+
+    assert contacts["row"].tolist() == [2]
+    assert contacts.iloc[0]["postal_code"] == "0150"
+    assert contacts.iloc[0]["payment_terms_days"] == 10
+    assert [(e["row"], e["column"]) for e in errors] == [
+        (3, "navn"), (4, "org_nummer"), (5, "org_nummer"), (6, "org_nummer")
+    ]
+    assert "rad 2" in errors[2]["error"]
+    assert warnings == []
+
+
+def test_customers_without_valid_org_number_are_private():
+    df = uploaded(navn=["Kari Nordmann", "Firma AS"], org_nummer=["123", "974760673"], epost=["kari@", None])
+    contacts, errors, warnings = prepare_contacts(df, CUSTOMERS)
+
+    assert errors == []
+    assert [w["column"] for w in warnings] == ["org_nummer", "epost"]
+
+    records = contact_records(contacts, CUSTOMERS, uuid.uuid4(), ["00007", "00008"])
+    assert [r["is_company"] for r in records] == [False, True]
+    assert records[0]["customer_number"] == "00007"
+    assert records[0]["payment_terms_days"] == 14
+    assert "bank_account" not in records[0]
+
+
+def test_upsert_statement_targets_org_number_constraint():
+    skip = str(upsert_statement(SUPPLIERS, update_existing=False).compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT uq_client_supplier_org_number DO NOTHING" in skip
+    assert "RETURNING xmax = 0" in skip
+
+    update = str(upsert_statement(SUPPLIERS, update_existing=True).compile(dialect=postgresql.dialect()))
+    assert "email = coalesce(excluded.email, suppliers.email)" in update
+    assert "supplier_number =" not in update.split("DO UPDATE")[1]
+
+
+def test_existing_lookup_uses_one_array_parameter():
+    org_numbers = [f"{n:09d}" for n in range(20000)]
+    compiled = existing_contacts_query(CUSTOMERS, uuid.uuid4(), org_numbers).compile(dialect=postgresql.dialect())
+
+    assert "customers.org_number = ANY (%(org_numbers)s::VARCHAR[])" in str(compiled)
+    assert len(compiled.params["org_numbers"]) == 20000
@@ -0,0 +1,109 @@
+"""
+Unit Tests for the in-memory currency rate table
+Run with: pytest tests/services/test_currency_rate_table.py -v
+"""
+
+import asyncio
+from dataclasses import astuple
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.currency_rate_table import CurrencyRateTable, TableRate
+
+
+def rate(currency, rate_date, value, source="norges_bank"):
+    stamp = datetime(2026, 1, 1)
+    return TableRate(currency, "NOK", Decimal(value), rate_date, source, stamp, stamp)
+
+
+@pytest.fixture
+def table():
+    table = CurrencyRateTable(ttl_seconds=3600)
+    table.load_rates([
+        rate("EUR", date(2026, 1, 5), "11.50"),
+        rate("EUR", date(2026, 1, 2), "11.40"),
+        rate("EUR", date(2026, 1, 6), "11.60"),
+        rate("USD", date(2026, 1, 2), "10.00"),
+        rate("USD", date(2026, 1, 2), "10.20", source="manual"),
+    ])
+    return table
+
+
+class TestRateOn:
+    def test_exact_date(self, table):
+        assert table.rate_on("EUR", date(2026, 1, 5)).rate == Decimal("11.50")
+
+    def test_falls_back_to_latest_before(self, table):
+        # Weekend: Friday's rate
+        assert table.rate_on("EUR", date(2026, 1, 4)).rate == Decimal("11.40")
+        assert table.rate_on("EUR", date(2026, 3, 1)).rate == Decimal("11.60")
+
+    def test_before_first_rate_or_unknown_currency(self, table):
+        assert table.rate_on("EUR", date(2025, 12, 31)) is None
+        assert table.rate_on("GBP", date(2026, 1, 5)) is None
+
+    def test_last_row_for_a_date_wins(self, table):
+        assert table.rate_on("USD", date(2026, 1, 2)).source == "manual"
+
+
+def test_convert_many_mixed_currencies_and_dates(table):
+    converted = table.convert_many(
+        [Decimal("100"), Decimal("100"), Decimal("250"), Decimal("100"), Decimal("1")],
+        ["EUR", "USD", "NOK", "EUR", "EUR"],
+        [date(2026, 1, 2), date(2026, 1, 9), date(2026, 1, 9), date(2026, 1, 7), date(2025, 1, 1)],
+    )
+
+    assert converted == [Decimal("1140.00"), Decimal("1020.00"), Decimal("250"), Decimal("1160.00"), None]
+
+
+def test_convert_between_foreign_currencies(table):
+    assert table.convert(Decimal("102"), "USD", "EUR", date(2026, 1, 6)) == Decimal("102") * Decimal("10.20") / Decimal("11.60")
+    assert table.convert(Decimal("1160"), "NOK", "EUR", date(2026, 1, 6)) == Decimal("100")
+
+
+def test_latest_and_history(table):
+    assert {currency: r.rate for currency, r in table.latest().items()} == {
+        "EUR": Decimal("11.60"), "USD": Decimal("10.20")
+    }
+    assert [r.rate_date for r in table.history("EUR", date(2026, 1, 3), date(2026, 1, 6))] == [
+        date(2026, 1, 5), date(2026, 1, 6)
+    ]
+
+
+def test_freshness(table):
+    assert table.is_fresh
+    table.invalidate()
+    assert not table.is_fresh
+
+
+def test_mismatched_lengths(table):
+    with pytest.raises(ValueError):
+        table.convert_many([Decimal("1")], ["EUR", "USD"], [date(2026, 1, 2)])
+
+
+def test_per_100_quotes_are_converted_per_unit(table):
+    table.load_rates([rate("SEK", date(2026, 1, 2), "98.50"), rate("EUR", date(2026, 1, 2), "11.40")])
+
+    assert table.rate_on("SEK", date(2026, 1, 2)).unit == 100
+    assert table.rates_many(["SEK", "EUR"], [date(2026, 1, 2)] * 2) == [Decimal("0.985"), Decimal("11.40")]
+    assert table.convert(Decimal("1000"), "SEK", "NOK", date(2026, 1, 2)) == Decimal("985.000")
+    assert table.convert(Decimal("100"), "EUR", "SEK", date(2026, 1, 2)) == Decimal("1140") / Decimal("0.985")
+
+
+def test_loading_lock_is_created_in_the_running_loop():
+    class Database:
+        async def execute(self, statement):
+            return SimpleNamespace(all=lambda: [astuple(rate("EUR", date(2026, 1, 2), "11.40"))])
+
+    table = CurrencyRateTable(ttl_seconds=3600)  # created outside any event loop, like rate_table
+
+    locks = []
+    for _ in range(2):
+        asyncio.run(table.reload(Database()))
+        locks.append(table._lock)
+
+    assert table.rate_on("EUR", date(2026, 1, 2)).rate == Decimal("11.40")
+    assert locks[0] is not locks[1]
@@ -0,0 +1,98 @@
+"""
+Unit Tests for foreign currency revaluation (in-memory steps)
+Run with: pytest tests/services/test_currency_revaluation.py -v
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import numpy as np
+
+from app.services.currency_rate_table import CurrencyRateTable, TableRate
+from app.services.currency_revaluation import (
+    CurrencyRevaluationService,
+    RevaluationGroup,
+    revaluation_lines,
+    revalue_cents,
+)
+
+AS_OF = date(2025, 12, 31)
+
+
+def make_rates():
+    stamp = datetime(2026, 1, 1)
+    table = CurrencyRateTable(ttl_seconds=3600)
+    table.load_rates([
+        TableRate("EUR", "NOK", Decimal(value), rate_date, "norges_bank", stamp, stamp)
+        for rate_date, value in [(date(2025, 11, 3), "11.50"), (date(2025, 12, 1), "11.70"), (AS_OF, "11.80")]
+    ])
+    return table
+
+
+def test_revalue_cents_rounds_each_item():
+    open_cents, book, revalued = revalue_cents(
+        np.array([100.0, 33.33]), np.array([11.5, 11.7]), np.array([11.8, 11.8])
+    )
+
+    assert open_cents.tolist() == [10000, 3333]
+    assert book.tolist() == [115000, 38996]
+    assert revalued.tolist() == [118000, 39329]
+
+
+class TestAddChunk:
+    def setup_method(self):
+        self.service = CurrencyRevaluationService(db=None, rates=make_rates())
+        self.groups = {}
+        self.missing = {"closing_rate": {}, "invoice_date_rate": 0}
+
+    def test_groups_per_client_ledger_and_currency(self):
+        client_a, client_b = uuid4(), uuid4()
+        rows = [
+            (client_a, "EUR", date(2025, 11, 10), Decimal("1000.00")),
+            (client_a, "EUR", date(2025, 12, 5), Decimal("500.00")),
+            (client_b, "EUR", date(2025, 12, 5), Decimal("200.00")),
+        ]
+        self.service._add_chunk("supplier", rows, AS_OF, self.groups, self.missing)
+        # A second chunk adds to the same group
+        self.service._add_chunk("supplier", rows[:1], AS_OF, self.groups, self.missing)
+
+        group = self.groups[(client_a, "supplier", "EUR")]
+        assert group.item_count == 3
+        assert group.open_amount_cents == 250000
+        assert group.book_value_cents == 1150000 + 585000 + 1150000
+        assert group.revalued_cents == 2500 * 1180
+        assert self.groups[(client_b, "supplier", "EUR")].adjustment_cents == 2000
+        # Payables worth more NOK are a loss
+        assert group.gain_cents == -(2500 * 1180 - 2885000)
+
+    def test_items_without_rates_are_reported(self):
+        rows = [
+            (uuid4(), "USD", date(2025, 12, 5), Decimal("100.00")),
+            (uuid4(), "EUR", date(2025, 1, 5), Decimal("100.00")),
+        ]
+        self.service._add_chunk("customer", rows, AS_OF, self.groups, self.missing)
+
+        assert self.groups == {}
+        assert self.missing == {"closing_rate": {"USD": 1}, "invoice_date_rate": 1}
+
+
+def test_revaluation_lines_balance():
+    client_id = uuid4()
+    groups = [
+        RevaluationGroup(client_id, "customer", "EUR", Decimal("11.80"), 4, 100000, 1150000, 1180000),
+        RevaluationGroup(client_id, "supplier", "EUR", Decimal("11.80"), 2, 50000, 585000, 590000),
+        RevaluationGroup(client_id, "supplier", "USD", Decimal("10.10"), 1, 10000, 102000, 101000),
+        RevaluationGroup(client_id, "customer", "SEK", Decimal("1.05"), 1, 10000, 10500, 10500),
+    ]
+
+    lines = revaluation_lines(groups)
+    by_account = {}
+    for line in lines:
+        by_account.setdefault(line["account_number"], []).append((line["debit_cents"], line["credit_cents"]))
+
+    assert sum(line["debit_cents"] for line in lines) == sum(line["credit_cents"] for line in lines)
+    assert by_account["1500"] == [(30000, 0)]
+    assert by_account["2400"] == [(0, 5000), (1000, 0)]
+    assert by_account["8060"] == [(0, 31000)]
+    assert by_account["8160"] == [(5000, 0)]
@@ -0,0 +1,122 @@
+"""
+Unit Tests for the streaming voucher journal export
+Run with: pytest tests/services/test_journal_export.py -v
+"""
+
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy.dialects import postgresql
+
+from app.services.journal_export import (
+    EXPORT_COLUMNS,
+    STREAM_WRITERS,
+    csv_chunk,
+    decode_cursor,
+    encode_cursor,
+    export_row,
+    journal_export_query,
+    ndjson_chunk,
+)
+
+
+def make_row(line_number=1, debit="100.00", credit="0.00"):
+    return SimpleNamespace(
+        accounting_date=date(2026, 1, 15),
+        voucher_series="A",
+        voucher_number="2026-0001",
+        source_type="vendor_invoice",
+        description="Kontorrekvisita",
+        created_by_type="user",
+        created_at=datetime(2026, 1, 15, 9, 30),
+        line_number=line_number,
+        account_number="6800",
+        debit_amount=Decimal(debit),
+        credit_amount=Decimal(credit),
+        vat_code="1",
+        vat_amount=None,
+        line_description=None,
+    )
+
+
+async def chunks_of(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    cursor = (date(2026, 3, 1), "A", "2026-0042", 3)
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_export_query_is_one_join_with_keyset_resume():
+    query = journal_export_query(
+        uuid.uuid4(),
+        date_from=date(2026, 1, 1),
+        date_to=date(2026, 12, 31),
+        series=["A", "B"],
+        after=(date(2026, 3, 1), "A", "2026-0042", 3),
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("SELECT") == 1
+    assert "JOIN general_ledger ON" in sql
+    assert "general_ledger_lines.fiscal_year >=" in sql
+    assert "general_ledger_lines.fiscal_year <=" in sql
+    assert "general_ledger.voucher_series IN" in sql
+    assert "(general_ledger.accounting_date, coalesce(general_ledger.voucher_series" in sql
+    assert "ORDER BY general_ledger.accounting_date" in sql
+
+
+def test_export_row_matches_columns_and_carries_cursor():
+    row = export_row(make_row(line_number=2))
+    record = dict(zip(EXPORT_COLUMNS, row))
+
+    assert len(row) == len(EXPORT_COLUMNS)
+    assert record["voucher_number"] == "A-2026-0001"
+    assert record["vat_amount"] == Decimal("0.00")
+    assert decode_cursor(record["cursor"]) == (date(2026, 1, 15), "A", "2026-0001", 2)
+
+
+def test_csv_and_ndjson_chunks():
+    rows = [export_row(make_row(1)), export_row(make_row(2, debit="0.00", credit="100.00"))]
+
+    parsed = list(csv.reader(io.StringIO(csv_chunk(rows, header=True))))
+    assert parsed[0] == list(EXPORT_COLUMNS)
+    assert parsed[2][EXPORT_COLUMNS.index("credit")] == "100.00"
+
+    lines = ndjson_chunk(rows).splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["debit"] == 100.0
+
+
+async def test_csv_stream_writes_header_once():
+    rows = [export_row(make_row(1))]
+    body = "".join([part async for part in STREAM_WRITERS["csv"](chunks_of(rows, rows))])
+
+    assert body.count("accounting_date") == 1
+    assert len(body.splitlines()) == 3
+
+    empty = "".join([part async for part in STREAM_WRITERS["csv"](chunks_of())])
+    assert empty.splitlines() == [",".join(EXPORT_COLUMNS)]
+
+
+async def test_xlsx_stream_produces_workbook():
+    rows = [export_row(make_row(n)) for n in range(1, 4)]
+    body = b"".join([part async for part in STREAM_WRITERS["xlsx"](chunks_of(rows))])
+
+    sheet = load_workbook(io.BytesIO(body)).active
+    values = list(sheet.values)
+    assert values[0] == EXPORT_COLUMNS
+    assert len(values) == 4
+    assert values[1][EXPORT_COLUMNS.index("account_number")] == "6800"
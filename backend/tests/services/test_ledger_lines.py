@@ -0,0 +1,82 @@
+"""
+Unit Tests for the denormalized ledger line columns and report filters
+Run with: pytest tests/services/test_ledger_lines.py -v
+"""
+
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy import and_, select
+
+from app.models.general_ledger import GeneralLedger, GeneralLedgerLine, set_line_entry_fields
+from app.services.ledger_lines import ensure_partitions, line_filters
+from app.utils.query_plans import render_sql
+
+
+def compile_where(filters):
+    return render_sql(select(GeneralLedgerLine.id).where(and_(*filters)))
+
+
+class TestLineFilters:
+    def test_date_range_adds_fiscal_year_bounds(self):
+        sql = compile_where(line_filters(uuid4(), date(2025, 1, 1), date(2025, 3, 31)))
+
+        assert "general_ledger_lines.status = 'posted'" in sql
+        assert "general_ledger_lines.fiscal_year >= 2024" in sql
+        assert "general_ledger_lines.fiscal_year <= 2026" in sql
+        assert "general_ledger.id" not in sql
+
+    def test_status_none_and_open_range(self):
+        sql = compile_where(line_filters(uuid4(), to_date=date(2025, 12, 31), status=None))
+
+        assert "status" not in sql
+        assert "fiscal_year >=" not in sql
+        assert "general_ledger_lines.fiscal_year <= 2026" in sql
+
+
+def test_new_line_copies_entry_columns():
+    entry = GeneralLedger(
+        id=uuid4(),
+        client_id=uuid4(),
+        accounting_date=date(2025, 12, 31),
+        fiscal_year=2025,
+        status="posted",
+    )
+    line = GeneralLedgerLine(
+        general_ledger_entry=entry,
+        line_number=1,
+        account_number="6300",
+        debit_amount=Decimal("100.00"),
+        credit_amount=Decimal("0.00"),
+    )
+
+    set_line_entry_fields(None, None, line)
+
+    assert line.client_id == entry.client_id
+    assert line.accounting_date == date(2025, 12, 31)
+    assert line.fiscal_year == 2025
+    assert line.status == "posted"
+
+
+async def test_partition_existence_is_rechecked_under_the_lock():
+    statements = []
+    existing = {"general_ledger_lines_y2025"}
+
+    class Connection:
+        async def execute(self, statement, params=None):
+            sql = str(statement)
+            statements.append(sql)
+            if sql.startswith("LOCK TABLE"):
+                # Another worker created 2026 while this one waited for the lock
+                existing.add("general_ledger_lines_y2026")
+            if "to_regclass" in sql:
+                return SimpleNamespace(scalar=lambda: params["name"] if params["name"] in existing else None)
+
+    created = await ensure_partitions(Connection(), [2025, 2026, 2027])
+
+    assert created == ["general_ledger_lines_y2027"]
+    assert [sql for sql in statements if sql.startswith("CREATE TABLE")] == [
+        "CREATE TABLE general_ledger_lines_y2027 (LIKE general_ledger_lines INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ]
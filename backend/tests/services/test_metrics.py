@@ -0,0 +1,93 @@
+"""
+Unit Tests for Prometheus metrics helpers and the metrics middleware
+Run with: pytest tests/services/test_metrics.py -v
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.middleware.metrics import MetricsMiddleware
+from app.utils.metrics import (
+    BANK_SYNC_DURATION,
+    record_llm_usage,
+    render_metrics,
+    timed,
+    track_bank_sync,
+)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestTimed:
+    def test_outcome_label(self):
+        labels = {"provider": "test-timed"}
+        with timed(BANK_SYNC_DURATION, **labels):
+            pass
+        with pytest.raises(ValueError):
+            with timed(BANK_SYNC_DURATION, **labels):
+                raise ValueError("boom")
+
+        assert sample("bank_sync_duration_seconds_count", outcome="success", **labels) == 1
+        assert sample("bank_sync_duration_seconds_count", outcome="error", **labels) == 1
+
+
+def test_record_llm_usage():
+    record_llm_usage("test-model", SimpleNamespace(input_tokens=120, output_tokens=30))
+    record_llm_usage("test-model", None)
+
+    assert sample("llm_tokens_total", model="test-model", kind="input") == 120
+    assert sample("llm_tokens_total", model="test-model", kind="output") == 30
+
+
+@pytest.mark.asyncio
+async def test_track_bank_sync_counts_results():
+    @track_bank_sync("test-dict")
+    async def dnb_like():
+        return {"fetched": 5, "new": 3, "duplicates": 2, "errors": 0}
+
+    @track_bank_sync("test-int")
+    async def tink_like():
+        return 4
+
+    assert (await dnb_like())["new"] == 3
+    assert await tink_like() == 4
+
+    assert sample("bank_sync_transactions_total", provider="test-dict", result="new") == 3
+    assert sample("bank_sync_transactions_total", provider="test-dict", result="duplicates") == 2
+    assert sample("bank_sync_transactions_total", provider="test-dict", result="errors") == 0
+    assert sample("bank_sync_transactions_total", provider="test-int", result="new") == 4
+    assert sample("bank_sync_duration_seconds_count", provider="test-int", outcome="success") == 1
+
+
+def test_middleware_labels_route_templates():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/test-metrics/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    client.get("/test-metrics/1")
+    client.get("/test-metrics/2")
+    client.get("/test-metrics/not-a-number")
+    client.get("/test-metrics-missing")
+
+    route = "/test-metrics/{item_id}"
+    assert sample("http_request_duration_seconds_count", method="GET", route=route, status="200") == 2
+    assert sample("http_request_duration_seconds_count", method="GET", route=route, status="422") == 1
+    assert sample("http_request_duration_seconds_count", method="GET", route="<unmatched>", status="404") >= 1
+    assert sample("http_requests_in_progress") == 0
+
+
+def test_render_metrics():
+    body, content_type = render_metrics()
+
+    assert content_type.startswith("text/plain")
+    assert b"# TYPE http_request_duration_seconds histogram" in body
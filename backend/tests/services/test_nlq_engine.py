@@ -0,0 +1,103 @@
+"""
+Unit Tests for the NLQ execution engine (sandbox, caches, DuckDB mirror)
+Run with: pytest tests/services/test_nlq_engine.py -v
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.services.nlq.cache import LRUCache, from_template, sql_cache_key, to_template
+from app.services.nlq.executor import is_safe_query, with_row_cap
+
+
+class TestSafeQuery:
+    """Test read-only validation"""
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT created_at, updated_at FROM vendor_invoices WHERE client_id = 'x';",
+        "WITH t AS (SELECT 1 AS n) SELECT n FROM t",
+        "SELECT * FROM vendors WHERE name ILIKE '%Delete Consulting%'",
+        'SELECT SUM(total_amount) AS "Sum oppdatert" FROM accruals',
+    ])
+    def test_allowed(self, sql):
+        assert is_safe_query(sql)
+
+    @pytest.mark.parametrize("sql", [
+        "DELETE FROM vendors",
+        "SELECT 1; DROP TABLE vendors",
+        "SELECT * FROM vendors -- comment",
+        "WITH d AS (DELETE FROM vendors RETURNING *) SELECT * FROM d",
+        "SELECT * FROM read_csv('x') ; ATTACH 'a.db'",
+        "UPDATE vendors SET name = 'x'",
+    ])
+    def test_rejected(self, sql):
+        assert not is_safe_query(sql)
+
+    def test_row_cap_wraps_query(self):
+        wrapped = with_row_cap("SELECT * FROM vendors;", 100)
+        assert wrapped.endswith("LIMIT 101")
+        assert ";" not in wrapped
+
+
+class TestCaches:
+    """Test SQL templating and LRU"""
+
+    def test_sql_template_shared_across_clients(self):
+        a, b = uuid4(), uuid4()
+        template = to_template(f"SELECT * FROM vendors WHERE client_id = '{a}'", a)
+
+        assert from_template(template, b) == f"SELECT * FROM vendors WHERE client_id = '{b}'"
+        assert sql_cache_key("Siste 10 bilag?", "v1") == sql_cache_key("siste  10 bilag", "v1")
+
+    def test_lru(self):
+        cache = LRUCache(max_entries=1)
+        cache.put("a", 1)
+        cache.put("b", 2)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+class TestDuckDBMirror:
+    """Test mirror upserts and sandboxed queries"""
+
+    @pytest.fixture
+    def mirror(self):
+        pytest.importorskip("duckdb")
+        from app.services.nlq.mirror import DuckDBMirror
+
+        mirror = DuckDBMirror(":memory:")
+        yield mirror
+        mirror.close()
+
+    def _invoice(self, id_, client_id, amount, updated):
+        return (id_, client_id, uuid4(), "INV-1", date(2026, 1, 1), date(2026, 1, 31),
+                amount, Decimal("0"), amount, "unpaid", "pending", updated)
+
+    async def test_upsert_and_query(self, mirror):
+        table = next(t for t in mirror.tables if t.name == "vendor_invoices")
+        client_id, invoice_id = uuid4(), uuid4()
+        mirror._apply_batch(table, [self._invoice(invoice_id, client_id, Decimal("100.00"), datetime(2026, 1, 1))], False)
+        mirror._apply_batch(table, [self._invoice(invoice_id, client_id, Decimal("250.00"), datetime(2026, 1, 2))], False)
+
+        result = await mirror.execute(
+            f"SELECT SUM(total_amount) AS total FROM vendor_invoices WHERE client_id = '{client_id}'",
+            max_rows=10, timeout_ms=5000,
+        )
+
+        assert result.rows == [{"total": Decimal("250.00")}]
+        assert mirror._watermark("vendor_invoices") == datetime(2026, 1, 2)
+
+    async def test_row_cap(self, mirror):
+        result = await mirror.execute("SELECT * FROM range(50)", max_rows=10, timeout_ms=5000)
+
+        assert len(result.rows) == 10
+        assert result.truncated
+
+    async def test_external_access_disabled(self, mirror):
+        with pytest.raises(Exception):
+            await mirror.execute("SELECT * FROM read_csv('/etc/hostname')", max_rows=10, timeout_ms=5000)
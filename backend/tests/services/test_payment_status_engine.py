@@ -0,0 +1,109 @@
+"""
+Unit Tests for set-based payment status helpers and the scheduler run claims
+Run with: pytest tests/services/test_payment_status_engine.py -v
+"""
+
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.payment_status_service import aging_buckets
+from app.tasks import leader_lock
+
+
+def test_aging_buckets_cover_every_due_date_once():
+    today = date(2026, 3, 31)
+    buckets = aging_buckets(today)
+
+    def bucket_of(due_date):
+        return [
+            name for name, earliest, latest in buckets
+            if (earliest is None or due_date >= earliest) and (latest is None or due_date <= latest)
+        ]
+
+    assert bucket_of(today) == ["current"]
+    assert bucket_of(today - timedelta(days=1)) == ["1_30"]
+    assert bucket_of(today - timedelta(days=30)) == ["1_30"]
+    assert bucket_of(today - timedelta(days=31)) == ["31_60"]
+    assert bucket_of(today - timedelta(days=90)) == ["61_90"]
+    assert bucket_of(today - timedelta(days=91)) == ["over_90"]
+    assert all(len(bucket_of(today - timedelta(days=d))) == 1 for d in range(-5, 400))
+
+
+class FakeEngine:
+    """Records statements; the claim INSERT returns a row unless already claimed"""
+
+    def __init__(self, claimed_by_other=False, fail=False):
+        self.claimed_by_other = claimed_by_other
+        self.fail = fail
+        self.statements = []
+
+    @asynccontextmanager
+    async def begin(self):
+        if self.fail:
+            raise OSError("connection refused")
+        yield self
+
+    async def scalar(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return None if self.claimed_by_other else "job"
+
+    async def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+
+
+def leader_job(monkeypatch, engine, result):
+    monkeypatch.setattr(leader_lock, "engine", engine)
+    calls = []
+
+    @leader_lock.run_as_leader("detect_overdue_invoices")
+    async def job():
+        calls.append(1)
+        return result
+
+    return job, calls
+
+
+async def test_run_is_claimed_once_per_day(monkeypatch):
+    engine = FakeEngine()
+    job, calls = leader_job(monkeypatch, engine, {"success": True})
+
+    assert await job() == {"success": True}
+    assert calls == [1]
+    assert "ON CONFLICT (job_name, scheduled_date) DO NOTHING" in engine.statements[0]
+    assert len(engine.statements) == 1  # claim kept after a successful run
+
+
+async def test_claimed_run_is_skipped(monkeypatch):
+    job, calls = leader_job(monkeypatch, FakeEngine(claimed_by_other=True), {"success": True})
+
+    result = await job()
+
+    assert result["skipped"] is True
+    assert calls == []
+
+
+async def test_failed_run_gives_back_its_claim(monkeypatch):
+    engine = FakeEngine()
+    job, calls = leader_job(monkeypatch, engine, {"success": False, "error": "boom"})
+
+    await job()
+
+    assert engine.statements[1].startswith("DELETE FROM scheduled_job_runs")
+
+
+async def test_database_outage_is_reported_as_failed_run(monkeypatch):
+    job, calls = leader_job(monkeypatch, FakeEngine(fail=True), {"success": True})
+
+    result = await job()
+
+    assert result["success"] is False
+    assert "connection refused" in result["error"]
+    assert calls == []
+
+
+def test_run_just_before_midnight_counts_for_next_day():
+    assert leader_lock.scheduled_date(datetime(2026, 3, 30, 23, 58)) == date(2026, 3, 31)
+    assert leader_lock.scheduled_date(datetime(2026, 3, 31, 0, 1)) == date(2026, 3, 31)
+    assert leader_lock.scheduled_date(datetime(2026, 3, 31, 9, 0)) == date(2026, 3, 31)
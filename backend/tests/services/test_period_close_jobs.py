@@ -0,0 +1,47 @@
+"""
+Unit Tests for tenant-wide period close jobs
+Run with: pytest tests/services/test_period_close_jobs.py -v
+"""
+
+from decimal import Decimal
+
+from app.services.period_close_jobs import item_status, summarize_timings
+from app.services.period_close_service import PeriodCloseService
+
+
+class TestItemStatus:
+    def test_success(self):
+        assert item_status({"status": "success", "errors": []}) == "succeeded"
+
+    def test_already_closed_is_skipped(self):
+        assert item_status({"status": "failed", "errors": ["Period is already closed"]}) == "skipped"
+
+    def test_failed_check(self):
+        assert item_status({"status": "failed", "errors": ["Balance check failed: 12.5"]}) == "failed"
+
+
+def test_summarize_timings():
+    summary = summarize_timings([
+        {"balance_check": 0.1, "accruals": 20.0, "close": 4.0},
+        {"balance_check": 0.3, "accruals": 40.0},
+        None,
+    ])
+
+    assert summary["accruals"] == {"count": 2, "avg_ms": 30.0, "max_ms": 40.0}
+    assert summary["close"] == {"count": 1, "avg_ms": 4.0, "max_ms": 4.0}
+    assert summary["balance_check"]["avg_ms"] == 0.2
+
+
+class TestBalanceResult:
+    def test_rounding_tolerance(self):
+        result = PeriodCloseService._balance_result(Decimal("0.40"), 12)
+        assert result["status"] == "passed"
+        assert result["message"] == "12 bilag kontrollert, alt balanserer"
+
+    def test_unbalanced(self):
+        result = PeriodCloseService._balance_result(Decimal("-150.00"), 3)
+        assert result["status"] == "failed"
+        assert result["diff"] == -150.0
+
+    def test_client_without_entries(self):
+        assert PeriodCloseService._balance_result(None, 0)["status"] == "passed"
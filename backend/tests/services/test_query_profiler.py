@@ -0,0 +1,103 @@
+"""
+Unit Tests for the per-request query profiler and its middleware
+Run with: pytest tests/services/test_query_profiler.py -v
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.middleware.query_profiler import QueryProfilerMiddleware
+from app.utils.query_profiler import (
+    ProfileRegistry,
+    QueryProfile,
+    current_profile,
+    instrument_engine,
+    registry,
+    statement_shape,
+)
+
+
+class TestStatementShape:
+    def test_parameters_and_literals_collapse(self):
+        assert statement_shape("SELECT * FROM t WHERE id = $1 AND name = 'x'") == \
+            statement_shape("SELECT *\n  FROM t WHERE id = $7 AND name = 'y''s'")
+
+    def test_in_lists_of_any_length_match(self):
+        assert statement_shape("SELECT 1 FROM t WHERE id IN ($1, $2)") == \
+            statement_shape("SELECT 1 FROM t WHERE id IN ($1, $2, $3, $4)")
+
+    def test_identifiers_keep_digits(self):
+        assert "general_ledger_lines_y2025" in statement_shape("SELECT * FROM general_ledger_lines_y2025 LIMIT 10")
+
+
+class TestQueryProfile:
+    def test_counts_repeated_shapes_and_slowest(self):
+        profile = QueryProfile()
+        for i in range(12):
+            profile.record(f"SELECT * FROM vendors WHERE id = {i}", 1.0)
+        profile.record("SELECT count(*) FROM general_ledger", 50.0)
+
+        assert profile.queries == 13
+        assert profile.db_ms == 62.0
+        repeated = profile.repeated(10)
+        assert len(repeated) == 1 and repeated[0]["count"] == 12
+        assert profile.slowest_statements()[0] == {"statement": "SELECT count(*) FROM general_ledger", "ms": 50.0}
+        assert len(profile.slowest_statements()) == 5
+        assert profile.server_timing(100.0) == 'db;dur=62.0;desc="13 queries", app;dur=38.0, total;dur=100.0'
+
+    def test_engine_events(self):
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+        profile = QueryProfile()
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))  # no active profile
+            token = current_profile.set(profile)
+            try:
+                for i in range(3):
+                    conn.execute(text("SELECT :x"), {"x": i})
+            finally:
+                current_profile.reset(token)
+
+        assert profile.queries == 3
+        assert list(profile.shapes.values())[0].count == 3
+
+
+def test_registry_ranks_routes():
+    routes = ProfileRegistry()
+    heavy, light = QueryProfile(), QueryProfile()
+    for _ in range(20):
+        heavy.record("SELECT * FROM vendors WHERE id = $1", 2.0)
+    light.record("SELECT 1", 1.0)
+
+    routes.record("GET /heavy", heavy, 60.0, heavy.repeated(10))
+    routes.record("GET /light", light, 5.0, [])
+
+    worst = routes.worst(sort="queries")
+    assert [r["route"] for r in worst] == ["GET /heavy", "GET /light"]
+    assert worst[0]["n_plus_one_requests"] == 1
+    assert worst[0]["repeated_shapes"][0]["max_count"] == 20
+
+
+def test_middleware_sets_server_timing_and_records_route():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        profile = current_profile.get()
+        for _ in range(3):
+            profile.record("SELECT * FROM items WHERE id = $1", 1.5)
+        return {"id": item_id}
+
+    app.add_middleware(QueryProfilerMiddleware, n_plus_one_threshold=3)
+    registry.reset()
+
+    response = TestClient(app).get("/items/1")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith('db;dur=4.5;desc="3 queries"')
+    stats = registry.worst(sort="n_plus_one")[0]
+    assert stats["route"] == "GET /items/{item_id}"
+    assert stats["n_plus_one_requests"] == 1
+    registry.reset()
@@ -0,0 +1,241 @@
+"""
+Unit Tests for the streaming SAF-T Financial writer and its validation pass
+Run with: pytest tests/services/test_saft_export.py -v
+"""
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from lxml import etree
+from sqlalchemy.dialects import postgresql
+
+import app.models  # noqa: F401  (register all mappers)
+from app.config import settings
+from app.services.saft_export import (
+    BACKEND_DIR,
+    BUNDLED_XSD_PATH,
+    SAFT_NAMESPACE,
+    SaftSchemaUnavailableError,
+    SaftExporter,
+    amount,
+    balance_nodes,
+    q,
+    saft_xsd_path,
+    split_address,
+    validate_saft_file,
+    write_node,
+)
+from app.services.subledger_analytics import SUBLEDGERS
+
+
+
+def line(voucher, series, number, line_number, account, debit="0", credit="0", vat_code=None, vat_amount=None):
+    return SimpleNamespace(
+        id=voucher,
+        voucher_series=series,
+        voucher_number=number,
+        accounting_date=date(2026, 2, 10),
+        description="Varekjøp",
+        created_at=datetime(2026, 2, 10, 8, 0),
+        line_number=line_number,
+        account_number=account,
+        debit_amount=Decimal(debit),
+        credit_amount=Decimal(credit),
+        vat_code=vat_code,
+        vat_amount=Decimal(vat_amount) if vat_amount else None,
+        vat_base_amount=None,
+        line_description=None,
+    )
+
+
+async def partitions_of(*partitions):
+    for partition in partitions:
+        yield partition
+
+
+async def write_file(path, partitions, declared=None):
+    """AuditFile with only the GeneralLedgerEntries section"""
+    with etree.xmlfile(str(path), encoding="UTF-8") as xf:
+        with xf.element(q("AuditFile"), nsmap={None: SAFT_NAMESPACE}):
+            with xf.element(q("GeneralLedgerEntries")):
+                if declared:
+                    for tag, value in declared.items():
+                        write_node(xf, tag, value)
+                return await SaftExporter.write_journals(xf, partitions, {"A": "Inngående faktura"}, {})
+
+
+def test_split_address_and_balances():
+    assert split_address("Storgata 1, 0150 Oslo") == ("Storgata 1", "0150", "Oslo")
+    assert split_address("Postboks 5") == ("Postboks 5", None, None)
+    assert balance_nodes("Opening", Decimal("-12.5")) == [("OpeningCreditBalance", "12.50")]
+    assert balance_nodes("Closing", Decimal("0")) == [("ClosingDebitBalance", "0.00")]
+
+
+async def test_journals_group_by_series_and_voucher(tmp_path):
+    a1, a2, b1 = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    rows = [
+        line(a1, "A", "2026-0001", 1, "6800", debit="100.00"),
+        line(a1, "A", "2026-0001", 2, "2400", credit="100.00"),
+        line(a2, "A", "2026-0002", 1, "6800", debit="50.00"),
+    ]
+    more = [
+        line(a2, "A", "2026-0002", 2, "2400", credit="50.00"),
+        line(b1, "B", "2026-0001", 1, "1920", debit="10.00"),
+        line(b1, "B", "2026-0001", 2, "3000", credit="10.00"),
+    ]
+    path = tmp_path / "saft.xml"
+    written = await write_file(path, partitions_of(rows, more))
+
+    assert written.entries == 3
+    assert written.debit == written.credit == Decimal("160.00")
+
+    ns = {"s": SAFT_NAMESPACE}
+    tree = etree.parse(str(path))
+    journals = tree.findall(".//s:Journal", ns)
+    assert [j.findtext("s:JournalID", namespaces=ns) for j in journals] == ["A", "B"]
+    assert journals[0].findtext("s:Description", namespaces=ns) == "Inngående faktura"
+    transactions = journals[0].findall("s:Transaction", ns)
+    assert [t.findtext("s:TransactionID", namespaces=ns) for t in transactions] == ["A-2026-0001", "A-2026-0002"]
+    # Voucher split across chunks stays one transaction
+    assert len(transactions[1].findall("s:Line", ns)) == 2
+    assert transactions[0].find("s:Line/s:CreditAmount/s:Amount", ns).text == "100.00"
+
+
+async def test_validation_pass_checks_control_totals_and_balance(tmp_path):
+    voucher = uuid.uuid4()
+    rows = [
+        line(voucher, "A", "2026-0001", 1, "6800", debit="80.00", vat_code="1", vat_amount="20.00"),
+        line(voucher, "A", "2026-0001", 2, "2710", debit="20.00"),
+        line(voucher, "A", "2026-0001", 3, "2400", credit="100.00"),
+    ]
+    good = tmp_path / "good.xml"
+    await write_file(good, partitions_of(rows), {
+        "NumberOfEntries": 1, "TotalDebit": amount(Decimal("100")), "TotalCredit": amount(Decimal("100")),
+    })
+    result = validate_saft_file(str(good), check_schema=False)  # partial file
+    assert result.valid, result.errors
+    assert result.totals.entries == 1
+    # TaxAmount/Amount is not counted as a debit or credit
+    assert result.totals.debit == Decimal("100.00")
+
+    bad = tmp_path / "bad.xml"
+    await write_file(bad, partitions_of(rows[:2]), {
+        "NumberOfEntries": 2, "TotalDebit": "100.00", "TotalCredit": "100.00",
+    })
+    result = validate_saft_file(str(bad), check_schema=False)
+    assert not result.valid
+    assert any("does not balance" in error for error in result.errors)
+    assert any(error.startswith("NumberOfEntries") for error in result.errors)
+    assert any(error.startswith("TotalCredit") for error in result.errors)
+
+
+def test_account_balances_query_is_one_filtered_aggregate():
+    query = SaftExporter(None).account_balances_query(uuid.uuid4(), date(2026, 1, 1), date(2026, 12, 31))
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("FILTER (WHERE") == 2
+    assert "GROUP BY general_ledger_lines.account_number" in sql
+    assert "JOIN" not in sql
+
+
+def customer(**values):
+    return SimpleNamespace(**{
+        "id": uuid.uuid4(), "org_number": "923609016", "is_company": True, "name": "Kunde AS",
+        "address_line1": "Storgata 1", "postal_code": "0150", "city": "Oslo", "country": "Norge",
+        "contact_person": None, "phone": None, "email": None, "customer_number": "10001",
+        **values,
+    })
+
+
+def supplier(**values):
+    return SimpleNamespace(**{
+        "id": uuid.uuid4(), "org_number": "974760673", "company_name": "Leverandør AS",
+        "address_line1": "Kaigaten 2", "postal_code": "5015", "city": "Bergen", "country": "NO",
+        "contact_person": "Kari Nordmann", "phone": "55 00 00 00", "email": None, "supplier_number": "20001",
+        **values,
+    })
+
+
+def test_contacts_carry_control_account_and_balances():
+    tag, node = SaftExporter.customer_node(customer(), (Decimal("100.00"), Decimal("250.00")))
+    assert tag == "Customer"
+    assert node[-1] == ("BalanceAccount", [
+        ("AccountID", "1500"), ("OpeningDebitBalance", "100.00"), ("ClosingDebitBalance", "250.00"),
+    ])
+
+    tag, node = SaftExporter.supplier_node(supplier(), (Decimal("0.00"), Decimal("-80.00")))
+    assert tag == "Supplier"
+    assert node[-1] == ("BalanceAccount", [
+        ("AccountID", "2400"), ("OpeningDebitBalance", "0.00"), ("ClosingCreditBalance", "80.00"),
+    ])
+
+
+def test_contact_balances_query_aggregates_the_sub_ledger():
+    query = SaftExporter(None).contact_balances_query(
+        SUBLEDGERS["supplier"], uuid.uuid4(), date(2026, 1, 1), date(2026, 12, 31)
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "FROM supplier_ledger JOIN supplier_ledger_transactions" in sql
+    assert sql.count("FILTER (WHERE") == 1
+    assert "GROUP BY supplier_ledger.supplier_id" in sql
+
+
+def test_missing_schema_fails_validation(tmp_path, monkeypatch):
+    path = tmp_path / "saft.xml"
+    path.write_text("<AuditFile/>")
+    monkeypatch.setattr(settings, "SAFT_XSD_PATH", str(tmp_path / "missing.xsd"))
+
+    with pytest.raises(SaftSchemaUnavailableError):
+        validate_saft_file(str(path))
+
+
+def test_relative_schema_path_is_resolved_from_the_backend_directory(monkeypatch):
+    monkeypatch.setattr(settings, "SAFT_XSD_PATH", "")
+    assert saft_xsd_path() == BUNDLED_XSD_PATH
+    assert BUNDLED_XSD_PATH.parent.is_dir()
+
+    monkeypatch.setattr(settings, "SAFT_XSD_PATH", "custom/saft.xsd")
+    assert saft_xsd_path() == BACKEND_DIR / "custom" / "saft.xsd"
+    assert (BACKEND_DIR / "app" / "services" / "saft_export.py").is_file()
+
+
+@pytest.mark.skipif(not BUNDLED_XSD_PATH.is_file(), reason="SAF-T 1.30 XSD not installed (scripts/fetch_saft_xsd.py)")
+async def test_generated_file_matches_the_saft_xsd(tmp_path):
+    client = SimpleNamespace(
+        org_number="999999999", name="Regnskap AS", address="Storgata 1, 0150 Oslo",
+        contact_person="Ola Nordmann", contact_email="ola@example.no", vat_registered=True, base_currency="NOK",
+    )
+    tax_code = SimpleNamespace(code="1", description="Fradrag inngående mva, høy sats", rate=Decimal("25"))
+    voucher = uuid.uuid4()
+    rows = [
+        line(voucher, "A", "2026-0001", 1, "6800", debit="80.00", vat_code="1", vat_amount="20.00"),
+        line(voucher, "A", "2026-0001", 2, "2710", debit="20.00"),
+        line(voucher, "A", "2026-0001", 3, "2400", credit="100.00"),
+    ]
+    exporter = SaftExporter(None)
+    path = tmp_path / "saft.xml"
+    with etree.xmlfile(str(path), encoding="UTF-8") as xf:
+        xf.write_declaration()
+        with xf.element(q("AuditFile"), nsmap={None: SAFT_NAMESPACE}):
+            write_node(xf, "Header", exporter.header(client, date(2026, 1, 1), date(2026, 12, 31)))
+            with xf.element(q("MasterFiles")):
+                with xf.element(q("GeneralLedgerAccounts")):
+                    write_node(xf, "Account", exporter.account_node("2400", "Leverandørgjeld", Decimal("0"), Decimal("-100")))
+                with xf.element(q("Customers")):
+                    write_node(xf, *exporter.customer_node(customer()))
+                with xf.element(q("Suppliers")):
+                    write_node(xf, *exporter.supplier_node(supplier(), (Decimal("0.00"), Decimal("-100.00"))))
+                write_node(xf, "TaxTable", exporter.tax_table({"1": tax_code}))
+            with xf.element(q("GeneralLedgerEntries")):
+                write_node(xf, "NumberOfEntries", 1)
+                write_node(xf, "TotalDebit", "100.00")
+                write_node(xf, "TotalCredit", "100.00")
+                await SaftExporter.write_journals(xf, partitions_of(rows), {}, {"1": tax_code})
+
+    result = validate_saft_file(str(path))
+
+    assert result.valid, result.errors
@@ -0,0 +1,84 @@
+"""
+Unit Tests for search conditions, keyset cursors and count modes
+Run with: pytest tests/services/test_search.py -v
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.models.audit_trail import AuditTrail
+from app.services.search import (
+    audit_search,
+    count_results,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    page_from_rows,
+)
+from app.utils.query_plans import render_sql
+
+
+def where_sql(condition):
+    return render_sql(select(AuditTrail.id).where(condition))
+
+
+class TestSearchCondition:
+    def test_full_text_and_trigram_branches(self):
+        sql = where_sql(audit_search("Kari Nordmann"))
+
+        assert "audit_trail.search_vector @@ websearch_to_tsquery('simple'::regconfig, 'Kari Nordmann')" in sql
+        assert "audit_trail.changed_by_name ILIKE '%Kari Nordmann%'" in sql
+        assert "audit_trail.reason ILIKE" in sql
+
+    def test_short_terms_skip_trigram(self):
+        sql = where_sql(audit_search(" ab "))
+
+        assert "ILIKE" not in sql
+        assert "'ab'" in sql
+
+    def test_like_wildcards_are_escaped(self):
+        sql = where_sql(audit_search("100%_done"))
+
+        assert "ILIKE '%100!%!_done%' ESCAPE '!'" in sql
+
+
+class TestKeysetCursor:
+    def test_round_trip(self):
+        row_id = uuid4()
+        ts = datetime(2026, 2, 15, 12, 30, 5, 123456)
+
+        assert decode_cursor(encode_cursor(ts, row_id)) == (ts, row_id)
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_condition_direction(self):
+        cursor = encode_cursor(datetime(2026, 1, 1), uuid4())
+
+        assert "(audit_trail.timestamp, audit_trail.id) <" in where_sql(
+            keyset_condition(AuditTrail.timestamp, AuditTrail.id, cursor)
+        )
+        assert "(audit_trail.timestamp, audit_trail.id) >" in where_sql(
+            keyset_condition(AuditTrail.timestamp, AuditTrail.id, cursor, descending=False)
+        )
+
+    def test_page_from_rows(self):
+        rows = [SimpleNamespace(id=uuid4(), timestamp=datetime(2026, 1, day)) for day in (3, 2, 1)]
+
+        page = page_from_rows(rows, 2, "timestamp")
+        assert page.rows == rows[:2]
+        assert decode_cursor(page.next_cursor) == (rows[1].timestamp, rows[1].id)
+
+        assert page_from_rows(rows[:2], 2, "timestamp").next_cursor is None
+
+
+async def test_count_mode_validation():
+    with pytest.raises(ValueError):
+        await count_results(None, select(AuditTrail.id), mode="fast")
+
+    assert await count_results(None, select(AuditTrail.id), mode="none") == {"count": None, "estimated": False}
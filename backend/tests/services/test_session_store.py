@@ -0,0 +1,114 @@
+"""
+Unit Tests for the session store and chat ContextManager
+Run with: pytest tests/services/test_session_store.py -v
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.services import session_store
+from app.services.session_store import InMemorySessionStore, deserialize, serialize
+from app.services.chat.context_manager import ContextManager
+
+
+@pytest.fixture
+async def make_store():
+    """Create stores and stop their sweepers after the test"""
+    stores = []
+
+    def factory(**kwargs):
+        kwargs.setdefault("default_ttl", 60)
+        store = InMemorySessionStore("test", **kwargs)
+        stores.append(store)
+        return store
+
+    yield factory
+    for store in stores:
+        await store.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for TTL tests"""
+    now = {"t": 1000.0}
+    monkeypatch.setattr(session_store.time, "monotonic", lambda: now["t"])
+    return now
+
+
+class TestInMemorySessionStore:
+    """Test LRU capacity and TTL expiry"""
+
+    async def test_lru_eviction(self, make_store):
+        store = make_store(max_entries=2)
+        await store.set("a", {"v": 1})
+        await store.set("b", {"v": 2})
+        await store.get("a")  # a is now most recently used
+        await store.set("c", {"v": 3})
+
+        assert await store.get("b") is None
+        assert await store.get("a") == {"v": 1}
+        assert store.evictions == 1
+
+    async def test_ttl_expiry_on_access(self, make_store, clock):
+        store = make_store()
+        await store.set("a", {"v": 1})
+        clock["t"] += 61
+
+        assert await store.get("a") is None
+
+    async def test_sweep_removes_idle_entries(self, make_store, clock):
+        store = make_store()
+        await store.set("old", {"v": 1})
+        clock["t"] += 30
+        await store.set("new", {"v": 2})
+        clock["t"] += 31
+
+        assert store.sweep() == 1
+        assert len(store) == 1
+
+    async def test_pop(self, make_store):
+        store = make_store()
+        await store.set("state", {"client_id": "x"})
+
+        assert await store.pop("state") == {"client_id": "x"}
+        assert await store.pop("state") is None
+
+
+class TestSerialization:
+    """Test compact Redis encoding"""
+
+    def test_round_trip_small(self):
+        value = {"at": datetime(2026, 1, 2, 3, 4, 5), "amount": Decimal("12.50"), "n": [1, "a"]}
+        data = serialize(value)
+
+        assert data[:1] == b"j"
+        assert deserialize(data) == value
+
+    def test_large_values_are_compressed(self):
+        value = {"history": [{"content": "hei " * 50}] * 20}
+        data = serialize(value)
+
+        assert data[:1] == b"z"
+        assert deserialize(data) == value
+
+
+class TestContextManager:
+    """Test chat context on top of the store"""
+
+    async def test_history_is_bounded(self, make_store):
+        manager = ContextManager(max_history=3, store=make_store())
+        for i in range(5):
+            await manager.add_message("s1", role="user", content=f"m{i}")
+
+        context = await manager.get_context("s1")
+        assert [m["content"] for m in context["conversation_history"]] == ["m2", "m3", "m4"]
+
+    async def test_pending_confirmation(self, make_store):
+        manager = ContextManager(store=make_store())
+        await manager.set_pending_confirmation("s1", "book_invoice", {"invoice_id": "1"}, "Bokfør?")
+
+        assert (await manager.get_pending_confirmation("s1"))["action"] == "book_invoice"
+        await manager.clear_pending_confirmation("s1")
+        assert await manager.get_pending_confirmation("s1") is None
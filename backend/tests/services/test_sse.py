@@ -0,0 +1,44 @@
+"""
+Unit Tests for Server-Sent Events helpers
+Run with: pytest tests/services/test_sse.py -v
+"""
+
+import json
+from decimal import Decimal
+
+from app.utils.sse import format_sse, stream_events
+
+
+def parse(frame):
+    event, data = frame.strip().split("\n")
+    return event[len("event: "):], json.loads(data[len("data: "):])
+
+
+class TestSSE:
+    """Test event framing and stream lifecycle"""
+
+    def test_format_sse(self):
+        frame = format_sse("action", {"type": "invoice_card", "data": {"amount": Decimal("10.50")}})
+
+        assert frame.endswith("\n\n")
+        assert parse(frame) == ("action", {"type": "invoice_card", "data": {"amount": "10.50"}})
+
+    async def test_events_then_done(self):
+        async def produce(emit):
+            await emit("action", {"type": "intent", "data": {}})
+            await emit("token", {"text": "Hei"})
+            return {"message": "Hei"}
+
+        frames = [parse(f) async for f in stream_events(produce)]
+
+        assert [event for event, _ in frames] == ["action", "token", "done"]
+        assert frames[-1][1] == {"message": "Hei"}
+
+    async def test_error_event(self):
+        async def produce(emit):
+            await emit("token", {"text": "a"})
+            raise RuntimeError("boom")
+
+        frames = [parse(f) async for f in stream_events(produce)]
+
+        assert frames[-1] == ("error", {"message": "boom"})
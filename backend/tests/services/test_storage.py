@@ -0,0 +1,124 @@
+"""
+Unit Tests for document storage backends
+Run with: pytest tests/services/test_storage.py -v
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.services import document_service
+from app.services.document_service import DocumentService
+from app.services.storage import LocalStorage, parse_range_header
+from app.services.storage.base import FileTooLargeError, RangeNotSatisfiableError
+from app.services.storage.s3 import S3Storage
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def _collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+class TestParseRangeHeader:
+    """Test HTTP Range header parsing"""
+
+    def test_no_header(self):
+        assert parse_range_header(None, 100) is None
+
+    def test_closed_range(self):
+        r = parse_range_header("bytes=10-19", 100)
+        assert (r.start, r.end, r.length) == (10, 19, 10)
+        assert r.content_range == "bytes 10-19/100"
+
+    def test_open_range_and_clamping(self):
+        assert parse_range_header("bytes=90-", 100).end == 99
+        assert parse_range_header("bytes=90-500", 100).end == 99
+
+    def test_suffix_range(self):
+        r = parse_range_header("bytes=-10", 100)
+        assert (r.start, r.end) == (90, 99)
+
+    def test_multi_range_served_in_full(self):
+        assert parse_range_header("bytes=0-1,5-6", 100) is None
+
+    def test_unsatisfiable(self):
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_range_header("bytes=100-", 100)
+
+
+class TestLocalStorage:
+    """Test local filesystem backend"""
+
+    async def test_save_stream_hashes_on_the_fly(self, tmp_path):
+        storage = LocalStorage(tmp_path)
+        stored = await storage.save_stream("a/b.pdf", _chunks(b"hello ", b"world"))
+
+        assert stored.size == 11
+        assert stored.sha256 == hashlib.sha256(b"hello world").hexdigest()
+        assert (tmp_path / "a" / "b.pdf").read_bytes() == b"hello world"
+
+    async def test_max_size_leaves_no_file(self, tmp_path):
+        storage = LocalStorage(tmp_path)
+        with pytest.raises(FileTooLargeError):
+            await storage.save_stream("big.bin", _chunks(b"x" * 8, b"x" * 8), max_size=10)
+
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_open_range(self, tmp_path):
+        storage = LocalStorage(tmp_path)
+        await storage.save_stream("doc.pdf", _chunks(bytes(range(100))))
+
+        r = parse_range_header("bytes=10-19", await storage.size("doc.pdf"))
+        assert await _collect(storage.open_range("doc.pdf", r)) == bytes(range(10, 20))
+        assert await _collect(storage.open_range("doc.pdf")) == bytes(range(100))
+
+    def test_rejects_path_traversal(self, tmp_path):
+        storage = LocalStorage(tmp_path / "root")
+        with pytest.raises(ValueError):
+            storage.path_for("../outside.txt")
+
+
+class TestDocumentDownloadUrl:
+    """Presigned URLs stored on the document row"""
+
+    async def test_stored_expiry_is_the_signed_one(self, monkeypatch):
+        class Client:
+            def __init__(self):
+                self.signed = 0
+
+            def generate_presigned_url(self, operation, Params, ExpiresIn):
+                self.signed += 1
+                return f"https://s3/{Params['Key']}?sig={self.signed}"
+
+        client = Client()
+        storage = S3Storage("documents", client=client)
+        monkeypatch.setattr(document_service, "get_document_storage", lambda bucket: storage)
+        expires_in = settings.PRESIGNED_URL_EXPIRES_SECONDS
+
+        # Signed 50 minutes ago by another request: still in the storage's cache
+        signed_at = datetime.utcnow() - timedelta(minutes=50)
+        storage._url_cache[("a.pdf", expires_in)] = ("https://s3/a.pdf?sig=old", signed_at + timedelta(seconds=expires_in))
+        document = SimpleNamespace(s3_bucket="documents", s3_key="a.pdf", download_url=None, download_url_expires_at=None)
+
+        url = await DocumentService(None).get_download_url(document)
+
+        assert url == "https://s3/a.pdf?sig=old"
+        assert document.download_url_expires_at == signed_at + timedelta(seconds=expires_in)
+
+    async def test_url_without_expiry_is_not_stored(self, monkeypatch):
+        class Storage(LocalStorage):
+            async def presigned_url(self, key, expires_in):
+                return f"https://cdn/{key}"
+
+        monkeypatch.setattr(document_service, "get_document_storage", lambda bucket: Storage("/tmp"))
+        document = SimpleNamespace(s3_bucket=None, s3_key="a.pdf", download_url=None, download_url_expires_at=None)
+
+        assert await DocumentService(None).get_download_url(document) == "https://cdn/a.pdf"
+        assert document.download_url is None
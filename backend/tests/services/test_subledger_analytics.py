@@ -0,0 +1,89 @@
+"""
+Unit Tests for sub-ledger aging and reconciliation queries
+Run with: pytest tests/services/test_subledger_analytics.py -v
+"""
+
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.models  # noqa: F401  (register all mappers)
+from app.services.subledger_analytics import (
+    BUCKET_KEYS,
+    SubledgerAnalytics,
+    bucket_amounts,
+    reconciliation,
+)
+
+
+def compile_sql(query):
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_bucket_amounts_totals_and_percentages():
+    amounts = {key: Decimal("0.00") for key in BUCKET_KEYS.values()}
+    amounts["not_due"] = Decimal("750.00")
+    amounts["90_plus_days"] = Decimal("250.00")
+
+    report = bucket_amounts(amounts)
+
+    assert report["total"] == 1000.0
+    assert report["aging"]["not_due"] == 750.0
+    assert report["percentages"]["not_due"] == 75.0
+    assert report["percentages"]["90_plus_days"] == 25.0
+    assert report["percentages"]["31_60_days"] == 0
+
+    empty = bucket_amounts({key: Decimal("0.00") for key in BUCKET_KEYS.values()})
+    assert empty["total"] == 0.0
+    assert set(empty["percentages"].values()) == {0}
+
+
+def test_reconciliation_allows_one_ore_rounding():
+    assert reconciliation(Decimal("100.00"), Decimal("100.00"))["reconciles"] is True
+    assert reconciliation(Decimal("100.005"), Decimal("100.00"))["reconciles"] is True
+
+    result = reconciliation(Decimal("100.00"), Decimal("90.00"))
+    assert result["reconciles"] is False
+    assert result["difference"] == 10.0
+    assert result["status"] == "ERROR - Does not reconcile!"
+
+
+def test_unknown_subledger_is_rejected():
+    with pytest.raises(ValueError):
+        SubledgerAnalytics(None, "employee")
+
+
+@pytest.mark.parametrize("ledger, table", [("supplier", "supplier_ledger"), ("customer", "customer_ledger")])
+def test_aging_is_one_grouping_sets_query(ledger, table):
+    sql = compile_sql(SubledgerAnalytics(None, ledger).aging_query(uuid.uuid4(), date.today()))
+
+    assert "GROUPING SETS" in sql
+    assert sql.count("FILTER (WHERE") == 2 * len(BUCKET_KEYS)
+    assert f"FROM {table}" in sql
+    # Current aging reads remaining_amount directly
+    assert "later_transactions" not in sql
+
+
+def test_aging_as_of_past_date_adds_back_later_payments():
+    as_of = date.today() - timedelta(days=60)
+    sql = compile_sql(SubledgerAnalytics(None, "supplier").aging_query(uuid.uuid4(), as_of))
+
+    assert "LEFT OUTER JOIN" in sql
+    assert "supplier_ledger_transactions.transaction_date >" in sql
+    assert "supplier_ledger.invoice_date <=" in sql
+
+
+@pytest.mark.parametrize("ledger, net", [
+    ("supplier", "general_ledger_lines.credit_amount - general_ledger_lines.debit_amount"),
+    ("customer", "general_ledger_lines.debit_amount - general_ledger_lines.credit_amount"),
+])
+def test_reconcile_is_a_single_select_on_line_columns(ledger, net):
+    sql = compile_sql(SubledgerAnalytics(None, ledger).reconcile_query(uuid.uuid4(), date.today()))
+
+    assert sql.count("SELECT") == 3  # outer select of two scalar subqueries
+    assert net in sql
+    assert "general_ledger_lines.fiscal_year <=" in sql
+    assert "JOIN general_ledger " not in sql
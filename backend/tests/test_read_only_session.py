@@ -0,0 +1,23 @@
+"""
+Tests for the read-only session dependency (get_read_db)
+Run with: pytest tests/test_read_only_session.py -v
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.database import get_read_db
+
+
+@pytest.mark.asyncio
+async def test_read_session_is_read_only():
+    sessions = get_read_db()
+    session = await sessions.__anext__()
+    try:
+        result = await session.execute(text("SHOW transaction_read_only"))
+        assert result.scalar() == "on"
+
+        with pytest.raises(DBAPIError, match="read-only transaction"):
+            await session.execute(text("UPDATE clients SET name = name WHERE false"))
+    finally:
+        await sessions.aclose()
@@ -0,0 +1,159 @@
+"""
+Voucher number allocation tests
+
+The stress test runs many concurrent transactions (each on its own
+connection) that allocate single numbers and blocks, book vouchers with
+them and either commit or roll back. Committed voucher numbers must form
+one gapless sequence without duplicates.
+
+Run with: pytest tests/test_voucher_numbering.py -v
+"""
+import asyncio
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.client import Client
+from app.models.general_ledger import GeneralLedger
+from app.models.tenant import Tenant
+from app.models.voucher_series import VoucherSeries
+from app.services.voucher_numbering import (
+    VoucherNumberAllocator,
+    VoucherNumberBlock,
+    format_voucher_number,
+)
+
+
+WORKERS = 16
+ROUNDS = 5
+SERIES = "AP"
+YEAR = 2026
+
+
+@pytest.fixture
+async def committed_client(test_engine):
+    """A client committed to the database (visible to other connections)"""
+    session_maker = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    tenant = Tenant(id=uuid4(), name="Numbering Test", org_number=f"9876{uuid4().hex[:5]}")
+    client = Client(
+        id=uuid4(),
+        tenant_id=tenant.id,
+        client_number=f"NUM{uuid4().hex[:6]}",
+        name="Numbering Test AS",
+        org_number=f"9998{uuid4().hex[:5]}",
+        is_demo=True,
+    )
+    async with session_maker() as session:
+        session.add(tenant)
+        await session.flush()
+        session.add(client)
+        await session.commit()
+
+    yield session_maker, client.id
+
+    async with session_maker() as session:
+        await session.execute(delete(GeneralLedger).where(GeneralLedger.client_id == client.id))
+        await session.execute(delete(VoucherSeries).where(VoucherSeries.client_id == client.id))
+        await session.execute(delete(Client).where(Client.id == client.id))
+        await session.execute(delete(Tenant).where(Tenant.id == tenant.id))
+        await session.commit()
+
+
+def voucher(client_id, voucher_number):
+    return GeneralLedger(
+        id=uuid4(),
+        client_id=client_id,
+        entry_date=date(YEAR, 3, 1),
+        accounting_date=date(YEAR, 3, 1),
+        period=f"{YEAR}-03",
+        fiscal_year=YEAR,
+        voucher_number=voucher_number,
+        voucher_series=SERIES,
+        description="Numbering stress test",
+        source_type="manual",
+        created_by_type="test",
+        status="posted",
+    )
+
+
+async def test_concurrent_allocation_is_gapless(committed_client):
+    session_maker, client_id = committed_client
+
+    async def worker(worker_id):
+        committed = []
+        for round_no in range(ROUNDS):
+            async with session_maker() as session:
+                allocator = VoucherNumberAllocator(session)
+                if (worker_id + round_no) % 2:
+                    numbers = [await allocator.next_number(client_id, SERIES, YEAR)]
+                else:
+                    block = await allocator.reserve(client_id, SERIES, YEAR, 1 + worker_id % 4)
+                    numbers = block.numbers()
+
+                session.add_all(voucher(client_id, number) for number in numbers)
+                await session.flush()
+
+                if (worker_id * ROUNDS + round_no) % 5 == 0:
+                    await session.rollback()
+                else:
+                    await session.commit()
+                    committed.extend(numbers)
+        return committed
+
+    results = await asyncio.gather(*(worker(i) for i in range(WORKERS)))
+    allocated = [number for numbers in results for number in numbers]
+
+    async with session_maker() as session:
+        booked = (await session.execute(
+            select(GeneralLedger.voucher_number).where(GeneralLedger.client_id == client_id)
+        )).scalars().all()
+
+    assert len(allocated) == len(set(allocated))
+    assert sorted(booked) == sorted(allocated)
+    assert sorted(booked) == [format_voucher_number(YEAR, n) for n in range(1, len(booked) + 1)]
+
+
+async def test_release_returns_unused_tail(committed_client):
+    session_maker, client_id = committed_client
+
+    async with session_maker() as session:
+        allocator = VoucherNumberAllocator(session)
+        block = await allocator.reserve(client_id, SERIES, YEAR, 10)
+        used = [block.next() for _ in range(3)]
+        assert await allocator.release(block) == 7
+
+        assert await allocator.next_number(client_id, SERIES, YEAR) == format_voucher_number(YEAR, 4)
+        assert used == [format_voucher_number(YEAR, n) for n in (1, 2, 3)]
+        await session.rollback()
+
+
+async def test_counter_seeds_from_existing_vouchers(committed_client):
+    session_maker, client_id = committed_client
+
+    async with session_maker() as session:
+        session.add(voucher(client_id, f"{YEAR}-0041"))
+        await session.flush()
+
+        number = await VoucherNumberAllocator(session).next_number(client_id, SERIES, YEAR)
+        assert number == f"{YEAR}-0042"
+        await session.rollback()
+
+
+class TestVoucherNumberBlock:
+    """Test block bookkeeping without a database"""
+
+    def test_next_and_exhaustion(self):
+        block = VoucherNumberBlock(client_id=uuid4(), series="P", fiscal_year=2026, start=41, count=2)
+
+        assert list(block) == ["2026-0041", "2026-0042"]
+        assert block.remaining == 0
+        with pytest.raises(ValueError):
+            block.next()
+
+    def test_numbers(self):
+        block = VoucherNumberBlock(client_id=uuid4(), series="P", fiscal_year=2026, start=9999, count=2)
+
+        assert block.numbers() == ["2026-9999", "2026-10000"]